@@ -0,0 +1,304 @@
+#!/usr/bin/env python3
+"""
+Emojis des lemmes par similarité sémantique, hors ligne (aucun appel réseau).
+
+Les lemmes du dictionnaire et les noms CLDR des emojis (module emoji : nom
+français, nom anglais si --vecteurs-en) sont plongés dans un fichier local
+de vecteurs de mots (format texte word2vec/fastText : "mot v1 v2 ...",
+première ligne "nb_mots dimension" facultative). Le vecteur d'un nom
+d'emoji est la moyenne des vecteurs de ses mots ("tête de chat" → tête,
+chat) ; celui d'un lemme composé ("arc-en-ciel"), la moyenne de ses parties
+s'il est absent du fichier. Les similarités cosinus lemmes × emojis sont
+calculées par lots (produit de matrices normalisées, NumPy).
+
+Seuls les vecteurs des mots utiles sont gardés à la lecture du fichier ;
+ils sont mis en cache dans data/vecteurs_cache.npz (reconstruit si le
+fichier de vecteurs change ou si des mots manquent).
+
+Un lemme sans emoji dans data/index_emojis.json reçoit l'emoji le plus
+proche si la similarité atteint SEUIL. Les emojis déjà présents (listes
+manuelles, build_emoji_index.py) ne sont jamais remplacés. Les autres
+lemmes (similarité trop faible, pas de vecteur) sont listés dans
+data/emojis_a_revoir.tsv : ce sont les seuls qu'il reste à traiter avec
+les listes manuelles ou build_emoji_index.py (OpenAI), qui ne demande que
+les lemmes absents de l'index.
+
+--vecteurs-en : vecteurs anglais alignés sur les vecteurs français (même
+espace, ex. wiki.fr.align.vec / wiki.en.align.vec de fastText) ; sans
+eux, seuls les noms français sont utilisés.
+
+Usage:
+    python assign_emojis_vecteurs.py [--vecteurs data/vecteurs.vec] [--vecteurs-en FICHIER]
+                                     [--seuil 0.5] [--tous] [--essai]
+    --tous  : toutes les catégories grammaticales (par défaut : noms, comme build_emoji_index.py)
+    --essai : affiche le résultat sans écrire l'index
+"""
+
+import json
+import os
+import re
+import sys
+import time
+
+import emoji
+import numpy as np
+
+# Fichiers
+FICHIER_DICTIONNAIRE = 'data/dictionnaire_dys.json'
+FICHIER_INDEX = 'data/index_emojis.json'
+FICHIER_VECTEURS = 'data/vecteurs.vec'
+FICHIER_CACHE = 'data/vecteurs_cache.npz'
+FICHIER_A_REVOIR = 'data/emojis_a_revoir.tsv'
+
+SEUIL = 0.5          # Similarité cosinus minimale pour attribuer un emoji
+TAILLE_LOT = 2048    # Lemmes par produit de matrices (lot × emojis similarités en mémoire)
+VERSION_MAX = 13.1   # Emojis plus récents absents des tablettes et ordinateurs des écoles
+
+# Mots des noms CLDR qui ne portent pas le sens de l'emoji
+MOTS_VIDES = {
+    'fr': {'de', 'du', 'des', 'la', 'le', 'les', 'un', 'une', 'au', 'aux', 'et', 'en', 'avec', 'sans',
+           'sur', 'sous', 'dans', 'pour', 'par', 'qui'},
+    'en': {'of', 'the', 'a', 'an', 'with', 'and', 'in', 'on', 'for', 'without', 'button'},
+}
+RE_MOTS = re.compile(r"[a-zà-ÿœæ]+")
+
+
+def lire_option(nom, defaut):
+    args = sys.argv[1:]
+    if nom in args and args.index(nom) + 1 < len(args):
+        return args[args.index(nom) + 1]
+    return defaut
+
+
+def extraire_lemmes(noms_seulement=True):
+    """Lemmes uniques du dictionnaire DYS (en minuscules, comme build_emoji_index.py)"""
+    with open(FICHIER_DICTIONNAIRE, 'r', encoding='utf-8') as f:
+        entries = json.load(f).get('entries', [])
+    lemmes = set()
+    for entry in entries:
+        if noms_seulement and entry.get('cgram') != 'NOM':
+            continue
+        lemme = (entry.get('lemme') or '').lower().strip()
+        if len(lemme) > 1:
+            lemmes.add(lemme)
+    return sorted(lemmes)
+
+
+def mots_du_nom(nom, langue):
+    """":tête_de_chat:" → ['tête', 'chat']"""
+    mots = RE_MOTS.findall(nom.strip(':').replace('_', ' ').lower())
+    return [m for m in mots if len(m) > 1 and m not in MOTS_VIDES[langue]]
+
+
+def noms_emojis(avec_anglais):
+    """
+    Emojis candidats : entièrement qualifiés, Emoji ≤ VERSION_MAX, sans
+    variantes de couleur de peau ni drapeaux (pays, régions)
+    @returns: [(emoji, mots du nom français, mots du nom anglais)]
+    """
+    candidats = []
+    for code, infos in emoji.EMOJI_DATA.items():
+        if infos.get('status') != emoji.STATUS['fully_qualified']:
+            continue
+        if infos.get('E', 0) > VERSION_MAX:
+            continue
+        if any(0x1F3FB <= ord(c) <= 0x1F3FF or 0x1F1E6 <= ord(c) <= 0x1F1FF or 0xE0020 <= ord(c) <= 0xE007F
+               for c in code):
+            continue
+        nom_fr = emoji.demojize(code, language='fr')
+        mots_fr = mots_du_nom(nom_fr, 'fr') if nom_fr != code else []
+        mots_en = mots_du_nom(infos.get('en', ''), 'en') if avec_anglais else []
+        if mots_fr or mots_en:
+            candidats.append((code, mots_fr, mots_en))
+    return candidats
+
+
+# --- Vecteurs de mots ---
+
+def signature(chemin):
+    stat = os.stat(chemin)
+    return f"{os.path.abspath(chemin)}:{stat.st_size}:{int(stat.st_mtime)}"
+
+
+def lire_vecteurs(chemin, vocabulaire):
+    """Lecture en flux : vecteurs des seuls mots du vocabulaire (première occurrence)"""
+    vecteurs = {}
+    dimension = None
+    with open(chemin, 'r', encoding='utf-8', errors='replace') as f:
+        for num, ligne in enumerate(f):
+            mot, _, valeurs = ligne.rstrip().partition(' ')
+            if num == 0 and valeurs.isdigit():
+                dimension = int(valeurs)  # En-tête "nb_mots dimension"
+                continue
+            if mot not in vocabulaire or mot in vecteurs:
+                continue
+            vecteur = np.array(valeurs.split(' '), dtype=np.float32)
+            if dimension is None:
+                dimension = len(vecteur)
+            if len(vecteur) == dimension:
+                vecteurs[mot] = vecteur
+    return vecteurs, dimension
+
+
+def charger_vecteurs(chemin, vocabulaire, cache):
+    """Vecteurs du vocabulaire, depuis le cache .npz s'il couvre tous les mots"""
+    sig = signature(chemin)
+    if os.path.exists(cache):
+        with np.load(cache, allow_pickle=False) as donnees:
+            if str(donnees['signature']) == sig and vocabulaire <= set(donnees['cherches'].tolist()):
+                print(f"   Cache {cache}")
+                matrice = donnees['matrice']
+                return dict(zip(donnees['mots'].tolist(), matrice)), matrice.shape[1]
+
+    vecteurs, dimension = lire_vecteurs(chemin, vocabulaire)
+    if vecteurs:
+        mots = sorted(vecteurs)
+        np.savez(cache, signature=np.array(sig), cherches=np.array(sorted(vocabulaire)),
+                 mots=np.array(mots), matrice=np.stack([vecteurs[m] for m in mots]))
+    return vecteurs, dimension
+
+
+def moyenne(mots, vecteurs):
+    """Moyenne des vecteurs (normalisés) des mots connus, None si aucun"""
+    connus = [vecteurs[m] for m in mots if m in vecteurs]
+    if not connus:
+        return None
+    return normaliser(np.stack(connus)).mean(axis=0)
+
+
+def normaliser(matrice):
+    normes = np.linalg.norm(matrice, axis=1, keepdims=True)
+    normes[normes == 0] = 1
+    return matrice / normes
+
+
+def vecteur_lemme(lemme, vecteurs):
+    if lemme in vecteurs:
+        return vecteurs[lemme]
+    return moyenne(RE_MOTS.findall(lemme), vecteurs)
+
+
+# --- Attribution ---
+
+def attribuer(lemmes, matrice_lemmes, matrice_emojis, emojis):
+    """
+    Emoji le plus proche de chaque lemme, par lots de TAILLE_LOT
+    @returns: [(lemme, emoji, similarité)]
+    """
+    matrice_lemmes = normaliser(matrice_lemmes)
+    transposee = normaliser(matrice_emojis).T.copy()
+    resultats = []
+    for debut in range(0, len(lemmes), TAILLE_LOT):
+        similarites = matrice_lemmes[debut:debut + TAILLE_LOT] @ transposee
+        meilleurs = similarites.argmax(axis=1)
+        scores = similarites[np.arange(len(meilleurs)), meilleurs]
+        for lemme, i, score in zip(lemmes[debut:debut + TAILLE_LOT], meilleurs, scores):
+            resultats.append((lemme, emojis[i], float(score)))
+    return resultats
+
+
+def main():
+    debut = time.time()
+    chemin_vecteurs = lire_option('--vecteurs', FICHIER_VECTEURS)
+    chemin_en = lire_option('--vecteurs-en', None)
+    seuil = float(lire_option('--seuil', SEUIL))
+    essai = '--essai' in sys.argv[1:]
+
+    index = {}
+    if os.path.exists(FICHIER_INDEX):
+        with open(FICHIER_INDEX, 'r', encoding='utf-8') as f:
+            index = json.load(f)
+    print(f"📚 Index existant : {len(index)} emojis")
+
+    lemmes = [l for l in extraire_lemmes(noms_seulement='--tous' not in sys.argv[1:]) if l not in index]
+    print(f"🔍 {len(lemmes)} lemmes sans emoji")
+    candidats = noms_emojis(avec_anglais=chemin_en is not None)
+    print(f"🎨 {len(candidats)} emojis candidats")
+    if not lemmes:
+        print("✨ Tous les lemmes ont déjà un emoji!")
+        return 0
+
+    for chemin in filter(None, (chemin_vecteurs, chemin_en)):
+        if not os.path.exists(chemin):
+            print(f"❌ Fichier de vecteurs non trouvé : {chemin}")
+            return 1
+
+    # Vocabulaire utile : lemmes, parties des lemmes composés, mots des noms français
+    vocabulaire_fr = set(lemmes)
+    for lemme in lemmes:
+        vocabulaire_fr.update(RE_MOTS.findall(lemme))
+    for _, mots_fr, _ in candidats:
+        vocabulaire_fr.update(mots_fr)
+    print(f"📂 Lecture de {chemin_vecteurs} ({len(vocabulaire_fr)} mots utiles)...")
+    vecteurs, dimension = charger_vecteurs(chemin_vecteurs, vocabulaire_fr, FICHIER_CACHE)
+    vecteurs_en = {}
+    if chemin_en:
+        vocabulaire_en = {m for _, _, mots_en in candidats for m in mots_en}
+        print(f"📂 Lecture de {chemin_en} ({len(vocabulaire_en)} mots utiles)...")
+        vecteurs_en, dimension_en = charger_vecteurs(chemin_en, vocabulaire_en, FICHIER_CACHE.replace('.npz', '_en.npz'))
+        if vecteurs_en and dimension_en != dimension:
+            print(f"❌ Dimensions différentes : {dimension} (fr) ≠ {dimension_en} (en)")
+            return 1
+    print(f"   {len(vecteurs)} mots trouvés (dimension {dimension})")
+    if not vecteurs:
+        print("❌ Aucun vecteur trouvé")
+        return 1
+
+    # Emojis : moyenne des noms français et anglais disponibles
+    emojis = []
+    lignes_emojis = []
+    for code, mots_fr, mots_en in candidats:
+        noms = [v for v in (moyenne(mots_fr, vecteurs), moyenne(mots_en, vecteurs_en)) if v is not None]
+        if noms:
+            emojis.append(code)
+            lignes_emojis.append(np.mean(noms, axis=0))
+
+    avec_vecteur = []
+    lignes_lemmes = []
+    sans_vecteur = []
+    for lemme in lemmes:
+        v = vecteur_lemme(lemme, vecteurs)
+        if v is None:
+            sans_vecteur.append(lemme)
+        else:
+            avec_vecteur.append(lemme)
+            lignes_lemmes.append(v)
+    print(f"🧮 Similarités : {len(avec_vecteur)} lemmes × {len(emojis)} emojis")
+
+    debut_calcul = time.time()
+    resultats = attribuer(avec_vecteur, np.stack(lignes_lemmes), np.stack(lignes_emojis), emojis) \
+        if avec_vecteur else []
+    duree_calcul = time.time() - debut_calcul
+
+    attribues = [(l, e, s) for l, e, s in resultats if s >= seuil]
+    a_revoir = sorted((r for r in resultats if r[2] < seuil), key=lambda r: -r[2])
+    for lemme, code, _ in attribues:
+        index[lemme] = code
+
+    if essai:
+        for lemme, code, score in sorted(attribues, key=lambda r: -r[2])[:30]:
+            print(f"   {lemme}: {code} ({score:.2f})")
+    else:
+        with open(FICHIER_INDEX, 'w', encoding='utf-8') as f:
+            json.dump(index, f, ensure_ascii=False, indent=2, sort_keys=True)
+        with open(FICHIER_A_REVOIR, 'w', encoding='utf-8', newline='\n') as f:
+            f.write('lemme\temoji_propose\tsimilarite\n')
+            for lemme, code, score in a_revoir:
+                f.write(f"{lemme}\t{code}\t{score:.3f}\n")
+            for lemme in sans_vecteur:
+                f.write(f"{lemme}\t\t\n")
+
+    print("-" * 30)
+    print("✅ Terminé !")
+    print(f"Emojis attribués (similarité ≥ {seuil}) : {len(attribues)} / {len(lemmes)}")
+    print(f"À revoir : {len(a_revoir)} similarité faible, {len(sans_vecteur)} sans vecteur")
+    print(f"Calcul des similarités : {duree_calcul:.2f}s")
+    if not essai:
+        print(f"📁 Index mis à jour : {FICHIER_INDEX}")
+        print(f"📁 À revoir : {FICHIER_A_REVOIR} (listes manuelles ou build_emoji_index.py)")
+    print(f"Durée : {time.time() - debut:.1f}s")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
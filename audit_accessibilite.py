@@ -0,0 +1,229 @@
+#!/usr/bin/env python3
+"""
+Audit d'accessibilité : combien de frappes faut-il pour que chaque mot du
+dictionnaire apparaisse dans le top-k de predict() ?
+
+Pour chaque entrée et chaque niveau où elle a une fréquence :
+    - frappes ortho : plus court préfixe de l'orthographe qui la place dans
+      le top-k ("bat" pour "bateau")
+    - frappes phon  : idem avec l'écriture « comme on l'entend » (champ phon
+      écrit en lettres : "bato")
+    0 = inaccessible : même le mot entier ne la place pas dans le top-k.
+
+Pas d'énumération de chaînes : les entrées sont regroupées par préfixe de
+2 lettres (un lot par groupe, réparti sur un pool de processus) et chaque
+lot descend les préfixes de ses mots longueur par longueur. Un préfixe
+n'est calculé qu'une fois pour tous les mots qui le partagent, et la
+descente s'arrête dès que tous les mots du lot sont résolus. Le scoring
+est celui des workers de build_topk.py (topk_worker.js ou worker Deno).
+
+Sorties :
+    data/audit_accessibilite.tsv  : une ligne par entrée (frappes par niveau et mode)
+    data/audit_accessibilite.json : statistiques par niveau et par cgram
+
+Usage :
+    python audit_accessibilite.py [--edge] [--k 5] [--niveaux cp,ce1]
+"""
+
+import json
+import os
+import sys
+import time
+from collections import defaultdict
+from multiprocessing import Pool
+
+from build_topk import CIBLES, TAILLE_LOT, demarrer_worker, interroger
+
+FICHIER_RAPPORT = 'data/audit_accessibilite.tsv'
+FICHIER_STATS = 'data/audit_accessibilite.json'
+
+K = 5                      # Top-k visible dans la popup
+MODES = ('ortho', 'phon')
+
+# Code phonétique simplifié → lettres (nasales et voyelles qui ne s'écrivent
+# pas comme elles se notent)
+ECRITURE_PHON = str.maketrans({'@': 'an', '1': 'in', '§': 'on', 'u': 'ou', 'y': 'u'})
+
+# Préfixes d'une lettre : partagés par tous les lots, gardés par processus
+_cache_courts = {}
+
+
+def lire_option(nom, defaut):
+    args = sys.argv[1:]
+    if nom in args and args.index(nom) + 1 < len(args):
+        return args[args.index(nom) + 1]
+    return defaut
+
+
+def frequence(entry, niveau):
+    freq = entry.get('freq')
+    if isinstance(freq, dict):
+        return freq.get(niveau) or 0
+    return freq or 0  # Dictionnaire optimisé : une seule fréquence
+
+
+def saisie(entry, mode):
+    if mode == 'ortho':
+        return (entry.get('ortho') or '').lower()
+    return (entry.get('phon') or '').translate(ECRITURE_PHON)
+
+
+def top_k(niveau, prefixes, k):
+    """Préfixes → ensemble des IDs du top-k (préfixes d'une lettre en cache)"""
+    resultats = {}
+    a_calculer = []
+    for p in prefixes:
+        if (niveau, p) in _cache_courts:
+            resultats[p] = _cache_courts[(niveau, p)]
+        else:
+            a_calculer.append(p)
+    for i in range(0, len(a_calculer), TAILLE_LOT):
+        lot = a_calculer[i:i + TAILLE_LOT]
+        reponse = interroger({'cmd': 'topk', 'niveau': niveau, 'prevWord': '', 'prefixes': lot, 'k': k})
+        for p, res in zip(lot, reponse['resultats']):
+            ids = {r[0] for r in res}
+            resultats[p] = ids
+            if len(p) == 1:
+                _cache_courts[(niveau, p)] = ids
+    return resultats
+
+
+def auditer_lot(tache):
+    """(niveau, mode, k, [(id, saisie)]) → [(id, frappes)] (0 = inaccessible)"""
+    niveau, mode, k, entrees = tache
+    frappes = {}
+    restantes = [(i, s) for i, s in entrees if s]
+    for i, s in entrees:
+        if not s:
+            frappes[i] = 0
+    longueur = 1
+    while restantes:
+        prefixes = sorted({s[:longueur] for _, s in restantes})
+        tops = top_k(niveau, prefixes, k)
+        suivantes = []
+        for i, s in restantes:
+            if i in tops[s[:longueur]]:
+                frappes[i] = longueur
+            elif len(s) <= longueur:
+                frappes[i] = 0
+            else:
+                suivantes.append((i, s))
+        restantes = suivantes
+        longueur += 1
+    return niveau, mode, list(frappes.items())
+
+
+def preparer_taches(entries, niveaux, k):
+    """Un lot par (niveau, mode, préfixe de 2 lettres de la saisie)"""
+    taches = []
+    for niveau in niveaux:
+        for mode in MODES:
+            groupes = defaultdict(list)
+            for entry in entries:
+                if frequence(entry, niveau) <= 0:
+                    continue
+                s = saisie(entry, mode)
+                groupes[s[:2]].append((entry['id'], s))
+            taches.extend((niveau, mode, k, groupe) for _, groupe in sorted(groupes.items()))
+    # Gros lots d'abord : meilleur équilibrage du pool
+    taches.sort(key=lambda t: -len(t[3]))
+    return taches
+
+
+def resumer(valeurs, longueurs):
+    """Statistiques d'un ensemble d'entrées pour un mode"""
+    accessibles = [(f, n) for f, n in zip(valeurs, longueurs) if f > 0]
+    total = len(valeurs)
+    return {
+        'entrees': total,
+        'inaccessibles': total - len(accessibles),
+        'taux_inaccessibles': round((total - len(accessibles)) / max(total, 1), 4),
+        'frappes_moy': round(sum(f for f, _ in accessibles) / max(len(accessibles), 1), 2),
+        # Part des lettres du mot épargnées par la suggestion
+        'gain_moy': round(sum(1 - f / max(n, 1) for f, n in accessibles) / max(len(accessibles), 1), 3),
+    }
+
+
+def calculer_stats(entries, frappes, niveaux):
+    par_id = {e['id']: e for e in entries}
+    stats = {}
+    for niveau in niveaux:
+        bloc = {}
+        for mode in MODES:
+            res = frappes[(niveau, mode)]
+            ids = sorted(res)
+            groupes = defaultdict(list)
+            for i in ids:
+                groupes[par_id[i].get('cgram') or '?'].append(i)
+            bloc[mode] = resumer([res[i] for i in ids], [len(saisie(par_id[i], mode)) for i in ids])
+            bloc[mode]['par_cgram'] = {
+                cgram: resumer([res[i] for i in g], [len(saisie(par_id[i], mode)) for i in g])
+                for cgram, g in sorted(groupes.items(), key=lambda x: -len(x[1]))
+            }
+        stats[niveau] = bloc
+    return stats
+
+
+def ecrire_rapport(entries, frappes, niveaux):
+    colonnes = [f"{mode}_{niveau}" for niveau in niveaux for mode in MODES]
+    with open(FICHIER_RAPPORT, 'w', encoding='utf-8', newline='\n') as f:
+        f.write('id\tortho\tcgram\t' + '\t'.join(colonnes) + '\n')
+        for entry in entries:
+            valeurs = []
+            for niveau in niveaux:
+                for mode in MODES:
+                    v = frappes[(niveau, mode)].get(entry['id'])
+                    valeurs.append('' if v is None else str(v))
+            if any(valeurs):
+                f.write(f"{entry['id']}\t{entry['ortho']}\t{entry.get('cgram') or ''}\t" + '\t'.join(valeurs) + '\n')
+
+
+def afficher(stats, k):
+    print(f"\n{'Niveau':<9} {'cgram':<9} {'entrées':>8} {'inacc. ortho':>13} {'frappes':>8} {'inacc. phon':>12} {'frappes':>8} {'gain':>6}")
+    for niveau, bloc in stats.items():
+        lignes = [('tout', bloc['ortho'], bloc['phon'])]
+        for cgram, o in bloc['ortho']['par_cgram'].items():
+            lignes.append((cgram, o, bloc['phon']['par_cgram'].get(cgram, o)))
+        for cgram, o, p in lignes[:9]:
+            print(f"{niveau:<9} {cgram:<9} {o['entrees']:>8} {o['taux_inaccessibles'] * 100:>12.1f}% {o['frappes_moy']:>8.2f} "
+                  f"{p['taux_inaccessibles'] * 100:>11.1f}% {p['frappes_moy']:>8.2f} {o['gain_moy'] * 100:>5.0f}%")
+    print(f"(top-{k} sans mot précédent ; gain : part des lettres épargnées, saisie ortho)")
+
+
+def auditer(cible='node'):
+    debut = time.time()
+    config = CIBLES[cible]
+    k = int(lire_option('--k', K))
+    niveaux = lire_option('--niveaux', ','.join(config['niveaux'])).split(',')
+    commande = config['worker'] + [config['dictionnaire']]
+
+    print(f"📂 Lecture de {config['dictionnaire']}...")
+    with open(config['dictionnaire'], 'r', encoding='utf-8') as f:
+        entries = json.load(f)['entries']
+
+    taches = preparer_taches(entries, niveaux, k)
+    nb_workers = os.cpu_count() or 1
+    print(f"⚙️ {len(taches)} lots ({len(niveaux)} niveaux × {len(MODES)} modes) sur {nb_workers} workers...")
+
+    frappes = {(n, m): {} for n in niveaux for m in MODES}
+    with Pool(nb_workers, initializer=demarrer_worker, initargs=(commande,)) as pool:
+        for i, (niveau, mode, resultats) in enumerate(pool.imap_unordered(auditer_lot, taches, chunksize=1)):
+            frappes[(niveau, mode)].update(resultats)
+            if (i + 1) % 200 == 0:
+                print(f"   {i + 1}/{len(taches)} lots ({time.time() - debut:.0f}s)")
+
+    stats = calculer_stats(entries, frappes, niveaux)
+    ecrire_rapport(entries, frappes, niveaux)
+    with open(FICHIER_STATS, 'w', encoding='utf-8') as f:
+        json.dump({'k': k, 'dictionnaire': config['dictionnaire'], 'niveaux': stats}, f, ensure_ascii=False, indent=2)
+
+    afficher(stats, k)
+    print("-" * 30)
+    print("✅ Terminé !")
+    print(f"Durée : {time.time() - debut:.1f}s")
+    print(f"📁 Fichiers générés : {FICHIER_RAPPORT}, {FICHIER_STATS}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(auditer('edge' if '--edge' in sys.argv[1:] else 'node'))
@@ -0,0 +1,97 @@
+/**
+ * BENCHMARK - Modèle de bigrammes
+ * Vérifie l'empreinte mémoire et la latence de recherche par rapport aux budgets.
+ *
+ * Usage: node bench/bench_bigrammes.js [data/dictionnaire_dys.json]
+ * Code de sortie 1 si un budget est dépassé.
+ */
+
+const path = require('path');
+const { performance } = require('perf_hooks');
+const PredicteurDys = require('../predicteur');
+
+// Budgets
+const BUDGET_OCTETS = 2 * 1024 * 1024; // 2 Mo en mémoire
+const BUDGET_LOOKUP_US = 2;            // 2 µs par recherche de contexte
+const BUDGET_SURCOUT_PREDICT_MS = 0.5; // surcoût max de predict() avec le modèle
+
+const ITERATIONS = 200000;
+
+function main() {
+  const dictPath = process.argv[2] || 'data/dictionnaire_dys.json';
+  const predicteur = new PredicteurDys(dictPath);
+  const modele = predicteur.bigrammes;
+  if (!modele) {
+    console.log(`❌ Pas de bigrammes.bin à côté de ${dictPath} (lancer build_bigrammes.py)`);
+    process.exit(1);
+  }
+
+  const stats = modele.stats();
+  let echec = false;
+
+  console.log("\n" + "=".repeat(50));
+  console.log("🔗 BENCHMARK BIGRAMMES");
+  console.log("=".repeat(50));
+  console.log(`Contextes : ${stats.contextes} | Paires : ${stats.paires}`);
+  console.log(`Mémoire   : ${(stats.octets / 1024).toFixed(1)} Ko (budget ${(BUDGET_OCTETS / 1024).toFixed(0)} Ko)`);
+  if (stats.octets > BUDGET_OCTETS) echec = true;
+
+  // 1. Latence de recherche (mélange de contextes présents et absents)
+  const nbEntries = predicteur.entries.length;
+  const requetes = new Int32Array(4096);
+  for (let i = 0; i < requetes.length; i++) {
+    requetes[i] = i % 2 === 0 && stats.contextes > 0
+      ? modele.cles[Math.floor(Math.random() * stats.contextes)] % (1 << 20)
+      : Math.floor(Math.random() * nbEntries);
+  }
+
+  let trouves = 0;
+  const t0 = performance.now();
+  for (let i = 0; i < ITERATIONS; i++) {
+    if (modele.successeurs(requetes[i & 4095])) trouves++;
+  }
+  const usParLookup = (performance.now() - t0) * 1000 / ITERATIONS;
+  console.log(`Lookup    : ${usParLookup.toFixed(3)} µs (budget ${BUDGET_LOOKUP_US} µs, ${trouves} trouvés)`);
+  if (usParLookup > BUDGET_LOOKUP_US) echec = true;
+
+  // 2. Surcoût dans predict() (prevWord avec successeurs vs modèle désactivé)
+  const prevWords = [];
+  for (let i = 0; i < stats.contextes && prevWords.length < 50; i++) {
+    const id = modele.cles[i] % (1 << 20);
+    if (modele.cles[i] < (1 << 20)) prevWords.push(predicteur.entries[id].ortho);
+  }
+  const inputs = ["ma", "cha", "pe", "bo", "le", "tr"];
+  const mesurer = () => {
+    const t = performance.now();
+    for (const prev of prevWords) {
+      for (const input of inputs) predicteur.predict(input, { prevWord: prev, limit: 10 });
+    }
+    return (performance.now() - t) / (prevWords.length * inputs.length);
+  };
+  // Meilleur de 5 passes alternées pour lisser le bruit (GC, JIT)
+  let avec = Infinity;
+  let sans = Infinity;
+  mesurer(); // chauffe
+  for (let passe = 0; passe < 5; passe++) {
+    predicteur.bigrammes = modele;
+    avec = Math.min(avec, mesurer());
+    predicteur.bigrammes = null;
+    sans = Math.min(sans, mesurer());
+  }
+  predicteur.bigrammes = modele;
+  const surcout = avec - sans;
+  console.log(`predict() : ${avec.toFixed(3)} ms avec / ${sans.toFixed(3)} ms sans (surcoût ${surcout.toFixed(3)} ms, budget ${BUDGET_SURCOUT_PREDICT_MS} ms)`);
+  if (surcout > BUDGET_SURCOUT_PREDICT_MS) echec = true;
+
+  // 3. Mot suivant sans lettre tapée
+  if (prevWords.length > 0) {
+    const t = performance.now();
+    for (let i = 0; i < 10000; i++) predicteur.predictNext(prevWords[i % prevWords.length], { limit: 5 });
+    console.log(`predictNext() : ${((performance.now() - t) * 1000 / 10000).toFixed(2)} µs`);
+  }
+
+  console.log(echec ? "\n❌ Budget dépassé" : "\n✅ Budgets respectés");
+  process.exit(echec ? 1 : 0);
+}
+
+main();
@@ -0,0 +1,78 @@
+/**
+ * BENCHMARK - Budget de latence de predict() (options.budgetMs)
+ * Charge mixte (préfixes courts hors table top-k, mots longs mal écrits,
+ * liaisons) rejouée sans budget puis avec plusieurs budgets : latence
+ * p50/p99/max, part des appels dégradés, étapes sautées et qualité
+ * (top-1 identique, recouvrement du top-10) par rapport à l'appel sans budget.
+ *
+ * Usage: node bench/bench_budget.js [data/dictionnaire_dys.json]
+ */
+
+const { performance } = require('perf_hooks');
+const PredicteurDys = require('../predicteur');
+
+const BUDGETS = [null, 25, 10, 5, 2];
+const TOURS = 5;
+const REQUETES = [
+  ["ma", ""], ["le", "je"], ["pa", "les"], ["cha", "le"], ["tr", ""],
+  ["bato", "un"], ["mézon", "la"], ["cahmp", ""], ["pobelle", ""], ["fotograf", "une"],
+  ["lézanfan", ""], ["lezami", "les"], ["zoizo", "les"], ["anticonstitutionelemant", ""],
+  ["pobellemanfotograf", ""], ["xqzwkyplmtrbv", ""], ["éléfan", "un"], ["otobus", "l"]
+];
+
+function centile(tries, p) {
+  return tries[Math.min(tries.length - 1, Math.floor(tries.length * p))];
+}
+
+function main() {
+  const dictPath = process.argv[2] || 'data/dictionnaire_dys.json';
+  const predicteur = new PredicteurDys(dictPath);
+  // Table top-k désactivée : on mesure le pipeline complet
+  const appeler = (q, prevWord, budgetMs, etapesSautees) =>
+    predicteur.predict(q, { prevWord, useTopK: false, budgetMs, etapesSautees });
+
+  // Chauffe (tries, JIT) et référence : ni budget ni interruption de la recherche floue
+  const reference = new Map();
+  for (const [q, prevWord] of REQUETES) {
+    appeler(q, prevWord, null, null);
+    const complet = predicteur.predict(q, { prevWord, useTopK: false, fuzzyBudgetMs: 1000 });
+    reference.set(`${q}|${prevWord}`, complet.map(r => r.id));
+  }
+
+  console.log("\n" + "=".repeat(78));
+  console.log("⏱️ BENCHMARK BUDGET DE LATENCE");
+  console.log("=".repeat(78));
+  console.log(`${'Budget'.padEnd(9)} ${'p50'.padStart(8)} ${'p99'.padStart(8)} ${'max'.padStart(8)} ${'dégradés'.padStart(9)} ${'top-1'.padStart(7)} ${'top-10'.padStart(7)}  étapes sautées`);
+
+  for (const budget of BUDGETS) {
+    const durees = [];
+    const sautees = {};
+    let degrades = 0;
+    let top1 = 0;
+    let recouvrement = 0;
+    let n = 0;
+    for (let tour = 0; tour < TOURS; tour++) {
+      for (const [q, prevWord] of REQUETES) {
+        const etapes = [];
+        const t = performance.now();
+        const ids = appeler(q, prevWord, budget, etapes).map(r => r.id);
+        durees.push(performance.now() - t);
+
+        const attendu = reference.get(`${q}|${prevWord}`);
+        if (ids[0] === attendu[0]) top1++;
+        recouvrement += attendu.length ? ids.filter(id => attendu.includes(id)).length / attendu.length : 1;
+        if (etapes.length) degrades++;
+        for (const etape of etapes) sautees[etape] = (sautees[etape] || 0) + 1;
+        n++;
+      }
+    }
+    durees.sort((a, b) => a - b);
+    const etiquette = budget === null ? 'aucun' : `${budget} ms`;
+    const detail = Object.entries(sautees).map(([e, c]) => `${e}:${c}`).join(' ') || '—';
+    console.log(`${etiquette.padEnd(9)} ${centile(durees, 0.5).toFixed(2).padStart(8)} ${centile(durees, 0.99).toFixed(2).padStart(8)} ${durees[durees.length - 1].toFixed(2).padStart(8)} ` +
+      `${(degrades / n * 100).toFixed(0).padStart(8)}% ${(top1 / n * 100).toFixed(0).padStart(6)}% ${(recouvrement / n * 100).toFixed(0).padStart(6)}%  ${detail}`);
+  }
+  console.log("(latences en ms ; la recherche floue est aussi bornée par son propre budget, 10 ms)");
+}
+
+main();
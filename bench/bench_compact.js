@@ -0,0 +1,101 @@
+/**
+ * BENCHMARK - Taille des réponses par frappe (format compact, regroupement par lemme)
+ * Mots tapés lettre par lettre, réponse sérialisée dans chaque format :
+ *   - complet : objets JSON (format par défaut de /api/predict)
+ *   - compact : lignes + schéma, avec tous les champs statiques
+ *   - compact + bundle : champs statiques omis pour les entrées du bundle client
+ *   - compact + bundle + lemmes : idem, un résultat par lemme
+ * Octets bruts et gzip (compression HTTP) par frappe, et part des lignes
+ * dont les champs statiques sont lus dans le bundle.
+ *
+ * Usage: node bench/bench_compact.js [data/dictionnaire_dys.json] [freqMin]
+ *        freqMin : celui de bundle_client.json (build_bundle_client.js), sinon 1
+ */
+
+const fs = require('fs');
+const zlib = require('zlib');
+const PredicteurDys = require('../predicteur');
+const { schemaCompact, compacterResultats } = require('../reponse_compacte');
+
+const MANIFESTE = 'supabase_export/functions/predict/data/bundle_client.json';
+const LIMIT = 8;
+const MOTS = [
+  ["bato", "un"], ["mézon", "la"], ["pobelle", ""], ["fotograf", "une"], ["cahmp", ""],
+  ["maman", "ma"], ["ecole", "l"], ["jardin", "le"], ["manger", "je"], ["jouent", "ils"],
+  ["petite", "une"], ["voiture", "la"], ["chevaux", "les"], ["finissons", "nous"], ["soleil", "le"]
+];
+
+function lireFreqMin() {
+  if (process.argv[3]) return parseFloat(process.argv[3]);
+  if (fs.existsSync(MANIFESTE)) return JSON.parse(fs.readFileSync(MANIFESTE, 'utf8')).freqMin ?? 1;
+  return 1;
+}
+
+function main() {
+  const dictPath = process.argv[2] || 'data/dictionnaire_dys.json';
+  const predicteur = new PredicteurDys(dictPath);
+  const freqMin = lireFreqMin();
+
+  // Même format que formaterReponse() (server.js), champs de contexte omis
+  const complet = (input, results) => ({
+    input, count: results.length,
+    results: results.map(r => ({
+      id: r.id, mot: r.ortho, lemme: r.lemme, emoji: predicteur.getEmoji(r.lemme),
+      phon: r.phon, phon_dys: r.phon_dys, cgram: r.cgram, genre: r.genre, nombre: r.nombre,
+      freq: r.freq?.cp_cm2?.toFixed(1) || '0', score: r.score?.toFixed(1) || '0',
+      match: r.matchType, segmentation: r.segmentation || null,
+      contextMatch: r.contextMatch || false, personnel: r.personnel || false
+    }))
+  });
+  const compact = (input, results, connus, formes) => ({
+    input, count: results.length, schema: schemaCompact(formes),
+    results: compacterResultats(results, {
+      freq: r => r.freq?.cp_cm2, emoji: lemme => predicteur.getEmoji(lemme), connus, formes
+    })
+  });
+
+  const formats = {
+    'complet': { taille: 0, gzip: 0 },
+    'compact': { taille: 0, gzip: 0 },
+    'compact + bundle': { taille: 0, gzip: 0 },
+    'compact + bundle + lemmes': { taille: 0, gzip: 0 }
+  };
+  const ajouter = (nom, reponse) => {
+    const octets = Buffer.from(JSON.stringify(reponse));
+    formats[nom].taille += octets.length;
+    formats[nom].gzip += zlib.gzipSync(octets).length;
+  };
+
+  let frappes = 0;
+  let lignes = 0;
+  let lignesBundle = 0;
+  for (const [mot, prevWord] of MOTS) {
+    for (let n = 2; n <= mot.length; n++) {
+      const q = mot.slice(0, n);
+      const results = predicteur.predict(q, { prevWord, limit: LIMIT });
+      const groupes = predicteur.predict(q, { prevWord, limit: LIMIT, grouperLemmes: true });
+      ajouter('complet', complet(q, results));
+      ajouter('compact', compact(q, results, null, false));
+      ajouter('compact + bundle', compact(q, results, freqMin, false));
+      ajouter('compact + bundle + lemmes', compact(q, groupes, freqMin, true));
+
+      frappes++;
+      lignes += results.length;
+      lignesBundle += results.filter(r => Math.round((r.freq?.cp_cm2 || 0) * 10) / 10 >= freqMin).length;
+    }
+  }
+
+  console.log("\n" + "=".repeat(64));
+  console.log("📦 BENCHMARK TAILLE DES RÉPONSES");
+  console.log("=".repeat(64));
+  console.log(`${frappes} frappes, limit ${LIMIT}, bundle client freq >= ${freqMin}`);
+  console.log(`${'Format'.padEnd(28)} ${'octets/frappe'.padStart(14)} ${'gzip'.padStart(8)} ${'gain gzip'.padStart(10)}`);
+  const reference = formats['complet'].gzip;
+  for (const [nom, f] of Object.entries(formats)) {
+    console.log(`${nom.padEnd(28)} ${(f.taille / frappes).toFixed(0).padStart(14)} ${(f.gzip / frappes).toFixed(0).padStart(8)} ` +
+      `${((1 - f.gzip / reference) * 100).toFixed(0).padStart(9)}%`);
+  }
+  console.log(`Lignes résolues par le bundle : ${(lignesBundle / Math.max(lignes, 1) * 100).toFixed(0)} %`);
+}
+
+main();
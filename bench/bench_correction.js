@@ -0,0 +1,129 @@
+/**
+ * BENCHMARK - Correction de texte complet (correction_phrase.js)
+ *
+ * Pages de texte synthétiques : mots tirés du dictionnaire (pondérés par
+ * fréquence, comme dans un vrai texte où les mots courants se répètent),
+ * une partie abîmés comme l'écrirait un enfant (lettre oubliée, doublée
+ * ou inversée, voyelle remplacée). Mesures :
+ *   - durée par page, cache des mots vidé (première page de l'élève)
+ *   - durée par page, cache chaud (même page renvoyée, ou texte suivant)
+ *   - mots abîmés rendus à leur orthographe d'origine, mots corrects gardés
+ * Puis phrases de non-régression (PHRASES_ATTENDUES) : sortie en erreur si
+ * l'une n'est plus corrigée comme attendu.
+ *
+ * Usage: node bench/bench_correction.js [data/dictionnaire_dys.json] [mots_par_page]
+ */
+
+const { performance } = require('perf_hooks');
+const PredicteurDys = require('../predicteur');
+const { CorrecteurPhrase } = require('../correction_phrase');
+
+const PAGES = 5;
+const MOTS_PAR_PAGE = 300;
+const TAUX_ERREURS = 0.3;
+const VOYELLES = 'aeiou';
+
+// Phrase tapée → correction attendue
+const PHRASES_ATTENDUES = [
+  ["Le chat mange un navion.", "Le chat mange un avion."] // Liaison "un n|avion" (pas de recherche floue)
+];
+
+let graine = 42;
+const aleatoire = () => (graine = (graine * 16807) % 2147483647) / 2147483647;
+
+function abimer(mot) {
+  const i = 1 + Math.floor(aleatoire() * (mot.length - 1));
+  switch (Math.floor(aleatoire() * 4)) {
+    case 0: return mot.slice(0, i) + mot.slice(i + 1);                     // lettre oubliée
+    case 1: return mot.slice(0, i) + mot[i - 1] + mot.slice(i);            // lettre doublée
+    case 2: return i < mot.length - 1 ? mot.slice(0, i) + mot[i + 1] + mot[i] + mot.slice(i + 2) : mot + 'e';
+    default: {
+      const j = mot.split('').findIndex((c, k) => k > 0 && VOYELLES.includes(c));
+      if (j < 0) return mot + 'e';
+      const v = VOYELLES[(VOYELLES.indexOf(mot[j]) + 1) % VOYELLES.length];
+      return mot.slice(0, j) + v + mot.slice(j + 1);
+    }
+  }
+}
+
+function tirerPage(entrees, cumul, total, n) {
+  const mots = [];
+  for (let i = 0; i < n; i++) {
+    const x = aleatoire() * total;
+    let bas = 0;
+    let haut = cumul.length - 1;
+    while (bas < haut) {
+      const milieu = (bas + haut) >> 1;
+      if (cumul[milieu] < x) bas = milieu + 1;
+      else haut = milieu;
+    }
+    const ortho = entrees[bas].ortho.toLowerCase();
+    const abime = ortho.length >= 4 && aleatoire() < TAUX_ERREURS;
+    mots.push({ ortho, saisie: abime ? abimer(ortho) : ortho, abime });
+  }
+  return mots;
+}
+
+function main() {
+  const dictPath = process.argv[2] || 'data/dictionnaire_dys.json';
+  const motsParPage = parseInt(process.argv[3]) || MOTS_PAR_PAGE;
+  const predicteur = new PredicteurDys(dictPath);
+  const correcteur = new CorrecteurPhrase(predicteur);
+
+  // Préchauffage (tries, JIT), comme au démarrage de server.js
+  correcteur.corriger("un bato dans la mézon");
+
+  const entrees = predicteur.entries.filter(e => /^[a-zàâäçéèêëîïôöùûüÿœæ]+$/i.test(e.ortho) && (e.freq?.cp_cm2 || 0) > 0);
+  const cumul = [];
+  let total = 0;
+  for (const e of entrees) cumul.push(total += e.freq.cp_cm2);
+
+  const stats = { froid: 0, chaud: 0, mots: 0, distincts: 0, abimes: 0, rendus: 0, corrects: 0, gardes: 0 };
+  for (let page = 0; page < PAGES; page++) {
+    const mots = tirerPage(entrees, cumul, total, motsParPage);
+    const texte = mots.map(m => m.saisie).join(' ') + '.';
+
+    correcteur.vider();
+    let t = performance.now();
+    const resultat = correcteur.corriger(texte);
+    stats.froid += performance.now() - t;
+    t = performance.now();
+    correcteur.corriger(texte);
+    stats.chaud += performance.now() - t;
+
+    stats.mots += mots.length;
+    stats.distincts += new Set(mots.map(m => m.saisie)).size;
+    mots.forEach((m, i) => {
+      const corrige = resultat.mots[i] ? resultat.mots[i].mot.toLowerCase() : '';
+      if (m.abime) {
+        stats.abimes++;
+        if (corrige === m.ortho) stats.rendus++;
+      } else {
+        stats.corrects++;
+        if (corrige === m.saisie) stats.gardes++;
+      }
+    });
+  }
+
+  console.log("\n" + "=".repeat(60));
+  console.log("📝 BENCHMARK CORRECTION DE TEXTE");
+  console.log("=".repeat(60));
+  console.log(`${PAGES} pages de ${motsParPage} mots (${(stats.distincts / PAGES).toFixed(0)} distincts par page), ${(TAUX_ERREURS * 100).toFixed(0)} % des mots de 4+ lettres abîmés`);
+  console.log(`Page, cache vidé : ${(stats.froid / PAGES).toFixed(1)} ms (${(stats.mots / stats.froid * 1000).toFixed(0)} mots/s)`);
+  console.log(`Page, cache chaud : ${(stats.chaud / PAGES).toFixed(1)} ms`);
+  console.log(`Mots abîmés rendus : ${stats.rendus}/${stats.abimes} (${(stats.rendus / Math.max(stats.abimes, 1) * 100).toFixed(0)} %)`);
+  console.log(`Mots corrects gardés : ${stats.gardes}/${stats.corrects} (${(stats.gardes / Math.max(stats.corrects, 1) * 100).toFixed(0)} %)`);
+
+  let echecs = 0;
+  for (const [texte, attendu] of PHRASES_ATTENDUES) {
+    const { corrige } = correcteur.corriger(texte);
+    if (corrige !== attendu) {
+      echecs++;
+      console.log(`❌ "${texte}" → "${corrige}" (attendu : "${attendu}")`);
+    }
+  }
+  console.log(`Phrases de non-régression : ${PHRASES_ATTENDUES.length - echecs}/${PHRASES_ATTENDUES.length}`);
+  process.exit(echecs > 0 ? 1 : 0);
+}
+
+main();
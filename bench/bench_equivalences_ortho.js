@@ -0,0 +1,84 @@
+/**
+ * BENCHMARK - Équivalences orthographiques
+ * Compare l'ancienne recherche (variantes matérialisées + startsWith sur
+ * chaque candidat) à l'automate parcourant le trie : mêmes IDs, même
+ * variante retenue, et temps par préfixe.
+ *
+ * Usage: node bench/bench_equivalences_ortho.js [data/dictionnaire_dys.json] [nbPrefixes]
+ */
+
+const { performance } = require('perf_hooks');
+const PredicteurDys = require('../predicteur');
+
+/**
+ * Ancienne implémentation de searchByOrthoPrefix (référence)
+ */
+function rechercheReference(predicteur, prefix) {
+  const results = [];
+  const variants = predicteur.generateOrthoVariants(prefix);
+  const candidateIds = new Set();
+  for (const variant of variants) {
+    if (variant.length >= 2) {
+      const ids = predicteur.idxOrthoPrefix[variant.substring(0, 2)];
+      if (ids) for (const id of ids) candidateIds.add(id);
+    }
+  }
+  for (const id of candidateIds) {
+    const orthoLower = predicteur.entries[id].ortho.toLowerCase();
+    for (const variant of variants) {
+      if (orthoLower.startsWith(variant)) {
+        results.push({ id, orthoVariant: variant !== prefix ? variant : null });
+        break;
+      }
+    }
+  }
+  return results;
+}
+
+function main() {
+  const dictPath = process.argv[2] || 'data/dictionnaire_dys.json';
+  const nbPrefixes = parseInt(process.argv[3]) || 2000;
+  const predicteur = new PredicteurDys(dictPath);
+  predicteur.getTrieOrtho();
+
+  // Préfixes observés (1 à 6 lettres), échantillonnés sur tout le dictionnaire
+  const prefixes = new Set();
+  const pas = Math.max(1, Math.floor(predicteur.entries.length / nbPrefixes));
+  for (let i = 0; i < predicteur.entries.length; i += pas) {
+    const ortho = predicteur.entries[i].ortho.toLowerCase();
+    for (let l = 1; l <= Math.min(6, ortho.length); l++) prefixes.add(ortho.slice(0, l));
+  }
+  const liste = [...prefixes];
+
+  let differences = 0;
+  for (const prefix of liste) {
+    const ref = rechercheReference(predicteur, prefix);
+    const res = predicteur.searchByOrthoPrefix(prefix);
+    const attendu = new Map(ref.map(r => [r.id, r.orthoVariant]));
+    const ok = res.length === ref.length && res.every(r => attendu.get(r.id) === r.orthoVariant);
+    if (!ok) {
+      if (differences < 5) console.log(`❌ "${prefix}" : ${ref.length} attendus, ${res.length} obtenus`);
+      differences++;
+    }
+  }
+
+  const mesurer = (fn) => {
+    fn(); // chauffe
+    const t = performance.now();
+    for (const prefix of liste) fn(prefix);
+    return (performance.now() - t) * 1000 / liste.length;
+  };
+  const tRef = mesurer(p => p && rechercheReference(predicteur, p));
+  const tAuto = mesurer(p => p && predicteur.searchByOrthoPrefix(p));
+
+  console.log("\n" + "=".repeat(50));
+  console.log(`🔤 ÉQUIVALENCES ORTHOGRAPHIQUES (${liste.length} préfixes)`);
+  console.log("=".repeat(50));
+  console.log(`Différences : ${differences}`);
+  console.log(`Référence   : ${tRef.toFixed(1)} µs / préfixe`);
+  console.log(`Automate    : ${tAuto.toFixed(1)} µs / préfixe (x${(tRef / tAuto).toFixed(1)})`);
+
+  process.exit(differences > 0 ? 1 : 0);
+}
+
+main();
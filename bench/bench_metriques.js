@@ -0,0 +1,159 @@
+/**
+ * BENCHMARK - Instrumentation de predict()
+ * 1. De bout en bout (indicatif) : un même prédicteur, métriques désactivées
+ *    (référence), activées (compteur à chaque appel, un appel chronométré sur
+ *    ECHANTILLON_METRIQUES) ou avec trace (chaque appel chronométré). Les
+ *    variantes sont alternées appel par appel ; une deuxième référence
+ *    identique donne le bruit de mesure de la machine (jusqu'à ±2,5 % sur un
+ *    seul cœur, bien plus que les quelques µs recherchées).
+ * 2. Budget : le coût de l'instrumentation activée, mesuré isolément, ramené
+ *    à un appel puis rapporté à la durée d'un appel.
+ * Désactivée, l'instrumentation se réduit à un test "metriques !== null" et
+ * aux tests "mesure" de chaque étape, tous dans predict().
+ *
+ * Usage: node bench/bench_metriques.js [data/dictionnaire_dys.json]
+ * Code de sortie 1 si un budget est dépassé.
+ */
+
+const { performance } = require('perf_hooks');
+const PredicteurDys = require('../predicteur');
+const { Metriques, MesureEtapes } = require('../metriques');
+
+// Budgets du coût de l'instrumentation activée (mesurée isolément)
+const BUDGET_SURCOUT_RELATIF = 0.01;    // 1 % d'un appel à predict()
+const BUDGET_SURCOUT_MS = 0.02;         // 20 µs par appel
+
+const TOURS = 8;
+const INPUTS = ["ma", "cha", "pe", "bo", "le", "tr", "bato", "mézon", "cahmp", "pobelle", "fotograf", "lé"];
+const ETAPES = ['segmentation', 'transcode', 'ortho', 'phon', 'scoring', 'sort'];
+const PREV_WORDS = ["", "le", "je", "les", "un"];
+
+// Quantile bas : le bruit (GC, autres processus) ne fait qu'allonger les appels
+const QUANTILE = 0.2;
+
+function quantile(valeurs, q) {
+  const tries = [...valeurs].sort((a, b) => a - b);
+  return tries[Math.floor(tries.length * q)];
+}
+
+let graine = 11;
+const aleatoire = () => (graine = (graine * 16807) % 2147483647) / 2147483647;
+
+/**
+ * Variantes alternées appel par appel, dans un ordre tiré au hasard à chaque
+ * fois (le bruit de la machine se répartit entre elles, et aucune ne suit
+ * toujours la même : la trace alloue, la variante suivante en paierait le GC)
+ * @param {Array<[string, Function]>} variantes - [nom, (input, prevWord) => void]
+ * @returns {object} - nom → { ms, ecart } : durée d'un appel (quantile bas de
+ *   chaque requête, moyenné sur les requêtes) et écart relatif à la première
+ *   variante (médiane des écarts par requête : une requête lente et bruitée
+ *   ne pèse pas plus qu'une autre)
+ */
+function alterner(variantes, tours) {
+  const requetes = [];
+  for (const prevWord of PREV_WORDS) {
+    for (const input of INPUTS) requetes.push({ input, prevWord, durees: variantes.map(() => []) });
+  }
+  const ordre = variantes.map((_, i) => i);
+  for (let tour = 0; tour < tours; tour++) {
+    for (const r of requetes) {
+      for (let k = ordre.length - 1; k > 0; k--) {
+        const j = Math.floor(aleatoire() * (k + 1));
+        [ordre[k], ordre[j]] = [ordre[j], ordre[k]];
+      }
+      for (const i of ordre) {
+        const t = performance.now();
+        variantes[i][1](r.input, r.prevWord);
+        r.durees[i].push(performance.now() - t);
+      }
+    }
+  }
+  const bas = requetes.map(r => r.durees.map(d => quantile(d, QUANTILE)));
+  const resultat = {};
+  variantes.forEach(([nom], i) => {
+    resultat[nom] = {
+      ms: bas.reduce((somme, q) => somme + q[i], 0) / bas.length,
+      ecart: quantile(bas.map(q => q[i] / q[0] - 1), 0.5)
+    };
+  });
+  return resultat;
+}
+
+function main() {
+  const dictPath = process.argv[2] || 'data/dictionnaire_dys.json';
+  const predicteur = new PredicteurDys(dictPath);
+  const metriques = new Metriques();
+
+  // Recherche floue exclue : son budget temps rend le travail non déterministe
+  const appeler = (input, prevWord, trace) =>
+    predicteur.predict(input, { prevWord, limit: 10, useFuzzy: false, trace });
+
+  // Chauffe (tries, JIT), avec et sans métriques
+  for (let i = 0; i < 3; i++) {
+    for (const input of INPUTS) {
+      predicteur.activerMetriques(i % 2 ? metriques : null);
+      appeler(input, '', i === 2 ? {} : null);
+    }
+  }
+
+  // 1. De bout en bout (indicatif) : métriques désactivées, activées, trace
+  const basculer = (registre, trace) => (input, prevWord) => {
+    predicteur.activerMetriques(registre);
+    appeler(input, prevWord, trace ? {} : null);
+  };
+  const mesures = alterner([
+    ['reference', basculer(null, false)],
+    ['bruit', basculer(null, false)],
+    ['metriques', basculer(metriques, false)],
+    ['trace', basculer(null, true)]
+  ], TOURS * 2);
+  predicteur.activerMetriques(null);
+  const sans = mesures.reference.ms;
+
+  console.log("\n" + "=".repeat(50));
+  console.log("📈 BENCHMARK MÉTRIQUES");
+  console.log("=".repeat(50));
+  let echec = false;
+  console.log(`predict() de bout en bout, indicatif (1 appel chronométré sur ${predicteur.echantillon} avec métriques) :`);
+  console.log(`  Désactivées : ${sans.toFixed(4)} ms/appel`);
+  for (const [nom, { ms, ecart }] of [
+    ["Désactivées (bis)", mesures.bruit], ["Prometheus", mesures.metriques], ["Trace", mesures.trace]
+  ]) {
+    console.log(`  ${nom} : ${ms.toFixed(4)} ms/appel (écart ${(ecart * 100).toFixed(2)} %)`);
+  }
+  console.log(`  (bruit de mesure : écart entre les deux références désactivées)`);
+
+  // Coût de l'instrumentation seule, sans predict() : compteur à chaque
+  // appel, chronomètres + histogrammes pour un appel sur l'échantillon
+  const ITERATIONS = 100000;
+  const registre = new Metriques();
+  let t0 = performance.now();
+  for (let i = 0; i < ITERATIONS; i++) {
+    const mesure = new MesureEtapes();
+    let t = mesure.debut;
+    for (const etape of ETAPES) t = mesure.ajouter(etape, t);
+    mesure.enregistrer(registre);
+  }
+  const usChronometre = (performance.now() - t0) * 1000 / ITERATIONS;
+  predicteur.activerMetriques(registre);
+  t0 = performance.now();
+  for (let i = 0; i < ITERATIONS; i++) predicteur.compterAppel();
+  const usCompteur = (performance.now() - t0) * 1000 / ITERATIONS;
+  predicteur.activerMetriques(null);
+  const usInstrumentation = usCompteur + usChronometre / predicteur.echantillon;
+  const relatif = usInstrumentation / 1000 / sans;
+  console.log(`Appel chronométré : ${usChronometre.toFixed(2)} µs, compteur : ${usCompteur.toFixed(3)} µs`);
+  console.log(`Instrumentation seule : ${usInstrumentation.toFixed(2)} µs/appel, ${(relatif * 100).toFixed(3)} % d'un appel`);
+  console.log(`  (budget ${(BUDGET_SURCOUT_MS * 1000).toFixed(0)} µs et ${(BUDGET_SURCOUT_RELATIF * 100).toFixed(0)} %)`);
+  if (usInstrumentation > BUDGET_SURCOUT_MS * 1000 || relatif > BUDGET_SURCOUT_RELATIF) echec = true;
+
+  // Coût de l'export /metrics
+  const t = performance.now();
+  const texte = metriques.exporter();
+  console.log(`Export /metrics : ${(performance.now() - t).toFixed(3)} ms, ${texte.split('\n').length} lignes`);
+
+  console.log(echec ? "\n❌ Budget dépassé" : "\n✅ Budgets respectés");
+  process.exit(echec ? 1 : 0);
+}
+
+main();
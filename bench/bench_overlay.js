@@ -0,0 +1,91 @@
+/**
+ * BENCHMARK - Lexiques de classe (overlay_lexique.js)
+ *
+ * CLASSES lexiques de MOTS_PAR_CLASSE mots (thème + prénoms) sur une même
+ * base. Mesures :
+ *   - construction d'un lexique (transcodage + index), en ms
+ *   - mémoire par classe (tas V8, après GC si node --expose-gc)
+ *   - surcoût de predict() avec le lexique, et mots du lexique trouvés
+ *     dans le top-5 pour leur préfixe de 3 lettres
+ *
+ * Usage: node --expose-gc bench/bench_overlay.js [data/dictionnaire_dys.json]
+ */
+
+const { performance } = require('perf_hooks');
+const PredicteurDys = require('../predicteur');
+const OverlayLexique = require('../overlay_lexique');
+
+const CLASSES = 200;
+const MOTS_PAR_CLASSE = 60;
+const THEME = ["volcan", "magma", "lave", "cratère", "éruption", "cendre", "séisme", "tectonique", "basalte", "geyser"];
+const SYLLABES = ["ka", "li", "an", "no", "é", "ma", "ya", "ni", "lou", "za", "té", "o", "ri", "ne", "jo", "el"];
+const BUDGET_FLOU_MS = 1000;
+
+let graine = 7;
+const aleatoire = () => (graine = (graine * 16807) % 2147483647) / 2147483647;
+
+function prenom() {
+  let mot = '';
+  const n = 2 + Math.floor(aleatoire() * 2);
+  for (let i = 0; i < n; i++) mot += SYLLABES[Math.floor(aleatoire() * SYLLABES.length)];
+  return mot.charAt(0).toUpperCase() + mot.slice(1);
+}
+
+function motsClasse() {
+  const mots = [...THEME];
+  while (mots.length < MOTS_PAR_CLASSE) mots.push(prenom());
+  return mots;
+}
+
+function tas() {
+  if (global.gc) global.gc();
+  return process.memoryUsage().heapUsed;
+}
+
+function main() {
+  const dictPath = process.argv[2] || 'data/dictionnaire_dys.json';
+  const predicteur = new PredicteurDys(dictPath);
+  new OverlayLexique(predicteur, THEME); // Préchauffage (JIT, cache de transcodage)
+
+  const avant = tas();
+  const lexiques = [];
+  let msConstruction = 0;
+  for (let c = 0; c < CLASSES; c++) {
+    const mots = motsClasse();
+    const t = performance.now();
+    lexiques.push(new OverlayLexique(predicteur, mots));
+    msConstruction += performance.now() - t;
+  }
+  const octets = (tas() - avant) / CLASSES;
+
+  // Surcoût à la requête et mots du lexique trouvés
+  const overlay = lexiques[0];
+  const requetes = overlay.entries.map(e => e.ortho.toLowerCase().slice(0, 3));
+  const options = { limit: 5, useTopK: false, fuzzyBudgetMs: BUDGET_FLOU_MS };
+  let msBase = 0;
+  let msOverlay = 0;
+  let trouves = 0;
+  for (let tour = 0; tour < 3; tour++) {
+    requetes.forEach((q, i) => {
+      let t = performance.now();
+      predicteur.predict(q, options);
+      msBase += performance.now() - t;
+      t = performance.now();
+      const resultats = predicteur.predict(q, { ...options, overlay });
+      msOverlay += performance.now() - t;
+      if (tour === 0 && resultats.some(r => r.id === overlay.entries[i].id)) trouves++;
+    });
+  }
+  const n = requetes.length * 3;
+
+  console.log("\n" + "=".repeat(60));
+  console.log("🏫 BENCHMARK LEXIQUES DE CLASSE");
+  console.log("=".repeat(60));
+  console.log(`${CLASSES} classes × ${MOTS_PAR_CLASSE} mots sur une base de ${predicteur.entries.length} entrées`);
+  console.log(`Construction d'un lexique : ${(msConstruction / CLASSES).toFixed(2)} ms`);
+  console.log(`Mémoire par classe : ${(octets / 1024).toFixed(1)} Ko${global.gc ? '' : ' (sans --expose-gc : approximatif)'}`);
+  console.log(`predict() base seule : ${(msBase / n).toFixed(3)} ms, avec lexique : ${(msOverlay / n).toFixed(3)} ms`);
+  console.log(`Mots du lexique dans le top-5 (3 lettres) : ${trouves}/${requetes.length}`);
+}
+
+main();
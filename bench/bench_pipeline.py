@@ -0,0 +1,345 @@
+#!/usr/bin/env python3
+"""
+BENCHMARK - Étapes Python du pipeline (extract_lemmes.py, add_emojis*.py,
+apply_manual_emojis.py, build_emoji_index.py, assign_emojis_vecteurs.py)
+
+Lexiques synthétiques de taille croissante (10k → 1M entrées, déterministes) :
+chaque étape est lancée hors ligne, dans un processus à part, sur l'entrée
+qu'elle attend (générée pour elle, les étapes ne se suivent pas). Mesures :
+    - durée (wall time, import des modules compris)
+    - pic de mémoire résidente du processus (ru_maxrss)
+    - débit : entrées du fichier d'entrée par seconde
+    - exposant de croissance entre deux tailles : log(t2/t1) / log(n2/n1)
+      (1 = linéaire ; signalé au-delà de SEUIL_EXPOSANT)
+
+Étapes réseau : le traducteur (deep_translator) et le client OpenAI sont
+remplacés par des faux locaux déterministes (--latence-ms pour simuler un
+aller-retour). assign_emojis_vecteurs.py lit un fichier de vecteurs
+synthétique (un vecteur aléatoire de DIMENSION_VECTEURS par lemme). Une
+étape dont une autre dépendance manque (module emoji...) est notée
+"ignorée" dans le rapport.
+
+Rapport JSON (--sortie, par défaut bench/pipeline_rapport.json) : commit,
+versions, mesures par étape et par taille. --comparer ancien.json affiche
+les écarts avec un rapport précédent et sort en erreur si une étape est
+plus lente de plus de SEUIL_REGRESSION.
+
+Usage :
+    python bench/bench_pipeline.py [--tailles 10000,100000,1000000] [--etapes extract_lemmes,...]
+                                   [--latence-ms 0] [--sortie rapport.json] [--comparer ancien.json]
+"""
+
+import json
+import math
+import os
+import platform
+import random
+import re
+import resource
+import runpy
+import subprocess
+import sys
+import tempfile
+import time
+import zlib
+from types import ModuleType, SimpleNamespace
+
+RACINE = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+FICHIER_RAPPORT = os.path.join(RACINE, 'bench', 'pipeline_rapport.json')
+
+TAILLES = (10000, 30000, 100000, 300000, 1000000)
+SEUIL_EXPOSANT = 1.3       # Croissance plus que linéaire
+DUREE_MIN_EXPOSANT = 0.5   # s : en dessous, le bruit domine
+SEUIL_REGRESSION = 1.25    # --comparer : 25 % plus lent
+
+SYLLABES = ['ba', 'be', 'bi', 'bo', 'ma', 'me', 'mi', 'mo', 'pa', 'po', 'ta', 'to', 'la', 'lo', 'ra', 'ri',
+            'cha', 'che', 'on', 'an', 'in', 'ou', 'eau', 'sa', 'so', 'va', 'fa', 'ga', 'da', 'na', 'ne', 're']
+# Mots réels mêlés au lexique : les recherches d'emojis trouvent quelque chose
+MOTS_REELS = ['maison', 'école', 'chat', 'chien', 'bateau', 'soleil', 'arbre', 'pomme', 'voiture', 'livre',
+              'fleur', 'oiseau', 'lune', 'pain', 'train', 'avion', 'lait', 'fromage', 'lion', 'tortue']
+CGRAMS = ['NOM', 'NOM', 'NOM', 'VER', 'ADJ', 'ADV']
+EMOJIS = ['🏠', '🏫', '🐱', '🐶', '⛵', '☀️', '🌳', '🍎', '🚗', '📖', '🌸', '🐦', '🌙', '🥖']
+DIMENSION_VECTEURS = 50
+
+# Étapes : script, fichier d'entrée (généré), dépendances réseau remplacées
+ETAPES = {
+    'extract_lemmes': {'script': 'extract_lemmes.py', 'entree': 'lexique_filtre.json', 'reseau': False},
+    'add_emojis': {'script': 'add_emojis.py', 'entree': 'lemmes.json', 'reseau': False},
+    'add_emojis_v2': {'script': 'add_emojis_v2.py', 'entree': 'lemmes_emojis.json', 'reseau': False},
+    'add_emojis_v3': {'script': 'add_emojis_v3.py', 'entree': 'lemmes.json', 'reseau': True},
+    'apply_manual_emojis': {'script': 'apply_manual_emojis.py', 'entree': 'lemmes_noms_emojis.json', 'reseau': False},
+    'build_emoji_index': {'script': 'build_emoji_index.py', 'entree': 'dictionnaire_dys.json', 'reseau': True},
+    'assign_emojis_vecteurs': {'script': 'assign_emojis_vecteurs.py', 'entree': 'dictionnaire_dys.json',
+                               'reseau': False, 'vecteurs': True},
+}
+
+
+def lire_option(nom, defaut):
+    args = sys.argv[1:]
+    if nom in args and args.index(nom) + 1 < len(args):
+        return args[args.index(nom) + 1]
+    return defaut
+
+
+# --- Lexique synthétique ---
+
+def generer_lexique(taille, graine=7):
+    """Entrées au format de data/lexique_filtre.json (~2 formes par lemme)"""
+    rnd = random.Random(graine)
+    entrees = []
+    lemme = None
+    while len(entrees) < taille:
+        if lemme is None or rnd.random() < 0.5:
+            if rnd.random() < 0.01:
+                lemme = rnd.choice(MOTS_REELS)
+            else:
+                lemme = ''.join(rnd.choice(SYLLABES) for _ in range(rnd.randint(1, 4)))
+            cgram = rnd.choice(CGRAMS)
+        f = round(rnd.random() ** 3 * 300, 2)
+        entrees.append({
+            'ortho': lemme if rnd.random() < 0.5 else lemme + 's',
+            'lemme': lemme,
+            'cgram': cgram,
+            'genre': rnd.choice(['m', 'f']),
+            'nombre': rnd.choice(['s', 'p']),
+            'freq': {'cp': f, 'ce1': f, 'ce2_cm2': f, 'cp_cm2': f},
+        })
+    return entrees
+
+
+def lemmes_de(entrees, avec_emojis=False):
+    """Entrées → format de data/lemmes.json (sortie de extract_lemmes.py)"""
+    uniques = {}
+    for e in entrees:
+        cle = (e['lemme'], e['cgram'])
+        if cle not in uniques:
+            uniques[cle] = {'lemme': e['lemme'], 'cgram': e['cgram'], 'score_freq': e['freq']['cp_cm2']}
+            if avec_emojis:
+                uniques[cle]['emoji'] = EMOJIS[zlib.crc32(e['lemme'].encode()) % len(EMOJIS)] \
+                    if zlib.crc32(e['lemme'].encode()) % 5 == 0 else None
+    return list(uniques.values())
+
+
+def ecrire_vecteurs(chemin, entrees, graine=7):
+    """Fichier de vecteurs (format texte fastText) : lemmes des noms et mots réels"""
+    rnd = random.Random(graine)
+    mots = sorted({e['lemme'] for e in entrees if e['cgram'] == 'NOM'} | set(MOTS_REELS))
+    with open(chemin, 'w', encoding='utf-8') as f:
+        f.write(f"{len(mots)} {DIMENSION_VECTEURS}\n")
+        for mot in mots:
+            f.write(mot + ' ' + ' '.join(f"{rnd.gauss(0, 1):.4f}" for _ in range(DIMENSION_VECTEURS)) + '\n')
+
+
+def ecrire_entree(dossier, etape, entrees):
+    """Écrit le fichier d'entrée de l'étape, renvoie son nombre d'entrées"""
+    nom = ETAPES[etape]['entree']
+    if nom == 'lexique_filtre.json':
+        donnees = entrees
+    elif nom == 'lemmes.json':
+        donnees = lemmes_de(entrees)
+    elif nom == 'dictionnaire_dys.json':
+        donnees = {'entries': [dict(e, id=i) for i, e in enumerate(entrees)]}
+    else:
+        donnees = lemmes_de(entrees, avec_emojis=True)
+    for fichier in ('index_emojis.json', 'cache_traductions.json', 'vecteurs_cache.npz'):
+        chemin = os.path.join(dossier, 'data', fichier)
+        if os.path.exists(chemin):
+            os.remove(chemin)
+    with open(os.path.join(dossier, 'data', nom), 'w', encoding='utf-8') as f:
+        json.dump(donnees, f, ensure_ascii=False)
+    if ETAPES[etape].get('vecteurs'):
+        ecrire_vecteurs(os.path.join(dossier, 'data', 'vecteurs.vec'), entrees)
+    return len(donnees['entries']) if isinstance(donnees, dict) else len(donnees)
+
+
+# --- Faux clients réseau (processus de l'étape) ---
+
+def installer_faux_reseau(latence_s):
+    class FauxTraducteur:
+        def __init__(self, source='auto', target='en'):
+            self.source, self.target = source, target
+
+        def translate(self, texte):
+            if latence_s:
+                time.sleep(latence_s)
+            return texte  # Mot inconnu : renvoyé tel quel, comme un vrai traducteur
+
+    class FauxCompletions:
+        def create(self, model=None, messages=None, **_):
+            if latence_s:
+                time.sleep(latence_s)
+            prompt = messages[-1]['content']
+            m = re.search(r'Mots à traiter: (\[.*\])', prompt, re.S)
+            mots = json.loads(m.group(1)) if m else []
+            reponse = {mot: EMOJIS[zlib.crc32(mot.encode()) % len(EMOJIS)] for mot in mots}
+            contenu = json.dumps(reponse, ensure_ascii=False)
+            return SimpleNamespace(choices=[SimpleNamespace(message=SimpleNamespace(content=contenu))])
+
+    class FauxOpenAI:
+        def __init__(self, api_key=None, **_):
+            self.chat = SimpleNamespace(completions=FauxCompletions())
+
+    modules = {
+        'deep_translator': {'GoogleTranslator': FauxTraducteur},
+        'openai': {'OpenAI': FauxOpenAI},
+        'dotenv': {'load_dotenv': lambda *a, **k: True},
+    }
+    for nom, attributs in modules.items():
+        module = ModuleType(nom)
+        module.__dict__.update(attributs)
+        sys.modules[nom] = module
+
+
+def executer_etape(etape, dossier, latence_ms):
+    """Processus fils : lance le script de l'étape, écrit la mesure sur stdout (JSON)"""
+    config = ETAPES[etape]
+    sortie = sys.stdout
+    if config['reseau']:
+        installer_faux_reseau(latence_ms / 1000)
+    os.chdir(dossier)
+    debut = time.perf_counter()
+    try:
+        with open(os.devnull, 'w', encoding='utf-8') as muet:
+            sys.stdout = muet
+            runpy.run_path(os.path.join(RACINE, config['script']), run_name='__main__')
+    except ImportError as e:
+        sys.stdout = sortie
+        print(json.dumps({'ignoree': f"module {e.name} absent"}))
+        return 0
+    except SystemExit as e:
+        # Scripts terminés par sys.exit(main())
+        if e.code:
+            raise
+    finally:
+        sys.stdout = sortie
+    duree = time.perf_counter() - debut
+    rss_mo = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024  # Ko sous Linux
+    print(json.dumps({'secondes': round(duree, 3), 'rss_max_mo': round(rss_mo, 1)}))
+    return 0
+
+
+# --- Harnais ---
+
+def mesurer(etape, dossier, nb_entrees, latence_ms):
+    proc = subprocess.run(
+        [sys.executable, os.path.abspath(__file__), '--executer', etape, dossier, str(latence_ms)],
+        capture_output=True, text=True, encoding='utf-8')
+    lignes = proc.stdout.strip().splitlines()
+    if proc.returncode != 0 or not lignes:
+        return {'erreur': (proc.stderr.strip().splitlines() or ['?'])[-1]}
+    mesure = json.loads(lignes[-1])
+    if 'secondes' in mesure:
+        mesure['entrees'] = nb_entrees
+        mesure['entrees_par_s'] = round(nb_entrees / max(mesure['secondes'], 1e-6))
+    return mesure
+
+
+def exposants(mesures):
+    """Exposant de croissance entre tailles successives mesurées"""
+    points = [(int(t), m['secondes'], m['entrees']) for t, m in sorted(mesures.items(), key=lambda x: int(x[0]))
+              if 'secondes' in m]
+    resultat = {}
+    for (t1, s1, n1), (t2, s2, n2) in zip(points, points[1:]):
+        if s1 > 0 and n2 > n1:
+            resultat[str(t2)] = round(math.log(s2 / s1) / math.log(n2 / n1), 2)
+    return resultat
+
+
+def commit_courant():
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], cwd=RACINE,
+                              capture_output=True, text=True).stdout.strip() or None
+    except OSError:
+        return None
+
+
+def afficher(rapport):
+    print(f"\n{'Étape':<24} {'entrées':>9} {'durée':>9} {'RSS max':>9} {'entrées/s':>11} {'exposant':>9}")
+    for etape, bloc in rapport['etapes'].items():
+        for taille, m in sorted(bloc['mesures'].items(), key=lambda x: int(x[0])):
+            if 'secondes' not in m:
+                print(f"{etape:<24} {int(taille):>9} {m.get('ignoree') or m.get('erreur')}")
+                continue
+            exp = bloc['exposants'].get(taille)
+            alerte = ' ⚠️' if taille in bloc['superlineaire'] else ''
+            print(f"{etape:<24} {m['entrees']:>9} {m['secondes']:>8.2f}s {m['rss_max_mo']:>7.0f}Mo "
+                  f"{m['entrees_par_s']:>11} {'' if exp is None else f'{exp:>9.2f}'}{alerte}")
+
+
+def comparer(rapport, chemin):
+    """Écarts avec un rapport précédent ; True si une étape a régressé"""
+    with open(chemin, 'r', encoding='utf-8') as f:
+        ancien = json.load(f)
+    print(f"\nComparaison avec {chemin} (commit {ancien.get('commit')})")
+    regression = False
+    for etape, bloc in rapport['etapes'].items():
+        anciennes = ancien.get('etapes', {}).get(etape, {}).get('mesures', {})
+        for taille, m in sorted(bloc['mesures'].items(), key=lambda x: int(x[0])):
+            a = anciennes.get(taille)
+            if 'secondes' not in m or not a or 'secondes' not in a or a['secondes'] <= 0:
+                continue
+            ratio = m['secondes'] / a['secondes']
+            lent = ratio > SEUIL_REGRESSION and m['secondes'] >= DUREE_MIN_EXPOSANT
+            regression |= lent
+            print(f"   {etape:<24} {int(taille):>9} {a['secondes']:>8.2f}s → {m['secondes']:>8.2f}s "
+                  f"(×{ratio:.2f}) RSS {a['rss_max_mo']:.0f} → {m['rss_max_mo']:.0f} Mo{' ⚠️' if lent else ''}")
+    return regression
+
+
+def main():
+    if '--executer' in sys.argv:
+        i = sys.argv.index('--executer')
+        return executer_etape(sys.argv[i + 1], sys.argv[i + 2], float(sys.argv[i + 3]))
+
+    debut = time.time()
+    tailles = [int(t) for t in lire_option('--tailles', ','.join(map(str, TAILLES))).split(',')]
+    etapes = lire_option('--etapes', ','.join(ETAPES)).split(',')
+    inconnues = [e for e in etapes if e not in ETAPES]
+    if inconnues:
+        print(f"❌ Étapes inconnues : {', '.join(inconnues)}")
+        return 1
+    latence_ms = float(lire_option('--latence-ms', 0))
+    sortie = lire_option('--sortie', FICHIER_RAPPORT)
+
+    rapport = {
+        'commit': commit_courant(),
+        'date': time.strftime('%Y-%m-%dT%H:%M:%S'),
+        'python': platform.python_version(),
+        'machine': platform.machine(),
+        'cpus': os.cpu_count(),
+        'latence_ms': latence_ms,
+        'etapes': {e: {'script': ETAPES[e]['script'], 'mesures': {}} for e in etapes},
+    }
+
+    with tempfile.TemporaryDirectory(prefix='bench_pipeline_') as dossier:
+        os.makedirs(os.path.join(dossier, 'data'))
+        for taille in tailles:
+            print(f"📂 Lexique synthétique de {taille} entrées...")
+            entrees = generer_lexique(taille)
+            for etape in etapes:
+                nb = ecrire_entree(dossier, etape, entrees)
+                mesure = mesurer(etape, dossier, nb, latence_ms)
+                rapport['etapes'][etape]['mesures'][str(taille)] = mesure
+                etat = f"{mesure['secondes']:.2f}s" if 'secondes' in mesure else mesure.get('ignoree') or mesure.get('erreur')
+                print(f"   {etape:<24} {etat}")
+
+    for bloc in rapport['etapes'].values():
+        bloc['exposants'] = exposants(bloc['mesures'])
+        bloc['superlineaire'] = [t for t, e in bloc['exposants'].items()
+                                 if e > SEUIL_EXPOSANT and bloc['mesures'][t]['secondes'] >= DUREE_MIN_EXPOSANT]
+
+    os.makedirs(os.path.dirname(os.path.abspath(sortie)), exist_ok=True)
+    with open(sortie, 'w', encoding='utf-8') as f:
+        json.dump(rapport, f, ensure_ascii=False, indent=2)
+
+    afficher(rapport)
+    regression = comparer(rapport, lire_option('--comparer', None)) if '--comparer' in sys.argv else False
+    print("-" * 30)
+    print("✅ Terminé !")
+    print(f"Durée : {time.time() - debut:.1f}s")
+    print(f"📁 Rapport : {sortie}")
+    return 1 if regression else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
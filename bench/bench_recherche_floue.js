@@ -0,0 +1,131 @@
+/**
+ * BENCHMARK - Recherche floue
+ * Génère des fautes réalistes (inversion, lettre oubliée, confusion DYS) sur
+ * des mots fréquents et mesure le rappel top-5 / top-10 de predict()
+ * avec et sans recherche floue, ainsi que la latence par requête.
+ * Vérifie aussi des fautes connues (FAUTES_ATTENDUES) : le mot attendu est
+ * dans le top-10, devant tout candidat trouvé en raccourcissant le préfixe.
+ *
+ * Usage: node bench/bench_recherche_floue.js [data/dictionnaire_dys.json] [nbMots]
+ */
+
+const { performance } = require('perf_hooks');
+const PredicteurDys = require('../predicteur');
+
+const BUDGET_P95_MS = 10; // Latence p95 de la recherche floue seule
+
+// Faute → mot attendu (régressions : fallback classé devant le match flou)
+const FAUTES_ATTENDUES = [
+  ['cahmp', 'champ'],
+  ['pobelle', 'poubelle'],
+];
+
+let seed = 42;
+function random() {
+  seed = (seed * 16807) % 2147483647;
+  return seed / 2147483647;
+}
+
+/**
+ * Applique une faute au milieu du mot (jamais sur la première lettre)
+ */
+function fauter(mot, chars) {
+  const i = 1 + Math.floor(random() * (mot.length - 2));
+  const type = Math.floor(random() * 3);
+  if (type === 0) {
+    // Inversion de deux lettres
+    return mot.slice(0, i) + mot[i + 1] + mot[i] + mot.slice(i + 2);
+  }
+  if (type === 1) {
+    // Lettre oubliée
+    return mot.slice(0, i) + mot.slice(i + 1);
+  }
+  // Confusion DYS (b/p, d/t, f/v...)
+  const code = chars[mot[i]];
+  const confusions = Object.keys(chars).filter(c => c !== mot[i] && code && chars[c] === code);
+  if (confusions.length === 0) return null;
+  return mot.slice(0, i) + confusions[Math.floor(random() * confusions.length)] + mot.slice(i + 1);
+}
+
+function percentile(valeurs, p) {
+  const tri = [...valeurs].sort((a, b) => a - b);
+  return tri[Math.min(tri.length - 1, Math.floor(tri.length * p))];
+}
+
+function main() {
+  const dictPath = process.argv[2] || 'data/dictionnaire_dys.json';
+  const nbMots = parseInt(process.argv[3]) || 300;
+  const predicteur = new PredicteurDys(dictPath);
+  const chars = predicteur.rules.CHARS;
+
+  // Mots fréquents d'au moins 5 lettres
+  const mots = predicteur.entries
+    .filter(e => e.ortho.length >= 5 && (e.freq?.cp_cm2 || 0) >= 10 && /^[a-zéèêàâîôûç]+$/.test(e.ortho))
+    .sort(() => random() - 0.5)
+    .slice(0, nbMots);
+
+  const cas = [];
+  for (const e of mots) {
+    const faute = fauter(e.ortho, chars);
+    if (faute && faute !== e.ortho) cas.push({ faute, attendu: e.ortho });
+  }
+
+  // Chauffe (construction des tries + JIT)
+  const tConstruction = performance.now();
+  const floue = predicteur.getRechercheFloue();
+  console.log(`\n🌳 Construction des tries : ${(performance.now() - tConstruction).toFixed(0)} ms`);
+  for (const c of cas.slice(0, 50)) predicteur.predict(c.faute, { limit: 10 });
+
+  const evaluer = (useFuzzy) => {
+    let top5 = 0;
+    let top10 = 0;
+    for (const c of cas) {
+      const res = predicteur.predict(c.faute, { limit: 10, useFuzzy });
+      const rang = res.findIndex(r => r.ortho === c.attendu);
+      if (rang !== -1 && rang < 5) top5++;
+      if (rang !== -1) top10++;
+    }
+    return { top5: top5 / cas.length, top10: top10 / cas.length };
+  };
+
+  const sans = evaluer(false);
+  const avec = evaluer(true);
+
+  // Latence de la recherche floue seule
+  const latences = [];
+  let interrompues = 0;
+  for (const c of cas) {
+    const t = performance.now();
+    floue.rechercher(c.faute, predicteur.transcode(c.faute));
+    latences.push(performance.now() - t);
+    if (floue.derniereRecherche.interrompu) interrompues++;
+  }
+
+  // Fautes connues : top-10, devant les candidats du fallback
+  const echecs = [];
+  for (const [faute, attendu] of FAUTES_ATTENDUES) {
+    const res = predicteur.predict(faute, { limit: 10 });
+    const rang = res.findIndex(r => r.ortho === attendu);
+    const premierFallback = res.findIndex(r => r.fallback);
+    if (rang === -1 || (premierFallback !== -1 && premierFallback < rang)) {
+      echecs.push(`${faute} → ${attendu} (rang ${rang === -1 ? 'absent' : rang + 1} : ${res.slice(0, 5).map(r => r.ortho).join(', ')})`);
+    }
+  }
+
+  const p50 = percentile(latences, 0.5);
+  const p95 = percentile(latences, 0.95);
+
+  console.log("=".repeat(50));
+  console.log(`🔎 BENCHMARK RECHERCHE FLOUE (${cas.length} fautes)`);
+  console.log("=".repeat(50));
+  console.log(`Rappel top-5  : ${(sans.top5 * 100).toFixed(1)}% → ${(avec.top5 * 100).toFixed(1)}%`);
+  console.log(`Rappel top-10 : ${(sans.top10 * 100).toFixed(1)}% → ${(avec.top10 * 100).toFixed(1)}%`);
+  console.log(`Latence floue : p50 ${p50.toFixed(2)} ms | p95 ${p95.toFixed(2)} ms (budget ${BUDGET_P95_MS} ms)`);
+  console.log(`Interrompues  : ${interrompues}`);
+  console.log(`Fautes connues : ${FAUTES_ATTENDUES.length - echecs.length}/${FAUTES_ATTENDUES.length}`);
+  for (const echec of echecs) console.log(`   ❌ ${echec}`);
+
+  process.exit(p95 > BUDGET_P95_MS || echecs.length > 0 ? 1 : 0);
+}
+
+main();
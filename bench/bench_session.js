@@ -0,0 +1,152 @@
+/**
+ * BENCHMARK - Sessions de prédiction (session_prediction.js)
+ *
+ * 1. Coût de calcul par frappe : predict() sans état vs avec la mémo de
+ *    session, en tapant chaque mot lettre par lettre (avec une correction :
+ *    dernière lettre effacée puis retapée). Les résultats doivent être
+ *    identiques.
+ * 2. Flux de frappe simulé (une frappe toutes les INTERVALLE ms) : latence
+ *    entre la dernière frappe d'un mot et l'affichage de ses suggestions.
+ *      - fifo     : chaque frappe calculée dans l'ordre, sans état
+ *      - session  : SessionPrediction (mémo + frappes périmées abandonnées)
+ *      - debounce : GET /api/predict après 150 ms sans frappe (public/index.html)
+ *
+ * Usage: node bench/bench_session.js [data/dictionnaire_dys.json] [intervalle_ms]
+ */
+
+const { performance } = require('perf_hooks');
+const PredicteurDys = require('../predicteur');
+const { SessionPrediction, MemoRecherche } = require('../session_prediction');
+
+const MOTS = ["bato", "mézon", "pobelle", "fotograf", "cahmp", "chocola", "élefan", "tortu", "papillon", "gato"];
+const TOURS = 5;
+const DEBOUNCE_MS = 150;
+// Recherche floue jamais interrompue : sans cela, son budget temps rend la
+// comparaison des résultats non déterministe
+const BUDGET_FLOU_MS = 1000;
+
+/**
+ * Frappes successives d'un mot : "b", "ba", ..., "bato", "bat", "bato"
+ */
+function frappesDuMot(mot) {
+  const frappes = [];
+  for (let i = 1; i <= mot.length; i++) frappes.push(mot.slice(0, i));
+  frappes.push(mot.slice(0, -1), mot);
+  return frappes;
+}
+
+function mesurerCalcul(predicteur) {
+  console.log("\n⚙️ Coût de calcul par frappe");
+  let total = { sans: 0, memo: 0, frappes: 0, differences: 0 };
+
+  for (let tour = 0; tour < TOURS; tour++) {
+    for (const mot of MOTS) {
+      const memo = new MemoRecherche();
+      for (const q of frappesDuMot(mot)) {
+        let t0 = performance.now();
+        const attendu = predicteur.predict(q, { prevWord: 'le', fuzzyBudgetMs: BUDGET_FLOU_MS });
+        total.sans += performance.now() - t0;
+
+        t0 = performance.now();
+        const obtenu = predicteur.predict(q, { prevWord: 'le', fuzzyBudgetMs: BUDGET_FLOU_MS, memo });
+        total.memo += performance.now() - t0;
+        total.frappes++;
+
+        if (attendu.map(r => r.id).join() !== obtenu.map(r => r.id).join()) total.differences++;
+      }
+    }
+  }
+
+  const sans = total.sans / total.frappes;
+  const memo = total.memo / total.frappes;
+  console.log(`   Sans état : ${(sans * 1000).toFixed(0)} µs/frappe`);
+  console.log(`   Mémo      : ${(memo * 1000).toFixed(0)} µs/frappe (×${(sans / memo).toFixed(2)})`);
+  console.log(`   Différences de résultats : ${total.differences}/${total.frappes}`);
+  return total.differences;
+}
+
+/**
+ * Rejoue les frappes d'un mot et renvoie la latence de la dernière
+ * (dernière frappe → suggestions affichées) et le nombre de calculs
+ */
+function rejouerMot(predicteur, mode, mot, intervalle) {
+  return new Promise(resolve => {
+    const frappes = frappesDuMot(mot);
+    const derniere = frappes.length - 1;
+    let tDerniere = 0;
+    let calculs = 0;
+
+    const afficher = (seq) => {
+      if (seq === derniere) resolve({ latence: performance.now() - tDerniere, calculs });
+    };
+    const calculer = (q) => {
+      calculs++;
+      return predicteur.predict(q, { prevWord: 'le' });
+    };
+
+    let envoyer;
+    if (mode === 'fifo') {
+      envoyer = (q, seq) => setImmediate(() => { calculer(q); afficher(seq); });
+    } else if (mode === 'session') {
+      const session = new SessionPrediction(predicteur, (frappe) => {
+        calculs = session.stats.calculees;
+        afficher(frappe.seq);
+      });
+      envoyer = (q, seq) => session.frappe({ q, prev: 'le', seq });
+    } else {
+      let minuterie = null;
+      envoyer = (q, seq) => {
+        clearTimeout(minuterie);
+        minuterie = setTimeout(() => { calculer(q); afficher(seq); }, DEBOUNCE_MS);
+      };
+    }
+
+    // Frappes programmées à intervalle fixe (le calcul peut les retarder,
+    // comme une file de requêtes sur un serveur occupé)
+    const debut = performance.now();
+    frappes.forEach((q, seq) => {
+      setTimeout(() => {
+        if (seq === derniere) tDerniere = performance.now();
+        envoyer(q, seq);
+      }, Math.max(0, debut + seq * intervalle - performance.now()));
+    });
+  });
+}
+
+async function mesurerFlux(predicteur, intervalle) {
+  console.log(`\n⌨️ Flux de frappe simulé (une frappe toutes les ${intervalle} ms)`);
+  console.log(`   ${'Mode'.padEnd(10)} ${'Latence moy.'.padStart(13)} ${'max'.padStart(9)} ${'Calculs/mot'.padStart(12)}`);
+
+  for (const mode of ['fifo', 'session', 'debounce']) {
+    const latences = [];
+    let calculs = 0;
+    for (let tour = 0; tour < TOURS; tour++) {
+      for (const mot of MOTS) {
+        const r = await rejouerMot(predicteur, mode, mot, intervalle);
+        latences.push(r.latence);
+        calculs += r.calculs;
+      }
+    }
+    const moyenne = latences.reduce((a, b) => a + b, 0) / latences.length;
+    console.log(`   ${mode.padEnd(10)} ${moyenne.toFixed(2).padStart(10)} ms ${Math.max(...latences).toFixed(2).padStart(6)} ms ${(calculs / latences.length).toFixed(1).padStart(12)}`);
+  }
+}
+
+async function main() {
+  const dictPath = process.argv[2] || 'data/dictionnaire_dys.json';
+  const intervalle = parseFloat(process.argv[3]) || 20;
+  const predicteur = new PredicteurDys(dictPath);
+
+  // Chauffe (tries, JIT)
+  for (const mot of MOTS) for (const q of frappesDuMot(mot)) predicteur.predict(q, { prevWord: 'le' });
+
+  const differences = mesurerCalcul(predicteur);
+  await mesurerFlux(predicteur, intervalle);
+
+  if (differences > 0) {
+    console.log("\n❌ La mémo de session change les résultats");
+    process.exit(1);
+  }
+}
+
+main();
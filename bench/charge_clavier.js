@@ -0,0 +1,520 @@
+/**
+ * GÉNÉRATEUR DE CHARGE - Frappes d'une classe en train d'écrire
+ *
+ * 1. Flux de frappes synthétique (ou rejoué depuis --flux) :
+ *    - mots tirés selon leur fréquence Manulex (freq[niveau] du dictionnaire)
+ *    - phrases : mot suivant tiré dans les successeurs de bigrammes du mot
+ *      précédent (bigrammes.bin) quand il en a, sinon selon la fréquence ;
+ *      prevWord / prev2 = mots précédents de la phrase
+ *    - fautes de l'élève : règles du prédicteur appliquées à l'envers
+ *      (rules/chars.json : consonne remplacée par une autre du même code,
+ *      accent oublié ; rules/ortho_equiv.json : graphie remplacée par une
+ *      graphie qui se lit pareil, "bateau" → "bato")
+ *    - une frappe par préfixe, parfois une lettre effacée puis retapée
+ * 2. Rejeu contre une cible, ELEVES élèves en parallèle :
+ *    - edge     : POST de l'edge function (supabase functions serve)
+ *    - edge-get : GET cachable de l'edge function (redirections 308 suivies)
+ *    - serveur  : GET /api/predict de server.js (expérimental : jamais rejoué
+ *      contre un serveur démarré, rapport marqué "experimentale")
+ *    Avec --intervalle > 0 (ms entre frappes, ±50 %), chaque élève tape à
+ *    son rythme sans attendre les réponses (boucle ouverte, latence mesurée
+ *    depuis l'instant prévu de la frappe) ; avec 0, chaque élève envoie la
+ *    frappe suivante dès la réponse reçue (débit maximal).
+ * 3. Rapport JSON (--sortie, par défaut bench/charge_rapport.json) : débit,
+ *    centiles de latence, erreurs par type, réponses dégradées.
+ *    --comparer ancien.json affiche les écarts et sort en erreur si le p95
+ *    ou le taux d'erreur régresse (sauf cible expérimentale).
+ *
+ * Usage:
+ *   node bench/charge_clavier.js [--cible edge|edge-get|serveur] [--url URL]
+ *        [--eleves 30] [--intervalle 200] [--duree 30] [--frappes 200]
+ *        [--taux-fautes 0.3] [--niveau cp_cm2] [--graine 42] [--timeout 5000]
+ *        [--dictionnaire data/dictionnaire_dys.json] [--jeton CLE_ANON]
+ *        [--enregistrer flux.jsonl] [--flux flux.jsonl]
+ *        [--sortie rapport.json] [--comparer ancien.json]
+ */
+
+const fs = require('fs');
+const http = require('http');
+const https = require('https');
+const path = require('path');
+const { execSync } = require('child_process');
+const { performance } = require('perf_hooks');
+const ModeleBigrammes = require('../bigrammes');
+
+const RACINE = path.join(__dirname, '..');
+const FICHIER_RAPPORT = path.join(__dirname, 'charge_rapport.json');
+const CIBLES = {
+  serveur: 'http://localhost:3000/api/predict',
+  edge: 'http://localhost:54321/functions/v1/predict',
+  'edge-get': 'http://localhost:54321/functions/v1/predict'
+};
+// Cibles dont le rejeu n'a pas été validé : à comparer entre elles seulement
+const CIBLES_EXPERIMENTALES = new Set(['serveur']);
+
+const ELEVES = 30;
+const INTERVALLE_MS = 200;       // Entre deux frappes d'un élève (0 = boucle fermée)
+const DUREE_S = 30;              // Boucle ouverte : durée du flux de chaque élève
+const FRAPPES_PAR_ELEVE = 200;   // Boucle fermée
+const TAUX_FAUTES = 0.3;         // Mots tapés avec au moins une faute
+const TAUX_EFFACEMENT = 0.05;    // Frappes suivies d'un effacement puis de la même lettre
+const PROBA_BIGRAMME = 0.7;      // Mot suivant tiré dans les successeurs du précédent
+const MOTS_PAR_PHRASE = [4, 10];
+const LIMITE = 8;
+const TIMEOUT_MS = 5000;
+const SEUIL_REGRESSION = 1.25;   // --comparer : p95 25 % plus lent
+const SEUIL_ERREURS = 0.01;      // --comparer : +1 point de taux d'erreur
+
+const RE_MOT = /^[a-zàâäçéèêëîïôöùûüÿœæ]+$/;
+const VOYELLES = 'aeiouyàâäéèêëîïôöùûüÿœæ';
+
+let graine = 42;
+const aleatoire = () => (graine = (graine * 16807) % 2147483647) / 2147483647;
+const choisir = tableau => tableau[Math.floor(aleatoire() * tableau.length)];
+
+function lireOption(nom, defaut) {
+  const i = process.argv.indexOf(nom);
+  return i >= 0 && i + 1 < process.argv.length ? process.argv[i + 1] : defaut;
+}
+
+function lireRegles(nom) {
+  return JSON.parse(fs.readFileSync(path.join(RACINE, 'rules', nom), 'utf8'));
+}
+
+// --- Fautes d'orthographe (règles du prédicteur à l'envers) ---
+
+/**
+ * Substitutions qu'un élève DYS peut faire : graphie correcte → graphies écrites
+ * @returns {Array<[string, Array<string>]>} - Triées de la plus longue à la plus courte
+ */
+function construireFautes() {
+  const substitutions = new Map();
+  const ajouter = (correct, ecrit) => {
+    if (correct === ecrit) return;
+    if (!substitutions.has(correct)) substitutions.set(correct, new Set());
+    substitutions.get(correct).add(ecrit);
+  };
+
+  // chars.json : lettres du même code auditif (b/p, d/t, f/v, m/n...), accents oubliés
+  const chars = lireRegles('chars.json');
+  const parCode = new Map();
+  for (const [lettre, code] of Object.entries(chars.confusions_consonnes || {})) {
+    if (lettre.startsWith('_')) continue;
+    if (!parCode.has(code)) parCode.set(code, []);
+    parCode.get(code).push(lettre);
+  }
+  for (const lettres of parCode.values()) {
+    for (const a of lettres) for (const b of lettres) ajouter(a, b);
+  }
+  for (const [lettre, code] of Object.entries(chars.voyelles_accentuees || {})) {
+    if (!lettre.startsWith('_')) ajouter(lettre, code);
+  }
+
+  // ortho_equiv.json : "o" → [o, au, eau, ô] se lit "eau s'écrit aussi o"
+  const equivalences = lireRegles('ortho_equiv.json');
+  for (const [groupe, regles] of Object.entries(equivalences)) {
+    if (groupe.startsWith('_')) continue;
+    for (const [ecrit, variantes] of Object.entries(regles)) {
+      if (ecrit.startsWith('_') || !Array.isArray(variantes)) continue;
+      for (const correct of variantes) ajouter(correct, ecrit);
+    }
+  }
+
+  return Array.from(substitutions, ([correct, ecrits]) => [correct, Array.from(ecrits)])
+    .sort((a, b) => b[0].length - a[0].length);
+}
+
+/**
+ * Une graphie de voyelle n'est remplacée que si elle forme un son à elle
+ * seule : pas au milieu d'une autre voyelle ("oi", "ue"), ni devant n/m
+ * ("on" est une nasale), ni e muet en fin de mot
+ */
+function graphieIsolee(mot, i, correct) {
+  if (!VOYELLES.includes(correct[0])) return true;
+  const avant = mot[i - 1];
+  const apres = mot[i + correct.length];
+  if (avant && VOYELLES.includes(avant)) return false;
+  if (!apres) return correct !== 'e'; // e muet final
+  return !VOYELLES.includes(apres) && !('nm'.includes(apres) && !/[nm]$/.test(correct));
+}
+
+/**
+ * Mot tel que l'élève l'écrit : une ou deux substitutions, jamais sur la première lettre
+ */
+function abimer(mot, fautes) {
+  let resultat = mot;
+  const nb = aleatoire() < 0.3 ? 2 : 1;
+  for (let n = 0; n < nb; n++) {
+    const possibles = [];
+    for (const [correct, ecrits] of fautes) {
+      let i = resultat.indexOf(correct, 1);
+      while (i > 0) {
+        if (graphieIsolee(resultat, i, correct)) possibles.push([i, correct, ecrits]);
+        i = resultat.indexOf(correct, i + 1);
+      }
+    }
+    if (possibles.length === 0) break;
+    const [i, correct, ecrits] = choisir(possibles);
+    resultat = resultat.slice(0, i) + choisir(ecrits) + resultat.slice(i + correct.length);
+  }
+  return resultat;
+}
+
+// --- Flux de frappes ---
+
+class GenerateurPhrases {
+  constructor(dictPath, niveau) {
+    const data = JSON.parse(fs.readFileSync(dictPath, 'utf8'));
+    this.entries = data.entries;
+    this.idsOrtho = new Map();
+    for (const e of this.entries) {
+      if (!this.idsOrtho.has(e.ortho)) this.idsOrtho.set(e.ortho, e.id);
+    }
+
+    // Tirage par fréquence Manulex (mots simples en minuscules)
+    const freq = e => (typeof e.freq === 'number' ? e.freq : e.freq?.[niveau]) || 0;
+    this.mots = this.entries.filter(e => RE_MOT.test(e.ortho) && freq(e) > 0);
+    this.cumul = [];
+    let total = 0;
+    for (const e of this.mots) this.cumul.push(total += freq(e));
+    this.total = total;
+
+    const cheminBigrammes = path.join(path.dirname(dictPath), 'bigrammes.bin');
+    this.bigrammes = fs.existsSync(cheminBigrammes) ? ModeleBigrammes.charger(cheminBigrammes) : null;
+    if (this.bigrammes && this.bigrammes.totalEntries !== this.entries.length) this.bigrammes = null;
+  }
+
+  tirerMot() {
+    const x = aleatoire() * this.total;
+    let bas = 0;
+    let haut = this.cumul.length - 1;
+    while (bas < haut) {
+      const milieu = (bas + haut) >> 1;
+      if (this.cumul[milieu] < x) bas = milieu + 1;
+      else haut = milieu;
+    }
+    return this.mots[bas].ortho;
+  }
+
+  motSuivant(prev, prev2) {
+    if (this.bigrammes && prev && aleatoire() < PROBA_BIGRAMME) {
+      const id2 = prev2 ? this.idsOrtho.get(prev2) ?? -1 : -1;
+      const succ = this.bigrammes.successeurs(this.idsOrtho.get(prev) ?? -1, id2);
+      if (succ && succ.ids.length > 0) {
+        let total = 0;
+        for (const p of succ.poids) total += p;
+        let x = aleatoire() * total;
+        for (let i = 0; i < succ.ids.length; i++) {
+          x -= succ.poids[i];
+          const entree = this.entries[succ.ids[i]];
+          if (x <= 0 && entree && RE_MOT.test(entree.ortho)) return entree.ortho;
+        }
+      }
+    }
+    return this.tirerMot();
+  }
+
+  phrase() {
+    const [min, max] = MOTS_PAR_PHRASE;
+    const n = min + Math.floor(aleatoire() * (max - min + 1));
+    const mots = [];
+    for (let i = 0; i < n; i++) mots.push(this.motSuivant(mots[i - 1], mots[i - 2]));
+    return mots;
+  }
+}
+
+/**
+ * Frappes d'un élève : { t (ms depuis le début), q, prev, prev2 }
+ */
+function fluxEleve(generateur, fautes, options) {
+  const { intervalle, dureeMs, frappesMax, tauxFautes } = options;
+  const frappes = [];
+  let t = 0;
+  const fini = () => (intervalle > 0 ? t >= dureeMs : frappes.length >= frappesMax);
+  while (!fini()) {
+    const mots = generateur.phrase();
+    for (let i = 0; i < mots.length && !fini(); i++) {
+      const ecrit = aleatoire() < tauxFautes ? abimer(mots[i], fautes) : mots[i];
+      const prev = mots[i - 1] || '';
+      const prev2 = mots[i - 2] || '';
+      const pas = () => intervalle * (0.5 + aleatoire());
+      t += 2 * pas(); // Pause entre deux mots
+      for (let n = 1; n <= ecrit.length; n++) {
+        frappes.push({ t: Math.round(t), q: ecrit.slice(0, n), prev, prev2 });
+        t += pas();
+        if (n > 1 && aleatoire() < TAUX_EFFACEMENT) {
+          frappes.push({ t: Math.round(t), q: ecrit.slice(0, n - 1), prev, prev2 });
+          t += pas();
+          frappes.push({ t: Math.round(t), q: ecrit.slice(0, n), prev, prev2 });
+          t += pas();
+        }
+      }
+    }
+  }
+  return frappes;
+}
+
+function lireFlux(chemin) {
+  const eleves = new Map();
+  for (const ligne of fs.readFileSync(chemin, 'utf8').split('\n')) {
+    if (!ligne.trim()) continue;
+    const { eleve, ...frappe } = JSON.parse(ligne);
+    if (!eleves.has(eleve)) eleves.set(eleve, []);
+    eleves.get(eleve).push(frappe);
+  }
+  return Array.from(eleves.values());
+}
+
+function ecrireFlux(chemin, flux) {
+  const lignes = [];
+  flux.forEach((frappes, eleve) => {
+    for (const frappe of frappes) lignes.push(JSON.stringify({ eleve, ...frappe }));
+  });
+  fs.writeFileSync(chemin, lignes.join('\n') + '\n');
+}
+
+// --- Rejeu ---
+
+class Client {
+  constructor(cible, url, options) {
+    this.cible = cible;
+    this.url = new URL(url);
+    this.timeoutMs = options.timeoutMs;
+    this.jeton = options.jeton;
+    const module = this.url.protocol === 'https:' ? https : http;
+    this.module = module;
+    this.agent = new module.Agent({ keepAlive: true, maxSockets: options.eleves });
+  }
+
+  requete(methode, url, corps = null) {
+    return new Promise((resolve) => {
+      const entetes = { 'Content-Type': 'application/json' };
+      if (this.jeton) entetes['Authorization'] = `Bearer ${this.jeton}`;
+      const req = this.module.request(url, { method: methode, headers: entetes, agent: this.agent }, (res) => {
+        const morceaux = [];
+        res.on('data', m => morceaux.push(m));
+        res.on('end', () => resolve({ status: res.statusCode, headers: res.headers, corps: Buffer.concat(morceaux).toString('utf8') }));
+        res.on('error', err => resolve({ erreur: 'reseau', message: err.message }));
+      });
+      req.setTimeout(this.timeoutMs, () => req.destroy(new Error('timeout')));
+      req.on('error', err => resolve({ erreur: err.message === 'timeout' ? 'timeout' : 'reseau', message: err.message }));
+      if (corps) req.write(corps);
+      req.end();
+    });
+  }
+
+  /**
+   * Une frappe : { status, degradee, redirections } ou { erreur }
+   */
+  async frappe({ q, prev, prev2 }) {
+    let reponse;
+    let redirections = 0;
+    if (this.cible === 'edge') {
+      reponse = await this.requete('POST', this.url, JSON.stringify({ query: q, prevWord: prev, prevWord2: prev2, limit: LIMITE }));
+    } else {
+      const params = this.cible === 'serveur'
+        ? { q, prev, prev2, limit: LIMITE }
+        : { query: q, prevWord: prev, prevWord2: prev2, limit: LIMITE };
+      let url = new URL(this.url);
+      for (const [k, v] of Object.entries(params)) if (v !== '') url.searchParams.set(k, v);
+      reponse = await this.requete('GET', url);
+      while (!reponse.erreur && [301, 302, 307, 308].includes(reponse.status) && redirections < 3) {
+        redirections++;
+        url = new URL(reponse.headers.location, url);
+        reponse = await this.requete('GET', url);
+      }
+    }
+    if (reponse.erreur) return reponse;
+    if (reponse.status !== 200) return { erreur: `http_${reponse.status}` };
+    let degradee = false;
+    try {
+      degradee = Array.isArray(JSON.parse(reponse.corps).degraded);
+    } catch (err) {
+      return { erreur: 'json' };
+    }
+    return { status: 200, degradee, redirections };
+  }
+}
+
+async function rejouer(client, flux, intervalle) {
+  const mesures = { latences: [], erreurs: {}, degradees: 0, redirections: 0, requetes: 0 };
+  const enregistrer = (resultat, latence) => {
+    mesures.requetes++;
+    if (resultat.erreur) {
+      mesures.erreurs[resultat.erreur] = (mesures.erreurs[resultat.erreur] || 0) + 1;
+      return;
+    }
+    mesures.latences.push(latence);
+    if (resultat.degradee) mesures.degradees++;
+    mesures.redirections += resultat.redirections;
+  };
+
+  const debut = performance.now();
+  const dormir = ms => new Promise(r => setTimeout(r, ms));
+  await Promise.all(flux.map(async (frappes) => {
+    if (intervalle > 0) {
+      // Boucle ouverte : chaque frappe part à son heure, réponse reçue ou non
+      const envois = [];
+      for (const frappe of frappes) {
+        const attente = debut + frappe.t - performance.now();
+        if (attente > 0) await dormir(attente);
+        const prevu = debut + frappe.t;
+        envois.push(client.frappe(frappe).then(r => enregistrer(r, performance.now() - prevu)));
+      }
+      await Promise.all(envois);
+    } else {
+      for (const frappe of frappes) {
+        const t = performance.now();
+        enregistrer(await client.frappe(frappe), performance.now() - t);
+      }
+    }
+  }));
+  mesures.dureeS = (performance.now() - debut) / 1000;
+  return mesures;
+}
+
+// --- Rapport ---
+
+function centiles(latences) {
+  const triees = Float64Array.from(latences).sort();
+  const c = q => triees.length ? +triees[Math.min(triees.length - 1, Math.floor(q * triees.length))].toFixed(2) : null;
+  const somme = triees.reduce((a, b) => a + b, 0);
+  return {
+    moyenne: triees.length ? +(somme / triees.length).toFixed(2) : null,
+    p50: c(0.5), p90: c(0.9), p95: c(0.95), p99: c(0.99),
+    max: triees.length ? +triees[triees.length - 1].toFixed(2) : null
+  };
+}
+
+function commitCourant() {
+  try {
+    return execSync('git rev-parse --short HEAD', { cwd: RACINE, stdio: ['ignore', 'pipe', 'ignore'] }).toString().trim();
+  } catch (err) {
+    return null;
+  }
+}
+
+function afficher(rapport) {
+  const r = rapport.resultats;
+  console.log("\n" + "=".repeat(60));
+  console.log(`⌨️ CHARGE CLAVIER → ${rapport.cible}${rapport.experimentale ? ' (expérimentale)' : ''} (${rapport.url})`);
+  console.log("=".repeat(60));
+  console.log(`${rapport.config.eleves} élèves, ${r.requetes} frappes en ${r.duree_s}s (intervalle ${rapport.config.intervalle_ms} ms)`);
+  console.log(`Débit : ${r.debit_rps} frappes/s`);
+  console.log(`Latence : moy ${r.latence_ms.moyenne} ms, p50 ${r.latence_ms.p50}, p90 ${r.latence_ms.p90}, p95 ${r.latence_ms.p95}, p99 ${r.latence_ms.p99}, max ${r.latence_ms.max}`);
+  const erreurs = Object.entries(r.erreurs).map(([k, n]) => `${k} ${n}`).join(', ');
+  console.log(`Erreurs : ${(r.taux_erreur * 100).toFixed(2)} %${erreurs ? ` (${erreurs})` : ''}`);
+  console.log(`Réponses dégradées (budget) : ${r.degradees}${r.redirections ? `, redirections suivies : ${r.redirections}` : ''}`);
+}
+
+function comparer(rapport, chemin) {
+  const ancien = JSON.parse(fs.readFileSync(chemin, 'utf8'));
+  const a = ancien.resultats;
+  const r = rapport.resultats;
+  console.log(`\nComparaison avec ${chemin} (commit ${ancien.commit}, cible ${ancien.cible})`);
+  if (ancien.cible !== rapport.cible || ancien.config.intervalle_ms !== rapport.config.intervalle_ms || ancien.config.eleves !== rapport.config.eleves) {
+    console.log("   ⚠️ Cible ou charge différente : écarts indicatifs");
+  }
+  const lignes = [
+    ['débit (frappes/s)', a.debit_rps, r.debit_rps],
+    ['latence p50 (ms)', a.latence_ms.p50, r.latence_ms.p50],
+    ['latence p95 (ms)', a.latence_ms.p95, r.latence_ms.p95],
+    ['latence p99 (ms)', a.latence_ms.p99, r.latence_ms.p99],
+    ["taux d'erreur", a.taux_erreur, r.taux_erreur]
+  ];
+  for (const [nom, avant, apres] of lignes) {
+    const ratio = avant ? ` (×${(apres / avant).toFixed(2)})` : '';
+    console.log(`   ${nom.padEnd(20)} ${String(avant).padStart(9)} → ${String(apres).padStart(9)}${ratio}`);
+  }
+  const lent = a.latence_ms.p95 > 0 && r.latence_ms.p95 / a.latence_ms.p95 > SEUIL_REGRESSION;
+  const erreurs = r.taux_erreur - a.taux_erreur > SEUIL_ERREURS;
+  if (lent) console.log(`   ⚠️ p95 plus lent de plus de ${((SEUIL_REGRESSION - 1) * 100).toFixed(0)} %`);
+  if (erreurs) console.log(`   ⚠️ Taux d'erreur en hausse de plus de ${(SEUIL_ERREURS * 100).toFixed(0)} point`);
+  if (rapport.experimentale && (lent || erreurs)) {
+    console.log("   ℹ️ Cible expérimentale : écarts affichés sans code de sortie en erreur");
+    return false;
+  }
+  return lent || erreurs;
+}
+
+async function main() {
+  const cible = lireOption('--cible', 'edge');
+  if (!CIBLES[cible]) {
+    console.log(`❌ Cible inconnue : ${cible} (${Object.keys(CIBLES).join(', ')})`);
+    process.exit(1);
+  }
+  const experimentale = CIBLES_EXPERIMENTALES.has(cible);
+  if (experimentale) {
+    console.log(`⚠️ Cible ${cible} expérimentale : rejeu jamais validé, chiffres indicatifs`);
+  }
+  const url = lireOption('--url', CIBLES[cible]);
+  const eleves = parseInt(lireOption('--eleves', ELEVES));
+  const intervalle = parseFloat(lireOption('--intervalle', INTERVALLE_MS));
+  const niveau = lireOption('--niveau', 'cp_cm2');
+  const tauxFautes = parseFloat(lireOption('--taux-fautes', TAUX_FAUTES));
+  graine = parseInt(lireOption('--graine', 42));
+  const graineInitiale = graine;
+
+  let flux;
+  const cheminFlux = lireOption('--flux', null);
+  if (cheminFlux) {
+    flux = lireFlux(cheminFlux);
+    console.log(`📂 Flux rejoué : ${flux.length} élèves (${cheminFlux})`);
+  } else {
+    const dictPath = lireOption('--dictionnaire', 'data/dictionnaire_dys.json');
+    console.log("📂 Chargement du dictionnaire...");
+    const generateur = new GenerateurPhrases(dictPath, niveau);
+    const fautes = construireFautes();
+    const options = {
+      intervalle,
+      dureeMs: parseFloat(lireOption('--duree', DUREE_S)) * 1000,
+      frappesMax: parseInt(lireOption('--frappes', FRAPPES_PAR_ELEVE)),
+      tauxFautes
+    };
+    flux = [];
+    for (let e = 0; e < eleves; e++) flux.push(fluxEleve(generateur, fautes, options));
+    console.log(`⌨️ ${flux.reduce((n, f) => n + f.length, 0)} frappes générées (${generateur.mots.length} mots, bigrammes ${generateur.bigrammes ? 'oui' : 'non'}, ${fautes.length} graphies fautives)`);
+    const cheminEnregistrement = lireOption('--enregistrer', null);
+    if (cheminEnregistrement) {
+      ecrireFlux(cheminEnregistrement, flux);
+      console.log(`💾 Flux enregistré : ${cheminEnregistrement}`);
+    }
+  }
+
+  const client = new Client(cible, url, { eleves: flux.length, timeoutMs: parseFloat(lireOption('--timeout', TIMEOUT_MS)), jeton: lireOption('--jeton', process.env.SUPABASE_ANON_KEY || null) });
+  console.log(`🚀 Rejeu contre ${cible} (${url})...`);
+  const mesures = await rejouer(client, flux, intervalle);
+  const nbErreurs = Object.values(mesures.erreurs).reduce((a, b) => a + b, 0);
+
+  const rapport = {
+    commit: commitCourant(),
+    date: new Date().toISOString().slice(0, 19),
+    cible,
+    experimentale,
+    url,
+    node: process.version,
+    config: {
+      eleves: flux.length, intervalle_ms: intervalle, taux_fautes: tauxFautes, niveau,
+      graine: graineInitiale, flux: cheminFlux
+    },
+    resultats: {
+      requetes: mesures.requetes,
+      duree_s: +mesures.dureeS.toFixed(2),
+      debit_rps: +(mesures.requetes / mesures.dureeS).toFixed(1),
+      latence_ms: centiles(mesures.latences),
+      erreurs: mesures.erreurs,
+      taux_erreur: mesures.requetes ? +(nbErreurs / mesures.requetes).toFixed(4) : 0,
+      degradees: mesures.degradees,
+      redirections: mesures.redirections
+    }
+  };
+
+  const sortie = lireOption('--sortie', FICHIER_RAPPORT);
+  fs.writeFileSync(sortie, JSON.stringify(rapport, null, 2) + '\n');
+  afficher(rapport);
+  const regression = process.argv.includes('--comparer') ? comparer(rapport, lireOption('--comparer', null)) : false;
+  console.log(`📁 Rapport : ${sortie}`);
+  process.exit(regression ? 1 : 0);
+}
+
+main();
@@ -0,0 +1,253 @@
+/**
+ * BENCHMARK - Cache HTTP devant le GET de l'edge function predict
+ *
+ * Proxy en mémoire qui joue le rôle du CDN : respecte Cache-Control
+ * (s-maxage, max-age, stale-while-revalidate, no-store), revalide avec
+ * If-None-Match (304) et répond lui-même aux If-None-Match des clients.
+ * La clé est l'URL complète : seules les URL canoniques sont partagées.
+ *
+ * Mode --rejouer : des élèves simulés tapent des phrases lettre par
+ * lettre (première lettre parfois en majuscule, mot précédent brut) en
+ * suivant les redirections 308 vers l'URL canonique. Mesures : requêtes
+ * servies par le cache, requêtes arrivées à la fonction (200 calculés,
+ * 304, 308), latence côté élève.
+ *
+ * Usage:
+ *   supabase functions serve predict   (ou toute URL de la fonction)
+ *   node bench/proxy_cache.js http://localhost:54321/functions/v1/predict [--port 8787]
+ *   node bench/proxy_cache.js <url> --rejouer [--eleves 100] [--ttl 5]
+ *     --ttl : durée de vie maximale (s) pour exercer la revalidation pendant le bench
+ */
+
+const http = require('http');
+const { performance } = require('perf_hooks');
+
+const PORT = 8787;
+const ELEVES = 100;
+const PHRASES_PAR_ELEVE = 3;
+const LIMITE = 8;
+const PHRASES = [
+  "le chat mange la souris", "ma maison est grande", "les enfants jouent dans le jardin",
+  "mon papa a une voiture rouge", "la maitresse lit une histoire", "je mange du chocolat",
+  "le petit chien court vite", "nous allons à la piscine", "il fait beau aujourd'hui",
+  "ma soeur a un chat noir", "le bateau est sur la mer", "les oiseaux chantent le matin",
+  "un éléphant dans la savane", "la tortue marche doucement", "je dessine un papillon"
+];
+
+let graine = 11;
+const aleatoire = () => (graine = (graine * 16807) % 2147483647) / 2147483647;
+
+function lireOption(nom, defaut) {
+  const i = process.argv.indexOf(nom);
+  return i >= 0 && i + 1 < process.argv.length ? process.argv[i + 1] : defaut;
+}
+
+/**
+ * Directives Cache-Control → { public, noStore, private, sMaxage, maxAge, swr }
+ */
+function lireCacheControl(valeur) {
+  const directives = {};
+  for (const partie of (valeur || '').split(',')) {
+    const [nom, arg] = partie.trim().toLowerCase().split('=');
+    if (nom) directives[nom] = arg === undefined ? true : parseInt(arg);
+  }
+  return {
+    noStore: directives['no-store'] === true || directives['private'] === true,
+    duree: directives['s-maxage'] ?? directives['max-age'] ?? null,
+    swr: directives['stale-while-revalidate'] || 0
+  };
+}
+
+class ProxyCache {
+  /**
+   * @param {string} origine - URL de la fonction (http://hôte:port/chemin)
+   * @param {object} options - { ttlMax (s) }
+   */
+  constructor(origine, options = {}) {
+    this.origine = new URL(origine);
+    this.ttlMax = options.ttlMax ?? Infinity;
+    this.cache = new Map(); // URL → { status, headers, corps, etag, expire, stale }
+    this.stats = { requetes: 0, hits: 0, stale: 0, revalidees: 0, origine: { 200: 0, 304: 0, 308: 0, autres: 0 } };
+  }
+
+  demanderOrigine(chemin, entetes = {}) {
+    return new Promise((resolve, reject) => {
+      const req = http.request({
+        hostname: this.origine.hostname, port: this.origine.port, path: chemin, method: 'GET', headers: entetes
+      }, (res) => {
+        const morceaux = [];
+        res.on('data', m => morceaux.push(m));
+        res.on('end', () => {
+          const cle = [200, 304, 308].includes(res.statusCode) ? res.statusCode : 'autres';
+          this.stats.origine[cle]++;
+          resolve({ status: res.statusCode, headers: res.headers, corps: Buffer.concat(morceaux) });
+        });
+      });
+      req.on('error', reject);
+      req.end();
+    });
+  }
+
+  stocker(chemin, reponse) {
+    const cc = lireCacheControl(reponse.headers['cache-control']);
+    if (cc.noStore || cc.duree === null || ![200, 308].includes(reponse.status)) {
+      this.cache.delete(chemin);
+      return;
+    }
+    const maintenant = Date.now();
+    const duree = Math.min(cc.duree, this.ttlMax) * 1000;
+    this.cache.set(chemin, {
+      status: reponse.status,
+      headers: reponse.headers,
+      corps: reponse.corps,
+      etag: reponse.headers.etag || null,
+      expire: maintenant + duree,
+      stale: maintenant + duree + cc.swr * 1000
+    });
+  }
+
+  async revalider(chemin, entree) {
+    const entetes = entree.etag ? { 'if-none-match': entree.etag } : {};
+    const reponse = await this.demanderOrigine(chemin, entetes);
+    if (reponse.status === 304) {
+      this.stats.revalidees++;
+      this.stocker(chemin, { ...entree, headers: { ...entree.headers, ...reponse.headers } });
+    } else {
+      this.stocker(chemin, reponse);
+    }
+    return this.cache.get(chemin) || reponse;
+  }
+
+  /**
+   * Réponse pour un chemin (+ requête) et l'If-None-Match du client
+   * @returns {Promise<object>} - { status, headers, corps, cache }
+   */
+  async obtenir(chemin, ifNoneMatch = null) {
+    this.stats.requetes++;
+    const maintenant = Date.now();
+    let entree = this.cache.get(chemin);
+    let etat = 'HIT';
+    if (entree && maintenant >= entree.expire) {
+      if (maintenant < entree.stale) {
+        // Servie périmée, revalidée en arrière-plan
+        etat = 'STALE';
+        this.stats.stale++;
+        this.revalider(chemin, entree).catch(() => {});
+      } else {
+        etat = 'REVALIDATED';
+        entree = await this.revalider(chemin, entree);
+      }
+    } else if (entree) {
+      this.stats.hits++;
+    } else {
+      etat = 'MISS';
+      const reponse = await this.demanderOrigine(chemin);
+      this.stocker(chemin, reponse);
+      entree = reponse;
+    }
+    if (ifNoneMatch && entree.status === 200 && entree.headers.etag === ifNoneMatch) {
+      return { status: 304, headers: entree.headers, corps: Buffer.alloc(0), cache: etat };
+    }
+    return { status: entree.status, headers: entree.headers, corps: entree.corps, cache: etat };
+  }
+
+  ecouter(port) {
+    return http.createServer(async (req, res) => {
+      if (req.method !== 'GET') {
+        res.writeHead(405).end();
+        return;
+      }
+      try {
+        const chemin = this.origine.pathname + (req.url.includes('?') ? req.url.slice(req.url.indexOf('?')) : '');
+        const reponse = await this.obtenir(chemin, req.headers['if-none-match'] || null);
+        res.writeHead(reponse.status, { ...reponse.headers, 'x-cache': reponse.cache });
+        res.end(reponse.corps);
+      } catch (err) {
+        res.writeHead(502).end(String(err));
+      }
+    }).listen(port);
+  }
+}
+
+/**
+ * Frappes d'un élève : URL brutes (mot précédent tel qu'écrit, majuscule en début de phrase)
+ */
+function frappesEleve() {
+  const urls = [];
+  for (let p = 0; p < PHRASES_PAR_ELEVE; p++) {
+    const mots = PHRASES[Math.floor(aleatoire() * PHRASES.length)].split(' ');
+    mots.forEach((mot, i) => {
+      const ecrit = i === 0 && aleatoire() < 0.5 ? mot.charAt(0).toUpperCase() + mot.slice(1) : mot;
+      const prev = i > 0 ? mots[i - 1] : '';
+      for (let n = 1; n <= ecrit.length; n++) {
+        const params = new URLSearchParams({ query: ecrit.slice(0, n) });
+        if (prev) params.set('prevWord', i === 1 && aleatoire() < 0.5 ? prev.charAt(0).toUpperCase() + prev.slice(1) : prev);
+        params.set('limit', String(LIMITE));
+        urls.push(params.toString());
+      }
+    });
+  }
+  return urls;
+}
+
+async function rejouer(proxy, nbEleves) {
+  const latences = [];
+  let redirections = 0;
+  const parEtat = { HIT: 0, STALE: 0, REVALIDATED: 0, MISS: 0 };
+  const debut = performance.now();
+  for (let e = 0; e < nbEleves; e++) {
+    for (const requete of frappesEleve()) {
+      const t = performance.now();
+      let chemin = proxy.origine.pathname + '?' + requete;
+      let reponse = await proxy.obtenir(chemin);
+      parEtat[reponse.cache]++;
+      // Le navigateur suit la redirection vers l'URL canonique
+      for (let sauts = 0; reponse.status === 308 && sauts < 3; sauts++) {
+        redirections++;
+        const cible = new URL(reponse.headers.location, 'http://cdn' + chemin);
+        chemin = cible.pathname + cible.search;
+        reponse = await proxy.obtenir(chemin);
+        parEtat[reponse.cache]++;
+      }
+      if (reponse.status !== 200) throw new Error(`${chemin} : HTTP ${reponse.status}`);
+      latences.push(performance.now() - t);
+    }
+  }
+  const duree = performance.now() - debut;
+  latences.sort((a, b) => a - b);
+  const centile = q => latences[Math.min(latences.length - 1, Math.floor(q * latences.length))].toFixed(2);
+  const s = proxy.stats;
+  const calculees = s.origine[200];
+
+  console.log("\n" + "=".repeat(60));
+  console.log("🌐 BENCHMARK CACHE HTTP (GET predict)");
+  console.log("=".repeat(60));
+  console.log(`${nbEleves} élèves, ${latences.length} frappes en ${(duree / 1000).toFixed(1)}s (${redirections} redirections suivies)`);
+  console.log(`Requêtes au cache : ${s.requetes} (HIT ${parEtat.HIT}, STALE ${parEtat.STALE}, REVALIDATED ${parEtat.REVALIDATED}, MISS ${parEtat.MISS})`);
+  console.log(`Requêtes à la fonction : ${s.origine[200] + s.origine[304] + s.origine[308] + s.origine.autres} (200 : ${s.origine[200]}, 304 : ${s.origine[304]}, 308 : ${s.origine[308]})`);
+  console.log(`URL distinctes en cache : ${proxy.cache.size}`);
+  console.log(`predict() évité : ${((1 - calculees / latences.length) * 100).toFixed(1)} % des frappes`);
+  console.log(`Latence par frappe : p50 ${centile(0.5)} ms, p95 ${centile(0.95)} ms`);
+}
+
+async function main() {
+  const origine = process.argv[2];
+  if (!origine || origine.startsWith('--')) {
+    console.log("Usage: node bench/proxy_cache.js <url_fonction> [--port 8787] [--rejouer] [--eleves 100] [--ttl 5]");
+    process.exit(1);
+  }
+  const ttl = parseFloat(lireOption('--ttl', ''));
+  const proxy = new ProxyCache(origine, { ttlMax: Number.isFinite(ttl) ? ttl : Infinity });
+  if (process.argv.includes('--rejouer')) {
+    await rejouer(proxy, parseInt(lireOption('--eleves', ELEVES)));
+    return;
+  }
+  const port = parseInt(lireOption('--port', PORT));
+  proxy.ecouter(port);
+  console.log(`🌐 Proxy cache sur http://localhost:${port} → ${origine}`);
+}
+
+main().catch((err) => {
+  console.error(`❌ ${err.message}`);
+  process.exit(1);
+});
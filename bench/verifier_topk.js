@@ -0,0 +1,82 @@
+/**
+ * VÉRIFICATION - Table top-k contre predict() en direct
+ * Compare, pour un échantillon de clés (niveau, classe, préfixe), la réponse
+ * de la table avec celle de predict() sans table : mêmes IDs dans le même
+ * ordre, mêmes types de match, scores égaux à la précision float32 près.
+ * Mesure aussi la latence des deux chemins.
+ *
+ * Usage: node bench/verifier_topk.js [data/dictionnaire_dys.json] [taille_echantillon]
+ * Code de sortie 1 si une différence est trouvée.
+ */
+
+const { performance } = require('perf_hooks');
+const PredicteurDys = require('../predicteur');
+
+const TOLERANCE_SCORE = 1e-3;
+// Même budget que topk_worker.js : en direct, une recherche floue interrompue
+// par son budget de 10 ms donnerait un classement moins complet que la table
+const BUDGET_FLOU_MS = 1000;
+const MAX_DIFFERENCES_AFFICHEES = 10;
+
+function main() {
+  const dictPath = process.argv[2] || 'data/dictionnaire_dys.json';
+  const taille = parseInt(process.argv[3]) || 2000;
+  const predicteur = new PredicteurDys(dictPath);
+  const table = predicteur.topk;
+  if (!table) {
+    console.log(`❌ Pas de topk.bin valide à côté de ${dictPath} (lancer build_topk.py)`);
+    process.exit(1);
+  }
+  // Même configuration que topk_worker.js (bigrammes hors table)
+  predicteur.bigrammes = null;
+
+  // Échantillon déterministe de clés (pas régulier sur la table)
+  const cles = Array.from(table.index.keys());
+  const pas = Math.max(1, Math.floor(cles.length / taille));
+  const echantillon = cles.filter((_, i) => i % pas === 0).slice(0, taille);
+
+  let differences = 0;
+  let msTable = 0;
+  let msDirect = 0;
+  for (const cle of echantillon) {
+    const [n, c, prefixe] = cle.split('\t');
+    const niveau = table.meta.niveaux[n];
+    const prevWord = table.meta.classes[c].prevWord;
+    const options = { level: niveau, limit: table.k, prevWord };
+
+    let t = performance.now();
+    const attendu = predicteur.predict(prefixe, { ...options, useTopK: false, fuzzyBudgetMs: BUDGET_FLOU_MS });
+    msDirect += performance.now() - t;
+    t = performance.now();
+    const obtenu = predicteur.predict(prefixe, options);
+    msTable += performance.now() - t;
+
+    const identique = attendu.length === obtenu.length && attendu.every((r, i) =>
+      r.id === obtenu[i].id &&
+      r.matchType === obtenu[i].matchType &&
+      (r.segmentation || null) === (obtenu[i].segmentation || null) &&
+      Math.abs(r.score - obtenu[i].score) <= TOLERANCE_SCORE
+    );
+    if (!identique) {
+      differences++;
+      if (differences <= MAX_DIFFERENCES_AFFICHEES) {
+        console.log(`   ≠ "${prefixe}" (${niveau}, prev "${prevWord}")`);
+        console.log(`     direct : ${attendu.map(r => r.ortho).join(', ')}`);
+        console.log(`     table  : ${obtenu.map(r => r.ortho).join(', ')}`);
+      }
+    }
+  }
+
+  const stats = table.stats();
+  console.log("\n" + "=".repeat(50));
+  console.log("⚡ VÉRIFICATION TABLE TOP-K");
+  console.log("=".repeat(50));
+  console.log(`Table     : ${stats.cles} clés, ${stats.resultats} résultats, ${(stats.octets / 1024).toFixed(1)} Ko`);
+  console.log(`Échantillon : ${echantillon.length} clés, ${differences} différence(s)`);
+  console.log(`Latence   : ${(msDirect / echantillon.length).toFixed(3)} ms en direct, ${(msTable / echantillon.length * 1000).toFixed(1)} µs par la table`);
+
+  console.log(differences > 0 ? "\n❌ Table incohérente (reconstruire avec build_topk.py)" : "\n✅ Table cohérente");
+  process.exit(differences > 0 ? 1 : 0);
+}
+
+main();
@@ -0,0 +1,99 @@
+const fs = require('fs');
+
+/**
+ * MODÈLE DE MOT SUIVANT (bigrammes / trigrammes)
+ * Lit le fichier binaire produit par build_bigrammes.py.
+ * Les tableaux typés pointent directement dans le buffer : pas de parsing,
+ * recherche dichotomique sur les clés de contexte.
+ */
+
+const MAGIC = 'DYSB';
+const VERSION = 1;
+const MAX_ID = 1 << 20;
+const TAILLE_ENTETE = 24;
+
+class ModeleBigrammes {
+  /**
+   * @param {Buffer|ArrayBuffer} buffer - Contenu de bigrammes.bin
+   */
+  constructor(buffer) {
+    const buf = Buffer.isBuffer(buffer) ? buffer : Buffer.from(buffer);
+    if (buf.toString('latin1', 0, 4) !== MAGIC) {
+      throw new Error('Fichier bigrammes invalide (magic)');
+    }
+    const version = buf.readUInt32LE(4);
+    if (version !== VERSION) {
+      throw new Error(`Version bigrammes non supportée: ${version}`);
+    }
+    const nbContextes = buf.readUInt32LE(8);
+    const nbPaires = buf.readUInt32LE(12);
+    this.totalEntries = buf.readUInt32LE(16);
+
+    // Copie alignée (Buffer.from peut partager un pool non aligné)
+    const ab = buf.buffer.slice(buf.byteOffset, buf.byteOffset + buf.byteLength);
+    let offset = TAILLE_ENTETE;
+    this.cles = new Float64Array(ab, offset, nbContextes);
+    offset += nbContextes * 8;
+    this.offsets = new Uint32Array(ab, offset, nbContextes + 1);
+    offset += (nbContextes + 1) * 4;
+    this.suivants = new Uint32Array(ab, offset, nbPaires);
+    offset += nbPaires * 4;
+    this.poids = new Uint8Array(ab, offset, nbPaires);
+
+    this.octets = ab.byteLength;
+  }
+
+  static charger(chemin) {
+    return new ModeleBigrammes(fs.readFileSync(chemin));
+  }
+
+  /**
+   * Position d'un contexte dans la table (-1 si absent)
+   */
+  trouverContexte(prev1, prev2 = -1) {
+    const cle = (prev2 + 1) * MAX_ID + prev1;
+    const cles = this.cles;
+    let lo = 0;
+    let hi = cles.length - 1;
+    while (lo <= hi) {
+      const mid = (lo + hi) >>> 1;
+      const v = cles[mid];
+      if (v === cle) return mid;
+      if (v < cle) lo = mid + 1;
+      else hi = mid - 1;
+    }
+    return -1;
+  }
+
+  /**
+   * Successeurs d'un contexte, triés par poids décroissant
+   * Essaie le trigramme (prev2, prev1) puis se replie sur le bigramme (prev1)
+   * @returns {{ids: Uint32Array, poids: Uint8Array}|null} - Vues sans copie
+   */
+  successeurs(prev1, prev2 = -1) {
+    if (prev1 < 0) return null;
+    let pos = prev2 >= 0 ? this.trouverContexte(prev1, prev2) : -1;
+    if (pos === -1) pos = this.trouverContexte(prev1);
+    if (pos === -1) return null;
+
+    const debut = this.offsets[pos];
+    const fin = this.offsets[pos + 1];
+    return {
+      ids: this.suivants.subarray(debut, fin),
+      poids: this.poids.subarray(debut, fin)
+    };
+  }
+
+  /**
+   * Statistiques mémoire
+   */
+  stats() {
+    return {
+      contextes: this.cles.length,
+      paires: this.suivants.length,
+      octets: this.octets
+    };
+  }
+}
+
+module.exports = ModeleBigrammes;
@@ -0,0 +1,189 @@
+#!/usr/bin/env python3
+"""
+Construit un modèle de mot suivant (bigrammes + trigrammes) à partir d'un
+corpus texte local, indexé sur les IDs du dictionnaire DYS.
+
+Le modèle est élagué (fréquence minimale, top-K successeurs par contexte),
+quantifié sur 8 bits et écrit dans un fichier binaire à tableaux triés,
+lu directement par bigrammes.js (recherche dichotomique, aucun parsing).
+
+Format (little-endian) :
+    en-tête   : b'DYSB', version u32, nb_contextes u32, nb_paires u32,
+                total_entries u32, padding u32
+    cles      : float64[nb_contextes]   (triées, clé = (prev2 + 1) * 2^20 + prev1)
+    offsets   : uint32[nb_contextes + 1]
+    suivants  : uint32[nb_paires]       (IDs, triés par poids décroissant)
+    poids     : uint8[nb_paires]        (log-probabilité quantifiée, 1..255)
+"""
+
+import glob
+import json
+import math
+import os
+import re
+import struct
+import sys
+import time
+from array import array
+from collections import Counter, defaultdict
+
+# Fichiers
+FICHIER_DICTIONNAIRE = 'data/dictionnaire_dys.json'
+DOSSIER_CORPUS = 'data/corpus'
+FICHIER_SORTIE = 'data/bigrammes.bin'
+
+# Élagage
+MIN_OCCURRENCES = 2        # Paires vues moins souvent : ignorées
+MAX_SUCCESSEURS = 32       # Successeurs gardés par contexte
+MIN_LOGPROBA = -4.0        # log10(P) minimal représentable (P >= 0.0001)
+
+# Budgets (vérifiés à la fin du build)
+BUDGET_OCTETS = 2 * 1024 * 1024
+
+VERSION = 1
+MAX_ID = 1 << 20           # Les IDs doivent tenir sur 20 bits (clé trigramme)
+AUCUN = -1                 # prev2 absent → contexte bigramme
+
+RE_PHRASE = re.compile(r'[.!?;:\n]+')
+RE_MOT = re.compile(r"[a-zàâäçéèêëîïôöùûüÿœæ]+", re.IGNORECASE)
+
+
+def cle_contexte(prev1, prev2=AUCUN):
+    return (prev2 + 1) * MAX_ID + prev1
+
+
+def charger_ids_ortho():
+    """ortho (minuscule) → ID canonique (plus petit ID de l'index_ortho)"""
+    print(f"📂 Lecture de {FICHIER_DICTIONNAIRE}...")
+    with open(FICHIER_DICTIONNAIRE, 'r', encoding='utf-8') as f:
+        data = json.load(f)
+
+    ids = {}
+    for ortho, liste in data['index_ortho'].items():
+        cle = ortho.lower()
+        if cle not in ids or liste[0] < ids[cle]:
+            ids[cle] = liste[0]
+
+    total = data['meta']['total_entries']
+    if total >= MAX_ID:
+        raise ValueError(f"Trop d'entrées pour des clés sur 20 bits : {total}")
+    return ids, total
+
+
+def lire_phrases(dossier):
+    """Générateur de phrases (listes de mots minuscules), fichier par fichier"""
+    for chemin in sorted(glob.glob(os.path.join(dossier, '**', '*.txt'), recursive=True)):
+        with open(chemin, 'r', encoding='utf-8', errors='ignore') as f:
+            reste = ''
+            for ligne in f:
+                morceaux = RE_PHRASE.split(reste + ligne)
+                reste = morceaux.pop()
+                for morceau in morceaux:
+                    yield RE_MOT.findall(morceau.lower())
+            if reste:
+                yield RE_MOT.findall(reste.lower())
+
+
+def compter(ids_ortho):
+    """Compte les n-grammes sur les IDs canoniques (mots inconnus = coupure)"""
+    comptes = defaultdict(Counter)
+    nb_mots = 0
+    nb_inconnus = 0
+
+    for mots in lire_phrases(DOSSIER_CORPUS):
+        prev1 = prev2 = AUCUN
+        for mot in mots:
+            nb_mots += 1
+            id_mot = ids_ortho.get(mot)
+            if id_mot is None:
+                nb_inconnus += 1
+                prev1 = prev2 = AUCUN
+                continue
+            if prev1 != AUCUN:
+                comptes[cle_contexte(prev1)][id_mot] += 1
+                if prev2 != AUCUN:
+                    comptes[cle_contexte(prev1, prev2)][id_mot] += 1
+            prev2, prev1 = prev1, id_mot
+
+    return comptes, nb_mots, nb_inconnus
+
+
+def quantifier(compte, total):
+    """log10(P) ∈ [MIN_LOGPROBA, 0] → 1..255"""
+    logp = max(math.log10(compte / total), MIN_LOGPROBA)
+    return max(1, round(255 * (1 - logp / MIN_LOGPROBA)))
+
+
+def elaguer(comptes):
+    """Garde les paires fréquentes, top-K par contexte, triées par poids"""
+    table = []
+    for cle, successeurs in comptes.items():
+        total = sum(successeurs.values())
+        gardes = [(s, c) for s, c in successeurs.most_common(MAX_SUCCESSEURS) if c >= MIN_OCCURRENCES]
+        if gardes:
+            table.append((cle, [(s, quantifier(c, total)) for s, c in gardes]))
+    table.sort(key=lambda x: x[0])
+    return table
+
+
+def ecrire(table, total_entries):
+    cles = array('d')
+    offsets = array('I', [0])
+    suivants = array('I')
+    poids = array('B')
+
+    for cle, successeurs in table:
+        cles.append(cle)
+        for id_suivant, q in successeurs:
+            suivants.append(id_suivant)
+            poids.append(q)
+        offsets.append(len(suivants))
+
+    if sys.byteorder != 'little':
+        for a in (cles, offsets, suivants):
+            a.byteswap()
+
+    with open(FICHIER_SORTIE, 'wb') as f:
+        f.write(b'DYSB')
+        f.write(struct.pack('<5I', VERSION, len(cles), len(suivants), total_entries, 0))
+        f.write(cles.tobytes())
+        f.write(offsets.tobytes())
+        f.write(suivants.tobytes())
+        f.write(poids.tobytes())
+
+    return os.path.getsize(FICHIER_SORTIE)
+
+
+def construire_bigrammes():
+    debut = time.time()
+    ids_ortho, total_entries = charger_ids_ortho()
+
+    print(f"📚 Lecture du corpus ({DOSSIER_CORPUS})...")
+    comptes, nb_mots, nb_inconnus = compter(ids_ortho)
+    if not comptes:
+        print("❌ Aucun n-gramme trouvé (corpus vide ?)")
+        return 1
+
+    print("✂️ Élagage et quantification...")
+    table = elaguer(comptes)
+    taille = ecrire(table, total_entries)
+
+    nb_bigrammes = sum(1 for cle, _ in table if cle < MAX_ID)
+    nb_paires = sum(len(s) for _, s in table)
+    print("-" * 30)
+    print("✅ Terminé !")
+    print(f"Mots lus : {nb_mots} ({nb_inconnus} hors dictionnaire)")
+    print(f"Contextes : {len(table)} ({nb_bigrammes} bigrammes, {len(table) - nb_bigrammes} trigrammes)")
+    print(f"Paires gardées : {nb_paires}")
+    print(f"Taille : {taille / 1024:.1f} Ko (budget {BUDGET_OCTETS / 1024:.0f} Ko)")
+    print(f"Durée : {time.time() - debut:.1f}s")
+    print(f"📁 Fichier généré : {FICHIER_SORTIE}")
+
+    if taille > BUDGET_OCTETS:
+        print("❌ Budget mémoire dépassé : augmenter MIN_OCCURRENCES ou réduire MAX_SUCCESSEURS")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(construire_bigrammes())
@@ -0,0 +1,194 @@
+/**
+ * BUNDLE CLIENT (prédiction hors ligne dans le navigateur)
+ * Construit un dictionnaire réduit aux mots fréquents d'un niveau, au format
+ * binaire, pour le moteur de l'edge function exécuté côté client
+ * (supabase_export/integration/lib/bundleClient.ts). Les règles sont celles
+ * de rules.ts, compilées avec l'application.
+ *
+ * Les mots rares restent servis par l'edge function : le hook prédit en
+ * local d'abord et n'appelle le serveur que si le bundle ne trouve rien
+ * de satisfaisant.
+ *
+ * Format (little-endian) :
+ *   en-tête : 'DYSC', version u32, nb_entrees u32, total_entries u32,
+ *             taille_meta u32, taille_texte u32, taille_emojis u32
+ *   meta    : JSON utf-8 (niveau, seuil, freqMin, dictionnaire, date), complété à 4 octets
+ *   texte   : une ligne par entrée "ortho\tphon\tphon_dys\tlemme\tcgram\tgenre\tnombre\tinfover"
+ *             complété à 4 octets
+ *   emojis  : lignes "lemme\temoji" (lemmes du bundle), complété à 4 octets
+ *   ids     : uint32[nb_entrees]  (IDs du dictionnaire complet : lexique personnel)
+ *   freq    : float32[nb_entrees] (fréquence du niveau choisi)
+ *
+ * Les index (préfixes ortho/DYS, phon_dys) sont reconstruits au chargement.
+ * Le manifeste (bundle_client.json) porte la version (empreinte du fichier)
+ * comparée à celle stockée en IndexedDB.
+ *
+ * dictionnaire : empreinte du dictionnaire source (calculée comme la version
+ * servie par server.js et l'edge function). Le client ne lit les champs
+ * statiques par ID que si la réponse compacte annonce la même version.
+ *
+ * freqMin : toutes les entrées de fréquence (arrondie à 0.1, comme dans le
+ * dictionnaire optimisé) >= freqMin sont dans le bundle. Le client l'envoie
+ * ("connus") pour recevoir des réponses compactes sans les champs statiques
+ * de ces entrées (voir reponse_compacte.js).
+ *
+ * Usage: node build_bundle_client.js [--niveau cp_cm2] [--seuil 1] [--budget 600]
+ */
+
+const fs = require('fs');
+const path = require('path');
+const zlib = require('zlib');
+const crypto = require('crypto');
+const { arrondirFreq } = require('./reponse_compacte');
+
+const FICHIER_DICTIONNAIRE = 'data/dictionnaire_dys.json';
+const FICHIER_EMOJIS = 'data/index_emojis.json';
+const DOSSIER_SORTIE = 'supabase_export/functions/predict/data';
+const FICHIER_SORTIE = 'bundle_client.bin';
+const FICHIER_MANIFESTE = 'bundle_client.json';
+
+const NIVEAU = 'cp_cm2';       // Fréquences utilisées (et gardées dans le bundle)
+const SEUIL_FREQ = 1;          // Occurrences par million minimales
+const BUDGET_KO = 600;         // Taille max du bundle (non compressé)
+
+const MAGIC = 'DYSC';
+const VERSION = 1;
+const TAILLE_ENTETE = 28;
+
+function lireArguments() {
+  const args = process.argv.slice(2);
+  const valeur = (nom, defaut) => {
+    const i = args.indexOf(nom);
+    return i >= 0 && args[i + 1] !== undefined ? args[i + 1] : defaut;
+  };
+  return {
+    niveau: valeur('--niveau', NIVEAU),
+    seuil: parseFloat(valeur('--seuil', SEUIL_FREQ)),
+    budgetOctets: parseFloat(valeur('--budget', BUDGET_KO)) * 1024
+  };
+}
+
+function bourrage(n) {
+  return Buffer.alloc((4 - (n % 4)) % 4);
+}
+
+/**
+ * Sérialise les entrées (dans l'ordre des IDs) au format DYSC
+ */
+function encoder(entrees, emojis, meta, totalEntries, niveau) {
+  const lignes = entrees.map(e => [
+    e.ortho, e.phon || '', e.phon_dys || '', e.lemme || '', e.cgram || '',
+    e.genre || '', e.nombre || '', (e.infover || '').trim()
+  ].join('\t'));
+  const texte = Buffer.from(lignes.join('\n'), 'utf8');
+
+  const lemmes = new Set(entrees.map(e => (e.lemme || '').toLowerCase()));
+  const lignesEmojis = [];
+  for (const lemme of lemmes) {
+    if (emojis[lemme]) lignesEmojis.push(`${lemme}\t${emojis[lemme]}`);
+  }
+  const texteEmojis = Buffer.from(lignesEmojis.join('\n'), 'utf8');
+  const metaOctets = Buffer.from(JSON.stringify(meta), 'utf8');
+
+  const entete = Buffer.alloc(TAILLE_ENTETE);
+  entete.write(MAGIC, 0, 'latin1');
+  entete.writeUInt32LE(VERSION, 4);
+  entete.writeUInt32LE(entrees.length, 8);
+  entete.writeUInt32LE(totalEntries, 12);
+  entete.writeUInt32LE(metaOctets.length, 16);
+  entete.writeUInt32LE(texte.length, 20);
+  entete.writeUInt32LE(texteEmojis.length, 24);
+
+  const ids = Buffer.alloc(entrees.length * 4);
+  const freq = Buffer.alloc(entrees.length * 4);
+  entrees.forEach((e, i) => {
+    ids.writeUInt32LE(e.id, i * 4);
+    freq.writeFloatLE(e.freq?.[niveau] || 0, i * 4);
+  });
+
+  return Buffer.concat([
+    entete,
+    metaOctets, bourrage(metaOctets.length),
+    texte, bourrage(texte.length),
+    texteEmojis, bourrage(texteEmojis.length),
+    ids, freq
+  ]);
+}
+
+function main() {
+  const debut = Date.now();
+  const { niveau, seuil, budgetOctets } = lireArguments();
+
+  console.log(`📂 Lecture de ${FICHIER_DICTIONNAIRE}...`);
+  const contenu = fs.readFileSync(FICHIER_DICTIONNAIRE);
+  const data = JSON.parse(contenu.toString('utf8'));
+  const dictionnaire = crypto.createHash('sha1').update(contenu).digest('hex').slice(0, 12);
+  const emojis = fs.existsSync(FICHIER_EMOJIS) ? JSON.parse(fs.readFileSync(FICHIER_EMOJIS, 'utf8')) : {};
+  const totalEntries = data.meta.total_entries;
+
+  // Entrées au-dessus du seuil, des plus fréquentes aux moins fréquentes
+  const freqDe = (e) => arrondirFreq(e.freq?.[niveau]);
+  const retenues = data.entries
+    .filter(e => freqDe(e) >= seuil)
+    .sort((a, b) => freqDe(b) - freqDe(a));
+  console.log(`🔎 ${retenues.length}/${data.entries.length} entrées avec freq ${niveau} >= ${seuil}`);
+
+  const meta = { niveau, seuil, freqMin: seuil, dictionnaire, date: new Date().toISOString().split('T')[0] };
+  const construire = (n) => encoder(
+    retenues.slice(0, n).sort((a, b) => a.id - b.id), emojis, meta, totalEntries, niveau);
+
+  // Budget dépassé : on garde les n plus fréquentes qui tiennent (dichotomie)
+  let n = retenues.length;
+  let bundle = construire(n);
+  if (bundle.length > budgetOctets) {
+    let bas = 0;
+    let haut = n;
+    while (bas < haut) {
+      const milieu = Math.ceil((bas + haut) / 2);
+      if (construire(milieu).length <= budgetOctets) bas = milieu;
+      else haut = milieu - 1;
+    }
+    // Coupure entre deux fréquences : une fréquence est entièrement dans le bundle ou absente
+    n = bas;
+    while (n > 0 && freqDe(retenues[n - 1]) === freqDe(retenues[n])) n--;
+    if (n > 0) meta.freqMin = freqDe(retenues[n - 1]);
+    bundle = construire(n);
+    console.log(`✂️ Budget de ${(budgetOctets / 1024).toFixed(0)} Ko : ${n} entrées gardées (freq >= ${meta.freqMin})`);
+  }
+  if (n === 0) {
+    console.log("❌ Aucune entrée ne tient dans le budget");
+    return 1;
+  }
+
+  const version = crypto.createHash('sha1').update(bundle).digest('hex').slice(0, 12);
+  const manifeste = {
+    version,
+    fichier: FICHIER_SORTIE,
+    octets: bundle.length,
+    entrees: n,
+    niveau,
+    seuil,
+    freqMin: meta.freqMin,
+    dictionnaire,
+    date: meta.date
+  };
+  fs.mkdirSync(DOSSIER_SORTIE, { recursive: true });
+  fs.writeFileSync(path.join(DOSSIER_SORTIE, FICHIER_SORTIE), bundle);
+  fs.writeFileSync(path.join(DOSSIER_SORTIE, FICHIER_MANIFESTE), JSON.stringify(manifeste, null, 2));
+
+  const gzip = zlib.gzipSync(bundle, { level: 9 }).length;
+  const couverture = retenues.slice(0, n).reduce((s, e) => s + (e.freq?.[niveau] || 0), 0) /
+    Math.max(data.entries.reduce((s, e) => s + (e.freq?.[niveau] || 0), 0), 1);
+
+  console.log("-".repeat(30));
+  console.log("✅ Terminé !");
+  console.log(`Entrées : ${n}/${totalEntries} (${(couverture * 100).toFixed(1)} % des occurrences du niveau ${niveau})`);
+  console.log(`Taille : ${(bundle.length / 1024).toFixed(1)} Ko (gzip ${(gzip / 1024).toFixed(1)} Ko), budget ${(budgetOctets / 1024).toFixed(0)} Ko`);
+  console.log(`Version : ${version} (dictionnaire ${dictionnaire})`);
+  console.log(`Durée : ${((Date.now() - debut) / 1000).toFixed(1)}s`);
+  console.log(`📁 Fichiers générés : ${DOSSIER_SORTIE}/${FICHIER_SORTIE}, ${FICHIER_MANIFESTE} (à déposer dans le bucket predict-data)`);
+  console.log("🔎 Mesures : deno run --allow-read supabase_export/tools/bench_bundle_client.ts");
+  return 0;
+}
+
+process.exit(main());
@@ -2,6 +2,8 @@
 """
 Script pour construire un index emoji à partir des lemmes du dictionnaire DYS.
 Utilise l'API OpenAI pour suggérer des emojis pertinents.
+Seuls les lemmes absents de l'index sont demandés : lancer d'abord
+assign_emojis_vecteurs.py (hors ligne) pour ne payer que les lemmes restants.
 """
 
 import json
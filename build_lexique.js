@@ -4,6 +4,7 @@ const readline = require('readline');
 // FICHIERS
 const INPUT_LEXIQUE = 'data/Lexique383.tsv';
 const INPUT_FILTRE = 'data/manulex_full.json';
+const INPUT_CODES = 'data/phon_codes.tsv';
 const OUTPUT_FILE = 'data/lexique_filtre.json';
 
 // TABLE DE CORRESPONDANCE STRICTE (Lexique383 -> Manulex)
@@ -19,36 +20,25 @@ const correspondance = {
     "CON": "CON"
 };
 
-// TABLE DE CONVERSION : LEXIQUE383 -> CODE SIMPLIFIÉ (phonetic_dys.csv)
-const mapPhonSimple = {
-    'a': 'a', 'i': 'i', 'e': 'e', 'E': 'e', 'o': 'o', 'O': 'o',
-    'u': 'u', 'y': 'y', '°': 'e', '2': 'e', '9': 'e',
-    '@': '@', '1': '1', '§': '§', '5': '1',
-    'S': 'ch', 'Z': 'j', 'R': 'r', 'N': 'ni', 'G': 'ng',
-    'j': 'i', '8': 'yi', 'w': 'w',
-    'b': 'b', 'd': 'd', 'f': 'f', 'g': 'g', 'k': 'k', 'l': 'l',
-    'm': 'm', 'n': 'n', 'p': 'p', 's': 's', 't': 't', 'v': 'v', 'z': 'z'
-};
-
-// TABLE DE CONVERSION : LEXIQUE383 -> CODE AUDITIF (phonetic_dys.csv)
-const mapPhonAuditif = {
-    'a': 'a', 'i': 'i', 'e': 'e', 'E': 'e', 'o': 'o', 'O': 'o',
-    'u': 'u', 'y': 'y', '°': 'e', '2': 'e', '9': 'e',
-    '@': '$', '1': '$', '§': '$', '5': '$',
-    'S': '£', 'Z': '£', 'R': 'r', 'N': 'ni', 'G': 'ng',
-    'j': 'i', '8': 'yi', 'w': 'w',
-    'b': '%', 'd': '#', 'f': '?', 'g': '&', 'k': '&', 'l': 'l',
-    'm': '€', 'n': '€', 'p': '%', 's': '!', 't': '#', 'v': '?', 'z': '!'
-};
-
-// Fonction de conversion phonétique
-function convertPhon(sampa, map) {
-    if (!sampa) return '';
-    return [...sampa].map(c => map[c] || c).join('');
+// CODES PHONÉTIQUES : LEXIQUE383 -> CODE SIMPLIFIÉ / CODE AUDITIF
+// Générés depuis data/phonetic_dys.csv par build_phon_codes.py (seule source de la table)
+function chargerCodesPhon() {
+    if (!fs.existsSync(INPUT_CODES)) {
+        throw new Error(`${INPUT_CODES} introuvable : lancer d'abord python build_phon_codes.py`);
+    }
+    const codes = new Map();
+    const lignes = fs.readFileSync(INPUT_CODES, 'utf8').split('\n');
+    for (let i = 1; i < lignes.length; i++) {
+        if (!lignes[i]) continue;
+        const [sampa, phon, phonDys] = lignes[i].split('\t');
+        codes.set(sampa, { phon, phon_dys: phonDys });
+    }
+    return codes;
 }
 
 async function processLexique() {
     console.time("Traitement");
+    const codesPhon = chargerCodesPhon();
     console.log("1. Chargement de Manulex...");
 
     // Chargement du JSON Manulex
@@ -112,11 +102,16 @@ async function processLexique() {
                 // Filtre : Exclure les mots avec trait d'union ET fréquence CP-CM2 < 1
                 if (row['ortho'].includes('-') && match.freq_u.cp_cm2 < 1) continue;
 
+                const codes = row['phon'] ? codesPhon.get(row['phon']) : { phon: '', phon_dys: '' };
+                if (!codes) {
+                    throw new Error(`Prononciation "${row['phon']}" absente de ${INPUT_CODES} : relancer python build_phon_codes.py`);
+                }
+
                 // Si on trouve le couple (Orthographe + Catégorie), on garde l'entrée
                 results.push({
                     ortho: row['ortho'],
-                    phon: convertPhon(row['phon'], mapPhonSimple),
-                    phon_dys: convertPhon(row['phon'], mapPhonAuditif),
+                    phon: codes.phon,
+                    phon_dys: codes.phon_dys,
                     lemme: row['lemme'],
                     cgram: row['cgram'], // On garde la nomenclature Lexique
                     genre: row['genre'],
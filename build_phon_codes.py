@@ -0,0 +1,176 @@
+#!/usr/bin/env python3
+"""
+Codes phonétiques (phon simplifié, phon_dys auditif) générés depuis
+data/phonetic_dys.csv, seule source de la table de correspondance
+Lexique383 → code simplifié → code auditif.
+
+La table est compilée en deux tables de traduction (str.maketrans) et la
+colonne phon de Lexique383 (lue en flux) est convertie en bloc : les
+prononciations distinctes sont jointes et traduites en un seul appel.
+
+Sorties :
+    data/phon_codes.tsv : phon Lexique383 → phon, phon_dys (lu par build_lexique.js)
+    --dictionnaire      : recode aussi les entrées de data/dictionnaire_dys.json
+                          et reconstruit index_phon, index_phon_dys et
+                          idx_dys_prefix, sans relancer le croisement Manulex
+
+Usage: python build_phon_codes.py [--dictionnaire]
+"""
+
+import csv
+import json
+import sys
+import time
+
+# Fichiers
+FICHIER_TABLE = 'data/phonetic_dys.csv'
+FICHIER_LEXIQUE = 'data/Lexique383.tsv'
+FICHIER_SORTIE = 'data/phon_codes.tsv'
+FICHIER_DICTIONNAIRE = 'data/dictionnaire_dys.json'
+
+# Colonnes de phonetic_dys.csv
+COL_LEXIQUE = 'Code lexique383'
+COL_SIMPLIFIE = 'Code simplifie'
+COL_AUDITIF = 'Code auditif'
+
+# Champs de Lexique383 repris tels quels dans le dictionnaire (clé de jointure)
+CHAMPS_CLE = ('ortho', 'lemme', 'cgram', 'genre', 'nombre', 'infover')
+
+
+def compiler_table(chemin):
+    """phonetic_dys.csv → (table simplifiée, table auditive) pour str.translate"""
+    simplifie = {}
+    auditif = {}
+    with open(chemin, 'r', encoding='utf-8-sig', newline='') as f:
+        for num, ligne in enumerate(csv.DictReader(f, delimiter=';'), start=2):
+            code = (ligne[COL_LEXIQUE] or '').strip()
+            if not code:
+                continue
+            if len(code) != 1:
+                raise ValueError(f"{chemin}:{num} : code Lexique383 sur plusieurs caractères ({code!r})")
+            if code in simplifie:
+                raise ValueError(f"{chemin}:{num} : code Lexique383 en double ({code!r})")
+            simplifie[code] = ligne[COL_SIMPLIFIE].strip()
+            auditif[code] = ligne[COL_AUDITIF].strip()
+    return str.maketrans(simplifie), str.maketrans(auditif), set(simplifie)
+
+
+def lire_lexique(chemin, avec_cles):
+    """
+    Lecture en flux de Lexique383 : prononciations distinctes (ordre
+    d'apparition) et, si demandé, prononciations par clé d'entrée
+    """
+    distinctes = {}
+    par_cle = {}
+    with open(chemin, 'r', encoding='utf-8') as f:
+        entete = f.readline().rstrip('\r\n').split('\t')
+        i_phon = entete.index('phon')
+        i_cles = [entete.index(c) for c in CHAMPS_CLE]
+        for ligne in f:
+            colonnes = ligne.rstrip('\r\n').split('\t')
+            if len(colonnes) <= i_phon:
+                continue
+            phon = colonnes[i_phon]
+            distinctes[phon] = None
+            if avec_cles:
+                cle = tuple(colonnes[i] if i < len(colonnes) else '' for i in i_cles)
+                par_cle.setdefault(cle, []).append(phon)
+    return list(distinctes), par_cle
+
+
+def convertir(phons, table):
+    """Conversion en bloc : une seule traduction pour toute la colonne"""
+    convertis = '\n'.join(phons).translate(table).split('\n')
+    if len(convertis) != len(phons):
+        raise ValueError("La table de traduction ne doit pas produire de retour à la ligne")
+    return convertis
+
+
+def recoder_dictionnaire(chemin, par_cle, codes):
+    """Recode phon/phon_dys des entrées et reconstruit les index phonétiques"""
+    print(f"📂 Lecture de {chemin}...")
+    with open(chemin, 'r', encoding='utf-8') as f:
+        data = json.load(f)
+
+    index_phon = {}
+    index_phon_dys = {}
+    idx_dys_prefix = {}
+    consommees = {}
+    nb_recodees = 0
+    nb_inconnues = 0
+    for entry in data['entries']:
+        cle = tuple(entry.get(c) or '' for c in CHAMPS_CLE)
+        candidates = par_cle.get(cle)
+        if candidates:
+            # Homographes de même clé : même ordre que dans Lexique383
+            rang = consommees.get(cle, 0)
+            consommees[cle] = rang + 1
+            phon, phon_dys = codes[candidates[min(rang, len(candidates) - 1)]]
+            entry['phon'] = phon
+            entry['phon_dys'] = phon_dys
+            nb_recodees += 1
+        else:
+            nb_inconnues += 1
+
+        eid = entry['id']
+        if entry.get('phon'):
+            index_phon.setdefault(entry['phon'], []).append(eid)
+        if entry.get('phon_dys'):
+            index_phon_dys.setdefault(entry['phon_dys'], []).append(eid)
+            if len(entry['phon_dys']) >= 2:
+                idx_dys_prefix.setdefault(entry['phon_dys'][:2], []).append(eid)
+
+    data['index_phon'] = index_phon
+    data['index_phon_dys'] = index_phon_dys
+    data['idx_dys_prefix'] = idx_dys_prefix
+    stats = data['meta'].get('index_stats')
+    if stats is not None:
+        stats['phon'] = len(index_phon)
+        stats['phon_dys'] = len(index_phon_dys)
+        stats['dys_prefix'] = len(idx_dys_prefix)
+
+    with open(chemin, 'w', encoding='utf-8') as f:
+        json.dump(data, f, ensure_ascii=False, indent=2)
+    return nb_recodees, nb_inconnues, len(index_phon_dys), len(idx_dys_prefix)
+
+
+def main(avec_dictionnaire):
+    debut = time.time()
+    print(f"📂 Compilation de {FICHIER_TABLE}...")
+    table_simple, table_auditive, connus = compiler_table(FICHIER_TABLE)
+    print(f"   {len(connus)} codes Lexique383")
+
+    print(f"📂 Lecture de {FICHIER_LEXIQUE}...")
+    phons, par_cle = lire_lexique(FICHIER_LEXIQUE, avec_dictionnaire)
+    print(f"   {len(phons)} prononciations distinctes")
+
+    inconnus = set(''.join(phons)) - connus
+    if inconnus:
+        print(f"⚠️ Caractères absents de la table (gardés tels quels) : {' '.join(sorted(inconnus))}")
+
+    simples = convertir(phons, table_simple)
+    auditifs = convertir(phons, table_auditive)
+    codes = {p: (s, a) for p, s, a in zip(phons, simples, auditifs)}
+
+    with open(FICHIER_SORTIE, 'w', encoding='utf-8', newline='\n') as f:
+        f.write('phon_lexique383\tphon\tphon_dys\n')
+        for phon in sorted(codes):
+            f.write(f"{phon}\t{codes[phon][0]}\t{codes[phon][1]}\n")
+
+    print("-" * 30)
+    print("✅ Terminé !")
+    print(f"📁 Fichier généré : {FICHIER_SORTIE} (lu par build_lexique.js)")
+
+    if avec_dictionnaire:
+        recodees, inconnues, nb_dys, nb_prefixes = recoder_dictionnaire(FICHIER_DICTIONNAIRE, par_cle, codes)
+        print(f"🔁 {recodees} entrées recodées ({inconnues} absentes de Lexique383, inchangées)")
+        print(f"📇 Index phon_dys : {nb_dys} clés, dys_prefix : {nb_prefixes} préfixes")
+        print(f"📁 Fichier mis à jour : {FICHIER_DICTIONNAIRE}")
+        print("   À relancer ensuite : optimize_dict.js, build_topk.py, build_bundle_client.js")
+
+    print(f"Durée : {time.time() - debut:.1f}s")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main('--dictionnaire' in sys.argv[1:]))
@@ -0,0 +1,67 @@
+/**
+ * POIDS DE L'EDGE FUNCTION
+ * Génère supabase_export/functions/predict/poids.ts depuis rules/poids.json,
+ * compilé par RuleRepository (valeurs par défaut pour les clés absentes,
+ * bonus de contexte par règle) : le moteur de l'edge function et le bundle
+ * client scorent avec les mêmes poids que predicteur.js.
+ *
+ * À relancer après chaque modification de rules/poids.json (ou de
+ * rules/context.json). Le fichier généré fait partie de RULES_VERSION : une
+ * table top-k construite avec d'autres poids est ignorée (build_topk.py --edge).
+ *
+ * Usage: node build_poids_edge.js [--verifier]
+ *   --verifier : n'écrit rien, code de sortie 1 si poids.ts n'est pas à jour
+ */
+
+const fs = require('fs');
+const path = require('path');
+const RuleRepository = require('./rules/RuleRepository');
+
+const FICHIER_SORTIE = path.join(__dirname, 'supabase_export/functions/predict/poids.ts');
+
+/**
+ * Source TypeScript de l'objet POIDS (clés dans l'ordre de la compilation)
+ */
+function generer(poids) {
+  const lignes = [
+    '// Généré par build_poids_edge.js depuis rules/poids.json : ne pas modifier à la main',
+    '// Poids du scoring de predict() ; contexte : bonus des règles de CONTEXT (rules.ts), par nom',
+    'export const POIDS = {'
+  ];
+  for (const [cle, valeur] of Object.entries(poids)) {
+    if (cle === 'contexte') continue;
+    lignes.push(`  ${cle}: ${valeur},`);
+  }
+  lignes.push('  contexte: {');
+  for (const [regle, boost] of Object.entries(poids.contexte)) {
+    lignes.push(`    ${regle}: ${boost},`);
+  }
+  lignes.push('  },', '};', '');
+  return lignes.join('\n');
+}
+
+function main() {
+  const verifier = process.argv.includes('--verifier');
+  const source = generer(new RuleRepository(path.join(__dirname, 'rules')).compiled.POIDS);
+  const actuel = fs.existsSync(FICHIER_SORTIE) ? fs.readFileSync(FICHIER_SORTIE, 'utf8') : null;
+
+  if (verifier) {
+    if (actuel !== source) {
+      console.log(`❌ ${path.relative(__dirname, FICHIER_SORTIE)} n'est pas à jour : node build_poids_edge.js`);
+      return 1;
+    }
+    console.log(`✅ ${path.relative(__dirname, FICHIER_SORTIE)} à jour`);
+    return 0;
+  }
+
+  if (actuel === source) {
+    console.log(`✅ ${path.relative(__dirname, FICHIER_SORTIE)} déjà à jour`);
+    return 0;
+  }
+  fs.writeFileSync(FICHIER_SORTIE, source);
+  console.log(`📁 Fichier généré : ${path.relative(__dirname, FICHIER_SORTIE)}`);
+  console.log("🔎 RULES_VERSION change : reconstruire topk.bin (python build_topk.py --edge)");
+  return 0;
+}
+
+process.exit(main());
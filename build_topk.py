@@ -0,0 +1,244 @@
+#!/usr/bin/env python3
+"""
+Précalcule les k meilleures suggestions des préfixes courts (1 à 3 lettres),
+là où predict() est le plus coûteux (gros buckets, toutes les segmentations,
+expansion phonétique) et où passe l'essentiel du trafic.
+
+Préfixes énumérés :
+    - préfixes de l'orthographe des entrées ("bat" pour "bateau")
+    - préfixes de la prononciation (champ phon) écrite en lettres : l'enfant
+      écrit souvent comme il entend ("bato")
+    - entrées courtes du journal de requêtes data/requetes.txt (optionnel)
+
+Pour chaque (niveau, classe de contexte, préfixe), le scoring est celui de
+predict() : des workers Node (topk_worker.js, un par cœur) calculent les
+résultats, ce script ne fait qu'orchestrer et écrire la table. Une classe
+de contexte regroupe les mots précédents qui donnent les mêmes résultats
+(même règle de contexte, mêmes liaisons déclenchées).
+
+Les blocs de résultats identiques (fréquents : la plupart des classes ne
+changent rien pour un préfixe donné) ne sont stockés qu'une fois.
+
+Format (little-endian) :
+    en-tête  : b'DYST', version u32, nb_cles u32, nb_resultats u32, k u32,
+               total_entries u32, taille_meta u32, taille_cles u32
+    meta     : JSON utf-8 (niveaux, classes, segmentations, versionRegles...)
+               complété à 4 octets
+    cles     : "niveau\\tclasse\\tpréfixe" séparés par \\n (indices dans meta)
+               complété à 4 octets
+    debuts   : uint32[nb_cles]         (position du bloc de résultats de la clé)
+    longueurs: uint8[nb_cles]          complété à 4 octets
+    ids      : uint32[nb_resultats]
+    scores   : float32[nb_resultats]
+    drapeaux : uint8[nb_resultats]   (voir topk.js)
+
+Usage :
+    python build_topk.py           # table de predicteur.js (data/topk.bin)
+    python build_topk.py --edge    # table de l'edge function (worker Deno)
+"""
+
+import json
+import os
+import re
+import struct
+import subprocess
+import sys
+import time
+from array import array
+from multiprocessing import Pool
+
+RACINE = os.path.dirname(os.path.abspath(__file__))
+
+# Cibles : prédicteur Node ou edge function Supabase (scoring différent)
+CIBLES = {
+    'node': {
+        'dictionnaire': 'data/dictionnaire_dys.json',
+        'sortie': 'data/topk.bin',
+        'worker': ['node', os.path.join(RACINE, 'topk_worker.js')],
+        'niveaux': ['cp_cm2', 'cp', 'ce1', 'ce2_cm2'],
+    },
+    'edge': {
+        'dictionnaire': 'supabase_export/functions/predict/data/dictionnaire_dys_optimized.json',
+        'sortie': 'supabase_export/functions/predict/data/topk.bin',
+        'worker': ['deno', 'run', '--allow-read', os.path.join(RACINE, 'supabase_export/tools/topk_worker.ts')],
+        'niveaux': ['cp_cm2'],  # Le dictionnaire optimisé ne garde qu'une fréquence
+    },
+}
+FICHIER_REQUETES = 'data/requetes.txt'
+
+K = 10                     # Résultats gardés par préfixe (= limit par défaut)
+LONGUEUR_MAX = 3           # Préfixes de 1 à 3 lettres
+TAILLE_LOT = 200           # Préfixes par requête au worker
+
+VERSION = 1
+RE_LETTRES = re.compile(r"^[a-zàâäçéèêëîïôöùûüÿœæ]+$")
+
+# Worker Node du processus courant (un par processus du pool)
+_worker = None
+
+
+def demarrer_worker(commande):
+    global _worker
+    _worker = subprocess.Popen(
+        commande, stdin=subprocess.PIPE, stdout=subprocess.PIPE,
+        stderr=subprocess.DEVNULL, text=True, encoding='utf-8', bufsize=1)
+
+
+def interroger(requete):
+    _worker.stdin.write(json.dumps(requete, ensure_ascii=False) + '\n')
+    _worker.stdin.flush()
+    return json.loads(_worker.stdout.readline())
+
+
+def calculer_lot(tache):
+    """(niveau, prevWord, prefixes) → résultats du worker, dans l'ordre des préfixes"""
+    niveau, prev_word, prefixes = tache
+    reponse = interroger({'cmd': 'topk', 'niveau': niveau, 'prevWord': prev_word,
+                          'prefixes': prefixes, 'k': K})
+    return reponse['resultats']
+
+
+def enumerer_prefixes(fichier_dictionnaire):
+    print(f"📂 Lecture de {fichier_dictionnaire}...")
+    with open(fichier_dictionnaire, 'r', encoding='utf-8') as f:
+        data = json.load(f)
+
+    prefixes = set()
+    for entry in data['entries']:
+        for mot in (entry.get('ortho', ''), entry.get('phon', '')):
+            mot = (mot or '').lower()
+            for n in range(1, min(LONGUEUR_MAX, len(mot)) + 1):
+                if RE_LETTRES.match(mot[:n]):
+                    prefixes.add(mot[:n])
+
+    if os.path.exists(FICHIER_REQUETES):
+        with open(FICHIER_REQUETES, 'r', encoding='utf-8') as f:
+            for ligne in f:
+                requete = ligne.strip().lower()
+                if 0 < len(requete) <= LONGUEUR_MAX:
+                    prefixes.add(requete)
+
+    return sorted(prefixes), data['meta']['total_entries']
+
+
+def ecrire(fichier_sortie, meta, cles, resultats_par_cle):
+    debuts = array('I')
+    longueurs = array('B')
+    ids = array('I')
+    scores = array('f')
+    drapeaux = array('B')
+
+    # Déduplication des blocs (scores comparés après arrondi float32)
+    blocs = {}
+    for resultats in resultats_par_cle:
+        bloc = array('f', [score for _, score, _ in resultats])
+        cle_bloc = (tuple(r[0] for r in resultats), bloc.tobytes(), tuple(r[2] for r in resultats))
+        debut = blocs.get(cle_bloc)
+        if debut is None:
+            debut = len(ids)
+            blocs[cle_bloc] = debut
+            for id_entree, _, drapeau in resultats:
+                ids.append(id_entree)
+                drapeaux.append(drapeau)
+            scores.extend(bloc)
+        debuts.append(debut)
+        longueurs.append(len(resultats))
+
+    if sys.byteorder != 'little':
+        for a in (debuts, ids, scores):
+            a.byteswap()
+
+    meta_octets = json.dumps(meta, ensure_ascii=False).encode('utf-8')
+    cles_octets = '\n'.join(cles).encode('utf-8')
+
+    def bourrage(n):
+        return b'\0' * (-n % 4)
+
+    with open(fichier_sortie, 'wb') as f:
+        f.write(b'DYST')
+        f.write(struct.pack('<7I', VERSION, len(cles), len(ids), K,
+                            meta['totalEntries'], len(meta_octets), len(cles_octets)))
+        f.write(meta_octets + bourrage(len(meta_octets)))
+        f.write(cles_octets + bourrage(len(cles_octets)))
+        f.write(debuts.tobytes())
+        f.write(longueurs.tobytes() + bourrage(len(longueurs)))
+        f.write(ids.tobytes())
+        f.write(scores.tobytes())
+        f.write(drapeaux.tobytes())
+
+    return {
+        'cles': len(cles) * 5 + len(cles_octets),
+        'blocs': len(blocs),
+        'resultats': len(ids) * 9,
+        'total': os.path.getsize(fichier_sortie),
+    }
+
+
+def construire_topk(cible='node'):
+    debut = time.time()
+    config = CIBLES[cible]
+    commande = config['worker'] + [config['dictionnaire']]
+    prefixes, total_entries = enumerer_prefixes(config['dictionnaire'])
+
+    # Informations sur les règles (classes de contexte, version)
+    demarrer_worker(commande)
+    info = interroger({'cmd': 'info'})
+    _worker.stdin.close()
+    _worker.wait()
+
+    if info['totalEntries'] != total_entries:
+        print("❌ Le worker n'a pas chargé le même dictionnaire")
+        return 1
+
+    niveaux = config['niveaux']
+    classes = info['classes']
+    print(f"🔤 {len(prefixes)} préfixes × {len(classes)} classes de contexte × {len(niveaux)} niveaux")
+
+    taches = []
+    cles = []
+    for n, niveau in enumerate(niveaux):
+        for c, classe in enumerate(classes):
+            for i in range(0, len(prefixes), TAILLE_LOT):
+                lot = prefixes[i:i + TAILLE_LOT]
+                taches.append((niveau, classe['prevWord'], lot))
+                cles.extend(f"{n}\t{c}\t{p}" for p in lot)
+
+    nb_workers = os.cpu_count() or 1
+    print(f"⚙️ Calcul sur {nb_workers} workers ({len(taches)} lots)...")
+    resultats_par_cle = []
+    with Pool(nb_workers, initializer=demarrer_worker, initargs=(commande,)) as pool:
+        for i, resultats in enumerate(pool.imap(calculer_lot, taches, chunksize=1)):
+            resultats_par_cle.extend(resultats)
+            if (i + 1) % 100 == 0:
+                print(f"   {i + 1}/{len(taches)} lots")
+
+    meta = {
+        'versionRegles': info['versionRegles'],
+        'totalEntries': total_entries,
+        'minPrefixLength': info['minPrefixLength'],
+        'longueurMax': LONGUEUR_MAX,
+        'niveaux': niveaux,
+        'classes': [{'cle': c['cle'], 'prevWord': c['prevWord']} for c in classes],
+        'segmentations': info['segmentations'],
+    }
+    tailles = ecrire(config['sortie'], meta, cles, resultats_par_cle)
+
+    nb_vides = sum(1 for r in resultats_par_cle if not r)
+    nb_resultats = sum(len(r) for r in resultats_par_cle)
+    print("-" * 30)
+    print("✅ Terminé !")
+    print(f"Clés : {len(cles)} ({nb_vides} sans résultat)")
+    print(f"Résultats : {nb_resultats} ({nb_resultats / max(len(cles), 1):.1f} par clé)")
+    print(f"Blocs distincts : {tailles['blocs']} ({len(cles) / max(tailles['blocs'], 1):.1f} clés par bloc)")
+    print("Taille :")
+    print(f"   clés      : {tailles['cles'] / 1024:.1f} Ko")
+    print(f"   résultats : {tailles['resultats'] / 1024:.1f} Ko (id u32 + score f32 + drapeaux u8, dédupliqués)")
+    print(f"   total     : {tailles['total'] / 1024:.1f} Ko")
+    print(f"Durée : {time.time() - debut:.1f}s")
+    print(f"📁 Fichier généré : {config['sortie']}")
+    print("🔎 Vérification : node bench/verifier_topk.js")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(construire_topk('edge' if '--edge' in sys.argv[1:] else 'node'))
@@ -0,0 +1,278 @@
+/**
+ * CORRECTION DE TEXTE COMPLET (POST /api/corriger)
+ * Un texte d'enfant collé par l'enseignant : chaque mot est corrigé en
+ * tenant compte de ses voisins, pas seulement du mot précédent tapé.
+ *
+ * 1. Candidats par mot : recherche de predict() (ortho, phonétique DYS,
+ *    floue, liaisons avec le mot précédent tel qu'il est écrit) plus les
+ *    homophones exacts (a/à, et/est, ver/vert/verre). Score "d'émission" :
+ *    scorerCandidats() sans contexte. Les K meilleurs sont gardés.
+ * 2. Décodage joint (Viterbi) : la transition entre deux mots voisins
+ *    reprend le bonus (ou la pénalité) des règles de contexte grammatical
+ *    et des bigrammes, appliqués au candidat retenu pour le mot précédent.
+ *
+ * Les candidats d'un mot ne dépendent que du mot et des liaisons qu'il
+ * peut recevoir : ils sont gardés d'un texte à l'autre (LRU), et un mot
+ * répété dans le texte n'est cherché qu'une fois.
+ */
+
+const { MemoRecherche } = require('./session_prediction');
+
+const K_CANDIDATS = 6;          // Candidats gardés par mot
+const ALTERNATIVES = 3;         // Autres candidats renvoyés par mot
+const TAILLE_CACHE = 5000;      // Mots gardés entre deux textes
+const TAILLE_MEMO = 1024;       // Préfixes mémorisés pendant un texte
+const SCORE_MOT_INCONNU = 20;   // Score minimal d'une correction d'un mot absent du dictionnaire (sinon gardé tel quel)
+
+// Mots (lettres, traits d'union internes) et élisions ("l'", "j'", "qu'")
+const RE_MOT = /[a-zàâäçéèêëîïôöùûüÿœæ]+(?:-[a-zàâäçéèêëîïôöùûüÿœæ]+)*'?/gi;
+
+class CorrecteurPhrase {
+  /**
+   * @param {PredicteurDys} predicteur
+   * @param {object} options - { level, metriques }
+   */
+  constructor(predicteur, options = {}) {
+    this.predicteur = predicteur;
+    this.level = options.level || 'cp_cm2';
+    this.metriques = options.metriques || null;
+    this.cache = new Map(); // "liaisons\tmot" → candidats triés par score d'émission
+  }
+
+  /**
+   * Règles de liaison déclenchées par le mot précédent (tel qu'écrit)
+   */
+  liaisons(prevWord) {
+    const prevLower = prevWord.toLowerCase();
+    const noms = [];
+    for (const rule of this.predicteur.rules.SEGMENTATION || []) {
+      if (rule.triggers && rule.triggers.has(prevLower)) noms.push(rule.name);
+    }
+    return noms.join(',');
+  }
+
+  /**
+   * Candidats d'un mot, du meilleur au moins bon score d'émission
+   * @param {string} mot - Mot en minuscules
+   * @param {string} prevWord - Mot précédent tel qu'écrit (liaisons)
+   * @param {MemoRecherche} memo - Recherches partagées pendant le texte
+   */
+  candidats(mot, prevWord, memo) {
+    const cle = `${this.liaisons(prevWord)}\t${mot}`;
+    const enCache = this.cache.get(cle);
+    if (enCache) {
+      if (this.metriques) this.metriques.incrementer('dys_cache_hits_total', { cache: 'correction' });
+      // Rafraîchir la position LRU
+      this.cache.delete(cle);
+      this.cache.set(cle, enCache);
+      return enCache;
+    }
+    if (this.metriques) this.metriques.incrementer('dys_cache_misses_total', { cache: 'correction' });
+
+    const p = this.predicteur;
+    const connu = p.getIdOrtho(mot) >= 0;
+    const capture = {};
+    p.predict(mot, {
+      level: this.level,
+      limit: K_CANDIDATS,
+      prevWord,
+      useTopK: false,
+      useFuzzy: !connu, // Un mot du dictionnaire n'est corrigé que par ses homophones
+      memo,
+      capture
+    });
+
+    // Textes cherchés : le mot, et ses segmentations si ce n'est pas un mot
+    // du dictionnaire ("les zanimo" → "animo" ; "dans" reste "dans")
+    const textes = new Map();
+    for (const seg of p.generateSegmentations(mot, prevWord)) {
+      if (seg.isSegmentation && connu) continue;
+      const texte = seg.text;
+      textes.set(seg.rule || '', { texte, code: p.transcode(texte) });
+    }
+
+    // Le mot est terminé : seuls les candidats qui l'écrivent en entier sont
+    // gardés (même orthographe ou variante, même code DYS, recherche floue),
+    // pas les complétions du préfixe ni celles du fallback
+    const groupes = new Map();
+    const ajouter = (regle, item) => {
+      if (!groupes.has(regle)) groupes.set(regle, new Map());
+      const groupe = groupes.get(regle);
+      if (!groupe.has(item.id)) groupe.set(item.id, item);
+    };
+    for (const item of capture.candidats || []) {
+      const regle = item.segmentation || '';
+      const t = textes.get(regle);
+      if (!t || item.fallback) continue;
+      const ortho = item.ortho.toLowerCase();
+      if (item.matchType === 'fuzzy' || ortho === t.texte || ortho === item.orthoVariant || item.phon_dys === t.code) {
+        ajouter(regle, item);
+      }
+    }
+    // Homophones exacts, même hors des préfixes cherchés (a/à, et/est)
+    const { code } = textes.get('');
+    for (const id of [...(p.indexOrtho[mot] || []), ...(p.indexPhonDys[code] || [])]) {
+      ajouter('', Object.assign({}, p.entries[id], { matchType: 'phon_dys' }));
+    }
+
+    const scores = [];
+    for (const [regle, groupe] of groupes) {
+      const t = textes.get(regle);
+      const items = Array.from(groupe.values());
+      const scoresGroupe = p.scorerCandidats(items, {
+        level: this.level, effectiveInput: t.texte, userDysCode: t.code,
+        contextRule: null, successeurs: null, lexiquePersonnel: null
+      });
+      // Un mot inconnu n'est remplacé que par un candidat plausible
+      scores.push(...(connu ? scoresGroupe : scoresGroupe.filter(r => r.score >= SCORE_MOT_INCONNU)));
+    }
+    scores.sort((a, b) => b.score - a.score);
+    const vus = new Set();
+    const resultat = scores.filter(r => !vus.has(r.id) && vus.add(r.id)).slice(0, K_CANDIDATS);
+
+    this.cache.set(cle, resultat);
+    if (this.cache.size > TAILLE_CACHE) this.cache.delete(this.cache.keys().next().value);
+    return resultat;
+  }
+
+  /**
+   * Découpe le texte en mots (positions conservées pour la reconstruction)
+   */
+  decouper(texte) {
+    const mots = [];
+    for (const m of texte.matchAll(RE_MOT)) {
+      mots.push({ saisie: m[0], debut: m.index, fin: m.index + m[0].length });
+    }
+    return mots;
+  }
+
+  /**
+   * Corrige un texte complet
+   * @param {string} texte
+   * @returns {object} - { texte, corrige, mots: [{ debut, fin, saisie, mot, id, score, corrige, contextMatch, segmentation, alternatives }] }
+   */
+  corriger(texte) {
+    const p = this.predicteur;
+    const P = p.rules.POIDS;
+    const memo = new MemoRecherche(null, TAILLE_MEMO);
+    const mots = this.decouper(texte);
+
+    // Treillis : un état par candidat (ou le mot tel quel)
+    const treillis = mots.map((m, i) => {
+      const mot = m.saisie.toLowerCase();
+      const prevWord = i > 0 ? mots[i - 1].saisie : '';
+      // Élisions : gardées telles quelles (servent de contexte au mot suivant)
+      const etats = mot.endsWith("'") ? [] : this.candidats(mot, prevWord, memo);
+      return etats.length > 0 ? etats : [{ id: -1, ortho: mot, score: SCORE_MOT_INCONNU }];
+    });
+
+    // Transitions, calculées une fois par orthographe précédente
+    const contextes = new Map();
+    const contexteDe = (ortho) => {
+      let c = contextes.get(ortho);
+      if (!c) {
+        c = { regle: p.getContextFilter(ortho), successeurs: p.getSuccesseurs(ortho) };
+        contextes.set(ortho, c);
+      }
+      return c;
+    };
+    const transition = (precedent, etat) => {
+      if (etat.id < 0) return 0;
+      const { regle, successeurs } = contexteDe(precedent.ortho);
+      let score = 0;
+      if (regle) {
+        if (p.matchesContext(etat, regle)) score += P.contexte[regle.name] ?? regle.boost;
+        else if (p.shouldPenalize(etat, regle)) score -= regle.penalty;
+      }
+      if (successeurs) {
+        const s = successeurs.get(etat.ortho);
+        if (s) score += s * P.bigramme;
+      }
+      return score;
+    };
+
+    // Viterbi : meilleur score cumulé par état et état précédent retenu
+    const cumuls = [];
+    const retours = [];
+    for (let i = 0; i < treillis.length; i++) {
+      const etats = treillis[i];
+      const cumul = new Array(etats.length);
+      const retour = new Array(etats.length).fill(-1);
+      for (let j = 0; j < etats.length; j++) {
+        if (i === 0) {
+          cumul[j] = etats[j].score;
+          continue;
+        }
+        let meilleur = -Infinity;
+        const precedents = treillis[i - 1];
+        for (let k = 0; k < precedents.length; k++) {
+          const s = cumuls[i - 1][k] + transition(precedents[k], etats[j]);
+          if (s > meilleur) {
+            meilleur = s;
+            retour[j] = k;
+          }
+        }
+        cumul[j] = meilleur + etats[j].score;
+      }
+      cumuls.push(cumul);
+      retours.push(retour);
+    }
+
+    // Remontée du meilleur chemin
+    const chemin = new Array(treillis.length);
+    if (treillis.length > 0) {
+      const dernier = cumuls[cumuls.length - 1];
+      chemin[treillis.length - 1] = dernier.indexOf(Math.max(...dernier));
+      for (let i = treillis.length - 1; i > 0; i--) {
+        chemin[i - 1] = retours[i][chemin[i]];
+      }
+    }
+
+    const resultats = mots.map((m, i) => {
+      const etat = treillis[i][chemin[i]];
+      const precedent = i > 0 ? treillis[i - 1][chemin[i - 1]] : null;
+      const mot = respecterCasse(m.saisie, etat.ortho);
+      return {
+        debut: m.debut,
+        fin: m.fin,
+        saisie: m.saisie,
+        mot,
+        id: etat.id,
+        score: +etat.score.toFixed(1),
+        corrige: mot !== m.saisie,
+        contextMatch: precedent ? transition(precedent, etat) > 0 : false,
+        segmentation: etat.segmentation || null,
+        alternatives: treillis[i]
+          .filter((e, j) => j !== chemin[i] && e.id >= 0 && e.ortho !== etat.ortho)
+          .slice(0, ALTERNATIVES)
+          .map(e => respecterCasse(m.saisie, e.ortho))
+      };
+    });
+
+    // Texte reconstruit : séparateurs et ponctuation d'origine
+    let corrige = '';
+    let position = 0;
+    for (const r of resultats) {
+      corrige += texte.slice(position, r.debut) + r.mot;
+      position = r.fin;
+    }
+    corrige += texte.slice(position);
+
+    return { texte, corrige, mots: resultats };
+  }
+
+  vider() {
+    this.cache.clear();
+  }
+}
+
+/**
+ * Reporte la majuscule initiale (ou tout en majuscules) de la saisie
+ */
+function respecterCasse(saisie, mot) {
+  if (saisie.length > 1 && saisie === saisie.toUpperCase()) return mot.toUpperCase();
+  if (saisie[0] !== saisie[0].toLowerCase()) return mot.charAt(0).toUpperCase() + mot.slice(1);
+  return mot;
+}
+
+module.exports = { CorrecteurPhrase };
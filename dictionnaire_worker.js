@@ -0,0 +1,28 @@
+/**
+ * WORKER DE VÉRIFICATION DU DICTIONNAIRE
+ * Worker thread lancé par GestionnaireDictionnaire.recharger() : charge le
+ * nouveau fichier et le contrôle sans bloquer le thread qui sert les requêtes.
+ *
+ * workerData : { chemin, requetes: [[saisie, attendu, prev], ...] }
+ * Message renvoyé : { version, controle: { entrees, requetes, vides, trouves, erreurs }, morceaux }
+ * morceaux : contenu lu, découpé par morceler() et transféré sans copie
+ * (relu par tranches par le thread principal, sans relire le fichier)
+ * Un fichier illisible (JSON invalide) termine le worker en erreur.
+ */
+
+const { parentPort, workerData } = require('worker_threads');
+const PredicteurDys = require('./predicteur');
+const { controler, morceler } = require('./gestion_dictionnaire');
+
+const predicteur = new PredicteurDys(workerData.chemin);
+const { entries, indexOrtho, indexPhonDys, meta, idxOrthoPrefix, idxDysPrefix } = predicteur;
+// Avant le contrôle : le contenu tel que lu dans le fichier
+const { morceaux, transferts } = morceler({
+  meta, index_ortho: indexOrtho, index_phon_dys: indexPhonDys,
+  idx_ortho_prefix: idxOrthoPrefix, idx_dys_prefix: idxDysPrefix, entries
+});
+parentPort.postMessage({
+  version: predicteur.dictVersion,
+  controle: controler(predicteur, workerData.requetes),
+  morceaux
+}, transferts);
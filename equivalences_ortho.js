@@ -0,0 +1,147 @@
+/**
+ * AUTOMATE D'ÉQUIVALENCES ORTHOGRAPHIQUES
+ * Remplace la génération de toutes les variantes d'un préfixe ("bato" →
+ * "bateau", "batau"...) suivie d'un startsWith par candidat.
+ *
+ * Les motifs de ortho_equiv.json sont compilés dans un petit trie : un seul
+ * passage sur le préfixe trouve leurs occurrences. Chaque substitution est
+ * ensuite parcourue directement dans le trie orthographique du dictionnaire
+ * (transitions alternatives), sans construire de chaîne intermédiaire.
+ *
+ * Mêmes résultats que generateOrthoVariants + searchByOrthoPrefix :
+ * une seule substitution par variante, sur l'occurrence finale du motif
+ * ou sur sa première occurrence au milieu du préfixe.
+ */
+
+class AutomateEquivalences {
+  /**
+   * @param {object} orthoEquivalents - Règles compilées ORTHO_EQUIVALENTS
+   */
+  constructor(orthoEquivalents) {
+    this.motifs = [];           // [{ motif, equivalents }] dans l'ordre des règles
+    this.racine = new Map();    // trie des motifs : char → { enfants, motifs }
+
+    for (const [motif, equivalents] of Object.entries(orthoEquivalents)) {
+      const index = this.motifs.length;
+      this.motifs.push({ motif, equivalents });
+
+      let niveau = this.racine;
+      let noeud = null;
+      for (const char of motif) {
+        noeud = niveau.get(char);
+        if (!noeud) {
+          noeud = { enfants: new Map(), motifs: [] };
+          niveau.set(char, noeud);
+        }
+        niveau = noeud.enfants;
+      }
+      if (noeud) noeud.motifs.push(index);
+    }
+  }
+
+  /**
+   * Sites de substitution d'un préfixe, dans l'ordre de generateOrthoVariants
+   * @returns {Array<{pos: number, longueur: number, equivalents: string[]}>}
+   */
+  sites(prefixe) {
+    const len = prefixe.length;
+    const premiere = new Array(this.motifs.length).fill(-1);
+    const finale = new Array(this.motifs.length).fill(false);
+
+    // Un passage : occurrences de tous les motifs à chaque position
+    for (let i = 0; i < len; i++) {
+      let niveau = this.racine;
+      for (let j = i; j < len; j++) {
+        const noeud = niveau.get(prefixe[j]);
+        if (!noeud) break;
+        for (const m of noeud.motifs) {
+          if (premiere[m] === -1) premiere[m] = i;
+          if (j === len - 1) finale[m] = true;
+        }
+        niveau = noeud.enfants;
+      }
+    }
+
+    const sites = [];
+    for (let m = 0; m < this.motifs.length; m++) {
+      const { motif, equivalents } = this.motifs[m];
+      const longueur = motif.length;
+      if (finale[m]) {
+        sites.push({ pos: len - longueur, longueur, equivalents });
+      }
+      const idx = premiere[m];
+      if (idx !== -1 && idx < len - longueur) {
+        sites.push({ pos: idx, longueur, equivalents });
+      }
+    }
+    return sites;
+  }
+
+  /**
+   * Préfixes couverts par rechercher() : le préfixe lui-même puis une
+   * substitution par site (variantes distinctes d'au moins 2 caractères),
+   * pour les petits index sans trie (lexiques de classe)
+   * @returns {string[]}
+   */
+  variantes(prefixe) {
+    const variantes = prefixe.length >= 2 ? [prefixe] : [];
+    for (const { pos, longueur, equivalents } of this.sites(prefixe)) {
+      for (const equiv of equivalents) {
+        const variante = prefixe.slice(0, pos) + equiv + prefixe.slice(pos + longueur);
+        if (variante.length >= 2 && !variantes.includes(variante)) variantes.push(variante);
+      }
+    }
+    return variantes;
+  }
+
+  /**
+   * Recherche dans le trie orthographique avec toutes les équivalences
+   * @param {Trie} trie - Trie des orthographes (minuscules)
+   * @param {string} prefixe - Préfixe en minuscules
+   * @param {function(number, string|null)} visiteur - Appelé une fois par ID,
+   *        avec la variante utilisée (null si le préfixe lui-même)
+   */
+  rechercher(trie, prefixe, visiteur) {
+    const vus = new Set();
+    const collecter = (noeud, variante) => {
+      trie.collecter(noeud, id => {
+        if (vus.has(id)) return;
+        vus.add(id);
+        visiteur(id, variante);
+      });
+    };
+
+    // Nœuds le long du préfixe exact (chemin partagé par toutes les variantes)
+    const chemin = [trie.racine];
+    for (let i = 0; i < prefixe.length; i++) {
+      const suivant = chemin[i].enfant(prefixe[i]);
+      if (!suivant) break;
+      chemin.push(suivant);
+    }
+
+    // 1. Le préfixe tel quel
+    if (prefixe.length >= 2 && chemin.length === prefixe.length + 1) {
+      collecter(chemin[prefixe.length], null);
+    }
+
+    // 2. Une substitution par site : avant + équivalent + après
+    for (const { pos, longueur, equivalents } of this.sites(prefixe)) {
+      if (chemin.length <= pos) continue; // Début du préfixe absent du trie
+      const fin = pos + longueur;
+      for (const equiv of equivalents) {
+        if (pos + equiv.length + prefixe.length - fin < 2) continue;
+
+        let noeud = trie.noeud(equiv, chemin[pos]);
+        for (let i = fin; noeud && i < prefixe.length; i++) {
+          noeud = noeud.enfant(prefixe[i]);
+        }
+        if (!noeud) continue;
+
+        const variante = prefixe.slice(0, pos) + equiv + prefixe.slice(fin);
+        collecter(noeud, variante !== prefixe ? variante : null);
+      }
+    }
+  }
+}
+
+module.exports = AutomateEquivalences;
@@ -0,0 +1,361 @@
+/**
+ * VERSIONS DU DICTIONNAIRE (rechargement à chaud de server.js)
+ * Un dictionnaire reconstruit est servi sans redémarrer le serveur :
+ *
+ * 1. Vérification dans un worker thread (dictionnaire_worker.js) : le
+ *    nouveau fichier est chargé et contrôlé (structure, requêtes de test)
+ *    pendant que la version courante continue de répondre. Le worker renvoie
+ *    le contenu vérifié, découpé en morceaux JSON.
+ * 2. Chargement dans le thread principal (les index ne se partagent pas
+ *    entre threads) : morceaux relus et tries de la recherche floue
+ *    construits par tranches de TRANCHE_MS, en rendant la main aux requêtes
+ *    entre deux. Puis préchauffage et bascule : une seule affectation, les
+ *    requêtes suivantes voient la nouvelle version.
+ * 3. L'ancienne version reste utilisable par les requêtes et sessions qui
+ *    l'ont acquise ; elle est libérée quand la dernière la rend.
+ *
+ * Requêtes de test : requetes_etiquetees.tsv à côté du dictionnaire (même
+ * format que tuner_poids.py). Un dictionnaire est refusé si une requête
+ * échoue, si trop de requêtes n'ont aucun résultat, ou s'il trouve moins
+ * de mots attendus que la version courante.
+ */
+
+const fs = require('fs');
+const path = require('path');
+const { performance } = require('perf_hooks');
+const { Worker } = require('worker_threads');
+const PredicteurDys = require('./predicteur');
+const RechercheFloue = require('./recherche_floue');
+const { Trie } = require('./trie');
+
+const MOTS_PRECHAUFFAGE = ['cahmp', 'pobelle', 'bateua']; // Tries de la recherche floue + JIT
+const LIMITE_CONTROLE = 10;        // Mot attendu cherché dans le top-10
+const BUDGET_FLOU_MS = 1000;       // Contrôle déterministe (recherche floue jamais interrompue)
+const MAX_VIDES = 0.1;             // Part admise de requêtes de test sans résultat
+const TOLERANCE_TROUVES = 0.05;    // Baisse admise de la part de mots attendus trouvés
+const INTERVALLE_SURVEILLANCE_MS = 2000;
+const TAILLE_MORCEAU = 1000;       // Éléments (entrées, clés d'index) par morceau JSON
+const TRANCHE_MS = 10;             // Travail du thread principal entre deux requêtes
+
+/**
+ * Contenu du dictionnaire en morceaux JSON (UTF-8), pour le relire par
+ * tranches : { cle: { valeur } } ou, pour les grands tableaux et index,
+ * { cle: { tableau, morceaux: [...] } }. Les octets sont transférés au
+ * thread principal sans copie (transferts : leurs ArrayBuffer)
+ * @returns {{morceaux: object, transferts: ArrayBuffer[]}}
+ */
+function morceler(data) {
+  const encodeur = new TextEncoder();
+  const transferts = [];
+  const encoder = valeur => {
+    const octets = encodeur.encode(JSON.stringify(valeur));
+    transferts.push(octets.buffer);
+    return octets;
+  };
+  const morceaux = {};
+  for (const [cle, valeur] of Object.entries(data)) {
+    const tableau = Array.isArray(valeur);
+    const elements = tableau ? valeur : (valeur && typeof valeur === 'object' ? Object.entries(valeur) : null);
+    if (!elements || elements.length <= TAILLE_MORCEAU) {
+      morceaux[cle] = { valeur: encoder(valeur) };
+      continue;
+    }
+    const parties = [];
+    for (let i = 0; i < elements.length; i += TAILLE_MORCEAU) {
+      parties.push(encoder(elements.slice(i, i + TAILLE_MORCEAU)));
+    }
+    morceaux[cle] = { tableau, morceaux: parties };
+  }
+  return { morceaux, transferts };
+}
+
+// Rend la main à la boucle d'événements (requêtes en attente)
+function ceder() {
+  return new Promise(resolve => setImmediate(resolve));
+}
+
+/**
+ * Appelle traiter sur chaque élément, en cédant toutes les TRANCHE_MS
+ */
+async function parTranches(elements, traiter) {
+  let debut = performance.now();
+  for (let i = 0; i < elements.length; i++) {
+    traiter(elements[i]);
+    if ((i & 255) === 255 && performance.now() - debut > TRANCHE_MS) {
+      await ceder();
+      debut = performance.now();
+    }
+  }
+}
+
+/**
+ * Inverse de morceler(), un morceau par tranche
+ */
+async function assembler(morceaux) {
+  const decodeur = new TextDecoder();
+  const lire = octets => JSON.parse(decodeur.decode(octets));
+  const data = {};
+  for (const [cle, { valeur, tableau, morceaux: parties }] of Object.entries(morceaux)) {
+    if (!parties) {
+      data[cle] = lire(valeur);
+      continue;
+    }
+    const cible = tableau ? [] : {};
+    for (const partie of parties) {
+      const elements = lire(partie);
+      if (tableau) {
+        for (const e of elements) cible.push(e);
+      } else {
+        for (const [k, v] of elements) cible[k] = v;
+      }
+      await ceder();
+    }
+    data[cle] = cible;
+  }
+  return data;
+}
+
+/**
+ * Tries de la recherche floue construits par tranches (sinon au premier
+ * appel, d'un bloc)
+ */
+async function construireTries(predicteur) {
+  const trieOrtho = new Trie();
+  const triePhon = new Trie();
+  await parTranches(predicteur.entries, e => {
+    if (e.ortho) trieOrtho.inserer(e.ortho.toLowerCase(), e.id);
+    if (e.phon_dys) triePhon.inserer(e.phon_dys, e.id);
+  });
+  predicteur.trieOrtho = trieOrtho;
+  predicteur.rechercheFloue = new RechercheFloue(predicteur.entries, predicteur.rules, trieOrtho, triePhon);
+}
+
+/**
+ * Requêtes de test : saisie<TAB>mot attendu<TAB>mot précédent (optionnel)
+ * @returns {Array<Array<string>>} - [] si le fichier est absent
+ */
+function lireRequetesTest(chemin) {
+  if (!fs.existsSync(chemin)) return [];
+  const requetes = [];
+  for (const ligne of fs.readFileSync(chemin, 'utf8').split(/\r?\n/)) {
+    if (!ligne.trim() || ligne.startsWith('#')) continue;
+    const [saisie, attendu, prev = ''] = ligne.split('\t');
+    if (saisie && attendu) requetes.push([saisie, attendu, prev]);
+  }
+  return requetes;
+}
+
+/**
+ * Contrôle d'un prédicteur : structure du dictionnaire puis requêtes de test
+ * @returns {object} - { entrees, requetes, vides, trouves, erreurs }
+ */
+function controler(predicteur, requetes) {
+  const { entries, meta } = predicteur;
+  const controle = { entrees: entries ? entries.length : 0, requetes: requetes.length, vides: 0, trouves: 0, erreurs: [] };
+  if (!Array.isArray(entries) || entries.length === 0) {
+    controle.erreurs.push('Dictionnaire sans entrées');
+    return controle;
+  }
+  if (!meta || meta.total_entries !== entries.length) {
+    controle.erreurs.push(`meta.total_entries (${meta && meta.total_entries}) ≠ ${entries.length} entrées`);
+  }
+  const invalide = entries.findIndex((e, i) => !e || e.id !== i || typeof e.ortho !== 'string');
+  if (invalide >= 0) controle.erreurs.push(`Entrée ${invalide} invalide (id ou ortho)`);
+  if (controle.erreurs.length > 0) return controle;
+
+  for (const [saisie, attendu, prevWord] of requetes) {
+    try {
+      const resultats = predicteur.predict(saisie, { limit: LIMITE_CONTROLE, prevWord, fuzzyBudgetMs: BUDGET_FLOU_MS });
+      if (resultats.length === 0) controle.vides++;
+      if (resultats.some(r => r.ortho.toLowerCase() === attendu.toLowerCase())) controle.trouves++;
+    } catch (err) {
+      controle.erreurs.push(`"${saisie}" : ${err.message}`);
+    }
+  }
+  return controle;
+}
+
+/**
+ * Raisons de refuser un dictionnaire contrôlé, comparé à la version courante
+ * @returns {Array<string>} - vide si le dictionnaire est accepté
+ */
+function raisonsRefus(controle, reference) {
+  const raisons = [...controle.erreurs];
+  if (controle.requetes > 0) {
+    if (controle.vides > controle.requetes * MAX_VIDES) {
+      raisons.push(`${controle.vides}/${controle.requetes} requêtes de test sans résultat`);
+    }
+    if (reference && reference.requetes > 0) {
+      const part = controle.trouves / controle.requetes;
+      const partReference = reference.trouves / reference.requetes;
+      if (part < partReference - TOLERANCE_TROUVES) {
+        raisons.push(`Mots attendus trouvés : ${(part * 100).toFixed(0)} % (version courante : ${(partReference * 100).toFixed(0)} %)`);
+      }
+    }
+  }
+  return raisons;
+}
+
+function prechauffer(predicteur) {
+  for (const mot of MOTS_PRECHAUFFAGE) {
+    predicteur.predict(mot, { limit: 5 });
+  }
+}
+
+async function prechaufferParTranches(predicteur) {
+  await construireTries(predicteur);
+  for (const mot of MOTS_PRECHAUFFAGE) {
+    await ceder();
+    predicteur.predict(mot, { limit: 5 });
+  }
+}
+
+class GestionnaireDictionnaire {
+  /**
+   * @param {string} chemin - dictionnaire_dys.json (rechargé depuis le même chemin)
+   * @param {object} options - { metriques, requetesTest (chemin) }
+   */
+  constructor(chemin, options = {}) {
+    this.chemin = chemin;
+    this.metriques = options.metriques || null;
+    this.requetesTest = lireRequetesTest(options.requetesTest || path.join(path.dirname(chemin), 'requetes_etiquetees.tsv'));
+    this.retirees = new Set();  // Anciennes versions encore utilisées
+    this.enCours = null;        // Rechargement en cours (Promise)
+    this.aRevoir = false;       // Fichier modifié pendant un rechargement
+
+    // Contrôle de la version de démarrage : référence du prochain rechargement
+    const predicteur = new PredicteurDys(chemin);
+    prechauffer(predicteur);
+    const controle = controler(predicteur, this.requetesTest);
+    // Métriques après le préchauffage, pour ne pas fausser les histogrammes
+    predicteur.activerMetriques(this.metriques);
+    this.courante = this.creerVersion(predicteur, controle);
+  }
+
+  creerVersion(predicteur, controle) {
+    return {
+      predicteur,
+      dictionnaire: predicteur.dictVersion,
+      regles: predicteur.rulesVersion,
+      chargeeLe: new Date().toISOString(),
+      controle,
+      requetes: 0 // Requêtes et sessions qui l'utilisent
+    };
+  }
+
+  /**
+   * Version courante, réservée jusqu'à liberer()
+   */
+  acquerir() {
+    const version = this.courante;
+    version.requetes++;
+    return version;
+  }
+
+  liberer(version) {
+    version.requetes--;
+    if (version.requetes === 0 && this.retirees.delete(version)) {
+      console.log(`🗑️ Dictionnaire ${version.dictionnaire} libéré`);
+    }
+  }
+
+  /**
+   * Recharge le fichier du dictionnaire (un seul rechargement à la fois :
+   * un appel pendant un rechargement reçoit le même résultat)
+   * @returns {Promise<object>} - { ok, change, version, precedente, controle, erreurs, ms }
+   */
+  recharger() {
+    if (!this.enCours) {
+      const debut = performance.now();
+      this.enCours = this.verifier()
+        .then(resultat => this.basculer(resultat))
+        .catch(err => ({ ok: false, change: false, erreurs: [err.message] }))
+        .then(resultat => {
+          resultat.ms = Math.round(performance.now() - debut);
+          if (this.metriques) {
+            const etat = resultat.ok ? (resultat.change ? 'bascule' : 'inchange') : 'refuse';
+            this.metriques.incrementer('dys_dictionnaire_rechargements_total', { resultat: etat });
+          }
+          return resultat;
+        })
+        .finally(() => {
+          this.enCours = null;
+        });
+    }
+    return this.enCours;
+  }
+
+  /**
+   * Chargement et contrôle du fichier dans un worker thread
+   */
+  verifier() {
+    return new Promise((resolve, reject) => {
+      const worker = new Worker(path.join(__dirname, 'dictionnaire_worker.js'), {
+        workerData: { chemin: this.chemin, requetes: this.requetesTest }
+      });
+      worker.once('message', resolve);
+      worker.once('error', reject);
+      worker.once('exit', code => {
+        if (code !== 0) reject(new Error(`Vérification interrompue (code ${code})`));
+      });
+    });
+  }
+
+  async basculer({ version, controle, morceaux }) {
+    const ancienne = this.courante;
+    if (version === ancienne.dictionnaire) {
+      return { ok: true, change: false, version, controle };
+    }
+    const erreurs = raisonsRefus(controle, ancienne.controle);
+    if (erreurs.length > 0) {
+      console.log(`⚠️ Dictionnaire ${version} refusé : ${erreurs.join(' ; ')}`);
+      return { ok: false, change: false, version, controle, erreurs };
+    }
+
+    // Contenu vérifié par le worker (pas de relecture du fichier, qui a pu
+    // changer entre-temps), relu et préchauffé par tranches
+    const data = await assembler(morceaux);
+    const predicteur = new PredicteurDys(this.chemin, { data, dictVersion: version });
+    await prechaufferParTranches(predicteur);
+    predicteur.activerMetriques(this.metriques);
+
+    const nouvelle = this.creerVersion(predicteur, controle);
+    this.courante = nouvelle;
+    if (ancienne.requetes > 0) this.retirees.add(ancienne);
+    console.log(`🔄 Dictionnaire ${ancienne.dictionnaire} → ${version} (${controle.entrees} mots, ${ancienne.requetes} requêtes encore sur l'ancienne version)`);
+    return { ok: true, change: true, version, precedente: ancienne.dictionnaire, controle };
+  }
+
+  /**
+   * Recharge à chaque modification du fichier (remplacement par rename compris)
+   */
+  surveiller() {
+    const lancer = () => this.recharger().then(resultat => {
+      if (!resultat.ok) console.log(`⚠️ Rechargement refusé : ${resultat.erreurs.join(' ; ')}`);
+      if (this.aRevoir) {
+        this.aRevoir = false;
+        lancer();
+      }
+    });
+    fs.watchFile(this.chemin, { interval: INTERVALLE_SURVEILLANCE_MS }, (actuel, precedent) => {
+      if (actuel.mtimeMs === precedent.mtimeMs || actuel.size === 0) return;
+      if (this.enCours) this.aRevoir = true;
+      else lancer();
+    });
+  }
+
+  etat() {
+    const { dictionnaire, regles, chargeeLe, controle, requetes } = this.courante;
+    return {
+      dictionnaire,
+      regles,
+      chargeeLe,
+      entrees: controle.entrees,
+      requetes,
+      retirees: Array.from(this.retirees, v => ({ dictionnaire: v.dictionnaire, requetes: v.requetes })),
+      rechargement: this.enCours !== null
+    };
+  }
+}
+
+module.exports = { GestionnaireDictionnaire, controler, lireRequetesTest, morceler };
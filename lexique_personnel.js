@@ -0,0 +1,156 @@
+/**
+ * LEXIQUE PERSONNEL
+ * Mémorise les suggestions acceptées par un utilisateur (session ou appareil)
+ * pour remonter ses mots habituels dans le classement de predict().
+ *
+ * Structure compacte : une LRU bornée (Map id → {poids, t}) avec décroissance
+ * exponentielle. La décroissance est calculée paresseusement à la lecture,
+ * donc le coût pendant le scoring est un simple Map.get par candidat.
+ *
+ * Les IDs sont ceux d'une version du dictionnaire (sha1 court, dictVersion) :
+ * la version est sérialisée avec le lexique, et un lexique d'une autre
+ * version (ou sans version) est ignoré à l'import plutôt que de booster
+ * d'autres mots.
+ */
+
+const MINUTE = 60 * 1000;
+// Poids au-delà duquel le boost est saturé (1 - 2^-100 ≈ 1) : borne à l'import
+const POIDS_MAX = 100;
+
+class LexiquePersonnel {
+  /**
+   * @param {object} options
+   * @param {number} options.capacite - Nombre max de mots mémorisés (LRU)
+   * @param {number} options.demiVieJours - Demi-vie de la décroissance
+   * @param {number} options.boostMax - Bonus de score maximal (saturation)
+   * @param {string|null} options.version - Version du dictionnaire des IDs
+   */
+  constructor({ capacite = 256, demiVieJours = 14, boostMax = 30, version = null } = {}) {
+    this.capacite = capacite;
+    this.demiVieMs = demiVieJours * 24 * 60 * MINUTE;
+    this.boostMax = boostMax;
+    this.version = version;
+    this.mots = new Map(); // id → { poids, t }
+  }
+
+  /**
+   * Poids courant d'une entrée (après décroissance)
+   */
+  poids(id, now = Date.now()) {
+    const m = this.mots.get(id);
+    if (!m) return 0;
+    return m.poids * Math.pow(2, -(now - m.t) / this.demiVieMs);
+  }
+
+  /**
+   * Enregistre une suggestion acceptée
+   * @param {number} id - ID de l'entrée du dictionnaire
+   */
+  enregistrer(id, now = Date.now()) {
+    const poids = this.poids(id, now) + 1;
+    // delete + set : l'entrée passe en fin de Map (plus récente)
+    this.mots.delete(id);
+    this.mots.set(id, { poids, t: now });
+
+    if (this.mots.size > this.capacite) {
+      const plusAncien = this.mots.keys().next().value;
+      this.mots.delete(plusAncien);
+    }
+  }
+
+  /**
+   * Bonus de score pour une entrée : croît vite puis sature à boostMax
+   * Ex: 1 choix → 15 pts, 2 choix → 22.5 pts, 3 choix → 26 pts
+   */
+  boost(id, now = Date.now()) {
+    if (this.mots.size === 0) return 0;
+    const p = this.poids(id, now);
+    if (p <= 0) return 0;
+    return this.boostMax * (1 - Math.pow(2, -p));
+  }
+
+  /**
+   * Renumérote les mots après un changement de dictionnaire
+   * @param {function(number): (number|undefined)} nouvelId - undefined si le mot a disparu
+   * @param {string|null} version - Version du nouveau dictionnaire
+   */
+  renumeroter(nouvelId, version = null) {
+    const mots = new Map();
+    for (const [id, m] of this.mots) {
+      const n = nouvelId(id);
+      if (n !== undefined) mots.set(n, m);
+    }
+    this.mots = mots;
+    this.version = version;
+  }
+
+  /**
+   * Retire les mots dont l'ID vérifie filtre (ex. mots d'un lexique de classe remplacé)
+   * @param {function(number): boolean} filtre
+   */
+  oublier(filtre) {
+    for (const id of this.mots.keys()) {
+      if (filtre(id)) this.mots.delete(id);
+    }
+  }
+
+  get size() {
+    return this.mots.size;
+  }
+
+  /**
+   * Sérialise en tableau plat : [version, t0, id, poids×100, minutes depuis t0, ...]
+   * (sans version connue : [t0, id, ...]). ~15 octets par mot en JSON, à
+   * stocker en localStorage ou côté serveur
+   */
+  serialize() {
+    let t0 = Infinity;
+    for (const m of this.mots.values()) t0 = Math.min(t0, m.t);
+    if (t0 === Infinity) return [];
+
+    const minutes0 = Math.floor(t0 / MINUTE);
+    const out = this.version ? [this.version, minutes0] : [minutes0];
+    for (const [id, m] of this.mots) {
+      out.push(id, Math.round(m.poids * 100), Math.floor(m.t / MINUTE) - minutes0);
+    }
+    return out;
+  }
+
+  /**
+   * Reconstruit un lexique depuis serialize()
+   * Les données viennent du client (localStorage, corps de requête) : entrées
+   * non finies ignorées, poids borné à [0, POIDS_MAX], dates futures ramenées
+   * à maintenant (sinon la décroissance deviendrait une amplification)
+   * @param {object} options - Options du constructeur ; avec options.version,
+   *   un lexique d'une autre version du dictionnaire (ou sans version) est vide
+   */
+  static deserialize(data, options = {}, now = Date.now()) {
+    const lexique = new LexiquePersonnel(options);
+    if (!Array.isArray(data)) return lexique;
+
+    const debut = typeof data[0] === 'string' ? 1 : 0;
+    const version = debut ? data[0] : null;
+    if (options.version != null && version !== options.version) return lexique;
+    lexique.version = version;
+    if (data.length < debut + 4) return lexique;
+
+    const minutes0 = data[debut];
+    if (!Number.isFinite(minutes0)) return lexique;
+    for (let i = debut + 1; i + 2 < data.length; i += 3) {
+      const [id, poids, minutes] = [data[i], data[i + 1], data[i + 2]];
+      if (!Number.isInteger(id) || !Number.isFinite(poids) || !Number.isFinite(minutes)) continue;
+      if (poids <= 0) continue;
+      lexique.mots.set(id, {
+        poids: Math.min(poids / 100, POIDS_MAX),
+        t: Math.min((minutes0 + minutes) * MINUTE, now)
+      });
+    }
+    // Respecter la capacité si elle a été réduite
+    while (lexique.mots.size > lexique.capacite) {
+      lexique.mots.delete(lexique.mots.keys().next().value);
+    }
+    return lexique;
+  }
+}
+
+module.exports = LexiquePersonnel;
@@ -0,0 +1,204 @@
+const { performance } = require('perf_hooks');
+
+/**
+ * MÉTRIQUES
+ * Compteurs et histogrammes au format d'exposition Prometheus (text 0.0.4).
+ * Aucune dépendance : les valeurs sont agrégées en mémoire et exportées
+ * par l'endpoint /metrics de server.js.
+ */
+
+// Seuils par défaut des histogrammes de durée (secondes)
+const BUCKETS_DUREE = [0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25];
+// Seuils par défaut des histogrammes de taille (nombre de candidats)
+const BUCKETS_TAILLE = [0, 10, 50, 100, 250, 500, 1000, 2500, 5000, 10000];
+// Seuils de profondeur de fallback (caractères retirés)
+const BUCKETS_PROFONDEUR = [0, 1, 2, 3, 4, 6, 8];
+
+const DEFINITIONS = {
+  // Histogrammes de predict() : appels échantillonnés (ECHANTILLON_METRIQUES de predicteur.js)
+  dys_predict_stage_seconds: { type: 'histogram', help: "Durée des étapes de predict() (appels échantillonnés)", buckets: BUCKETS_DUREE },
+  dys_predict_seconds: { type: 'histogram', help: "Durée totale de predict() (appels échantillonnés)", buckets: BUCKETS_DUREE },
+  dys_predict_candidates: { type: 'histogram', help: "Taille de l'ensemble de candidats avant scoring (appels échantillonnés)", buckets: BUCKETS_TAILLE },
+  dys_predict_fallback_depth: { type: 'histogram', help: "Caractères retirés par le fallback (appels échantillonnés)", buckets: BUCKETS_PROFONDEUR },
+  dys_http_request_seconds: { type: 'histogram', help: "Durée des requêtes HTTP", buckets: BUCKETS_DUREE },
+  dys_predict_total: { type: 'counter', help: "Nombre d'appels à predict()" },
+  dys_predict_degraded_total: { type: 'counter', help: "Étapes de predict() sautées faute de budget" },
+  dys_cache_hits_total: { type: 'counter', help: "Réponses servies depuis un cache" },
+  dys_cache_misses_total: { type: 'counter', help: "Requêtes non trouvées dans un cache" },
+  dys_dictionnaire_rechargements_total: { type: 'counter', help: "Rechargements du dictionnaire (bascule, inchange, refuse)" }
+};
+
+function formaterLabels(labels) {
+  if (!labels) return '';
+  const parties = Object.entries(labels).map(([k, v]) => `${k}="${String(v).replace(/["\\\n]/g, '_')}"`);
+  return parties.join(',');
+}
+
+class Metriques {
+  constructor() {
+    this.series = new Map(); // nom + valeurs des labels → série
+  }
+
+  serie(nom, labels) {
+    // Clé brute (valeurs des labels) : le formatage n'a lieu qu'à la création
+    let cle = nom;
+    if (labels) {
+      for (const k in labels) cle += '\u0001' + labels[k];
+    }
+    let serie = this.series.get(cle);
+    if (!serie) {
+      const labelsTexte = formaterLabels(labels);
+      const def = DEFINITIONS[nom] || { type: 'counter', help: nom };
+      serie = { nom, labelsTexte, type: def.type, valeur: 0, somme: 0, compte: 0 };
+      if (def.type === 'histogram') {
+        serie.buckets = def.buckets;
+        serie.comptes = new Array(def.buckets.length).fill(0);
+      }
+      this.series.set(cle, serie);
+    }
+    return serie;
+  }
+
+  /**
+   * Incrémente un compteur
+   */
+  incrementer(nom, labels = null, n = 1) {
+    this.serie(nom, labels).valeur += n;
+  }
+
+  /**
+   * Ajoute une observation à un histogramme
+   */
+  observer(nom, valeur, labels = null) {
+    this.observerSerie(this.serie(nom, labels), valeur);
+  }
+
+  /**
+   * Ajoute une observation à un histogramme déjà résolu par serie()
+   * (appelants fréquents : la série est gardée, sans reconstruire sa clé)
+   */
+  observerSerie(serie, valeur) {
+    serie.somme += valeur;
+    serie.compte++;
+    const buckets = serie.buckets;
+    for (let i = 0; i < buckets.length; i++) {
+      if (valeur <= buckets[i]) {
+        serie.comptes[i]++;
+        break;
+      }
+    }
+  }
+
+  /**
+   * Export au format texte Prometheus
+   */
+  exporter() {
+    const parNom = new Map();
+    for (const serie of this.series.values()) {
+      if (!parNom.has(serie.nom)) parNom.set(serie.nom, []);
+      parNom.get(serie.nom).push(serie);
+    }
+
+    const lignes = [];
+    for (const [nom, series] of parNom) {
+      const def = DEFINITIONS[nom] || { type: 'counter', help: nom };
+      lignes.push(`# HELP ${nom} ${def.help}`);
+      lignes.push(`# TYPE ${nom} ${def.type}`);
+      for (const s of series) {
+        const sep = s.labelsTexte ? ',' : '';
+        if (s.type === 'histogram') {
+          let cumul = 0;
+          for (let i = 0; i < s.buckets.length; i++) {
+            cumul += s.comptes[i];
+            lignes.push(`${nom}_bucket{${s.labelsTexte}${sep}le="${s.buckets[i]}"} ${cumul}`);
+          }
+          lignes.push(`${nom}_bucket{${s.labelsTexte}${sep}le="+Inf"} ${s.compte}`);
+          lignes.push(`${nom}_sum${s.labelsTexte ? `{${s.labelsTexte}}` : ''} ${s.somme}`);
+          lignes.push(`${nom}_count${s.labelsTexte ? `{${s.labelsTexte}}` : ''} ${s.compte}`);
+        } else {
+          lignes.push(`${nom}${s.labelsTexte ? `{${s.labelsTexte}}` : ''} ${s.valeur}`);
+        }
+      }
+    }
+    return lignes.join('\n') + '\n';
+  }
+}
+
+// Séries de predict() résolues une fois par registre (enregistrer() est
+// appelé à chaque prédiction)
+const seriesPredict = new WeakMap();
+
+function seriesDe(metriques) {
+  let series = seriesPredict.get(metriques);
+  if (!series) {
+    series = {
+      duree: metriques.serie('dys_predict_seconds', null),
+      candidats: metriques.serie('dys_predict_candidates', null),
+      profondeur: metriques.serie('dys_predict_fallback_depth', null),
+      etapes: new Map()
+    };
+    seriesPredict.set(metriques, series);
+  }
+  return series;
+}
+
+/**
+ * Chronométrage des étapes d'un appel à predict()
+ * Les étapes répétées (boucle de fallback, segmentations) sont cumulées.
+ */
+class MesureEtapes {
+  constructor() {
+    this.debut = performance.now();
+    this.etapes = {};
+    this.candidats = 0;
+    this.profondeurFallback = 0;
+  }
+
+  now() {
+    return performance.now();
+  }
+
+  /**
+   * Ajoute la durée écoulée depuis t0 à une étape
+   * @returns {number} - L'instant courant (pour enchaîner les étapes)
+   */
+  ajouter(etape, t0) {
+    const t = performance.now();
+    this.etapes[etape] = (this.etapes[etape] || 0) + (t - t0);
+    return t;
+  }
+
+  /**
+   * Résumé en millisecondes (champ debug, en-tête Server-Timing)
+   */
+  resume() {
+    const etapes = {};
+    for (const [nom, ms] of Object.entries(this.etapes)) etapes[nom] = +ms.toFixed(3);
+    return {
+      totalMs: +(performance.now() - this.debut).toFixed(3),
+      etapes,
+      candidats: this.candidats,
+      profondeurFallback: this.profondeurFallback
+    };
+  }
+
+  /**
+   * Enregistre l'appel dans les histogrammes
+   */
+  enregistrer(metriques) {
+    const series = seriesDe(metriques);
+    metriques.observerSerie(series.duree, (performance.now() - this.debut) / 1000);
+    for (const etape in this.etapes) {
+      let serie = series.etapes.get(etape);
+      if (!serie) {
+        serie = metriques.serie('dys_predict_stage_seconds', { stage: etape });
+        series.etapes.set(etape, serie);
+      }
+      metriques.observerSerie(serie, this.etapes[etape] / 1000);
+    }
+    metriques.observerSerie(series.candidats, this.candidats);
+    metriques.observerSerie(series.profondeur, this.profondeurFallback);
+  }
+}
+
+module.exports = { Metriques, MesureEtapes };
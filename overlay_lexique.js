@@ -0,0 +1,182 @@
+/**
+ * LEXIQUES DE CLASSE (surcouche du dictionnaire)
+ * Mots ajoutés par l'enseignant (projet "volcans", prénoms des élèves) et
+ * suggérés par predict() avec l'option overlay, sans reconstruire ni
+ * copier dictionnaire_dys.json.
+ *
+ * - Les mots sont transcodés en phon_dys avec les règles du prédicteur
+ *   (transcode) et indexés à part : orthographes triées (plage de préfixe
+ *   par recherche dichotomique, pour chaque variante de l'automate
+ *   d'équivalences de la base), codes phon_dys triés (plage de l'initiale).
+ *   Pas de trie ni de Map : quelques dizaines de mots ne justifient pas un
+ *   nœud par lettre, l'essentiel de la mémoire reste les entrées elles-mêmes.
+ * - La base reste partagée et en lecture seule : chaque classe ne garde
+ *   que ses quelques mots. Leurs IDs sont dans l'espace de la classe, au-delà
+ *   de toute base (ID_DEBUT + espace × TAILLE_ESPACE) : jamais de collision
+ *   avec une entrée du dictionnaire, du bundle client ou d'une autre classe.
+ *   Mêmes IDs quand le lexique est reconstruit pour une autre version du
+ *   dictionnaire (même espace, même liste) ; un lexique remplacé reçoit un
+ *   nouvel espace, les IDs de l'ancien ne désignent plus rien.
+ * - Construire ou remplacer un lexique prend quelques millisecondes.
+ * - La recherche floue (fautes de frappe) ne parcourt que la base : un mot
+ *   du lexique est trouvé par son préfixe orthographique ou son code DYS.
+ */
+
+const FREQ_DEFAUT = 50;   // Fréquence (tous niveaux) d'un mot sans fréquence donnée
+const MAX_MOTS = 2000;    // Mots par lexique de classe
+const MAX_LONGUEUR = 40;
+const RE_MOT = /^[a-zàâäçéèêëîïôöùûüÿœæ]+(?:[-' ][a-zàâäçéèêëîïôöùûüÿœæ]+)*$/i;
+const NIVEAUX = ['cp', 'ce1', 'ce2_cm2', 'cp_cm2'];
+const ID_DEBUT = 1 << 24; // Premier ID des mots de classe (dictionnaires < 16M entrées)
+const TAILLE_ESPACE = 2048; // IDs par espace de classe (≥ MAX_MOTS)
+
+const comparer = (a, b) => (a < b ? -1 : a > b ? 1 : 0);
+
+/**
+ * Premier indice d'un tableau trié dont la clé est ≥ prefixe (dichotomie)
+ */
+function debutPlage(tries, cle, prefixe) {
+  let bas = 0;
+  let haut = tries.length;
+  while (bas < haut) {
+    const milieu = (bas + haut) >> 1;
+    if (cle(tries[milieu]) < prefixe) bas = milieu + 1;
+    else haut = milieu;
+  }
+  return bas;
+}
+
+class OverlayLexique {
+  /**
+   * @param {PredicteurDys} predicteur - Base partagée (règles, transcodage, automate)
+   * @param {Array<string|object>} mots - "volcan" ou { ortho, lemme, cgram, genre, nombre, freq, emoji }
+   * @param {number} espace - Espace d'IDs de la classe (un par lexique de classe)
+   */
+  constructor(predicteur, mots, espace = 0) {
+    if (!Array.isArray(mots)) throw new Error('Liste de mots attendue');
+    if (mots.length > MAX_MOTS) throw new Error(`Lexique limité à ${MAX_MOTS} mots`);
+
+    this.predicteur = predicteur;
+    this.espace = espace;
+    this.idDebut = ID_DEBUT + espace * TAILLE_ESPACE;
+    this.entries = [];
+    this.frequences = new Map(); // Fréquence → objet freq partagé par les entrées
+
+    const vus = new Set();
+    for (const mot of mots) {
+      const entry = this.normaliser(typeof mot === 'string' ? { ortho: mot } : mot);
+      const cle = `${entry.ortho}\t${entry.cgram}`;
+      if (vus.has(cle)) continue;
+      vus.add(cle);
+
+      entry.id = this.idDebut + this.entries.length;
+      this.entries.push(entry);
+    }
+    this.frequences = null;
+
+    // Index : entrées triées par orthographe en minuscules (cles) et par code DYS
+    const cles = new Map(this.entries.map(e => [e, e.ortho.toLowerCase()]));
+    this.parOrtho = this.entries.slice().sort((a, b) => comparer(cles.get(a), cles.get(b)) || a.id - b.id);
+    this.cles = this.parOrtho.map(e => cles.get(e));
+    this.parDys = this.entries.filter(e => e.phon_dys).sort((a, b) => comparer(a.phon_dys, b.phon_dys) || a.id - b.id);
+  }
+
+  /**
+   * Entrée au format du dictionnaire ; phon_dys calculé depuis l'orthographe
+   */
+  normaliser(mot) {
+    const ortho = typeof mot.ortho === 'string' ? mot.ortho.trim() : '';
+    if (!ortho || ortho.length > MAX_LONGUEUR || !RE_MOT.test(ortho)) {
+      throw new Error(`Mot invalide : ${JSON.stringify(mot.ortho)}`);
+    }
+    const f = Number.isFinite(mot.freq) && mot.freq >= 0 ? mot.freq : FREQ_DEFAUT;
+    let freq = this.frequences.get(f);
+    if (!freq) {
+      freq = {};
+      for (const niveau of NIVEAUX) freq[niveau] = f;
+      this.frequences.set(f, freq);
+    }
+    return {
+      ortho,
+      lemme: mot.lemme || ortho,
+      cgram: mot.cgram || 'NOM',
+      genre: mot.genre || '',
+      nombre: mot.nombre || '',
+      infover: '',
+      phon: null,
+      phon_dys: this.predicteur.transcode(ortho.toLowerCase()),
+      freq,
+      emoji: mot.emoji || null,
+      overlay: true
+    };
+  }
+
+  get size() {
+    return this.entries.length;
+  }
+
+  /**
+   * Entrée du lexique par ID (null si l'ID n'en fait pas partie)
+   */
+  entree(id) {
+    return this.entries[id - this.idDebut] || null;
+  }
+
+  /**
+   * Recherche par préfixe orthographique, mêmes équivalences que
+   * PredicteurDys.searchByOrthoPrefix
+   */
+  searchByOrthoPrefix(prefix) {
+    const prefixe = prefix.toLowerCase();
+    const results = [];
+    const vus = new Set();
+    for (const variante of this.predicteur.automateEquivalences.variantes(prefixe)) {
+      for (let i = debutPlage(this.cles, c => c, variante); i < this.cles.length && this.cles[i].startsWith(variante); i++) {
+        const entry = this.parOrtho[i];
+        if (vus.has(entry.id)) continue;
+        vus.add(entry.id);
+        results.push(Object.assign({}, entry, { orthoVariant: variante !== prefixe ? variante : null }));
+      }
+    }
+    results.sort((a, b) => a.id - b.id);
+    return results;
+  }
+
+  /**
+   * Recherche par code DYS, même correspondance que PredicteurDys.searchByPhonDys
+   * (le code doit commencer par la même initiale)
+   */
+  searchByPhonDys(userCode, rawInput) {
+    if (!userCode) return [];
+    const initiale = userCode[0];
+    const results = [];
+    for (let i = debutPlage(this.parDys, e => e.phon_dys, initiale); i < this.parDys.length; i++) {
+      const entry = this.parDys[i];
+      if (entry.phon_dys[0] !== initiale) break;
+      if (this.predicteur.isPhoneticMatch(userCode, entry.phon_dys, rawInput)) results.push(entry);
+    }
+    results.sort((a, b) => a.id - b.id);
+    return results;
+  }
+
+  /**
+   * Mots du lexique (format d'entrée du constructeur)
+   */
+  serialize() {
+    return this.entries.map(({ ortho, lemme, cgram, genre, nombre, freq, emoji }) => ({
+      ortho, lemme, cgram, genre, nombre, freq: freq.cp_cm2, emoji
+    }));
+  }
+
+  /**
+   * Espace de classe d'un ID (-1 pour une entrée du dictionnaire)
+   */
+  static espaceDe(id) {
+    return id >= ID_DEBUT ? Math.floor((id - ID_DEBUT) / TAILLE_ESPACE) : -1;
+  }
+}
+
+OverlayLexique.ID_DEBUT = ID_DEBUT;
+OverlayLexique.TAILLE_ESPACE = TAILLE_ESPACE;
+
+module.exports = OverlayLexique;
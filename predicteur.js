@@ -1,6 +1,14 @@
+const crypto = require('crypto');
 const fs = require('fs');
 const path = require('path');
+const { performance } = require('perf_hooks');
 const RuleRepository = require('./rules/RuleRepository');
+const ModeleBigrammes = require('./bigrammes');
+const RechercheFloue = require('./recherche_floue');
+const AutomateEquivalences = require('./equivalences_ortho');
+const { Trie } = require('./trie');
+const { MesureEtapes } = require('./metriques');
+const { TableTopK } = require('./topk');
 
 /**
  * PREDICTEUR DE MOTS DYS
@@ -10,13 +18,40 @@ const RuleRepository = require('./rules/RuleRepository');
 // Charger les règles depuis le repository
 const ruleRepo = new RuleRepository(path.join(__dirname, 'rules'));
 
+// Hors budget, seuls les candidats les plus fréquents sont scorés (par résultat demandé)
+const CANDIDATS_DEGRADES_PAR_RESULTAT = 20;
+
+// Regroupement par lemme : candidats demandés par résultat (les formes fléchies
+// d'un même lemme occupent souvent plusieurs places du top-k)
+const CANDIDATS_PAR_LEMME = 3;
+
+// Métriques : un appel sur N est chronométré pour les histogrammes (le
+// chronométrage coûte plusieurs µs, trop pour les préfixes rapides)
+const ECHANTILLON_METRIQUES = 10;
+
+// Affinage d'une recherche ortho mémorisée : au-delà de N candidats précédents
+// (préfixes de 2 lettres), la recherche dans le trie coûte moins que le filtrage
+const SEUIL_AFFINAGE_ORTHO = 512;
+
 class PredicteurDys {
   /**
    * @param {string} jsonPath - Chemin vers dictionnaire_dys.json
+   * @param {object|null} charge - { data, dictVersion } déjà lus (rechargement :
+   *   contenu vérifié par le worker) ; emojis, bigrammes et top-k sont lus à
+   *   côté de jsonPath dans tous les cas
    */
-  constructor(jsonPath) {
+  constructor(jsonPath, charge = null) {
     console.log("📂 Chargement du dictionnaire...");
-    const data = JSON.parse(fs.readFileSync(jsonPath, 'utf8'));
+    let data;
+    if (charge) {
+      data = charge.data;
+      this.dictVersion = charge.dictVersion;
+    } else {
+      const contenu = fs.readFileSync(jsonPath);
+      data = JSON.parse(contenu.toString('utf8'));
+      // Empreinte du fichier (version servie, clé des caches clients)
+      this.dictVersion = crypto.createHash('sha1').update(contenu).digest('hex').slice(0, 12);
+    }
     
     // Utiliser les index déjà construits
     this.entries = data.entries;
@@ -30,14 +65,202 @@ class PredicteurDys {
     
     // Référence aux règles compilées
     this.rules = ruleRepo.getMappings();
+    this.rulesVersion = ruleRepo.getVersion();
+    
+    // Automate des équivalences orthographiques (compilé depuis les règles)
+    this.automateEquivalences = new AutomateEquivalences(this.rules.ORTHO_EQUIVALENTS);
+    
+    // Tries construits à la première utilisation
+    this.trieOrtho = null;
+    this.rechercheFloue = null;
+    
+    // Métriques Prometheus (désactivées par défaut, voir activerMetriques)
+    this.metriques = null;
+    this.echantillon = ECHANTILLON_METRIQUES;
+    this.appelsNonMesures = 0;
     
     // Charger l'index emoji (fichier séparé)
     this.indexEmojis = this.loadEmojis(jsonPath);
     
+    // Charger le modèle de mot suivant (optionnel, build_bigrammes.py)
+    this.bigrammes = this.loadBigrammes(jsonPath);
+    
+    // Table top-k des préfixes courts (optionnelle, build_topk.py)
+    this.topk = this.loadTopK(jsonPath);
+    
     console.log(`✅ ${this.meta.total_entries} mots chargés`);
     console.log(`🎨 ${Object.keys(this.indexEmojis).length} emojis chargés`);
   }
 
+  /**
+   * Charge le modèle de bigrammes depuis bigrammes.bin (même dossier)
+   * @param {string} dictPath - Chemin du dictionnaire
+   * @returns {ModeleBigrammes|null}
+   */
+  loadBigrammes(dictPath) {
+    const bigrammesPath = path.join(path.dirname(dictPath), 'bigrammes.bin');
+    if (!fs.existsSync(bigrammesPath)) return null;
+    
+    const modele = ModeleBigrammes.charger(bigrammesPath);
+    if (modele.totalEntries !== this.meta.total_entries) {
+      console.log("⚠️ bigrammes.bin ne correspond pas au dictionnaire (à reconstruire)");
+      return null;
+    }
+    const stats = modele.stats();
+    console.log(`🔗 ${stats.contextes} contextes de bigrammes chargés (${(stats.octets / 1024).toFixed(0)} Ko)`);
+    return modele;
+  }
+
+  /**
+   * Charge la table top-k précalculée depuis topk.bin (même dossier)
+   * Ignorée si elle a été construite avec un autre dictionnaire ou d'autres règles
+   * @param {string} dictPath - Chemin du dictionnaire
+   * @returns {TableTopK|null}
+   */
+  loadTopK(dictPath) {
+    const topkPath = path.join(path.dirname(dictPath), 'topk.bin');
+    if (!fs.existsSync(topkPath)) return null;
+    
+    let table;
+    try {
+      table = TableTopK.charger(topkPath);
+    } catch (err) {
+      console.log(`⚠️ topk.bin illisible (${err.message}), à reconstruire`);
+      return null;
+    }
+    if (table.totalEntries !== this.meta.total_entries || table.meta.versionRegles !== this.rulesVersion) {
+      console.log("⚠️ topk.bin ne correspond pas au dictionnaire ou aux règles (à reconstruire)");
+      return null;
+    }
+    const stats = table.stats();
+    console.log(`⚡ ${stats.cles} préfixes précalculés chargés (${(stats.octets / 1024).toFixed(0)} Ko)`);
+    return table;
+  }
+
+  /**
+   * Classe de contexte d'un mot précédent : tout ce qui, dans predict(),
+   * dépend de prevWord hors bigrammes (règle de contexte, liaisons déclenchées).
+   * Deux mots de la même classe donnent les mêmes résultats.
+   * @returns {string} - Ex: "determinants_masc_sing|liaisons_n"
+   */
+  classeContexte(prevWord) {
+    const contextRule = this.getContextFilter(prevWord);
+    const prevLower = prevWord ? prevWord.toLowerCase() : '';
+    const liaisons = [];
+    if (prevLower) {
+      for (const rule of this.rules.SEGMENTATION || []) {
+        if (rule.triggers && rule.triggers.has(prevLower)) liaisons.push(rule.name);
+      }
+    }
+    return `${contextRule ? contextRule.name : ''}|${liaisons.join(',')}`;
+  }
+
+  /**
+   * Réponse précalculée pour un préfixe court (options par défaut uniquement)
+   * @returns {Array|null} - Résultats au format de predict(), null si absent de la table
+   */
+  chercherTopK(input, options, mesure = null) {
+    const {
+      level = "cp_cm2",
+      limit = 10,
+      usePhonetic = true,
+      useFuzzy = true,
+      useTopK = true,
+      minPrefixLength = 2,
+      prevWord = '',
+      prevWord2 = '',
+      lexiquePersonnel = null,
+      overlay = null
+    } = options;
+    
+    const table = this.topk;
+    if (!table || !useTopK) return null;
+    const prefixe = input.trim().toLowerCase();
+    if (prefixe.length > table.longueurMax) return null;
+    
+    // Options hors défaut, lexique personnel ou de classe, ou successeurs propres
+    // à prevWord : le classement diffère de celui de la table
+    if (!usePhonetic || !useFuzzy || lexiquePersonnel || overlay || limit > table.k ||
+        minPrefixLength !== table.meta.minPrefixLength) return null;
+    if (this.bigrammes && prevWord &&
+        this.bigrammes.successeurs(this.getIdOrtho(prevWord), this.getIdOrtho(prevWord2))) return null;
+    
+    const trouve = table.chercher(level, this.classeContexte(prevWord), prefixe);
+    if (this.metriques) {
+      this.metriques.incrementer(trouve ? 'dys_cache_hits_total' : 'dys_cache_misses_total', { cache: 'topk' });
+    }
+    if (!trouve) return null;
+    
+    const n = Math.min(limit, trouve.ids.length);
+    const results = new Array(n);
+    for (let i = 0; i < n; i++) {
+      const { matchType, fallback, contextMatch, segmentation } = table.decoder(trouve.drapeaux[i]);
+      const extra = { matchType };
+      if (segmentation) extra.segmentation = segmentation;
+      if (fallback) extra.fallback = true;
+      extra.score = trouve.scores[i];
+      extra.contextMatch = contextMatch;
+      extra.personnel = false;
+      // Object.assign plutôt qu'un spread suivi d'ajouts : ~20x plus rapide sous V8
+      results[i] = Object.assign({}, this.entries[trouve.ids[i]], extra);
+    }
+    
+    if (mesure) {
+      mesure.ajouter('topk', mesure.debut);
+      mesure.candidats = n;
+    }
+    return results;
+  }
+
+  /**
+   * ID canonique d'une orthographe (plus petit ID de l'index_ortho)
+   * Même convention que build_bigrammes.py
+   */
+  getIdOrtho(mot) {
+    if (!mot) return -1;
+    const ids = this.indexOrtho[mot] || this.indexOrtho[mot.toLowerCase()];
+    return ids ? ids[0] : -1;
+  }
+
+  /**
+   * Successeurs probables après prevWord (et prevWord2 pour les trigrammes)
+   * Indexés par orthographe : toutes les entrées homographes en profitent
+   * @returns {Map<string, number>|null} - ortho → poids (0-1)
+   */
+  getSuccesseurs(prevWord, prevWord2 = '') {
+    if (!this.bigrammes || !prevWord) return null;
+    const succ = this.bigrammes.successeurs(this.getIdOrtho(prevWord), this.getIdOrtho(prevWord2));
+    if (!succ) return null;
+    
+    const carte = new Map();
+    for (let i = 0; i < succ.ids.length; i++) {
+      const entry = this.entries[succ.ids[i]];
+      if (entry) carte.set(entry.ortho, succ.poids[i] / 255);
+    }
+    return carte;
+  }
+
+  /**
+   * Suggère le mot suivant avant que la première lettre soit tapée
+   * @param {string} prevWord - Le mot précédent
+   * @param {object} options - { limit, prevWord2 }
+   */
+  predictNext(prevWord, options = {}) {
+    const { limit = 10, prevWord2 = '' } = options;
+    if (!this.bigrammes || !prevWord) return [];
+    
+    const succ = this.bigrammes.successeurs(this.getIdOrtho(prevWord), this.getIdOrtho(prevWord2));
+    if (!succ) return [];
+    
+    const results = [];
+    for (let i = 0; i < succ.ids.length && results.length < limit; i++) {
+      const entry = this.entries[succ.ids[i]];
+      if (!entry) continue;
+      results.push({ ...entry, matchType: 'bigramme', score: succ.poids[i] / 255 * 100, contextMatch: false });
+    }
+    return results;
+  }
+
   /**
    * Charge l'index des emojis depuis un fichier séparé
    * @param {string} dictPath - Chemin du dictionnaire (pour trouver le dossier data)
@@ -63,12 +286,69 @@ class PredicteurDys {
     return this.indexEmojis[lemme.toLowerCase()] || null;
   }
 
+  /**
+   * Active l'enregistrement des durées par étape dans un registre de métriques
+   * @param {Metriques|null} metriques - null pour désactiver
+   * @param {number} echantillon - Un appel chronométré sur N (1 = tous)
+   */
+  activerMetriques(metriques, echantillon = ECHANTILLON_METRIQUES) {
+    this.metriques = metriques;
+    this.echantillon = echantillon;
+  }
+
+  /**
+   * Fin d'un appel chronométré : histogrammes si l'appel est échantillonné,
+   * durées par étape dans trace si demandée
+   */
+  terminerMesure(mesure, echantillonne, trace) {
+    if (echantillonne) mesure.enregistrer(this.metriques);
+    if (trace) Object.assign(trace, mesure.resume());
+  }
+
+  /**
+   * Compte un appel à predict() (métriques actives)
+   * @returns {boolean} - true si cet appel est chronométré
+   */
+  compterAppel() {
+    this.metriques.incrementer('dys_predict_total');
+    if (++this.appelsNonMesures < this.echantillon) return false;
+    this.appelsNonMesures = 0;
+    return true;
+  }
+
   /**
    * Recharge les règles à chaud (pour le développement)
    */
   reloadRules() {
     ruleRepo.reload();
     this.rules = ruleRepo.getMappings();
+    this.rulesVersion = ruleRepo.getVersion();
+    if (this.topk && this.topk.meta.versionRegles !== this.rulesVersion) {
+      console.log("⚠️ Règles modifiées : table top-k désactivée (relancer build_topk.py)");
+      this.topk = null;
+    }
+    this.automateEquivalences = new AutomateEquivalences(this.rules.ORTHO_EQUIVALENTS);
+    this.rechercheFloue = null; // Les coûts d'édition dépendent des règles
+  }
+
+  /**
+   * Trie des orthographes en minuscules, construit à la demande
+   */
+  getTrieOrtho() {
+    if (!this.trieOrtho) {
+      this.trieOrtho = Trie.depuisEntrees(this.entries, e => e.ortho.toLowerCase());
+    }
+    return this.trieOrtho;
+  }
+
+  /**
+   * Index de recherche floue (tries ortho + phon_dys), construit à la demande
+   */
+  getRechercheFloue() {
+    if (!this.rechercheFloue) {
+      this.rechercheFloue = new RechercheFloue(this.entries, this.rules, this.getTrieOrtho());
+    }
+    return this.rechercheFloue;
   }
 
   /**
@@ -265,6 +545,8 @@ class PredicteurDys {
   /**
    * Génère des variantes orthographiques d'un préfixe
    * Ex: "bato" → ["bato", "bateau", "batau"]
+   * Version de référence : la recherche passe par AutomateEquivalences
+   * (voir bench/bench_equivalences_ortho.js pour la vérification)
    */
   generateOrthoVariants(prefix) {
     const variants = new Set([prefix]);
@@ -297,52 +579,60 @@ class PredicteurDys {
 
   /**
    * Recherche par préfixe orthographique (avec variantes)
-   * Utilise l'index par préfixe pour une recherche O(1)
+   * Parcourt le trie orthographique avec l'automate des équivalences :
+   * aucune variante n'est matérialisée, aucun startsWith par candidat
    */
   searchByOrthoPrefix(prefix) {
     const results = [];
-    const seenIds = new Set();
     prefix = prefix.toLowerCase();
     
-    // Générer les variantes du préfixe
-    const variants = this.generateOrthoVariants(prefix);
-    
-    // Collecter les IDs candidats via l'index par préfixe
-    const candidateIds = new Set();
-    for (const variant of variants) {
-      if (variant.length >= 2) {
-        const prefix2 = variant.substring(0, 2);
-        const ids = this.idxOrthoPrefix[prefix2];
-        if (ids) {
-          for (const id of ids) {
-            candidateIds.add(id);
-          }
-        }
-      }
-    }
+    this.automateEquivalences.rechercher(this.getTrieOrtho(), prefix, (id, variant) => {
+      const item = { ...this.entries[id] };
+      item.orthoVariant = variant;
+      results.push(item);
+    });
     
-    // Filtrer les candidats qui matchent vraiment
-    for (const id of candidateIds) {
-      if (seenIds.has(id)) continue;
-      
-      const entry = this.entries[id];
-      const orthoLower = entry.ortho.toLowerCase();
-      
-      // Vérifier si l'ortho commence par une des variantes
-      for (const variant of variants) {
-        if (orthoLower.startsWith(variant)) {
-          seenIds.add(id);
-          const item = { ...entry };
-          item.orthoVariant = variant !== prefix ? variant : null;
-          results.push(item);
-          break;
-        }
-      }
+    // Ordre des IDs (comme l'index par préfixe) pour des égalités de score stables
+    results.sort((a, b) => a.id - b.id);
+    return results;
+  }
+
+  /**
+   * searchByOrthoPrefix(prefix) tiré des résultats d'un préfixe plus court
+   * (frappe suivante d'une session) : mêmes entrées, même ordre, mêmes
+   * variantes. null si une variante de prefix ne prolonge aucune variante du
+   * préfixe court (ses mots peuvent manquer aux résultats précédents), ou
+   * si les résultats précédents sont trop nombreux pour que filtrer soit rentable
+   */
+  affinerOrthoPrefix(prefix, precedents, prefixeCourt) {
+    if (precedents.length > SEUIL_AFFINAGE_ORTHO) return null;
+    const variantes = this.automateEquivalences.variantes(prefix);
+    const couvrantes = this.automateEquivalences.variantes(prefixeCourt);
+    if (!variantes.every(v => couvrantes.some(c => v.startsWith(c)))) return null;
+
+    const results = [];
+    for (const item of precedents) {
+      const ortho = item.ortho.toLowerCase();
+      const variante = variantes.find(v => ortho.startsWith(v));
+      if (variante === undefined) continue;
+      const orthoVariant = variante !== prefix ? variante : null;
+      // Les résultats mémorisés ne sont jamais modifiés : partagés tant que la variante est la même
+      results.push(item.orthoVariant === orthoVariant ? item : Object.assign({}, item, { orthoVariant }));
     }
-    
     return results;
   }
 
+  /**
+   * searchByPhonDys(userCode) tiré des résultats d'un code plus court qu'il
+   * prolonge : tout code qui correspond au plus long commence par le plus
+   * court, donc figure déjà dans ses résultats (même ordre). null sinon
+   */
+  affinerPhonDys(userCode, precedents, codeCourt) {
+    if (codeCourt.length < 2 || !userCode.startsWith(codeCourt)) return null;
+    if (userCode === codeCourt) return precedents;
+    return precedents.filter(entry => this.isPhoneticMatch(userCode, entry.phon_dys));
+  }
+
   /**
    * Recherche par code phonétique DYS
    * Utilise l'index par préfixe pour une recherche O(1)
@@ -419,11 +709,54 @@ class PredicteurDys {
       level = "cp_cm2",  // Niveau de fréquence à utiliser
       limit = 10,        // Nombre max de résultats
       usePhonetic = true, // Activer la recherche phonétique DYS
+      useFuzzy = true,   // Activer la recherche floue (distance d'édition)
+      fuzzyBudgetMs = 10, // Budget de latence de la recherche floue
       minPrefixLength = 2, // Longueur minimale du préfixe pour le fallback
-      prevWord = ''      // Mot précédent pour la segmentation
+      prevWord = '',     // Mot précédent pour la segmentation
+      prevWord2 = '',    // Avant-dernier mot (trigrammes)
+      lexiquePersonnel = null, // LexiquePersonnel de l'utilisateur (optionnel)
+      overlay = null,    // OverlayLexique de la classe (mots ajoutés à la base)
+      useTopK = true,    // Utiliser la table précalculée des préfixes courts
+      trace = null,      // Objet rempli avec les durées par étape (debug)
+      memo = null,       // MemoRecherche d'une session (résultats par préfixe recherché)
+      budgetMs = null,   // Budget de latence de l'appel (null = illimité)
+      etapesSautees = null, // Tableau rempli avec les étapes sautées faute de budget
+      grouperLemmes = false, // Un résultat par lemme (autres formes dans "formes")
+      poids = null,      // Poids du scoring (null = rules/poids.json)
+      capture = null     // Objet rempli avec les candidats et le contexte du scoring
     } = options;
 
-    if (!input || input.trim().length === 0) return [];
+    if (grouperLemmes) {
+      const elargis = this.predict(input, Object.assign({}, options, {
+        grouperLemmes: false, limit: limit * CANDIDATS_PAR_LEMME
+      }));
+      return this.grouperParLemme(elargis, limit);
+    }
+
+    // Rien de tapé : suggestion du mot suivant (si modèle de bigrammes)
+    if (!input || input.trim().length === 0) return this.predictNext(prevWord, options);
+    
+    // Chronométrage si trace demandée, ou pour un appel échantillonné si
+    // métriques actives (dys_predict_total compte tous les appels, table
+    // top-k comprise)
+    const echantillonne = this.metriques !== null && this.compterAppel();
+    const mesure = (echantillonne || trace) ? new MesureEtapes() : null;
+    
+    // Préfixe court avec les options par défaut : une seule lecture de table
+    const precalcule = this.chercherTopK(input, options, mesure);
+    if (precalcule) {
+      if (mesure) this.terminerMesure(mesure, echantillonne, trace);
+      return precalcule;
+    }
+    let t = mesure ? mesure.debut : 0;
+    
+    // Échéance : au-delà, les étapes coûteuses (phonétique, floue, liaisons,
+    // fallback profond) sont sautées. La recherche ortho du mot tapé est
+    // toujours faite, le fallback continue (ortho seule) tant qu'aucun
+    // candidat n'est trouvé.
+    const echeance = budgetMs != null ? performance.now() + budgetMs : Infinity;
+    const horsBudget = () => echeance !== Infinity && performance.now() >= echeance;
+    const sautees = new Set();
     
     const originalInput = input.trim().toLowerCase();
     let candidatesMap = new Map();
@@ -432,54 +765,88 @@ class PredicteurDys {
 
     // Générer les segmentations possibles (liaisons françaises)
     const segmentations = this.generateSegmentations(originalInput, prevWord);
+    if (mesure) t = mesure.ajouter('segmentation', t);
     
     // Essayer TOUTES les segmentations et fusionner les résultats
-    for (const seg of segmentations) {
+    for (let s = 0; s < segmentations.length; s++) {
+      const seg = segmentations[s];
+      if (s > 0 && horsBudget()) {
+        sautees.add('segmentation');
+        break;
+      }
       let searchInput = seg.text;
       let localFallback = false;
       
       // Boucle de fallback pour cette segmentation
       while (searchInput.length >= minPrefixLength) {
-        const userDysCode = this.transcode(searchInput);
+        const degrade = horsBudget();
+        if (degrade && localFallback && candidatesMap.size > 0) {
+          sautees.add('fallback');
+          break;
+        }
+        if (mesure) t = mesure.now();
+        const userDysCode = memo
+          ? memo.obtenir('transcode', searchInput, () => this.transcode(searchInput))
+          : this.transcode(searchInput);
+        if (mesure) t = mesure.ajouter('transcode', t);
         let foundResults = false;
         
         // 1. Recherche orthographique classique
-        const orthoResults = this.searchByOrthoPrefix(searchInput);
+        let orthoResults = memo
+          ? memo.obtenir('ortho', searchInput, () => this.searchByOrthoPrefix(searchInput),
+            (precedents, court) => this.affinerOrthoPrefix(searchInput, precedents, court))
+          : this.searchByOrthoPrefix(searchInput);
+        if (overlay) orthoResults = orthoResults.concat(overlay.searchByOrthoPrefix(searchInput));
         for (const item of orthoResults) {
           if (!candidatesMap.has(item.id)) {
-            const entry = { ...item, matchType: 'ortho' };
+            const entry = Object.assign({}, item, { matchType: 'ortho' });
             if (seg.isSegmentation) {
               entry.segmentation = seg.rule;
             }
             if (localFallback) {
               entry.fallback = true;
+              entry.profondeurFallback = seg.text.length - searchInput.length;
             }
             candidatesMap.set(item.id, entry);
             foundResults = true;
           }
         }
+        if (mesure) t = mesure.ajouter('ortho', t);
 
         // 2. Recherche phonétique DYS (si activée)
-        if (usePhonetic) {
-          const phonResults = this.searchByPhonDys(userDysCode, searchInput);
+        if (usePhonetic && (degrade || horsBudget())) {
+          sautees.add('phon');
+        } else if (usePhonetic) {
+          let phonResults = memo
+            ? memo.obtenir('phon', searchInput, () => this.searchByPhonDys(userDysCode, searchInput),
+              (precedents, court) => this.affinerPhonDys(userDysCode, precedents,
+                memo.obtenir('transcode', court, () => this.transcode(court))))
+            : this.searchByPhonDys(userDysCode, searchInput);
+          if (overlay) phonResults = phonResults.concat(overlay.searchByPhonDys(userDysCode, searchInput));
           
           for (const item of phonResults) {
             if (!candidatesMap.has(item.id)) {
-              const entry = { ...item, matchType: 'phon_dys' };
+              const entry = Object.assign({}, item, { matchType: 'phon_dys' });
               if (seg.isSegmentation) {
                 entry.segmentation = seg.rule;
               }
               if (localFallback) {
                 entry.fallback = true;
+                entry.profondeurFallback = seg.text.length - searchInput.length;
               }
               candidatesMap.set(item.id, entry);
               foundResults = true;
             }
           }
+          if (mesure) t = mesure.ajouter('phon', t);
         }
         
         // Si on a trouvé des résultats, on arrête le fallback pour cette segmentation
         if (foundResults) {
+          if (mesure) {
+            const profondeur = seg.text.length - searchInput.length;
+            if (profondeur > mesure.profondeurFallback) mesure.profondeurFallback = profondeur;
+          }
           if (seg.isSegmentation) {
             usedSegmentation = seg;
           }
@@ -493,75 +860,182 @@ class PredicteurDys {
       }
     }
     
+    // 3. Recherche floue (lettres inversées ou oubliées au milieu du mot) :
+    //    une seule fois, sur l'input complet, après les recherches exactes de
+    //    toutes les segmentations et de leurs fallbacks, et seulement si
+    //    elles ont trouvé moins de `limit` candidats sans raccourcir le
+    //    préfixe. Un match exact n'est jamais remplacé ; un candidat du
+    //    fallback retrouvé par la recherche floue devient un match flou.
+    //    Son budget propre est réduit au budget restant de l'appel
+    let exacts = 0;
+    for (const c of candidatesMap.values()) {
+      if (!c.fallback) exacts++;
+    }
+    if (useFuzzy && originalInput.length >= 3 && exacts < limit) {
+      const budgetFlou = Math.min(fuzzyBudgetMs, echeance - performance.now());
+      if (budgetFlou <= 0) {
+        sautees.add('fuzzy');
+      } else {
+        if (mesure) t = mesure.now();
+        const codeFlou = memo
+          ? memo.obtenir('transcode', originalInput, () => this.transcode(originalInput))
+          : this.transcode(originalInput);
+        const rechercherFloue = () => {
+          const resultats = this.getRechercheFloue().rechercher(originalInput, codeFlou, {
+            budgetMs: budgetFlou
+          });
+          if (budgetFlou < fuzzyBudgetMs && this.rechercheFloue.derniereRecherche.interrompu) {
+            sautees.add('fuzzy_partiel');
+          }
+          return resultats;
+        };
+        // Un résultat tronqué par le budget de l'appel n'est pas mémorisé
+        const fuzzyResults = memo && budgetFlou === fuzzyBudgetMs
+          ? memo.obtenir('fuzzy', originalInput, rechercherFloue)
+          : rechercherFloue();
+        for (const [id, { cout, complet }] of fuzzyResults) {
+          const existant = candidatesMap.get(id);
+          if (!existant || existant.fallback) {
+            candidatesMap.set(id, Object.assign({}, this.entries[id], { matchType: 'fuzzy', editCost: cout, motComplet: complet }));
+          }
+        }
+        if (mesure) t = mesure.ajouter('fuzzy', t);
+      }
+    }
+    
+    if (mesure) {
+      mesure.candidats = candidatesMap.size;
+      t = mesure.now();
+    }
+    
     // Utiliser le bon input pour les scores
     const effectiveInput = usedSegmentation ? usedSegmentation.text : originalInput;
-    const userDysCode = this.transcode(effectiveInput);
+    const userDysCode = memo
+      ? memo.obtenir('transcode', effectiveInput, () => this.transcode(effectiveInput))
+      : this.transcode(effectiveInput);
     
-    // Récupérer le contexte grammatical
+    // Récupérer le contexte grammatical et les successeurs probables
     const contextRule = this.getContextFilter(prevWord);
+    const successeurs = this.getSuccesseurs(prevWord, prevWord2);
 
     // 3. Calcul du score et tri
     let results = Array.from(candidatesMap.values());
     
-    // Trouver la fréquence max pour normaliser
-    const maxFreq = Math.max(...results.map(r => r.freq?.[level] || 0), 1);
+    // Hors budget (gros buckets des préfixes courts) : scoring limité aux plus fréquents
+    const maxDegrade = limit * CANDIDATS_DEGRADES_PAR_RESULTAT;
+    if (results.length > maxDegrade && horsBudget()) {
+      results.sort((a, b) => (b.freq?.[level] || 0) - (a.freq?.[level] || 0));
+      results.length = maxDegrade;
+      sautees.add('scoring_partiel');
+    }
+    
+    // Entrées du scoring : mises de côté sur demande (tuner_worker.js re-score
+    // les mêmes candidats avec d'autres poids sans refaire la recherche)
+    const contexteScore = { level, effectiveInput, userDysCode, contextRule, successeurs, lexiquePersonnel };
+    if (capture) {
+      capture.candidats = results;
+      capture.contexte = contexteScore;
+    }
+    results = this.scorerCandidats(results, contexteScore, poids);
+    if (mesure) t = mesure.ajouter('scoring', t);
+    
+    // Tri par score décroissant
+    results.sort((a, b) => b.score - a.score);
+    results = results.slice(0, limit);
+
+    if (mesure) {
+      mesure.ajouter('sort', t);
+      this.terminerMesure(mesure, echantillonne, trace);
+    }
+    if (sautees.size > 0) {
+      if (etapesSautees) etapesSautees.push(...sautees);
+      if (trace) trace.etapesSautees = Array.from(sautees);
+      if (this.metriques) {
+        for (const etape of sautees) this.metriques.incrementer('dys_predict_degraded_total', { stage: etape });
+      }
+    }
+
+    return results;
+  }
+
+  /**
+   * Score des candidats (étape 3 de predict), sans tri
+   * @param {Array} candidats - Candidats de la recherche (non modifiés)
+   * @param {object} contexte - { level, effectiveInput, userDysCode, contextRule, successeurs, lexiquePersonnel }
+   * @param {object} poids - Poids du scoring (null = rules/poids.json)
+   * @returns {Array} - Copies des candidats avec score, contextMatch et personnel
+   */
+  scorerCandidats(candidats, contexte, poids = null) {
+    const P = poids || this.rules.POIDS;
+    const { level, effectiveInput, userDysCode, contextRule, successeurs, lexiquePersonnel } = contexte;
+    // Trouver la fréquence max pour normaliser (matchs exacts seulement : les
+    // candidats de la recherche floue ne font pas baisser leurs scores)
+    let maxFreq = 1;
+    for (const r of candidats) {
+      const f = r.freq?.[level] || 0;
+      if (f > maxFreq && r.matchType !== 'fuzzy') maxFreq = f;
+    }
+    const now = Date.now();
     
-    results = results.map(item => {
+    return candidats.map(item => {
       let score = 0;
       const freq = item.freq?.[level] || 0;
       
-      // A. Score fréquence avec échelle logarithmique (0-60 points)
+      // A. Score fréquence avec échelle logarithmique (0-60 points par défaut)
       // log permet de mieux différencier freq:382 vs freq:0.9
       if (freq > 0) {
         const logFreq = Math.log10(freq + 1);
         const logMax = Math.log10(maxFreq + 1);
-        score += (logFreq / logMax) * 60;
+        score += Math.min(logFreq / logMax, 1) * P.frequence_log;
       }
       
       // B. Bonus fréquence absolue pour les mots très courants
-      if (freq > 100) score += 15;
-      if (freq > 300) score += 10;
+      if (freq > 100) score += P.bonus_freq_100;
+      if (freq > 300) score += P.bonus_freq_300;
       
-      // C. Bonus match orthographique (+25 points)
-      if (item.matchType === 'ortho') {
-        score += 25;
+      // C. Bonus match orthographique (+25 points) ; un match flou est un
+      //    préfixe orthographique à quelques éditions près (pénalité en I)
+      const flou = item.matchType === 'fuzzy';
+      if (item.matchType === 'ortho' || flou) {
+        score += P.match_ortho;
       }
       
-      // D. Bonus mot exact ou très proche (+40 points)
-      if (item.ortho.toLowerCase() === effectiveInput) {
-        score += 40;
-      } else if (item.ortho.toLowerCase().startsWith(effectiveInput)) {
+      // D. Bonus mot exact ou très proche (+40 points), mot entier à
+      //    quelques éditions près pour un match flou
+      if (item.ortho.toLowerCase() === effectiveInput || (flou && item.motComplet)) {
+        score += P.mot_exact;
+      } else if (flou || item.ortho.toLowerCase().startsWith(effectiveInput)) {
         // Bonus proportionnel à la longueur du match
-        const matchRatio = effectiveInput.length / item.ortho.length;
-        score += matchRatio * 20;
+        const matchRatio = Math.min(effectiveInput.length / item.ortho.length, 1);
+        score += matchRatio * P.prefixe_ortho;
       }
       
       // E. Bonus code DYS exact (+10 points)
       if (item.phon_dys === userDysCode) {
-        score += 10;
+        score += P.code_dys_exact;
       } else if (item.phon_dys?.startsWith(userDysCode)) {
         const dysMatchRatio = userDysCode.length / item.phon_dys.length;
-        score += dysMatchRatio * 8;
+        score += dysMatchRatio * P.prefixe_dys;
       }
       
       // F. Bonus mot court (favorise les mots simples)
       if (item.ortho.length <= 6) {
-        score += 8;
+        score += P.mot_court_6;
       } else if (item.ortho.length <= 8) {
-        score += 4;
+        score += P.mot_court_8;
       }
       
       // G. Pénalité mots trop longs
       const lengthDiff = item.ortho.length - effectiveInput.length;
-      if (lengthDiff > 4) {
-        score -= (lengthDiff - 4) * 3;
+      if (lengthDiff > P.marge_longueur) {
+        score -= (lengthDiff - P.marge_longueur) * P.penalite_longueur;
       }
       
       // H. Bonus contexte grammatical
       let contextMatch = false;
       if (contextRule) {
         if (this.matchesContext(item, contextRule)) {
-          score += contextRule.boost;
+          score += P.contexte[contextRule.name] ?? contextRule.boost;
           contextMatch = true;
         } else if (this.shouldPenalize(item, contextRule)) {
           // Pénaliser les formes incorrectes (ex: infinitif quand on attend conjugué)
@@ -569,13 +1043,54 @@ class PredicteurDys {
         }
       }
       
-      return { ...item, score, contextMatch };
+      // I. Pénalité distance d'édition (recherche floue), ou lettres retirées
+      //    du préfixe (fallback) : un match flou proche passe devant
+      if (flou) {
+        score -= item.editCost * P.penalite_floue;
+      } else if (item.fallback) {
+        score -= (item.profondeurFallback || 1) * P.penalite_fallback;
+      }
+      
+      // J. Bonus mot suivant probable (bigrammes, 0-20 points)
+      if (successeurs) {
+        const p = successeurs.get(item.ortho);
+        if (p) score += p * P.bigramme;
+      }
+      
+      // K. Bonus lexique personnel (mots déjà choisis par l'utilisateur)
+      let personnel = false;
+      if (lexiquePersonnel) {
+        const bonus = lexiquePersonnel.boost(item.id, now);
+        if (bonus > 0) {
+          score += bonus;
+          personnel = true;
+        }
+      }
+      
+      // Object.assign plutôt que la décomposition : nettement plus rapide
+      // sous V8 sur les gros ensembles de candidats (préfixes courts)
+      return Object.assign({}, item, { score, contextMatch, personnel });
     });
-    
-    // Tri par score décroissant
-    results.sort((a, b) => b.score - a.score);
+  }
 
-    return results.slice(0, limit);
+  /**
+   * Garde le meilleur résultat de chaque lemme, les autres formes (par score
+   * décroissant) sont listées dans son champ "formes"
+   * @param {Array} results - Résultats triés par score
+   * @param {number} limit - Nombre de lemmes gardés
+   */
+  grouperParLemme(results, limit) {
+    const groupes = new Map();
+    for (const r of results) {
+      const cle = (r.lemme || r.ortho).toLowerCase();
+      const groupe = groupes.get(cle);
+      if (!groupe) {
+        if (groupes.size < limit) groupes.set(cle, Object.assign({}, r, { formes: [] }));
+      } else if (r.ortho !== groupe.ortho && !groupe.formes.includes(r.ortho)) {
+        groupe.formes.push(r.ortho);
+      }
+    }
+    return Array.from(groupes.values());
   }
 
   /**
@@ -595,7 +1110,8 @@ class PredicteurDys {
       match: r.matchType,
       fallback: r.fallback || false,
       segmentation: r.segmentation || null,
-      contextMatch: r.contextMatch || false
+      contextMatch: r.contextMatch || false,
+      personnel: r.personnel || false
     }));
   }
 }
@@ -0,0 +1,207 @@
+const { performance } = require('perf_hooks');
+const { Trie } = require('./trie');
+
+/**
+ * RECHERCHE FLOUE (distance d'édition pondérée)
+ * Parcours d'un trie avec une ligne de Damerau-Levenshtein par nœud :
+ * les branches dont le coût minimal dépasse le seuil sont coupées.
+ *
+ * Les coûts suivent les classes de confusion DYS de chars.json :
+ * "b"→"p" ou "é"→"e" coûtent moins cher qu'une vraie substitution,
+ * une inversion ("cahmp" → "champ") coûte moins cher que deux substitutions.
+ *
+ * Recherche par préfixe : "pobel" trouve "poubelle" (une lettre oubliée).
+ * Un mot qui se termine sur le préfixe trouvé ("cahmp" → "champ") est
+ * marqué complet : c'est le mot tapé, pas une complétion ("champion").
+ */
+
+const COUT_PLEIN = 1;
+const COUT_CONFUSION = 0.5;
+const COUT_MUET = 0.5;
+const COUT_INVERSION = 0.5;
+
+/**
+ * Coûts d'édition sur l'orthographe (classes de chars.json)
+ */
+function coutsOrtho(rules) {
+  const chars = rules.CHARS || {};
+  return {
+    substitution(a, b) {
+      if (a === b) return 0;
+      const ca = chars[a];
+      if (ca !== undefined && ca !== '' && ca === chars[b]) return COUT_CONFUSION;
+      return COUT_PLEIN;
+    },
+    // Lettre muette (ex: "h") oubliée ou ajoutée
+    insertion(c) {
+      return chars[c] === '' ? COUT_MUET : COUT_PLEIN;
+    },
+    inversion: COUT_INVERSION
+  };
+}
+
+/**
+ * Coûts d'édition sur les codes DYS (voyelles proches de final_vowels.json)
+ */
+function coutsPhon(rules) {
+  const expansions = rules.FINAL_VOWEL_EXPANSIONS || {};
+  return {
+    substitution(a, b) {
+      if (a === b) return 0;
+      if (expansions[a] && expansions[a].includes(b)) return COUT_CONFUSION;
+      return COUT_PLEIN;
+    },
+    insertion() {
+      return COUT_PLEIN;
+    },
+    inversion: COUT_INVERSION
+  };
+}
+
+/**
+ * Seuil de coût par défaut selon la longueur de la requête
+ */
+function coutMaxParDefaut(longueur) {
+  if (longueur <= 4) return 1;
+  if (longueur <= 9) return 1.5;
+  return 2;
+}
+
+class RechercheFloue {
+  /**
+   * @param {Array<object>} entries - Entrées du dictionnaire
+   * @param {object} rules - Règles compilées (RuleRepository.getMappings())
+   * @param {Trie} trieOrtho - Trie orthographique déjà construit (optionnel, partagé)
+   */
+  constructor(entries, rules, trieOrtho = null, triePhon = null) {
+    this.trieOrtho = trieOrtho || Trie.depuisEntrees(entries, e => e.ortho.toLowerCase());
+    this.triePhon = triePhon || Trie.depuisEntrees(entries, e => e.phon_dys);
+    this.coutsOrtho = coutsOrtho(rules);
+    this.coutsPhon = coutsPhon(rules);
+  }
+
+  /**
+   * Recherche floue sur l'orthographe et le code DYS
+   * @param {string} input - Ce que l'utilisateur a tapé (minuscules)
+   * @param {string} userDysCode - Transcodage DYS de l'input
+   * @param {object} options
+   * @param {number} options.maxCout - Coût d'édition max (défaut selon la longueur)
+   * @param {number} options.maxParNoeud - IDs collectés max par préfixe trouvé
+   * @param {number} options.maxResultats - IDs retournés max (meilleurs coûts d'abord)
+   * @param {number} options.budgetMs - Budget de latence par requête
+   * @returns {Map<number, {cout: number, complet: boolean}>} - ID → coût d'édition
+   *          minimal, et si le mot entier (pas seulement un préfixe) est à ce coût
+   */
+  rechercher(input, userDysCode, options = {}) {
+    const {
+      maxCout = coutMaxParDefaut(input.length),
+      maxParNoeud = 50,
+      maxResultats = 200,
+      budgetMs = 10
+    } = options;
+
+    const debut = performance.now();
+    const etat = {
+      trouves: [], // { trie, noeud, cout } : préfixes à distance <= maxCout
+      maxCout,
+      deadline: debut + budgetMs / 2,
+      visites: 0,
+      interrompu: false
+    };
+
+    // Moitié du budget pour l'orthographe, le reste pour le code DYS
+    this.parcourir(this.trieOrtho, input, this.coutsOrtho, etat);
+    let interrompu = etat.interrompu;
+    if (userDysCode && userDysCode.length >= 2) {
+      etat.deadline = debut + budgetMs;
+      etat.interrompu = false;
+      this.parcourir(this.triePhon, userDysCode, this.coutsPhon, etat);
+      interrompu = interrompu || etat.interrompu;
+    }
+
+    // Collecter les IDs des meilleurs préfixes d'abord
+    etat.trouves.sort((a, b) => a.cout - b.cout);
+    const resultats = new Map();
+    for (const { trie, noeud, cout } of etat.trouves) {
+      if (resultats.size >= maxResultats) break;
+      trie.collecter(noeud, id => {
+        if (!resultats.has(id)) resultats.set(id, { cout, complet: false });
+      }, maxParNoeud);
+      if (noeud.ids) {
+        for (const id of noeud.ids) {
+          const r = resultats.get(id);
+          if (r && r.cout === cout) r.complet = true;
+        }
+      }
+    }
+
+    this.derniereRecherche = { visites: etat.visites, interrompu };
+    return resultats;
+  }
+
+  /**
+   * Parcours du trie avec les lignes de la matrice d'édition
+   * Une ligne par profondeur, réutilisée entre nœuds frères (pas d'allocation par nœud)
+   */
+  parcourir(trie, requete, couts, etat) {
+    const n = requete.length;
+    etat.lignes = [new Float64Array(n + 1)];
+    const ligne0 = etat.lignes[0];
+    for (let i = 1; i <= n; i++) {
+      ligne0[i] = ligne0[i - 1] + couts.insertion(requete[i - 1]);
+    }
+    if (!trie.racine.enfants) return;
+    for (const [char, enfant] of trie.racine.enfants) {
+      this.visiter(trie, enfant, char, '', 1, null, requete, couts, etat);
+    }
+  }
+
+  visiter(trie, noeud, char, charParent, profondeur, ligneAvantPrec, requete, couts, etat) {
+    if (etat.interrompu) return;
+    if ((++etat.visites & 255) === 0 && performance.now() > etat.deadline) {
+      etat.interrompu = true;
+      return;
+    }
+
+    const n = requete.length;
+    const lignePrec = etat.lignes[profondeur - 1];
+    let ligne = etat.lignes[profondeur];
+    if (!ligne) {
+      ligne = new Float64Array(n + 1);
+      etat.lignes[profondeur] = ligne;
+    }
+    const coutIns = couts.insertion(char);
+    ligne[0] = lignePrec[0] + coutIns;
+    let minLigne = ligne[0];
+
+    for (let i = 1; i <= n; i++) {
+      const q = requete[i - 1];
+      let cout = Math.min(
+        lignePrec[i] + coutIns,                           // lettre oubliée par l'utilisateur
+        ligne[i - 1] + couts.insertion(q),                // lettre en trop
+        lignePrec[i - 1] + couts.substitution(q, char)    // lettre confondue
+      );
+      // Inversion de deux lettres adjacentes
+      if (ligneAvantPrec && i > 1 && q === charParent && requete[i - 2] === char) {
+        cout = Math.min(cout, ligneAvantPrec[i - 2] + couts.inversion);
+      }
+      ligne[i] = cout;
+      if (cout < minLigne) minLigne = cout;
+    }
+
+    if (minLigne > etat.maxCout) return;
+
+    // Préfixe complet trouvé : tous les mots sous ce nœud sont candidats
+    const coutFinal = ligne[n];
+    if (coutFinal <= etat.maxCout && coutFinal < lignePrec[n]) {
+      etat.trouves.push({ trie, noeud, cout: coutFinal });
+    }
+
+    if (!noeud.enfants) return;
+    for (const [c, enfant] of noeud.enfants) {
+      this.visiter(trie, enfant, c, char, profondeur + 1, lignePrec, requete, couts, etat);
+    }
+  }
+}
+
+module.exports = RechercheFloue;
@@ -0,0 +1,67 @@
+/**
+ * RÉPONSE COMPACTE (?format=compact)
+ * Une ligne (tableau) par résultat au lieu d'un objet, colonnes décrites par
+ * "schema". Les champs statiques d'une entrée (lemme, cgram, genre, nombre,
+ * emoji) ne sont envoyés que si le client ne peut pas les lire dans son
+ * bundle (build_bundle_client.js) : il annonce avec "connus" la fréquence
+ * minimale de son bundle, toutes les entrées au-dessus y sont.
+ *
+ * Les colonnes nulles en fin de ligne sont omises. Même format que
+ * supabase_export/functions/predict/compact.ts (edge function, décodage côté client).
+ */
+
+const DRAPEAU_CONTEXTE = 1;
+const DRAPEAU_PERSONNEL = 2;
+const DRAPEAU_FALLBACK = 4;
+
+const COLONNES_STATIQUES = ['lemme', 'cgram', 'genre', 'nombre', 'emoji'];
+
+/**
+ * Colonnes des lignes compactes
+ * @param {boolean} formes - Résultats groupés par lemme (colonne "formes")
+ */
+function schemaCompact(formes = false) {
+  return ['id', 'mot', 'score', 'match', 'drapeaux', 'segmentation']
+    .concat(formes ? ['formes'] : [], COLONNES_STATIQUES);
+}
+
+/**
+ * Fréquence arrondie comme dans le dictionnaire optimisé et le bundle client
+ */
+function arrondirFreq(freq) {
+  return Math.round((freq || 0) * 10) / 10;
+}
+
+/**
+ * @param {Array} results - Résultats de predict()
+ * @param {object} options
+ * @param {function(object): number} options.freq - Fréquence d'un résultat (niveau du bundle)
+ * @param {function(string): string|null} options.emoji - Emoji d'un lemme
+ * @param {number|null} options.connus - Fréquence minimale du bundle client (null = aucun bundle)
+ * @param {boolean} options.formes - Résultats groupés par lemme
+ * @returns {Array<Array>} - Lignes dans l'ordre de schemaCompact(formes)
+ */
+function compacterResultats(results, { freq, emoji, connus = null, formes = false }) {
+  return results.map(r => {
+    const drapeaux = (r.contextMatch ? DRAPEAU_CONTEXTE : 0) |
+      (r.personnel ? DRAPEAU_PERSONNEL : 0) |
+      (r.fallback ? DRAPEAU_FALLBACK : 0);
+    const ligne = [r.id, r.ortho, Math.round((r.score || 0) * 10) / 10, r.matchType, drapeaux, r.segmentation || null];
+    if (formes) ligne.push(r.formes && r.formes.length > 0 ? r.formes : null);
+    // Les mots d'un lexique de classe ne sont jamais dans le bundle
+    if (connus == null || r.overlay || arrondirFreq(freq(r)) < connus) {
+      ligne.push(r.lemme || null, r.cgram || null, r.genre || null, r.nombre || null, r.emoji || emoji(r.lemme));
+    }
+    while (ligne[ligne.length - 1] == null) ligne.pop();
+    return ligne;
+  });
+}
+
+module.exports = {
+  DRAPEAU_CONTEXTE,
+  DRAPEAU_PERSONNEL,
+  DRAPEAU_FALLBACK,
+  schemaCompact,
+  arrondirFreq,
+  compacterResultats
+};
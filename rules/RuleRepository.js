@@ -1,6 +1,27 @@
+const crypto = require('crypto');
 const fs = require('fs');
 const path = require('path');
 
+// Poids du scoring de predict() : valeurs d'origine, pour les clés absentes de poids.json
+const POIDS_DEFAUT = {
+  frequence_log: 60,
+  bonus_freq_100: 15,
+  bonus_freq_300: 10,
+  match_ortho: 25,
+  mot_exact: 40,
+  prefixe_ortho: 20,
+  code_dys_exact: 10,
+  prefixe_dys: 8,
+  mot_court_6: 8,
+  mot_court_8: 4,
+  marge_longueur: 4,
+  penalite_longueur: 3,
+  penalite_floue: 60,
+  penalite_fallback: 0,
+  bigramme: 20
+};
+const BOOST_CONTEXTE_DEFAUT = 20;
+
 /**
  * RULE REPOSITORY
  * Gère le chargement et l'accès aux règles de mapping DYS
@@ -11,6 +32,7 @@ class RuleRepository {
     this.rulesDir = rulesDir;
     this.rules = {};
     this.compiled = null;
+    this.version = null;
     this.load();
   }
 
@@ -26,10 +48,17 @@ class RuleRepository {
     this.rules.orthoEquiv = this.loadFile('ortho_equiv.json');
     this.rules.segmentation = this.loadFile('segmentation.json');
     this.rules.context = this.loadFile('context.json');
+    this.rules.poids = this.loadFile('poids.json');
     
     // Compiler les règles pour un accès rapide
     this.compile();
     
+    // Empreinte du contenu des règles (invalide les tables précalculées)
+    this.version = crypto.createHash('sha1')
+      .update(JSON.stringify(this.rules))
+      .digest('hex')
+      .slice(0, 12);
+    
     console.log(`✅ Règles chargées: ${this.countRules()} règles au total`);
   }
 
@@ -51,13 +80,15 @@ class RuleRepository {
    * Compile les règles pour un accès rapide
    */
   compile() {
+    const context = this.compileContext();
     this.compiled = {
       PATTERNS: this.compilePatterns(),
       CHARS: this.compileChars(),
       FINAL_VOWEL_EXPANSIONS: this.compileFinalVowels(),
       ORTHO_EQUIVALENTS: this.compileOrthoEquiv(),
       SEGMENTATION: this.compileSegmentation(),
-      CONTEXT: this.compileContext(),
+      CONTEXT: context,
+      POIDS: this.compilePoids(context),
       NASAL_STARTS: new Set(['a', 'e', 'i', 'o', 'u', 'y'])
     };
   }
@@ -186,7 +217,7 @@ class RuleRepository {
           infover_match: rule.filter.infover_match || null,
           infover_exclude: rule.filter.infover_exclude || null
         },
-        boost: rule.boost || 20,
+        boost: this.rules.poids?.contexte?.[ruleName] ?? rule.boost ?? BOOST_CONTEXTE_DEFAUT,
         penalty: rule.penalty_non_match || 0
       };
       
@@ -199,6 +230,23 @@ class RuleRepository {
     return triggerMap;
   }
 
+  /**
+   * Compile les poids du scoring (poids.json, valeurs par défaut pour les clés absentes)
+   * Les bonus de contexte sont aussi dans CONTEXT (boost de chaque règle)
+   */
+  compilePoids(context) {
+    const poids = Object.assign({}, POIDS_DEFAUT);
+    const p = this.rules.poids || {};
+    for (const [cle, valeur] of Object.entries(p)) {
+      if (!cle.startsWith('_') && typeof valeur === 'number') poids[cle] = valeur;
+    }
+    poids.contexte = {};
+    for (const rule of context.values()) {
+      poids.contexte[rule.name] = rule.boost;
+    }
+    return poids;
+  }
+
   /**
    * Compte le nombre total de règles
    */
@@ -255,6 +303,13 @@ class RuleRepository {
     return this.compiled?.CONTEXT || new Map();
   }
 
+  /**
+   * Empreinte des règles chargées (change à chaque modification d'un fichier)
+   */
+  getVersion() {
+    return this.version;
+  }
+
   /**
    * Retourne toutes les règles compilées (format compatible avec l'ancien MAPPINGS)
    */
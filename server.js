@@ -1,29 +1,183 @@
+const crypto = require('crypto');
 const express = require('express');
+const { performance } = require('perf_hooks');
 const path = require('path');
-const PredicteurDys = require('./predicteur');
+const { GestionnaireDictionnaire } = require('./gestion_dictionnaire');
+const LexiquePersonnel = require('./lexique_personnel');
+const OverlayLexique = require('./overlay_lexique');
+const { Metriques } = require('./metriques');
+const { SessionPrediction } = require('./session_prediction');
+const { schemaCompact, compacterResultats } = require('./reponse_compacte');
+const { CorrecteurPhrase } = require('./correction_phrase');
 
 const app = express();
 const PORT = 3000;
 
-// Charger le prédicteur
+// Métriques Prometheus (activées sur le prédicteur après son préchauffage)
+// METRICS=0 pour désactiver
+const metriques = process.env.METRICS === '0' ? null : new Metriques();
+
+// Charger le prédicteur (versions du dictionnaire, rechargées à chaud)
+// DICT_WATCH=1 : recharger à chaque modification du fichier
 console.log("🚀 Démarrage du serveur...");
-const predicteur = new PredicteurDys('data/dictionnaire_dys.json');
+const gestionnaire = new GestionnaireDictionnaire('data/dictionnaire_dys.json', { metriques });
+if (process.env.DICT_WATCH === '1') gestionnaire.surveiller();
+
+// Budget de latence d'un appel à predict() (ms) : au-delà, les étapes coûteuses
+// sont sautées et listées dans le champ "degraded" de la réponse
+// PREDICT_BUDGET_MS=0 pour désactiver
+const BUDGET_PREDICT_MS = process.env.PREDICT_BUDGET_MS === '0'
+    ? null
+    : (parseFloat(process.env.PREDICT_BUDGET_MS) || 25);
+
+// Correspondance des IDs d'une version du dictionnaire à une autre (mêmes
+// mots), calculée une fois par paire de versions
+const traductionsIds = new WeakMap();
+
+function traductionIds(de, vers) {
+    let parVersion = traductionsIds.get(de);
+    if (!parVersion) {
+        parVersion = new WeakMap();
+        traductionsIds.set(de, parVersion);
+    }
+    let nouvelId = parVersion.get(vers);
+    if (!nouvelId) {
+        const ids = new Map();
+        const cle = e => `${e.ortho}\t${e.cgram}\t${e.genre}\t${e.nombre}`;
+        for (const e of vers.entries) {
+            if (!ids.has(cle(e))) ids.set(cle(e), e.id);
+        }
+        // Mots de classe : IDs au-delà de toute base, dans l'espace de leur classe, inchangés (voir OverlayLexique)
+        nouvelId = id => de.entries[id] ? ids.get(cle(de.entries[id])) : (id >= OverlayLexique.ID_DEBUT ? id : undefined);
+        parVersion.set(vers, nouvelId);
+    }
+    return nouvelId;
+}
+
+// Lexiques personnels par utilisateur (uid = session ou appareil)
+// Chacun est numéroté pour une version du dictionnaire et renuméroté à la
+// première requête sur une autre version : les sessions encore sur l'ancienne
+// version gardent des IDs cohérents jusqu'à leur frappe suivante
+const MAX_LEXIQUES = 10000;
+const lexiquesPersonnels = new Map(); // uid → { lexique, predicteur }
+
+function getLexiquePersonnel(uid, predicteur, creer = false) {
+    if (!uid) return null;
+    const entree = lexiquesPersonnels.get(uid);
+    if (metriques) {
+        metriques.incrementer(entree ? 'dys_cache_hits_total' : 'dys_cache_misses_total', { cache: 'lexique' });
+    }
+    if (entree) {
+        // Rafraîchir la position LRU
+        lexiquesPersonnels.delete(uid);
+        lexiquesPersonnels.set(uid, entree);
+        if (entree.predicteur !== predicteur) {
+            entree.lexique.renumeroter(traductionIds(entree.predicteur, predicteur), predicteur.dictVersion);
+            entree.predicteur = predicteur;
+        }
+        return entree.lexique;
+    }
+    if (!creer) return null;
+    return placerLexiquePersonnel(uid, new LexiquePersonnel({ version: predicteur.dictVersion }), predicteur);
+}
+
+// Insertion en tête de LRU (création ou import), le plus ancien est évincé
+function placerLexiquePersonnel(uid, lexique, predicteur) {
+    lexiquesPersonnels.delete(uid);
+    lexiquesPersonnels.set(uid, { lexique, predicteur });
+    if (lexiquesPersonnels.size > MAX_LEXIQUES) {
+        lexiquesPersonnels.delete(lexiquesPersonnels.keys().next().value);
+    }
+    return lexique;
+}
+
+// Lexiques de classe (mots ajoutés par l'enseignant, cid = classe)
+// Fusionnés à la requête avec ?classe=cid, la base reste partagée. Un
+// OverlayLexique par version du dictionnaire en service (transcodage et
+// automate de cette version, mêmes IDs), libéré avec elle
+const MAX_CLASSES = 1000;
+const lexiquesClasses = new Map(); // cid → { mots, espace, overlays: WeakMap predicteur → OverlayLexique }
+// Espace d'IDs du dernier lexique de classe créé : chaque lexique (création ou
+// remplacement) a le sien, un mot choisi dans une classe ne booste jamais un
+// mot d'une autre classe ou d'une ancienne liste
+let dernierEspaceClasse = 0;
+
+// Lexique de classe remplacé ou supprimé : ses mots quittent les lexiques personnels
+function oublierClasse(classe) {
+    if (!classe) return;
+    for (const { lexique } of lexiquesPersonnels.values()) {
+        lexique.oublier(id => OverlayLexique.espaceDe(id) === classe.espace);
+    }
+}
+
+// Construit à la première requête sur une version, puis réutilisé : des
+// requêtes sur deux versions en alternance ne reconstruisent rien
+function getOverlay(cid, predicteur) {
+    if (!cid) return null;
+    const classe = lexiquesClasses.get(cid);
+    if (!classe) return null;
+    let overlay = classe.overlays.get(predicteur);
+    if (!overlay) {
+        overlay = new OverlayLexique(predicteur, classe.mots, classe.espace);
+        classe.overlays.set(predicteur, overlay);
+    }
+    // Rafraîchir la position LRU
+    lexiquesClasses.delete(cid);
+    lexiquesClasses.set(cid, classe);
+    return overlay;
+}
 
 // Servir les fichiers statiques
 app.use(express.static('public'));
+app.use(express.json());
 
-// API de prédiction
-app.get('/api/predict', (req, res) => {
-    const input = req.query.q || '';
-    const prevWord = req.query.prev || '';
-    const limit = parseInt(req.query.limit) || 10;
-    
-    if (input.length < 1) {
-        return res.json({ results: [] });
-    }
-    
-    const results = predicteur.predict(input, { limit, prevWord });
-    
+// Version du dictionnaire : acquise pour la durée de la requête (l'ancienne
+// version reste chargée tant qu'une requête l'utilise) et annoncée dans les
+// en-têtes, pour que les caches en tiennent compte
+app.use('/api', (req, res, next) => {
+    const version = gestionnaire.acquerir();
+    let libere = false;
+    req.version = version;
+    req.libererVersion = () => {
+        if (libere) return;
+        libere = true;
+        gestionnaire.liberer(version);
+    };
+    res.on('close', req.libererVersion);
+    res.set({ 'X-Dict-Version': version.dictionnaire, 'X-Rules-Version': version.regles });
+    next();
+});
+
+// Durée des requêtes API
+if (metriques) {
+    app.use('/api', (req, res, next) => {
+        const debut = process.hrtime.bigint();
+        res.on('finish', () => {
+            const secondes = Number(process.hrtime.bigint() - debut) / 1e9;
+            metriques.observer('dys_http_request_seconds', secondes, { route: req.route ? req.route.path : 'autre', status: res.statusCode });
+        });
+        next();
+    });
+}
+
+// Export Prometheus
+app.get('/metrics', (req, res) => {
+    if (!metriques) return res.status(404).send('Métriques désactivées (METRICS=0)\n');
+    res.type('text/plain; version=0.0.4').send(metriques.exporter());
+});
+
+// Format de réponse demandé (?format=compact&grouper=lemme&connus=1.2)
+function lireFormat(params) {
+    const connus = parseFloat(params.connus);
+    return {
+        compact: params.format === 'compact',
+        grouperLemmes: params.grouper === 'lemme',
+        connus: Number.isFinite(connus) ? connus : null
+    };
+}
+
+// Réponse de prédiction (GET /api/predict et sessions)
+function formaterReponse(predicteur, input, prevWord, results, etapesSautees = [], format = {}) {
     // Récupérer le contexte détecté
     const contextRule = predicteur.getContextFilter(prevWord);
     const contextInfo = contextRule ? {
@@ -31,30 +185,260 @@ app.get('/api/predict', (req, res) => {
         boost: contextRule.boost
     } : null;
     
-    const formatted = results.map(r => ({
-        mot: r.ortho,
-        lemme: r.lemme,
-        emoji: predicteur.getEmoji(r.lemme),
-        phon: r.phon,
-        phon_dys: r.phon_dys,
-        cgram: r.cgram,
-        genre: r.genre,
-        nombre: r.nombre,
-        freq: r.freq?.cp_cm2?.toFixed(1) || '0',
-        score: r.score?.toFixed(1) || '0',
-        match: r.matchType,
-        segmentation: r.segmentation || null,
-        contextMatch: r.contextMatch || false
-    }));
-    
-    res.json({
+    const response = {
         input,
         prevWord: prevWord || null,
         code_dys: predicteur.transcode(input),
         context: contextInfo,
-        count: formatted.length,
-        results: formatted
+        count: results.length
+    };
+    
+    if (format.compact) {
+        // Lignes + schéma ; champs statiques résolus par le client (bundle)
+        response.schema = schemaCompact(format.grouperLemmes);
+        response.results = compacterResultats(results, {
+            freq: r => r.freq?.cp_cm2,
+            emoji: lemme => predicteur.getEmoji(lemme),
+            connus: format.connus,
+            formes: format.grouperLemmes
+        });
+    } else {
+        response.results = results.map(r => {
+            const formatted = {
+                id: r.id,
+                mot: r.ortho,
+                lemme: r.lemme,
+                emoji: r.emoji || predicteur.getEmoji(r.lemme),
+                phon: r.phon,
+                phon_dys: r.phon_dys,
+                cgram: r.cgram,
+                genre: r.genre,
+                nombre: r.nombre,
+                freq: r.freq?.cp_cm2?.toFixed(1) || '0',
+                score: r.score?.toFixed(1) || '0',
+                match: r.matchType,
+                segmentation: r.segmentation || null,
+                contextMatch: r.contextMatch || false,
+                personnel: r.personnel || false,
+                classe: r.overlay || false
+            };
+            if (r.formes) formatted.formes = r.formes;
+            return formatted;
+        });
+    }
+    if (etapesSautees.length > 0) response.degraded = etapesSautees;
+    return response;
+}
+
+// API de prédiction
+app.get('/api/predict', (req, res) => {
+    const input = req.query.q || '';
+    const prevWord = req.query.prev || '';
+    const prevWord2 = req.query.prev2 || '';
+    // Borné comme les sessions : grouperLemmes multiplie encore par 3
+    const limit = Math.min(Math.max(parseInt(req.query.limit) || 10, 1), 50);
+    const lexiquePersonnel = getLexiquePersonnel(req.query.uid, req.version.predicteur);
+    const overlay = getOverlay(req.query.classe, req.version.predicteur);
+    const trace = req.query.debug ? {} : null;
+    const format = lireFormat(req.query);
+    
+    // Sans input, seul le mot suivant (bigrammes) peut être suggéré
+    if (input.length < 1 && !prevWord) {
+        return res.json({ results: [] });
+    }
+    
+    const predicteur = req.version.predicteur;
+    const etapesSautees = [];
+    const results = predicteur.predict(input, {
+        limit, prevWord, prevWord2, lexiquePersonnel, overlay, trace,
+        budgetMs: BUDGET_PREDICT_MS, etapesSautees, grouperLemmes: format.grouperLemmes
     });
+    const response = formaterReponse(predicteur, input, prevWord, results, etapesSautees, format);
+    
+    // Durées par étape (?debug=1)
+    if (trace && trace.etapes) {
+        response.debug = trace;
+        const timings = Object.entries(trace.etapes).map(([nom, ms]) => `${nom};dur=${ms}`);
+        timings.push(`total;dur=${trace.totalMs}`);
+        res.set('Server-Timing', timings.join(', '));
+    }
+    
+    res.json(response);
+});
+
+// Sessions de prédiction en flux (SSE)
+// GET /api/session ouvre le flux : événement "session" avec le sid, puis un
+// événement "prediction" par frappe calculée (format choisi à l'ouverture,
+// mêmes paramètres que /api/predict). Les frappes sont envoyées sans
+// debounce par POST /api/session/:sid { q, prev, prev2, seq, limit } ;
+// seule la plus récente est calculée.
+const sessions = new Map();
+
+function envoyerEvenement(res, evenement, donnees) {
+    res.write(`event: ${evenement}\ndata: ${JSON.stringify(donnees)}\n\n`);
+}
+
+app.get('/api/session', (req, res) => {
+    const sid = crypto.randomUUID();
+    res.set({
+        'Content-Type': 'text/event-stream',
+        'Cache-Control': 'no-cache',
+        'Connection': 'keep-alive'
+    });
+    res.flushHeaders();
+    
+    // La session garde sa version du dictionnaire jusqu'à la frappe qui suit
+    // une bascule, pas jusqu'à la fermeture du flux
+    const entree = { uid: req.query.uid || null, classe: req.query.classe || null, version: gestionnaire.acquerir() };
+    req.libererVersion();
+    
+    const format = lireFormat(req.query);
+    entree.session = new SessionPrediction(entree.version.predicteur, (frappe, results, etapesSautees) => {
+        const { predicteur, dictionnaire, regles } = entree.version;
+        envoyerEvenement(res, 'prediction', {
+            seq: frappe.seq,
+            version: { dictionnaire, regles },
+            ...formaterReponse(predicteur, frappe.q, frappe.prev, results, etapesSautees, format)
+        });
+    }, { metriques, budgetMs: BUDGET_PREDICT_MS, grouperLemmes: format.grouperLemmes });
+    sessions.set(sid, entree);
+    envoyerEvenement(res, 'session', { sid, version: { dictionnaire: entree.version.dictionnaire, regles: entree.version.regles } });
+    
+    // Commentaire périodique : garde la connexion ouverte derrière les proxys
+    const battement = setInterval(() => res.write(': ping\n\n'), 25000);
+    req.on('close', () => {
+        clearInterval(battement);
+        sessions.delete(sid);
+        gestionnaire.liberer(entree.version);
+    });
+});
+
+app.post('/api/session/:sid', (req, res) => {
+    const entree = sessions.get(req.params.sid);
+    if (!entree) {
+        return res.status(404).json({ error: 'Session inconnue ou fermée' });
+    }
+    const { q = '', prev = '', prev2 = '', seq, limit } = req.body || {};
+    if (!Number.isInteger(seq) || typeof q !== 'string') {
+        return res.status(400).json({ error: 'q et seq (entier croissant) requis' });
+    }
+    if (entree.version !== req.version) {
+        gestionnaire.liberer(entree.version);
+        entree.version = gestionnaire.acquerir();
+        entree.session.changerPredicteur(entree.version.predicteur);
+    }
+    const accepte = entree.session.frappe({
+        q, prev, prev2, seq,
+        limit: Math.min(Math.max(parseInt(limit) || 10, 1), 50),
+        lexiquePersonnel: getLexiquePersonnel(entree.uid, entree.version.predicteur),
+        overlay: getOverlay(entree.classe, entree.version.predicteur)
+    });
+    res.status(202).json({ ok: accepte, seq });
+});
+
+// Correction d'un texte complet (texte d'élève collé par l'enseignant)
+// POST /api/corriger { texte } → texte corrigé et, par mot, la correction
+// retenue et ses alternatives
+const MAX_CARACTERES_CORRECTION = 20000;
+
+// Un correcteur (et son cache de candidats) par version du dictionnaire
+function getCorrecteur(version) {
+    if (!version.correcteur) version.correcteur = new CorrecteurPhrase(version.predicteur, { metriques });
+    return version.correcteur;
+}
+
+app.post('/api/corriger', (req, res) => {
+    const { texte } = req.body || {};
+    if (typeof texte !== 'string') {
+        return res.status(400).json({ error: 'texte requis' });
+    }
+    if (texte.length > MAX_CARACTERES_CORRECTION) {
+        return res.status(413).json({ error: `Texte limité à ${MAX_CARACTERES_CORRECTION} caractères` });
+    }
+    const debut = performance.now();
+    const resultat = getCorrecteur(req.version).corriger(texte);
+    resultat.ms = +(performance.now() - debut).toFixed(1);
+    res.json(resultat);
+});
+
+// Enregistrer une suggestion acceptée
+app.post('/api/select', (req, res) => {
+    const { uid, id, classe } = req.body || {};
+    const predicteur = req.version.predicteur;
+    const overlay = getOverlay(classe, predicteur);
+    if (!uid || !Number.isInteger(id) || !(predicteur.entries[id] || (overlay && overlay.entree(id)))) {
+        return res.status(400).json({ error: 'uid et id valides requis' });
+    }
+    getLexiquePersonnel(uid, predicteur, true).enregistrer(id);
+    res.json({ ok: true });
+});
+
+// Exporter / importer le lexique personnel (persistance côté client)
+app.get('/api/profil/:uid', (req, res) => {
+    const lexique = getLexiquePersonnel(req.params.uid, req.version.predicteur);
+    res.json({ uid: req.params.uid, lexique: lexique ? lexique.serialize() : [] });
+});
+
+// Un lexique exporté depuis une autre version du dictionnaire est ignoré
+// (ses IDs désigneraient d'autres mots) : count indique ce qui a été repris
+app.put('/api/profil/:uid', (req, res) => {
+    const predicteur = req.version.predicteur;
+    const lexique = LexiquePersonnel.deserialize(req.body?.lexique, { version: predicteur.dictVersion });
+    placerLexiquePersonnel(req.params.uid, lexique, predicteur);
+    res.json({ ok: true, count: lexique.size });
+});
+
+// Lexique d'une classe : PUT { mots: ["volcan", { ortho: "Kylian", cgram: "NOM" }] }
+// remplace le lexique (effet dès la frappe suivante, sessions ouvertes comprises)
+app.get('/api/classe/:cid/lexique', (req, res) => {
+    const overlay = getOverlay(req.params.cid, req.version.predicteur);
+    res.json({ classe: req.params.cid, mots: overlay ? overlay.serialize() : [] });
+});
+
+app.put('/api/classe/:cid/lexique', (req, res) => {
+    const debut = performance.now();
+    let overlay;
+    try {
+        overlay = new OverlayLexique(req.version.predicteur, req.body?.mots, dernierEspaceClasse + 1);
+    } catch (e) {
+        return res.status(400).json({ error: e.message });
+    }
+    dernierEspaceClasse++;
+    oublierClasse(lexiquesClasses.get(req.params.cid));
+    lexiquesClasses.delete(req.params.cid);
+    lexiquesClasses.set(req.params.cid, {
+        mots: overlay.serialize(),
+        espace: overlay.espace,
+        overlays: new WeakMap([[req.version.predicteur, overlay]])
+    });
+    if (lexiquesClasses.size > MAX_CLASSES) {
+        lexiquesClasses.delete(lexiquesClasses.keys().next().value);
+    }
+    res.json({ ok: true, count: overlay.size, ms: +(performance.now() - debut).toFixed(1) });
+});
+
+app.delete('/api/classe/:cid/lexique', (req, res) => {
+    oublierClasse(lexiquesClasses.get(req.params.cid));
+    res.json({ ok: lexiquesClasses.delete(req.params.cid) });
+});
+
+// Version servie (dictionnaire, règles, anciennes versions encore utilisées)
+app.get('/api/version', (req, res) => {
+    res.json(gestionnaire.etat());
+});
+
+// Recharger le dictionnaire après un déploiement (fichier remplacé sur place)
+// Authorization: Bearer $ADMIN_TOKEN ; désactivé si ADMIN_TOKEN n'est pas défini
+app.post('/api/admin/dictionnaire', async (req, res) => {
+    const jeton = process.env.ADMIN_TOKEN;
+    const attendu = Buffer.from(`Bearer ${jeton}`);
+    const recu = Buffer.from(req.get('authorization') || '');
+    if (!jeton || recu.length !== attendu.length || !crypto.timingSafeEqual(recu, attendu)) {
+        return res.status(403).json({ error: 'Jeton d\'administration requis' });
+    }
+    req.libererVersion(); // Ne pas retenir l'ancienne version pendant la vérification
+    const resultat = await gestionnaire.recharger();
+    res.status(resultat.ok ? 200 : 422).json(resultat);
 });
 
 // Démarrer le serveur
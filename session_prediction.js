@@ -0,0 +1,157 @@
+/**
+ * SESSIONS DE PRÉDICTION (flux SSE de server.js)
+ * Une session par onglet ouvert : chaque frappe est envoyée sans debounce,
+ * la session garde l'état du mot en cours et ne calcule que la frappe la
+ * plus récente.
+ *
+ * - MemoRecherche : transcodage, recherche ortho, phonétique et floue par
+ *   préfixe recherché. En ajoutant une lettre, les recherches ortho et
+ *   phonétique filtrent les candidats du préfixe précédent au lieu de
+ *   reparcourir les index, et le fallback retombe sur les préfixes déjà
+ *   calculés ; en effaçant, tout est déjà en mémoire.
+ * - Frappes périmées : une frappe remplacée avant son calcul est abandonnée,
+ *   un résultat dépassé par une frappe plus récente n'est pas envoyé.
+ */
+
+const TAILLE_MEMO = 128; // Préfixes gardés par étape
+
+class MemoRecherche {
+  /**
+   * @param {Metriques|null} metriques - Compte les hits/misses (cache="session")
+   */
+  constructor(metriques = null, taille = TAILLE_MEMO) {
+    this.etapes = new Map(); // étape → Map<préfixe, résultat>
+    this.taille = taille;
+    this.metriques = metriques;
+  }
+
+  /**
+   * Résultat mémorisé d'une étape, calculé à la première demande
+   * @param {string} etape - 'transcode', 'ortho', 'phon' ou 'fuzzy'
+   * @param {string} cle - Préfixe recherché
+   * @param {function(): *} calculer
+   * @param {function(Array, string): (Array|null)} affiner - Optionnel : tire
+   *        le résultat de celui du plus long préfixe mémorisé de cle (frappe
+   *        suivante) ; null (non applicable) ou vide : calculer()
+   */
+  obtenir(etape, cle, calculer, affiner = null) {
+    let table = this.etapes.get(etape);
+    if (!table) {
+      table = new Map();
+      this.etapes.set(etape, table);
+    }
+    if (table.has(cle)) {
+      if (this.metriques) this.metriques.incrementer('dys_cache_hits_total', { cache: 'session' });
+      return table.get(cle);
+    }
+    if (this.metriques) this.metriques.incrementer('dys_cache_misses_total', { cache: 'session' });
+
+    let valeur = null;
+    if (affiner) {
+      for (let n = cle.length - 1; n > 0; n--) {
+        const court = cle.slice(0, n);
+        if (table.has(court)) {
+          valeur = affiner(table.get(court), court);
+          break;
+        }
+      }
+    }
+    if (!valeur || valeur.length === 0) valeur = calculer();
+    if (table.size >= this.taille) table.delete(table.keys().next().value);
+    table.set(cle, valeur);
+    return valeur;
+  }
+
+  vider() {
+    this.etapes.clear();
+  }
+}
+
+class SessionPrediction {
+  /**
+   * @param {PredicteurDys} predicteur
+   * @param {function(object, Array, Array)} envoyer - Reçoit la frappe, ses résultats
+   *        et les étapes sautées faute de budget
+   * @param {object} options - { metriques, budgetMs, grouperLemmes }
+   */
+  constructor(predicteur, envoyer, options = {}) {
+    this.predicteur = predicteur;
+    this.envoyer = envoyer;
+    this.memo = new MemoRecherche(options.metriques || null);
+    this.budgetMs = options.budgetMs ?? null;
+    this.grouperLemmes = options.grouperLemmes || false;
+    this.prevWord = '';
+    this.derniereSeq = -1;
+    this.enAttente = null;
+    this.planifie = false;
+    this.stats = { frappes: 0, calculees: 0, abandonnees: 0 };
+  }
+
+  /**
+   * Nouvelle frappe du client
+   * @param {object} frappe - { q, prev, prev2, seq, limit, lexiquePersonnel, overlay }
+   * @returns {boolean} - false si la frappe est plus ancienne que la dernière reçue
+   */
+  frappe(frappe) {
+    if (frappe.seq <= this.derniereSeq) return false;
+    this.derniereSeq = frappe.seq;
+    this.stats.frappes++;
+
+    // La frappe précédente n'a pas encore été calculée : elle est remplacée
+    if (this.enAttente) this.stats.abandonnees++;
+    this.enAttente = frappe;
+
+    // Calcul au prochain tour de boucle : les frappes arrivées entre-temps
+    // (requêtes HTTP déjà reçues) remplacent celle-ci
+    if (!this.planifie) {
+      this.planifie = true;
+      setImmediate(() => this.traiter());
+    }
+    return true;
+  }
+
+  /**
+   * Nouvelle version du dictionnaire : les préfixes mémorisés sont périmés
+   */
+  changerPredicteur(predicteur) {
+    if (predicteur === this.predicteur) return;
+    this.predicteur = predicteur;
+    this.memo.vider();
+  }
+
+  traiter() {
+    this.planifie = false;
+    const frappe = this.enAttente;
+    this.enAttente = null;
+    if (!frappe) return;
+
+    // Nouveau mot : les préfixes du mot précédent ne servent plus
+    const { q = '', prev = '', prev2 = '', limit = 10, lexiquePersonnel = null, overlay = null } = frappe;
+    if (prev !== this.prevWord) {
+      this.memo.vider();
+      this.prevWord = prev;
+    }
+
+    const etapesSautees = [];
+    const results = (q.trim() || prev)
+      ? this.predicteur.predict(q, {
+          limit, prevWord: prev, prevWord2: prev2, lexiquePersonnel, overlay,
+          memo: this.memo, budgetMs: this.budgetMs, etapesSautees,
+          grouperLemmes: this.grouperLemmes
+        })
+      : [];
+    this.stats.calculees++;
+
+    // Les frappes reçues pendant le calcul sont traitées avant l'envoi :
+    // si l'une d'elles est plus récente, ce résultat est déjà périmé
+    setImmediate(() => {
+      if (this.derniereSeq > frappe.seq) {
+        this.stats.abandonnees++;
+        return;
+      }
+      this.envoyer(frappe, results, etapesSautees);
+    });
+  }
+}
+
+module.exports = { SessionPrediction, MemoRecherche };
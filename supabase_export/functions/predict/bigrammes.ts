@@ -0,0 +1,60 @@
+/**
+ * MODÈLE DE MOT SUIVANT (version Edge)
+ * Lecteur du fichier binaire produit par build_bigrammes.py (voir bigrammes.js).
+ */
+
+const VERSION = 1;
+const MAX_ID = 1 << 20;
+const TAILLE_ENTETE = 24;
+
+export class ModeleBigrammes {
+  public totalEntries: number;
+  private cles: Float64Array;
+  private offsets: Uint32Array;
+  private suivants: Uint32Array;
+  private poids: Uint8Array;
+
+  constructor(buffer: ArrayBuffer) {
+    const view = new DataView(buffer);
+    const magic = String.fromCharCode(...new Uint8Array(buffer, 0, 4));
+    if (magic !== "DYSB") throw new Error("Fichier bigrammes invalide (magic)");
+    const version = view.getUint32(4, true);
+    if (version !== VERSION) throw new Error(`Version bigrammes non supportée: ${version}`);
+    const nbContextes = view.getUint32(8, true);
+    const nbPaires = view.getUint32(12, true);
+    this.totalEntries = view.getUint32(16, true);
+
+    let offset = TAILLE_ENTETE;
+    this.cles = new Float64Array(buffer, offset, nbContextes);
+    offset += nbContextes * 8;
+    this.offsets = new Uint32Array(buffer, offset, nbContextes + 1);
+    offset += (nbContextes + 1) * 4;
+    this.suivants = new Uint32Array(buffer, offset, nbPaires);
+    offset += nbPaires * 4;
+    this.poids = new Uint8Array(buffer, offset, nbPaires);
+  }
+
+  private trouverContexte(prev1: number, prev2 = -1): number {
+    const cle = (prev2 + 1) * MAX_ID + prev1;
+    let lo = 0;
+    let hi = this.cles.length - 1;
+    while (lo <= hi) {
+      const mid = (lo + hi) >>> 1;
+      const v = this.cles[mid];
+      if (v === cle) return mid;
+      if (v < cle) lo = mid + 1;
+      else hi = mid - 1;
+    }
+    return -1;
+  }
+
+  successeurs(prev1: number, prev2 = -1): { ids: Uint32Array; poids: Uint8Array } | null {
+    if (prev1 < 0) return null;
+    let pos = prev2 >= 0 ? this.trouverContexte(prev1, prev2) : -1;
+    if (pos === -1) pos = this.trouverContexte(prev1);
+    if (pos === -1) return null;
+    const debut = this.offsets[pos];
+    const fin = this.offsets[pos + 1];
+    return { ids: this.suivants.subarray(debut, fin), poids: this.poids.subarray(debut, fin) };
+  }
+}
@@ -0,0 +1,73 @@
+/**
+ * REQUÊTES GET CACHABLES (CDN, cache HTTP)
+ * Une même saisie tapée par des milliers d'élèves ("ma", "le", "cha") doit
+ * donner une seule URL : le cache la sert sans appeler predict().
+ *
+ * Forme canonique (paramètres dans cet ordre) :
+ *   query    : minuscules, sans espaces autour
+ *   ctx      : classe de contexte du mot précédent ("determinants_masc_sing|liaisons_n"),
+ *              à la place de prevWord quand celui-ci n'a pas de successeurs de bigrammes
+ *   prevWord, prevWord2 : seulement s'ils ont des successeurs (voir contexteCanonique)
+ *   limit    : borné à [1, 50]
+ *   format=compact, grouper=lemme, connus : comme le POST
+ * Une URL non canonique est redirigée (308, cachable) vers sa forme canonique.
+ */
+
+import type { PredicteurDys } from "./predicteur.ts";
+
+export const LIMITE_DEFAUT = 10;
+export const LIMITE_MAX = 50;
+
+export interface RequeteCanonique {
+  query: string;
+  ctx?: string;
+  prev?: string;
+  prev2?: string;
+  limit: number;
+  compact: boolean;
+  grouperLemmes: boolean;
+  connus: number | null;
+}
+
+// Paramètres d'une URL GET → requête canonique (ou message d'erreur)
+export function canoniser(params: URLSearchParams, predicteur: PredicteurDys): RequeteCanonique | string {
+  const query = (params.get("query") ?? "").trim().toLowerCase();
+  const limite = parseInt(params.get("limit") ?? "");
+  const compact = params.get("format") === "compact";
+  const connus = parseFloat(params.get("connus") ?? "");
+  const requete: RequeteCanonique = {
+    query,
+    limit: Number.isFinite(limite) ? Math.min(Math.max(limite, 1), LIMITE_MAX) : LIMITE_DEFAUT,
+    compact,
+    grouperLemmes: params.get("grouper") === "lemme",
+    connus: compact && Number.isFinite(connus) ? connus : null,
+  };
+
+  if (params.has("prevWord")) {
+    Object.assign(requete, predicteur.contexteCanonique(params.get("prevWord") ?? "", params.get("prevWord2") ?? ""));
+  } else if (params.has("ctx")) {
+    const ctx = params.get("ctx") ?? "";
+    if (predicteur.representantContexte(ctx) === null) return `Classe de contexte inconnue: ${ctx}`;
+    if (ctx !== "|") requete.ctx = ctx;
+  }
+  return requete;
+}
+
+// Chaîne de requête canonique (sans "?")
+export function chaineCanonique(requete: RequeteCanonique): string {
+  const params = new URLSearchParams({ query: requete.query });
+  if (requete.ctx !== undefined) params.set("ctx", requete.ctx);
+  if (requete.prev !== undefined) params.set("prevWord", requete.prev);
+  if (requete.prev2 !== undefined) params.set("prevWord2", requete.prev2);
+  params.set("limit", String(requete.limit));
+  if (requete.compact) params.set("format", "compact");
+  if (requete.grouperLemmes) params.set("grouper", "lemme");
+  if (requete.connus !== null) params.set("connus", String(requete.connus));
+  return params.toString();
+}
+
+// Mots précédents à passer à predict() (un représentant de la classe pour ctx)
+export function motsPrecedents(requete: RequeteCanonique, predicteur: PredicteurDys): { prevWord: string; prevWord2: string } {
+  if (requete.ctx !== undefined) return { prevWord: predicteur.representantContexte(requete.ctx) ?? "", prevWord2: "" };
+  return { prevWord: requete.prev ?? "", prevWord2: requete.prev2 ?? "" };
+}
@@ -0,0 +1,62 @@
+/**
+ * RÉPONSE COMPACTE (format: "compact")
+ * Une ligne (tableau) par résultat, colonnes décrites par "schema". Les champs
+ * statiques (lemme, cgram, genre, nombre, emoji) ne sont envoyés que pour les
+ * entrées absentes du bundle client : celui-ci annonce avec "connus" sa
+ * fréquence minimale (freqMin du manifeste), toutes les entrées au-dessus y sont.
+ * Les colonnes nulles en fin de ligne sont omises.
+ * Même format que reponse_compacte.js (serveur Node).
+ */
+
+import type { PredictResult } from "./predicteur.ts";
+
+export const DRAPEAU_CONTEXTE = 1;
+export const DRAPEAU_PERSONNEL = 2;
+export const DRAPEAU_FALLBACK = 4;
+
+const COLONNES_STATIQUES = ["lemme", "cgram", "genre", "nombre", "emoji"];
+
+export type LigneCompacte = Array<string | number | string[] | null>;
+
+export interface ResultatCompact {
+  id: number;
+  mot: string;
+  score: number;
+  match: string;
+  drapeaux: number;
+  segmentation: string | null;
+  formes?: string[] | null;
+  // Absents si l'entrée est dans le bundle client
+  lemme?: string | null;
+  cgram?: string | null;
+  genre?: string | null;
+  nombre?: string | null;
+  emoji?: string | null;
+}
+
+export function schemaCompact(formes = false): string[] {
+  return ["id", "mot", "score", "match", "drapeaux", "segmentation", ...(formes ? ["formes"] : []), ...COLONNES_STATIQUES];
+}
+
+// Le dictionnaire optimisé a déjà des fréquences arrondies à 0.1 (comme freqMin)
+export function compacterResultats(results: PredictResult[], connus: number | null, formes = false): LigneCompacte[] {
+  return results.map((r) => {
+    const drapeaux = (r.contextMatch ? DRAPEAU_CONTEXTE : 0) | (r.personnel ? DRAPEAU_PERSONNEL : 0) | (r.fallback ? DRAPEAU_FALLBACK : 0);
+    const ligne: LigneCompacte = [r.id, r.ortho, Math.round((r.score || 0) * 10) / 10, r.matchType, drapeaux, r.segmentation || null];
+    if (formes) ligne.push(r.formes && r.formes.length > 0 ? r.formes : null);
+    if (connus == null || (r.freq || 0) < connus) {
+      ligne.push(r.lemme || null, r.cgram || null, r.genre || null, r.nombre || null, r.emoji || null);
+    }
+    while (ligne[ligne.length - 1] == null) ligne.pop();
+    return ligne;
+  });
+}
+
+// Lignes → objets (colonnes omises : null)
+export function decoderResultatsCompacts(schema: string[], lignes: LigneCompacte[]): ResultatCompact[] {
+  return lignes.map((ligne) => {
+    const resultat: Record<string, unknown> = {};
+    schema.forEach((colonne, i) => (resultat[colonne] = ligne[i] ?? null));
+    return resultat as unknown as ResultatCompact;
+  });
+}
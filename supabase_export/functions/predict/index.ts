@@ -5,16 +5,34 @@
  */
 
 import { serve } from "https://deno.land/std@0.168.0/http/server.ts";
-import { PredicteurDys, type DictData } from "./predicteur.ts";
+import { PredicteurDys, type DictData, type PredictTrace } from "./predicteur.ts";
+import { LexiquePersonnel } from "./lexiquePersonnel.ts";
+import { ModeleBigrammes } from "./bigrammes.ts";
+import { TableTopK } from "./topk.ts";
+import { compacterResultats, schemaCompact } from "./compact.ts";
+import { canoniser, chaineCanonique, motsPrecedents } from "./canonique.ts";
+import { empreinte, RULES_VERSION } from "./rules.ts";
 
 // Configuration URL
 const SUPABASE_URL = Deno.env.get("SUPABASE_URL") || "";
 // Assurez-vous que ce chemin correspond bien à votre bucket
 const STORAGE_BASE = `${SUPABASE_URL}/storage/v1/object/public/predict-data`;
+// Budget de latence de predict() (ms) : au-delà, les étapes coûteuses sont sautées
+// et listées dans "degraded". PREDICT_BUDGET_MS=0 pour désactiver
+const BUDGET_PREDICT_MS = Deno.env.get("PREDICT_BUDGET_MS") === "0"
+  ? null
+  : (parseFloat(Deno.env.get("PREDICT_BUDGET_MS") || "") || 25);
+// Réponses GET : navigateur 5 min, CDN 1 h, puis revalidation (304 sans predict)
+const CACHE_CONTROL = "public, max-age=300, s-maxage=3600, stale-while-revalidate=86400";
 
 // --- GESTION DU CACHE GLOBAL ---
 // Ces variables survivenet entre les requêtes tant que l'instance n'est pas tuée
 let predicteur: PredicteurDys | null = null;
+// Version des données chargées (ETag des fichiers du bucket), partie de l'ETag des réponses GET
+let versionDonnees = "";
+// Empreinte du fichier du dictionnaire (comme predicteur.js et build_bundle_client.js) :
+// le client vérifie que son bundle a les mêmes IDs avant de lire des lignes compactes
+let versionDictionnaire = "";
 let initPromise: Promise<void> | null = null;
 
 async function initPredicteur(): Promise<void> {
@@ -34,20 +52,36 @@ async function initPredicteur(): Promise<void> {
       const startTime = performance.now();
       
       // Téléchargement parallèle pour gagner du temps
-      const [dictResponse, emojisResponse] = await Promise.all([
+      const [dictResponse, emojisResponse, bigrammesResponse, topkResponse] = await Promise.all([
         fetch(`${STORAGE_BASE}/dictionnaire_dys.json`),
         fetch(`${STORAGE_BASE}/index_emojis.json`),
+        fetch(`${STORAGE_BASE}/bigrammes.bin`), // Optionnel (build_bigrammes.py)
+        fetch(`${STORAGE_BASE}/topk.bin`),      // Optionnel (build_topk.py --edge)
       ]);
       
       if (!dictResponse.ok) throw new Error(`Erreur dico: ${dictResponse.status}`);
       if (!emojisResponse.ok) throw new Error(`Erreur emojis: ${emojisResponse.status}`);
       
-      const dictData = await dictResponse.json();
+      const dictOctets = await dictResponse.arrayBuffer();
+      const dictData = JSON.parse(new TextDecoder().decode(dictOctets));
       const emojisData = await emojisResponse.json();
+      const bigrammes = bigrammesResponse.ok
+        ? new ModeleBigrammes(await bigrammesResponse.arrayBuffer())
+        : null;
+      const topk = topkResponse.ok
+        ? new TableTopK(await topkResponse.arrayBuffer())
+        : null;
       
       // Initialisation de la nouvelle classe optimisée
       // Le casting 'any' évite les erreurs de typage strict sur le JSON
-      predicteur = new PredicteurDys(dictData as any, emojisData as any);
+      predicteur = new PredicteurDys(dictData as any, emojisData as any, bigrammes, topk);
+      versionDictionnaire = [...new Uint8Array(await crypto.subtle.digest("SHA-1", dictOctets))]
+        .map((o) => o.toString(16).padStart(2, "0")).join("").slice(0, 12);
+      versionDonnees = empreinte(JSON.stringify([
+        dictData.meta,
+        ...[dictResponse, emojisResponse, bigrammesResponse, topkResponse]
+          .map((r) => r.ok ? r.headers.get("etag") ?? r.headers.get("last-modified") ?? "" : null),
+      ]));
       
       const duration = (performance.now() - startTime).toFixed(0);
       console.log(`✅ Prédicteur prêt : ${dictData.meta.total_entries} mots chargés en ${duration}ms`);
@@ -65,17 +99,148 @@ async function initPredicteur(): Promise<void> {
 // Headers CORS
 const corsHeaders = {
   "Access-Control-Allow-Origin": "*",
-  "Access-Control-Allow-Methods": "POST, OPTIONS",
-  "Access-Control-Allow-Headers": "Content-Type, Authorization, x-client-info, apikey",
+  "Access-Control-Allow-Methods": "GET, POST, OPTIONS",
+  "Access-Control-Allow-Headers": "Content-Type, Authorization, x-client-info, apikey, If-None-Match",
+  "Access-Control-Expose-Headers": "Server-Timing, ETag, X-Dict-Version",
 };
 
+// En-tête Server-Timing (visible dans l'onglet Réseau du navigateur)
+function serverTiming(trace: PredictTrace): string {
+  const parts = Object.entries(trace.etapes).map(([nom, ms]) => `${nom};dur=${ms.toFixed(3)}`);
+  parts.push(`total;dur=${trace.totalMs.toFixed(3)}`);
+  return parts.join(", ");
+}
+
+interface OptionsReponse {
+  query: string;
+  prevWord: string;
+  prevWord2: string;
+  limit: number;
+  level?: string;
+  lexiquePersonnel?: LexiquePersonnel | null;
+  trace?: PredictTrace | null;
+  budgetMs: number | null;
+  compact: boolean;
+  grouperLemmes: boolean;
+  connus: number | null;
+}
+
+// Prédiction et formatage de la réponse (POST et GET)
+function repondre(predicteur: PredicteurDys, options: OptionsReponse): Record<string, unknown> {
+  const { query, prevWord, prevWord2, limit, level = "cp_cm2", lexiquePersonnel = null, trace = null, budgetMs, compact, grouperLemmes, connus } = options;
+  const etapesSautees: string[] = [];
+  const results = predicteur.predict(query, {
+    limit,
+    prevWord,
+    prevWord2,
+    level,
+    minPrefixLength: 2, // Cherche dès 2 lettres
+    usePhonetic: true,
+    lexiquePersonnel,
+    trace,
+    budgetMs,
+    etapesSautees,
+    grouperLemmes,
+  });
+
+  // Formatage de la réponse (Identique à votre format Front-End)
+  const response: Record<string, unknown> = {
+    input: query,
+    code_dys: predicteur.transcode(query), // Utile pour le debug front
+    prevWord: prevWord || null,
+    count: results.length,
+  };
+  // Version du dictionnaire : les IDs (et le lexique personnel) en dépendent
+  response.version = versionDictionnaire;
+  if (compact) {
+    response.schema = schemaCompact(grouperLemmes);
+    response.results = compacterResultats(results, connus, grouperLemmes);
+  } else {
+    response.results = results.map((r) => ({
+      id: r.id,
+      mot: r.ortho,
+      lemme: r.lemme,
+      emoji: r.emoji || null,
+      phon: r.phon,
+      phon_dys: r.phon_dys,
+      cgram: r.cgram,
+      genre: r.genre,
+      nombre: r.nombre,
+      freq: r.freq?.toFixed(1) || "0",
+      score: r.score?.toFixed(1) || "0",
+      match: r.matchType,
+      segmentation: r.segmentation || null,
+      contextMatch: r.contextMatch || false,
+      personnel: r.personnel || false,
+      ...(r.formes ? { formes: r.formes } : {}),
+    }));
+  }
+
+  if (etapesSautees.length > 0) response.degraded = etapesSautees;
+  return response;
+}
+
+// GET cachable : URL canonique (redirection 308 sinon), ETag fort dérivé des
+// versions des règles et des données, 304 sans appeler predict()
+async function traiterGet(req: Request): Promise<Response> {
+  await initPredicteur();
+  if (!predicteur) throw new Error("Le prédicteur n'a pas pu être initialisé.");
+
+  const url = new URL(req.url);
+  const requete = canoniser(url.searchParams, predicteur);
+  if (typeof requete === "string") {
+    return new Response(JSON.stringify({ error: requete, results: [] }), {
+      status: 400,
+      headers: { ...corsHeaders, "Content-Type": "application/json", "Cache-Control": "no-store" },
+    });
+  }
+  const canonique = chaineCanonique(requete);
+  if (url.search.slice(1) !== canonique) {
+    return new Response(null, { status: 308, headers: { ...corsHeaders, "Location": `?${canonique}`, "Cache-Control": CACHE_CONTROL } });
+  }
+
+  const etag = `"${RULES_VERSION}-${versionDonnees}"`;
+  const headers: Record<string, string> = { ...corsHeaders, "ETag": etag, "Cache-Control": CACHE_CONTROL, "X-Dict-Version": versionDictionnaire };
+  const ifNoneMatch = req.headers.get("if-none-match");
+  if (ifNoneMatch && ifNoneMatch.split(",").some((e) => e.trim() === etag || e.trim() === "*")) {
+    return new Response(null, { status: 304, headers });
+  }
+
+  const { prevWord, prevWord2 } = motsPrecedents(requete, predicteur);
+  // Sans input, seul le mot suivant (bigrammes) peut être suggéré
+  const response: Record<string, unknown> = requete.query || prevWord
+    ? repondre(predicteur, {
+        query: requete.query, prevWord, prevWord2, limit: requete.limit,
+        // Pas de budget : une réponse mise en cache doit être complète (et identique à chaque calcul)
+        budgetMs: null,
+        compact: requete.compact, grouperLemmes: requete.grouperLemmes, connus: requete.connus,
+      })
+    : { results: [] };
+  if (requete.ctx !== undefined) {
+    response.prevWord = null;
+    response.ctx = requete.ctx;
+  }
+  return new Response(JSON.stringify(response), { headers: { ...headers, "Content-Type": "application/json" } });
+}
+
 serve(async (req: Request) => {
   // 1. Gestion du Preflight CORS
   if (req.method === "OPTIONS") {
     return new Response(null, { headers: corsHeaders });
   }
 
-  // 2. Vérification Méthode
+  // 2. Vérification Méthode (GET : requêtes cachables, voir canonique.ts)
+  if (req.method === "GET") {
+    try {
+      return await traiterGet(req);
+    } catch (error) {
+      console.error("Erreur Handler:", error);
+      return new Response(
+        JSON.stringify({ error: "Internal Error", details: String(error) }),
+        { status: 500, headers: { ...corsHeaders, "Content-Type": "application/json", "Cache-Control": "no-store" } }
+      );
+    }
+  }
   if (req.method !== "POST") {
     return new Response(JSON.stringify({ error: "Method not allowed" }), { 
       status: 405, 
@@ -91,62 +256,52 @@ serve(async (req: Request) => {
 
     // 4. Lecture du Body
     const body = await req.json();
-    const { query, prevWord = "", limit = 10, level = "cp_cm2" } = body;
+    const { query, prevWord = "", prevWord2 = "", limit = 10, level = "cp_cm2", lexique = null, debug = false } = body;
+    // Format compact (lignes + schéma) et regroupement par lemme, sur demande
+    const compact = body.format === "compact";
+    const grouperLemmes = body.grouper === "lemme";
+    const connus = typeof body.connus === "number" ? body.connus : null;
 
     // 5. Validation rapide
-    if (!query || typeof query !== "string") {
+    if (typeof query !== "string" || (!query && !prevWord)) {
       return new Response(JSON.stringify({ error: "Query manquante", results: [] }), { 
         status: 400, 
         headers: { ...corsHeaders, "Content-Type": "application/json" } 
       });
     }
 
-    if (query.trim().length < 1) {
+    // Sans input, seul le mot suivant (bigrammes) peut être suggéré
+    if (query.trim().length < 1 && !prevWord) {
       return new Response(JSON.stringify({ results: [] }), { 
         headers: { ...corsHeaders, "Content-Type": "application/json" } 
       });
     }
 
     const t0 = performance.now();
+    // Durées par étape, seulement sur demande (debug: true)
+    const trace: PredictTrace | null = debug
+      ? { totalMs: 0, etapes: {}, candidats: 0, profondeurFallback: 0 }
+      : null;
 
     // 6. Appel de l'algorithme "Turbo"
-    const results = predicteur.predict(query, {
-      limit: Math.min(limit, 50),
-      prevWord: prevWord,
-      level: level,
-      minPrefixLength: 2, // Cherche dès 2 lettres
-      usePhonetic: true
+    const response = repondre(predicteur, {
+      query, prevWord, prevWord2, limit: Math.min(limit, 50), level,
+      // Lexique personnel sérialisé envoyé par le client (stateless), ignoré
+      // s'il a été construit sur une autre version du dictionnaire
+      lexiquePersonnel: lexique ? LexiquePersonnel.deserialize(lexique, { version: versionDictionnaire }) : null,
+      trace, budgetMs: BUDGET_PREDICT_MS, compact, grouperLemmes, connus,
     });
 
     const duration = (performance.now() - t0).toFixed(2);
-    console.log(`🔍 "${query}" -> ${results.length} res | ${duration}ms`);
-
-    // 7. Formatage de la réponse (Identique à votre format Front-End)
-    const response = {
-      input: query,
-      code_dys: predicteur.transcode(query), // Utile pour le debug front
-      prevWord: prevWord || null,
-      count: results.length,
-      results: results.map((r) => ({
-        mot: r.ortho,
-        lemme: r.lemme,
-        emoji: r.emoji || null,
-        phon: r.phon,
-        phon_dys: r.phon_dys,
-        cgram: r.cgram,
-        genre: r.genre,
-        nombre: r.nombre,
-        freq: r.freq?.toFixed(1) || "0",
-        score: r.score?.toFixed(1) || "0",
-        match: r.matchType,
-        segmentation: r.segmentation || null,
-        contextMatch: r.contextMatch || false,
-      })),
-    };
-
-    return new Response(JSON.stringify(response), {
-      headers: { ...corsHeaders, "Content-Type": "application/json" },
-    });
+    console.log(`🔍 "${query}" -> ${response.count} res | ${duration}ms`);
+
+    const headers: Record<string, string> = { ...corsHeaders, "Content-Type": "application/json", "X-Dict-Version": versionDictionnaire };
+    if (trace) {
+      response.debug = trace;
+      headers["Server-Timing"] = serverTiming(trace);
+    }
+
+    return new Response(JSON.stringify(response), { headers });
 
   } catch (error) {
     console.error("Erreur Handler:", error);
@@ -0,0 +1,82 @@
+/**
+ * LEXIQUE PERSONNEL (version Edge)
+ * LRU bornée id → {poids, t} avec décroissance exponentielle paresseuse.
+ * Même format de sérialisation que lexique_personnel.js :
+ * [version du dictionnaire, t0 (minutes), id, poids×100, minutes depuis t0, ...]
+ * Un lexique d'une autre version (ou sans version) est ignoré à l'import.
+ */
+
+const MINUTE = 60 * 1000;
+// Poids au-delà duquel le boost est saturé : borne à l'import
+const POIDS_MAX = 100;
+
+export interface LexiquePersonnelOptions { capacite?: number; demiVieJours?: number; boostMax?: number; version?: string | null; }
+
+export class LexiquePersonnel {
+  private capacite: number;
+  private demiVieMs: number;
+  private boostMax: number;
+  private mots = new Map<number, { poids: number; t: number }>();
+  // Version du dictionnaire des IDs (sha1 court)
+  version: string | null;
+
+  constructor({ capacite = 256, demiVieJours = 14, boostMax = 30, version = null }: LexiquePersonnelOptions = {}) {
+    this.capacite = capacite;
+    this.demiVieMs = demiVieJours * 24 * 60 * MINUTE;
+    this.boostMax = boostMax;
+    this.version = version;
+  }
+
+  get size(): number { return this.mots.size; }
+
+  poids(id: number, now = Date.now()): number {
+    const m = this.mots.get(id);
+    if (!m) return 0;
+    return m.poids * Math.pow(2, -(now - m.t) / this.demiVieMs);
+  }
+
+  enregistrer(id: number, now = Date.now()): void {
+    const poids = this.poids(id, now) + 1;
+    this.mots.delete(id);
+    this.mots.set(id, { poids, t: now });
+    if (this.mots.size > this.capacite) this.mots.delete(this.mots.keys().next().value!);
+  }
+
+  boost(id: number, now = Date.now()): number {
+    if (this.mots.size === 0) return 0;
+    const p = this.poids(id, now);
+    if (p <= 0) return 0;
+    return this.boostMax * (1 - Math.pow(2, -p));
+  }
+
+  serialize(): (string | number)[] {
+    let t0 = Infinity;
+    for (const m of this.mots.values()) t0 = Math.min(t0, m.t);
+    if (t0 === Infinity) return [];
+    const minutes0 = Math.floor(t0 / MINUTE);
+    const out: (string | number)[] = this.version ? [this.version, minutes0] : [minutes0];
+    for (const [id, m] of this.mots) out.push(id, Math.round(m.poids * 100), Math.floor(m.t / MINUTE) - minutes0);
+    return out;
+  }
+
+  // Données client : entrées non finies ignorées, poids borné, dates futures ramenées à maintenant ;
+  // avec options.version, un lexique d'une autre version (ou sans version) est vide
+  static deserialize(data: unknown, options: LexiquePersonnelOptions = {}, now = Date.now()): LexiquePersonnel {
+    const lexique = new LexiquePersonnel(options);
+    if (!Array.isArray(data)) return lexique;
+    const debut = typeof data[0] === 'string' ? 1 : 0;
+    const version: string | null = debut ? data[0] : null;
+    if (options.version != null && version !== options.version) return lexique;
+    lexique.version = version;
+    if (data.length < debut + 4) return lexique;
+    const minutes0 = data[debut];
+    if (typeof minutes0 !== 'number' || !Number.isFinite(minutes0)) return lexique;
+    for (let i = debut + 1; i + 2 < data.length; i += 3) {
+      const [id, poids, minutes] = [data[i], data[i + 1], data[i + 2]];
+      if (!Number.isInteger(id) || !Number.isFinite(poids) || !Number.isFinite(minutes) || poids <= 0) continue;
+      lexique.mots.set(id, { poids: Math.min(poids / 100, POIDS_MAX), t: Math.min((minutes0 + minutes) * MINUTE, now) });
+    }
+    while (lexique.mots.size > lexique.capacite) lexique.mots.delete(lexique.mots.keys().next().value!);
+    return lexique;
+  }
+}
@@ -0,0 +1,33 @@
+// Généré par build_poids_edge.js depuis rules/poids.json : ne pas modifier à la main
+// Poids du scoring de predict() ; contexte : bonus des règles de CONTEXT (rules.ts), par nom
+export const POIDS = {
+  frequence_log: 60,
+  bonus_freq_100: 15,
+  bonus_freq_300: 10,
+  match_ortho: 25,
+  mot_exact: 40,
+  prefixe_ortho: 20,
+  code_dys_exact: 10,
+  prefixe_dys: 8,
+  mot_court_6: 8,
+  mot_court_8: 4,
+  marge_longueur: 4,
+  penalite_longueur: 3,
+  penalite_floue: 60,
+  penalite_fallback: 20,
+  bigramme: 20,
+  contexte: {
+    determinants_masc_sing: 25,
+    determinants_fem_sing: 25,
+    determinants_pluriel: 25,
+    pronom_je: 20,
+    pronom_tu: 20,
+    pronom_il_elle: 20,
+    pronom_nous: 20,
+    pronom_vous: 20,
+    pronom_ils_elles: 20,
+    adverbes_intensite: 20,
+    preposition_de: 15,
+    preposition_a: 15,
+  },
+};
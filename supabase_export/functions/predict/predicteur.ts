@@ -5,12 +5,21 @@
  * - Gestion variantes G/J, K/C...
  */
 
-import { PATTERNS, CHARS, FINAL_VOWEL_EXPANSIONS, ORTHO_EQUIVALENTS, START_EQUIVALENTS, CONTEXT, SEGMENTATION, SILENT_FINAL_LETTERS, type ContextRule } from "./rules.ts";
+import type { LexiquePersonnel } from "./lexiquePersonnel.ts";
+import type { ModeleBigrammes } from "./bigrammes.ts";
+import type { TableTopK } from "./topk.ts";
+import { PATTERNS, CHARS, FINAL_VOWEL_EXPANSIONS, ORTHO_EQUIVALENTS, START_EQUIVALENTS, CONTEXT, SEGMENTATION, SILENT_FINAL_LETTERS, RULES_VERSION, POIDS, type ContextRule } from "./rules.ts";
 
 export interface DictEntry { id: number; ortho: string; phon: string; phon_dys: string; lemme: string; cgram: string; genre?: string; nombre?: string; infover?: string; freq: number; }
 export interface DictData { meta: { total_entries: number; }; entries: DictEntry[]; index_phon_dys: Record<string, number[]>; idx_ortho_prefix: Record<string, number[]>; idx_dys_prefix: Record<string, number[]>; }
-export interface PredictOptions { level?: string; limit?: number; usePhonetic?: boolean; minPrefixLength?: number; prevWord?: string; }
-export interface PredictResult extends DictEntry { score: number; matchType: string; emoji?: string | null; segmentation?: string | null; contextMatch?: boolean; fallback?: boolean; }
+export interface PredictOptions { level?: string; limit?: number; usePhonetic?: boolean; minPrefixLength?: number; prevWord?: string; prevWord2?: string; lexiquePersonnel?: Pick<LexiquePersonnel, "boost"> | null; useTopK?: boolean; trace?: PredictTrace | null; budgetMs?: number | null; etapesSautees?: string[] | null; grouperLemmes?: boolean; }
+export interface PredictTrace { totalMs: number; etapes: Record<string, number>; candidats: number; profondeurFallback: number; etapesSautees?: string[]; }
+export interface PredictResult extends DictEntry { score: number; matchType: string; emoji?: string | null; segmentation?: string | null; contextMatch?: boolean; personnel?: boolean; fallback?: boolean; formes?: string[]; }
+
+// Hors budget, seuls les candidats les plus fréquents sont scorés (par résultat demandé)
+const CANDIDATS_DEGRADES_PAR_RESULTAT = 20;
+// Regroupement par lemme : candidats demandés par résultat
+const CANDIDATS_PAR_LEMME = 3;
 
 export class PredicteurDys {
   private entries: DictEntry[];
@@ -18,15 +27,131 @@ export class PredicteurDys {
   private idxOrthoPrefix: Record<string, number[]>;
   private idxDysPrefix: Record<string, number[]>;
   private indexEmojis: Record<string, string>;
+  private bigrammes: ModeleBigrammes | null;
+  private topk: TableTopK | null;
+  private idsOrtho: Map<string, number> | null = null;
+  private entreesPhonDys: [string, number[]][] | null = null;
+  private representants: Map<string, string> | null = null;
   public meta: { total_entries: number };
 
-  constructor(dictData: DictData, emojisData: Record<string, string> = {}) {
+  constructor(dictData: DictData, emojisData: Record<string, string> = {}, bigrammes: ModeleBigrammes | null = null, topk: TableTopK | null = null) {
     this.entries = dictData.entries;
     this.indexPhonDys = dictData.index_phon_dys;
     this.idxOrthoPrefix = dictData.idx_ortho_prefix;
     this.idxDysPrefix = dictData.idx_dys_prefix;
     this.meta = dictData.meta;
     this.indexEmojis = emojisData;
+    this.bigrammes = bigrammes && bigrammes.totalEntries === dictData.meta.total_entries ? bigrammes : null;
+    // Table construite avec un autre dictionnaire ou d'autres règles : ignorée
+    this.topk = topk && topk.totalEntries === dictData.meta.total_entries && topk.meta.versionRegles === RULES_VERSION ? topk : null;
+  }
+
+  // Classe de contexte : règle de contexte + liaisons déclenchées par prevWord (hors bigrammes)
+  classeContexte(prevWord: string): string {
+    const contextRule = this.getContextFilter(prevWord);
+    const prevLower = prevWord ? prevWord.toLowerCase() : "";
+    const liaisons = prevLower ? SEGMENTATION.filter((r) => r.triggers?.has(prevLower)).map((r) => r.name) : [];
+    return `${contextRule ? contextRule.name : ""}|${liaisons.join(",")}`;
+  }
+
+  // Mot précédent représentant une classe de contexte (sans successeurs de bigrammes),
+  // null si aucun mot déclencheur ne la représente
+  representantContexte(classe: string): string | null {
+    if (!this.representants) {
+      this.representants = new Map([["|", ""]]);
+      const mots = new Set<string>(CONTEXT.keys());
+      for (const rule of SEGMENTATION) for (const mot of rule.triggers ?? []) mots.add(mot);
+      for (const mot of [...mots].sort()) {
+        const classe = this.classeContexte(mot);
+        if (!this.representants.has(classe) && !this.getSuccesseurs(mot)) this.representants.set(classe, mot);
+      }
+    }
+    return this.representants.get(classe) ?? null;
+  }
+
+  // Forme canonique du contexte (GET cachable) : mêmes résultats pour une même forme.
+  // Sans successeurs de bigrammes, seule la classe de contexte compte ; sinon le mot
+  // précédent, et l'avant-dernier s'il a un contexte trigramme propre
+  contexteCanonique(prevWord: string, prevWord2 = ""): { ctx?: string; prev?: string; prev2?: string } {
+    const prev = prevWord.trim();
+    if (!prev) return {};
+    const id1 = this.getIdOrtho(prev);
+    const id2 = this.getIdOrtho(prevWord2.trim());
+    const avec = this.bigrammes && id1 >= 0 ? this.bigrammes.successeurs(id1, id2) : null;
+    if (!avec) {
+      const classe = this.classeContexte(prev);
+      if (classe === "|") return {};
+      return this.representantContexte(classe) !== null ? { ctx: classe } : { prev: prev.toLowerCase() };
+    }
+    const sans = this.bigrammes!.successeurs(id1);
+    const canonique: { prev: string; prev2?: string } = { prev: this.entries[id1].ortho };
+    if (!sans || avec.ids.byteOffset !== sans.ids.byteOffset) canonique.prev2 = this.entries[id2].ortho;
+    return canonique;
+  }
+
+  // Réponse précalculée pour un préfixe court (options par défaut uniquement)
+  private chercherTopK(input: string, options: PredictOptions): PredictResult[] | null {
+    const { limit = 10, usePhonetic = true, useTopK = true, minPrefixLength = 2, prevWord = "", prevWord2 = "", lexiquePersonnel = null, trace = null } = options;
+    const table = this.topk;
+    if (!table || !useTopK) return null;
+    const prefixe = input.trim().toLowerCase();
+    if (prefixe.length > table.meta.longueurMax) return null;
+    if (!usePhonetic || lexiquePersonnel || limit > table.k || minPrefixLength !== table.meta.minPrefixLength) return null;
+    if (this.bigrammes && prevWord && this.bigrammes.successeurs(this.getIdOrtho(prevWord), this.getIdOrtho(prevWord2))) return null;
+
+    const debut = trace ? performance.now() : 0;
+    // Le dictionnaire optimisé n'a qu'une fréquence : un seul niveau dans la table
+    const trouve = table.chercher(table.meta.niveaux[0], this.classeContexte(prevWord), prefixe);
+    if (!trouve) return null;
+    const results: PredictResult[] = [];
+    for (let i = 0; i < Math.min(limit, trouve.ids.length); i++) {
+      const entry = this.entries[trouve.ids[i]];
+      const { matchType, fallback, contextMatch, segmentation } = table.decoder(trouve.drapeaux[i]);
+      results.push(Object.assign({}, entry, {
+        score: trouve.scores[i], matchType, segmentation: segmentation ?? undefined, fallback: fallback || undefined,
+        contextMatch, personnel: false, emoji: this.getEmoji(entry.lemme),
+      }));
+    }
+    if (trace) {
+      const ms = performance.now() - debut;
+      Object.assign(trace, { totalMs: ms, etapes: { topk: ms }, candidats: results.length, profondeurFallback: 0 });
+    }
+    return results;
+  }
+
+  // ID canonique d'une orthographe (plus petit ID), même convention que build_bigrammes.py
+  private getIdOrtho(mot: string): number {
+    if (!mot) return -1;
+    if (!this.idsOrtho) {
+      this.idsOrtho = new Map();
+      for (const e of this.entries) if (!this.idsOrtho.has(e.ortho)) this.idsOrtho.set(e.ortho, e.id);
+    }
+    return this.idsOrtho.get(mot) ?? this.idsOrtho.get(mot.toLowerCase()) ?? -1;
+  }
+
+  private getSuccesseurs(prevWord: string, prevWord2 = ""): Map<string, number> | null {
+    if (!this.bigrammes || !prevWord) return null;
+    const succ = this.bigrammes.successeurs(this.getIdOrtho(prevWord), this.getIdOrtho(prevWord2));
+    if (!succ) return null;
+    const carte = new Map<string, number>();
+    for (let i = 0; i < succ.ids.length; i++) {
+      const entry = this.entries[succ.ids[i]];
+      if (entry) carte.set(entry.ortho, succ.poids[i] / 255);
+    }
+    return carte;
+  }
+
+  predictNext(prevWord: string, options: PredictOptions = {}): PredictResult[] {
+    const { limit = 10, prevWord2 = "" } = options;
+    if (!this.bigrammes || !prevWord) return [];
+    const succ = this.bigrammes.successeurs(this.getIdOrtho(prevWord), this.getIdOrtho(prevWord2));
+    if (!succ) return [];
+    const results: PredictResult[] = [];
+    for (let i = 0; i < succ.ids.length && results.length < limit; i++) {
+      const entry = this.entries[succ.ids[i]];
+      if (entry) results.push({ ...entry, score: (succ.poids[i] / 255) * 100, matchType: "bigramme", contextMatch: false, emoji: this.getEmoji(entry.lemme) });
+    }
+    return results;
   }
 
   getEmoji(lemme: string): string | null { if (!lemme) return null; return this.indexEmojis[lemme.toLowerCase()] || null; }
@@ -165,7 +290,7 @@ export class PredicteurDys {
       for (let i = 0; i < variants.length; i++) {
         if (orthoLower.startsWith(variants[i])) {
           seenIds.add(id);
-          results.push({ ...entry });
+          results.push(entry); // Copié à l'insertion dans les candidats
           break;
         }
       }
@@ -213,7 +338,8 @@ export class PredicteurDys {
         }
       }
     } else {
-      for (const [dysCode, ids] of Object.entries(this.indexPhonDys)) {
+      if (!this.entreesPhonDys) this.entreesPhonDys = Object.entries(this.indexPhonDys);
+      for (const [dysCode, ids] of this.entreesPhonDys) {
         if (this.isPhoneticMatch(userCode, dysCode)) {
           for (const id of ids) {
             if (!seenIds.has(id)) {
@@ -260,45 +386,96 @@ export class PredicteurDys {
     return variants;
   }
 
+  // Un résultat par lemme (le mieux classé), les autres formes dans "formes"
+  grouperParLemme(results: PredictResult[], limit: number): PredictResult[] {
+    const groupes = new Map<string, PredictResult & { formes: string[] }>();
+    for (const r of results) {
+      const cle = (r.lemme || r.ortho).toLowerCase();
+      const groupe = groupes.get(cle);
+      if (!groupe) {
+        if (groupes.size < limit) groupes.set(cle, Object.assign({}, r, { formes: [] as string[] }));
+      } else if (r.ortho !== groupe.ortho && !groupe.formes.includes(r.ortho)) {
+        groupe.formes.push(r.ortho);
+      }
+    }
+    return Array.from(groupes.values());
+  }
+
   predict(input: string, options: PredictOptions = {}): PredictResult[] {
-    const { level = "cp_cm2", limit = 10, usePhonetic = true, minPrefixLength = 2, prevWord = "" } = options;
-    if (!input?.trim()) return [];
+    const { level = "cp_cm2", limit = 10, usePhonetic = true, minPrefixLength = 2, prevWord = "", prevWord2 = "", lexiquePersonnel = null, trace = null, budgetMs = null, etapesSautees = null, grouperLemmes = false } = options;
+    if (grouperLemmes) {
+      const elargis = this.predict(input, Object.assign({}, options, { grouperLemmes: false, limit: limit * CANDIDATS_PAR_LEMME }));
+      return this.grouperParLemme(elargis, limit);
+    }
+    if (!input?.trim()) return this.predictNext(prevWord, options);
+
+    // Préfixe court avec les options par défaut : une seule lecture de table
+    const precalcule = this.chercherTopK(input, options);
+    if (precalcule) return precalcule;
+
+    // Chronométrage par étape uniquement si une trace est demandée (debug)
+    const debut = trace ? performance.now() : 0;
+    let t = debut;
+    const etape = (nom: string) => {
+      const maintenant = performance.now();
+      trace!.etapes[nom] = (trace!.etapes[nom] || 0) + (maintenant - t);
+      t = maintenant;
+    };
+    if (trace) { trace.etapes = {}; trace.profondeurFallback = 0; }
+
+    // Échéance : au-delà, phonétique, liaisons et fallback profond sont sautés
+    // (l'ortho du mot tapé est toujours cherchée, le fallback continue tant qu'aucun candidat)
+    const echeance = budgetMs != null ? performance.now() + budgetMs : Infinity;
+    const horsBudget = () => echeance !== Infinity && performance.now() >= echeance;
+    const sautees = new Set<string>();
 
     const originalInput = input.trim().toLowerCase();
     const candidatesMap = new Map<number, PredictResult>();
     let usedSegmentation: { text: string; rule?: string } | null = null;
     const segmentations = this.generateSegmentations(originalInput, prevWord);
+    if (trace) etape("segmentation");
 
-    for (const seg of segmentations) {
+    for (let s = 0; s < segmentations.length; s++) {
+      const seg = segmentations[s];
+      if (s > 0 && horsBudget()) { sautees.add("segmentation"); break; }
       let searchInput = seg.text;
       let localFallback = false;
       
       while (searchInput.length >= minPrefixLength) {
+        const degrade = horsBudget();
+        if (degrade && localFallback && candidatesMap.size > 0) { sautees.add("fallback"); break; }
+        if (trace) t = performance.now();
         const userDysCodes = this.getPhoneticKeys(searchInput); 
+        if (trace) etape("transcode");
         let foundResults = false;
 
         const orthoResults = this.searchByOrthoPrefix(searchInput);
         for (const item of orthoResults) {
           if (!candidatesMap.has(item.id)) {
-            candidatesMap.set(item.id, { ...item, score: 0, matchType: "ortho", segmentation: seg.isSegmentation ? seg.rule : undefined, fallback: localFallback || undefined });
+            candidatesMap.set(item.id, Object.assign({}, item, { score: 0, matchType: "ortho", segmentation: seg.isSegmentation ? seg.rule : undefined, fallback: localFallback || undefined }));
             foundResults = true;
           }
         }
+        if (trace) etape("ortho");
 
-        if (usePhonetic) {
+        if (usePhonetic && (degrade || horsBudget())) {
+          sautees.add("phon");
+        } else if (usePhonetic) {
           const keysToSearch = userDysCodes.length > 4 ? userDysCodes.slice(0, 4) : userDysCodes;
           for (const dysCode of keysToSearch) {
             const phonResults = this.searchByPhonDys(dysCode);
             for (const item of phonResults) {
               if (!candidatesMap.has(item.id)) {
-                candidatesMap.set(item.id, { ...item, score: 0, matchType: "phon_dys", segmentation: seg.isSegmentation ? seg.rule : undefined, fallback: localFallback || undefined });
+                candidatesMap.set(item.id, Object.assign({}, item, { score: 0, matchType: "phon_dys", segmentation: seg.isSegmentation ? seg.rule : undefined, fallback: localFallback || undefined }));
                 foundResults = true;
               }
             }
           }
+          if (trace) etape("phon");
         }
 
         if (foundResults) {
+          if (trace) trace.profondeurFallback = Math.max(trace.profondeurFallback, seg.text.length - searchInput.length);
           if (seg.isSegmentation) usedSegmentation = seg;
           break; 
         }
@@ -309,35 +486,43 @@ export class PredicteurDys {
       }
     }
 
+    if (trace) { trace.candidats = candidatesMap.size; t = performance.now(); }
     const effectiveInput = usedSegmentation?.text || originalInput;
     const userDysCodes = this.getPhoneticKeys(effectiveInput);
     const contextRule = this.getContextFilter(prevWord);
+    const successeurs = this.getSuccesseurs(prevWord, prevWord2);
     
     let results = Array.from(candidatesMap.values());
+    if (results.length > limit * CANDIDATS_DEGRADES_PAR_RESULTAT && horsBudget()) {
+      results.sort((a, b) => (b.freq || 0) - (a.freq || 0));
+      results.length = limit * CANDIDATS_DEGRADES_PAR_RESULTAT;
+      sautees.add("scoring_partiel");
+    }
     const maxFreq = Math.max(...results.map((r) => r.freq || 0), 1);
+    const now = Date.now();
 
     results = results.map((item) => {
       let score = 0;
       const freq = item.freq || 0;
-      if (freq > 0) score += (Math.log10(freq + 1) / Math.log10(maxFreq + 1)) * 60;
-      if (freq > 100) score += 15;
-      if (freq > 300) score += 10;
-      if (item.matchType === "ortho") score += 25;
+      if (freq > 0) score += (Math.log10(freq + 1) / Math.log10(maxFreq + 1)) * POIDS.frequence_log;
+      if (freq > 100) score += POIDS.bonus_freq_100;
+      if (freq > 300) score += POIDS.bonus_freq_300;
+      if (item.matchType === "ortho") score += POIDS.match_ortho;
       if (item.ortho.toLowerCase() === effectiveInput) {
-        score += 40;
+        score += POIDS.mot_exact;
       } else if (item.ortho.toLowerCase().startsWith(effectiveInput)) {
         const matchRatio = effectiveInput.length / item.ortho.length;
-        score += matchRatio * 20;
+        score += matchRatio * POIDS.prefixe_ortho;
       }
       const bestPhonMatch = userDysCodes.find(code => item.phon_dys === code || item.phon_dys?.startsWith(code));
       if (bestPhonMatch) {
-        if (item.phon_dys === bestPhonMatch) score += 10;
-        else score += (bestPhonMatch.length / item.phon_dys.length) * 8;
+        if (item.phon_dys === bestPhonMatch) score += POIDS.code_dys_exact;
+        else score += (bestPhonMatch.length / item.phon_dys.length) * POIDS.prefixe_dys;
       }
-      if (item.ortho.length <= 6) score += 8;
-      else if (item.ortho.length <= 8) score += 4;
+      if (item.ortho.length <= 6) score += POIDS.mot_court_6;
+      else if (item.ortho.length <= 8) score += POIDS.mot_court_8;
       const lengthDiff = item.ortho.length - effectiveInput.length;
-      if (lengthDiff > 4) score -= (lengthDiff - 4) * 3;
+      if (lengthDiff > POIDS.marge_longueur) score -= (lengthDiff - POIDS.marge_longueur) * POIDS.penalite_longueur;
       let contextMatch = false;
       if (contextRule) {
         if (this.matchesContext(item, contextRule)) {
@@ -345,10 +530,35 @@ export class PredicteurDys {
           contextMatch = true;
         } else if (this.shouldPenalize(item, contextRule)) score -= contextRule.penalty;
       }
-      return { ...item, score, contextMatch, emoji: this.getEmoji(item.lemme) };
+      if (successeurs) {
+        const p = successeurs.get(item.ortho);
+        if (p) score += p * POIDS.bigramme;
+      }
+      let personnel = false;
+      if (lexiquePersonnel) {
+        const bonus = lexiquePersonnel.boost(item.id, now);
+        if (bonus > 0) { score += bonus; personnel = true; }
+      }
+      // Candidats déjà copiés : score écrit en place (les spreads coûtent cher sur les gros buckets)
+      item.score = score;
+      item.contextMatch = contextMatch;
+      item.personnel = personnel;
+      return item;
     });
 
+    if (trace) etape("scoring");
+
     results.sort((a, b) => b.score - a.score);
-    return results.slice(0, limit);
+    results = results.slice(0, limit);
+    for (const item of results) item.emoji = this.getEmoji(item.lemme);
+    if (trace) {
+      etape("sort");
+      trace.totalMs = performance.now() - debut;
+    }
+    if (sautees.size > 0) {
+      if (etapesSautees) etapesSautees.push(...sautees);
+      if (trace) trace.etapesSautees = Array.from(sautees);
+    }
+    return results;
   }
 }
\ No newline at end of file
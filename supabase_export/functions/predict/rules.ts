@@ -3,6 +3,11 @@
  * Ajout des protections omm/onn pour que "komment" marche avec l'algo Turbo.
  */
 
+import { POIDS } from "./poids.ts";
+
+// Poids du scoring, générés depuis rules/poids.json (node build_poids_edge.js)
+export { POIDS };
+
 export interface Pattern { src: string; code: string; }
 export interface ContextRule { name: string; filter: { cgram: string[] | null; genre: string | null; nombre: string | null; infover_match: string[] | null; infover_exclude: string[] | null; }; boost: number; penalty: number; }
 export interface SegmentationRule { name: string; triggers: Set<string> | null; prefixes: string[]; minRestLength: number; action: string; }
@@ -124,18 +129,18 @@ export const ORTHO_EQUIVALENTS: Record<string, string[]> = {
 };
 
 export const CONTEXT: Map<string, ContextRule> = new Map([
-  ...["un", "le", "mon", "ton", "son", "ce", "du", "au"].map(t => [t, { name: "determinants_masc_sing", filter: { cgram: ["NOM", "ADJ"], genre: "m", nombre: "s", infover_match: null, infover_exclude: null }, boost: 25, penalty: 0 }] as [string, ContextRule]),
-  ...["une", "la", "ma", "ta", "sa", "cette"].map(t => [t, { name: "determinants_fem_sing", filter: { cgram: ["NOM", "ADJ"], genre: "f", nombre: "s", infover_match: null, infover_exclude: null }, boost: 25, penalty: 0 }] as [string, ContextRule]),
-  ...["les", "des", "mes", "tes", "ses", "ces", "aux", "nos", "vos", "leurs"].map(t => [t, { name: "determinants_pluriel", filter: { cgram: ["NOM", "ADJ"], genre: null, nombre: "p", infover_match: null, infover_exclude: null }, boost: 25, penalty: 0 }] as [string, ContextRule]),
-  ...["je", "j'"].map(t => [t, { name: "pronom_je", filter: { cgram: ["VER"], genre: null, nombre: null, infover_match: ["1s", "1sg"], infover_exclude: null }, boost: 20, penalty: 0 }] as [string, ContextRule]),
-  ["tu", { name: "pronom_tu", filter: { cgram: ["VER"], genre: null, nombre: null, infover_match: ["2s", "2sg"], infover_exclude: null }, boost: 20, penalty: 0 }],
-  ...["il", "elle", "on"].map(t => [t, { name: "pronom_il_elle", filter: { cgram: ["VER"], genre: null, nombre: null, infover_match: ["3s", "3sg"], infover_exclude: null }, boost: 20, penalty: 0 }] as [string, ContextRule]),
-  ["nous", { name: "pronom_nous", filter: { cgram: ["VER"], genre: null, nombre: null, infover_match: ["1p", "1pl"], infover_exclude: null }, boost: 20, penalty: 0 }],
-  ["vous", { name: "pronom_vous", filter: { cgram: ["VER"], genre: null, nombre: null, infover_match: ["2p", "2pl"], infover_exclude: null }, boost: 20, penalty: 0 }],
-  ...["ils", "elles"].map(t => [t, { name: "pronom_ils_elles", filter: { cgram: ["VER"], genre: null, nombre: null, infover_match: ["3p", "3pl"], infover_exclude: null }, boost: 20, penalty: 0 }] as [string, ContextRule]),
-  ...["très", "tres", "plus", "moins", "trop", "assez", "si"].map(t => [t, { name: "adverbes_intensite", filter: { cgram: ["ADJ", "ADV"], genre: null, nombre: null, infover_match: null, infover_exclude: null }, boost: 20, penalty: 0 }] as [string, ContextRule]),
-  ...["de", "d'"].map(t => [t, { name: "preposition_de", filter: { cgram: ["NOM", "VER"], genre: null, nombre: null, infover_match: null, infover_exclude: null }, boost: 15, penalty: 0 }] as [string, ContextRule]),
-  ...["à", "a"].map(t => [t, { name: "preposition_a", filter: { cgram: ["NOM", "VER"], genre: null, nombre: null, infover_match: null, infover_exclude: null }, boost: 15, penalty: 0 }] as [string, ContextRule]),
+  ...["un", "le", "mon", "ton", "son", "ce", "du", "au"].map(t => [t, { name: "determinants_masc_sing", filter: { cgram: ["NOM", "ADJ"], genre: "m", nombre: "s", infover_match: null, infover_exclude: null }, boost: POIDS.contexte.determinants_masc_sing, penalty: 0 }] as [string, ContextRule]),
+  ...["une", "la", "ma", "ta", "sa", "cette"].map(t => [t, { name: "determinants_fem_sing", filter: { cgram: ["NOM", "ADJ"], genre: "f", nombre: "s", infover_match: null, infover_exclude: null }, boost: POIDS.contexte.determinants_fem_sing, penalty: 0 }] as [string, ContextRule]),
+  ...["les", "des", "mes", "tes", "ses", "ces", "aux", "nos", "vos", "leurs"].map(t => [t, { name: "determinants_pluriel", filter: { cgram: ["NOM", "ADJ"], genre: null, nombre: "p", infover_match: null, infover_exclude: null }, boost: POIDS.contexte.determinants_pluriel, penalty: 0 }] as [string, ContextRule]),
+  ...["je", "j'"].map(t => [t, { name: "pronom_je", filter: { cgram: ["VER"], genre: null, nombre: null, infover_match: ["1s", "1sg"], infover_exclude: null }, boost: POIDS.contexte.pronom_je, penalty: 0 }] as [string, ContextRule]),
+  ["tu", { name: "pronom_tu", filter: { cgram: ["VER"], genre: null, nombre: null, infover_match: ["2s", "2sg"], infover_exclude: null }, boost: POIDS.contexte.pronom_tu, penalty: 0 }],
+  ...["il", "elle", "on"].map(t => [t, { name: "pronom_il_elle", filter: { cgram: ["VER"], genre: null, nombre: null, infover_match: ["3s", "3sg"], infover_exclude: null }, boost: POIDS.contexte.pronom_il_elle, penalty: 0 }] as [string, ContextRule]),
+  ["nous", { name: "pronom_nous", filter: { cgram: ["VER"], genre: null, nombre: null, infover_match: ["1p", "1pl"], infover_exclude: null }, boost: POIDS.contexte.pronom_nous, penalty: 0 }],
+  ["vous", { name: "pronom_vous", filter: { cgram: ["VER"], genre: null, nombre: null, infover_match: ["2p", "2pl"], infover_exclude: null }, boost: POIDS.contexte.pronom_vous, penalty: 0 }],
+  ...["ils", "elles"].map(t => [t, { name: "pronom_ils_elles", filter: { cgram: ["VER"], genre: null, nombre: null, infover_match: ["3p", "3pl"], infover_exclude: null }, boost: POIDS.contexte.pronom_ils_elles, penalty: 0 }] as [string, ContextRule]),
+  ...["très", "tres", "plus", "moins", "trop", "assez", "si"].map(t => [t, { name: "adverbes_intensite", filter: { cgram: ["ADJ", "ADV"], genre: null, nombre: null, infover_match: null, infover_exclude: null }, boost: POIDS.contexte.adverbes_intensite, penalty: 0 }] as [string, ContextRule]),
+  ...["de", "d'"].map(t => [t, { name: "preposition_de", filter: { cgram: ["NOM", "VER"], genre: null, nombre: null, infover_match: null, infover_exclude: null }, boost: POIDS.contexte.preposition_de, penalty: 0 }] as [string, ContextRule]),
+  ...["à", "a"].map(t => [t, { name: "preposition_a", filter: { cgram: ["NOM", "VER"], genre: null, nombre: null, infover_match: null, infover_exclude: null }, boost: POIDS.contexte.preposition_a, penalty: 0 }] as [string, ContextRule]),
 ]);
 
 export const SEGMENTATION: SegmentationRule[] = [
@@ -144,4 +149,19 @@ export const SEGMENTATION: SegmentationRule[] = [
   { name: "liaisons_t", triggers: new Set(["petit", "grand", "est", "ont", "sont", "fait", "tout", "quand", "comment"]), prefixes: ["t"], minRestLength: 1, action: "remove_first" },
   { name: "elision_l", triggers: null, prefixes: ["l"], minRestLength: 2, action: "remove_first" },
   { name: "elision_d", triggers: null, prefixes: ["d"], minRestLength: 2, action: "remove_first" },
-];
\ No newline at end of file
+];
+// Empreinte des règles compilées (FNV-1a) : une table top-k construite avec
+// d'autres règles est ignorée (voir build_topk.py --edge)
+export function empreinte(texte: string): string {
+  let h = 0x811c9dc5;
+  for (let i = 0; i < texte.length; i++) {
+    h ^= texte.charCodeAt(i);
+    h = Math.imul(h, 0x01000193) >>> 0;
+  }
+  return h.toString(16).padStart(8, "0");
+}
+
+export const RULES_VERSION: string = empreinte(JSON.stringify(
+  [PATTERNS, CHARS, FINAL_VOWEL_EXPANSIONS, ORTHO_EQUIVALENTS, START_EQUIVALENTS, SILENT_FINAL_LETTERS, CONTEXT, SEGMENTATION, POIDS],
+  (_cle, valeur) => valeur instanceof Set || valeur instanceof Map ? [...valeur] : valeur,
+));
@@ -0,0 +1,98 @@
+/**
+ * TABLE TOP-K PRÉCALCULÉE (version Edge)
+ * Lecteur du fichier binaire produit par build_topk.py --edge (voir topk.js).
+ */
+
+const VERSION = 1;
+const TAILLE_ENTETE = 32;
+const TYPES_MATCH = ["ortho", "phon_dys", "fuzzy"];
+
+export interface MetaTopK {
+  versionRegles: string;
+  totalEntries: number;
+  minPrefixLength: number;
+  longueurMax: number;
+  niveaux: string[];
+  classes: { cle: string; prevWord: string }[];
+  segmentations: string[];
+}
+
+const aligner4 = (n: number) => (n + 3) & ~3;
+
+export class TableTopK {
+  public k: number;
+  public totalEntries: number;
+  public meta: MetaTopK;
+  private index = new Map<string, number>();
+  private niveaux: Map<string, number>;
+  private classes: Map<string, number>;
+  private debuts: Uint32Array;
+  private longueurs: Uint8Array;
+  private ids: Uint32Array;
+  private scores: Float32Array;
+  private drapeaux: Uint8Array;
+
+  constructor(buffer: ArrayBuffer) {
+    const view = new DataView(buffer);
+    const magic = String.fromCharCode(...new Uint8Array(buffer, 0, 4));
+    if (magic !== "DYST") throw new Error("Fichier top-k invalide (magic)");
+    const version = view.getUint32(4, true);
+    if (version !== VERSION) throw new Error(`Version top-k non supportée: ${version}`);
+    const nbCles = view.getUint32(8, true);
+    const nbResultats = view.getUint32(12, true);
+    this.k = view.getUint32(16, true);
+    this.totalEntries = view.getUint32(20, true);
+    const tailleMeta = view.getUint32(24, true);
+    const tailleCles = view.getUint32(28, true);
+
+    const decoder = new TextDecoder();
+    let offset = TAILLE_ENTETE;
+    this.meta = JSON.parse(decoder.decode(new Uint8Array(buffer, offset, tailleMeta)));
+    offset += aligner4(tailleMeta);
+    const lignes = decoder.decode(new Uint8Array(buffer, offset, tailleCles)).split("\n");
+    offset += aligner4(tailleCles);
+    for (let i = 0; i < nbCles; i++) this.index.set(lignes[i], i);
+    this.niveaux = new Map(this.meta.niveaux.map((n, i) => [n, i]));
+    this.classes = new Map(this.meta.classes.map((c, i) => [c.cle, i]));
+
+    this.debuts = new Uint32Array(buffer, offset, nbCles);
+    offset += nbCles * 4;
+    this.longueurs = new Uint8Array(buffer, offset, nbCles);
+    offset += aligner4(nbCles);
+    this.ids = new Uint32Array(buffer, offset, nbResultats);
+    offset += nbResultats * 4;
+    this.scores = new Float32Array(buffer, offset, nbResultats);
+    offset += nbResultats * 4;
+    this.drapeaux = new Uint8Array(buffer, offset, nbResultats);
+  }
+
+  chercher(niveau: string, classe: string, prefixe: string): { ids: Uint32Array; scores: Float32Array; drapeaux: Uint8Array } | null {
+    const n = this.niveaux.get(niveau);
+    const c = this.classes.get(classe);
+    if (n === undefined || c === undefined) return null;
+    const pos = this.index.get(`${n}\t${c}\t${prefixe}`);
+    if (pos === undefined) return null;
+    const debut = this.debuts[pos];
+    const fin = debut + this.longueurs[pos];
+    return { ids: this.ids.subarray(debut, fin), scores: this.scores.subarray(debut, fin), drapeaux: this.drapeaux.subarray(debut, fin) };
+  }
+
+  decoder(drapeau: number): { matchType: string; fallback: boolean; contextMatch: boolean; segmentation: string | null } {
+    const seg = drapeau >> 4;
+    return {
+      matchType: TYPES_MATCH[drapeau & 3],
+      fallback: (drapeau & 4) !== 0,
+      contextMatch: (drapeau & 8) !== 0,
+      segmentation: seg > 0 ? this.meta.segmentations[seg - 1] : null,
+    };
+  }
+}
+
+// Encode les drapeaux d'un résultat de predict() (utilisé par tools/topk_worker.ts)
+export function encoderDrapeaux(r: { matchType: string; fallback?: boolean; contextMatch?: boolean; segmentation?: string | null }, segmentations: string[]): number {
+  let drapeau = Math.max(0, TYPES_MATCH.indexOf(r.matchType));
+  if (r.fallback) drapeau |= 4;
+  if (r.contextMatch) drapeau |= 8;
+  if (r.segmentation) drapeau |= (segmentations.indexOf(r.segmentation) + 1) << 4;
+  return drapeau;
+}
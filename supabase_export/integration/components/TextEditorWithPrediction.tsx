@@ -42,6 +42,7 @@ export function TextEditorWithPrediction({
     codeDys,
     predict,
     clear,
+    select,
     selectedIndex,
     navigateUp,
     navigateDown,
@@ -143,9 +144,10 @@ export function TextEditorWithPrediction({
       }
     }, 0);
 
-    clear();
+    // Mémorise le choix (lexique personnel) puis vide les suggestions
+    select(result);
     setShowPopup(false);
-  }, [text, onChange, extractCurrentWord, clear]);
+  }, [text, onChange, extractCurrentWord, select]);
 
   // Gérer les touches clavier
   const handleKeyDown = useCallback((e: React.KeyboardEvent<HTMLTextAreaElement>) => {
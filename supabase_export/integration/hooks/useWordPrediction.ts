@@ -3,14 +3,36 @@
  * 
  * Remplace l'ancien hook avec base locale par un appel à l'Edge Function Supabase
  * qui contient 42K mots avec support phonétique DYS complet.
+ *
+ * Prédiction locale d'abord : les mots fréquents sont prédits dans le navigateur
+ * (bundle hors ligne, voir lib/bundleClient.ts), sans aller-retour réseau.
+ * L'Edge Function n'est appelée que si le bundle ne trouve pas assez de
+ * résultats (mots rares, fautes lourdes).
+ *
+ * Réponses compactes : l'Edge Function renvoie des lignes (ID, mot, score...)
+ * sans les champs statiques des entrées déjà présentes dans le bundle, lus
+ * ici par leur ID. Seulement si le bundle a été construit avec le dictionnaire
+ * de l'Edge Function (champ `version`) : sinon les champs sont redemandés et
+ * le bundle rechargé.
  */
 
 import { useState, useCallback, useMemo, useRef, useEffect } from 'react';
 import { supabase } from '@/integrations/supabase/client';
 import debounce from 'lodash/debounce';
+import { LexiquePersonnel } from '../lib/lexiquePersonnel';
+import { chargerPredicteurLocal, type PredicteurLocal } from '../lib/bundleClient';
+import type { PredictResult } from '../../functions/predict/predicteur.ts';
+import {
+  decoderResultatsCompacts,
+  DRAPEAU_CONTEXTE,
+  DRAPEAU_PERSONNEL,
+  type LigneCompacte,
+  type ResultatCompact,
+} from '../../functions/predict/compact.ts';
 
 // Types
 export interface PredictionResult {
+  id: number;
   mot: string;
   lemme: string;
   emoji: string | null;
@@ -24,6 +46,9 @@ export interface PredictionResult {
   match: 'ortho' | 'phon_dys';
   segmentation: string | null;
   contextMatch: boolean;
+  personnel: boolean;
+  /** Autres formes du lemme (option groupByLemma) */
+  formes?: string[];
 }
 
 export interface PredictionResponse {
@@ -31,7 +56,11 @@ export interface PredictionResponse {
   code_dys: string;
   prevWord: string | null;
   count: number;
-  results: PredictionResult[];
+  /** Présent en format compact : colonnes des lignes de results */
+  schema?: string[];
+  /** Version du dictionnaire (IDs des résultats et du lexique personnel) */
+  version?: string;
+  results: PredictionResult[] | LigneCompacte[];
 }
 
 export interface UseWordPredictionOptions {
@@ -45,6 +74,14 @@ export interface UseWordPredictionOptions {
   useCache?: boolean;
   /** Taille max du cache (défaut: 100) */
   maxCacheSize?: number;
+  /** Classement adaptatif selon les mots déjà choisis (défaut: true) */
+  personalize?: boolean;
+  /** Prédiction locale d'abord avec le bundle hors ligne (défaut: true) */
+  offline?: boolean;
+  /** Réponses compactes de l'Edge Function (défaut: true) */
+  compact?: boolean;
+  /** Une suggestion par lemme, autres formes dans `formes` (défaut: false) */
+  groupByLemma?: boolean;
 }
 
 export interface UseWordPredictionReturn {
@@ -73,6 +110,123 @@ export interface UseWordPredictionReturn {
 // Cache global (persiste entre les re-renders)
 const globalCache = new Map<string, PredictionResult[]>();
 
+// Prédicteur local (bundle hors ligne), chargé une fois pour toutes les instances
+const URL_MANIFESTE_BUNDLE = supabase.storage.from('predict-data').getPublicUrl('bundle_client.json').data.publicUrl;
+// Résultats locaux (hors fallback) suffisants pour ne pas appeler le serveur
+const MIN_RESULTATS_LOCAUX = 3;
+let predicteurLocal: PredicteurLocal | null = null;
+let chargementLocal: Promise<PredicteurLocal | null> | null = null;
+// Version du dictionnaire de l'Edge Function (dernière réponse)
+let versionServeur: string | null = null;
+
+function chargerLocal(): Promise<PredicteurLocal | null> {
+  if (!chargementLocal) {
+    chargementLocal = chargerPredicteurLocal(URL_MANIFESTE_BUNDLE)
+      .then((p) => (predicteurLocal = p))
+      .catch((err) => {
+        console.warn('Prédiction locale indisponible:', err);
+        return null;
+      });
+  }
+  return chargementLocal;
+}
+
+// Les IDs du bundle sont ceux du dictionnaire servi (version inconnue : on suppose que oui)
+function bundleAJour(): boolean {
+  return predicteurLocal?.dictionnaire != null &&
+    (versionServeur === null || versionServeur === predicteurLocal.dictionnaire);
+}
+
+// Nouveau dictionnaire côté serveur : nouveau manifeste, bundle retéléchargé s'il a changé
+function rechargerLocal(): void {
+  if (!predicteurLocal) return;
+  chargementLocal = null;
+  chargerLocal();
+}
+
+// Même format que la réponse de l'Edge Function
+function versResultat(r: PredictResult): PredictionResult {
+  return {
+    id: r.id,
+    mot: r.ortho,
+    lemme: r.lemme,
+    emoji: r.emoji || null,
+    phon: r.phon,
+    phon_dys: r.phon_dys,
+    cgram: r.cgram,
+    genre: r.genre || '',
+    nombre: r.nombre || '',
+    freq: r.freq?.toFixed(1) || '0',
+    score: r.score?.toFixed(1) || '0',
+    match: r.matchType as PredictionResult['match'],
+    segmentation: r.segmentation || null,
+    contextMatch: r.contextMatch || false,
+    personnel: r.personnel || false,
+    ...(r.formes ? { formes: r.formes } : {}),
+  };
+}
+
+// Ligne compacte : champs statiques non envoyés lus dans le bundle local
+function depuisCompact(c: ResultatCompact): PredictionResult {
+  const entree = c.lemme == null ? predicteurLocal?.entrees.get(c.id) : undefined;
+  const lemme = c.lemme ?? entree?.lemme ?? c.mot;
+  return {
+    id: c.id,
+    mot: c.mot,
+    lemme,
+    emoji: c.emoji ?? (entree ? predicteurLocal!.predicteur.getEmoji(lemme) : null),
+    phon: entree?.phon || '',
+    phon_dys: entree?.phon_dys || '',
+    cgram: c.cgram ?? entree?.cgram ?? '',
+    genre: c.genre ?? entree?.genre ?? '',
+    nombre: c.nombre ?? entree?.nombre ?? '',
+    freq: entree ? entree.freq.toFixed(1) : '0',
+    score: c.score.toFixed(1),
+    match: c.match as PredictionResult['match'],
+    segmentation: c.segmentation,
+    contextMatch: (c.drapeaux & DRAPEAU_CONTEXTE) !== 0,
+    personnel: (c.drapeaux & DRAPEAU_PERSONNEL) !== 0,
+    ...(c.formes ? { formes: c.formes } : {}),
+  };
+}
+
+// Lexique personnel (persisté en localStorage, partagé entre les instances)
+const LEXIQUE_STORAGE_KEY = 'dys_lexique_personnel';
+let lexiquePersonnel: LexiquePersonnel | null = null;
+
+// Version du dictionnaire des IDs enregistrés : celle du serveur, sinon du bundle
+function versionIds(): string | null {
+  return versionServeur || predicteurLocal?.dictionnaire || null;
+}
+
+function getLexiquePersonnel(): LexiquePersonnel {
+  if (!lexiquePersonnel) {
+    let data: unknown = null;
+    try {
+      data = JSON.parse(localStorage.getItem(LEXIQUE_STORAGE_KEY) || 'null');
+    } catch {
+      // Données corrompues ou localStorage indisponible : on repart de zéro
+    }
+    lexiquePersonnel = LexiquePersonnel.deserialize(data);
+  }
+  // Nouveau dictionnaire (ou lexique sans version) : ses IDs désigneraient d'autres mots
+  const version = versionIds();
+  if (version && lexiquePersonnel.version !== version) {
+    lexiquePersonnel = new LexiquePersonnel({ version });
+    saveLexiquePersonnel();
+  }
+  return lexiquePersonnel;
+}
+
+function saveLexiquePersonnel(): void {
+  if (!lexiquePersonnel) return;
+  try {
+    localStorage.setItem(LEXIQUE_STORAGE_KEY, JSON.stringify(lexiquePersonnel.serialize()));
+  } catch {
+    // Quota dépassé ou mode privé : la personnalisation reste en mémoire
+  }
+}
+
 export function useWordPrediction(
   options: UseWordPredictionOptions = {}
 ): UseWordPredictionReturn {
@@ -82,6 +236,10 @@ export function useWordPrediction(
     minLength = 2,
     useCache = true,
     maxCacheSize = 100,
+    personalize = true,
+    offline = true,
+    compact = true,
+    groupByLemma = false,
   } = options;
 
   // State
@@ -128,7 +286,7 @@ export function useWordPrediction(
     }
 
     // Clé de cache
-    const cacheKey = `${trimmedInput}|${prevWord}`;
+    const cacheKey = `${trimmedInput}|${prevWord}${groupByLemma ? '|lemme' : ''}`;
     
     // Vérifier le cache
     const cached = cacheGet(cacheKey);
@@ -147,17 +305,37 @@ export function useWordPrediction(
     setIsLoading(true);
     setError(null);
 
+    const appeler = (connus: number | undefined) => supabase.functions.invoke<PredictionResponse>(
+      'predict',
+      {
+        body: { 
+          query: trimmedInput, 
+          prevWord: prevWord || undefined,
+          limit,
+          lexique: personalize && getLexiquePersonnel().size > 0
+            ? getLexiquePersonnel().serialize()
+            : undefined,
+          format: compact ? 'compact' : undefined,
+          connus,
+          grouper: groupByLemma ? 'lemme' : undefined,
+        },
+      }
+    );
+
     try {
-      const { data, error: supabaseError } = await supabase.functions.invoke<PredictionResponse>(
-        'predict',
-        {
-          body: { 
-            query: trimmedInput, 
-            prevWord: prevWord || undefined,
-            limit 
-          },
-        }
-      );
+      // Entrées du bundle : champs statiques inutiles
+      const connus = compact && bundleAJour() ? predicteurLocal!.freqMin ?? undefined : undefined;
+      let { data, error: supabaseError } = await appeler(connus);
+      if (data?.version) {
+        const change = data.version !== versionServeur;
+        versionServeur = data.version;
+        if (change && !bundleAJour()) rechargerLocal();
+      }
+      if (!supabaseError && data?.schema && connus !== undefined && data.version !== predicteurLocal?.dictionnaire) {
+        // Bundle d'un autre dictionnaire : ses IDs ne désignent pas les mêmes entrées
+        if (!data.version) versionServeur = '';
+        ({ data, error: supabaseError } = await appeler(undefined));
+      }
 
       // Vérifier si la requête a été annulée
       if (lastQueryRef.current !== trimmedInput) {
@@ -169,7 +347,9 @@ export function useWordPrediction(
       }
 
       if (data) {
-        const results = data.results || [];
+        const results = data.schema
+          ? decoderResultatsCompacts(data.schema, data.results as LigneCompacte[]).map(depuisCompact)
+          : (data.results || []) as PredictionResult[];
         setSuggestions(results);
         setCodeDys(data.code_dys || null);
         setSelectedIndex(-1);
@@ -184,12 +364,15 @@ export function useWordPrediction(
       }
       
       console.warn('Prédiction DYS indisponible:', err);
-      setError('Prédiction temporairement indisponible');
-      setSuggestions([]);
+      // Hors ligne : les suggestions locales déjà affichées restent
+      if (!(offline && predicteurLocal)) {
+        setError('Prédiction temporairement indisponible');
+        setSuggestions([]);
+      }
     } finally {
       setIsLoading(false);
     }
-  }, [minLength, limit, cacheGet, cacheSet]);
+  }, [minLength, limit, personalize, offline, compact, groupByLemma, cacheGet, cacheSet]);
 
   // Debounced predict
   const debouncedPredict = useMemo(
@@ -200,6 +383,30 @@ export function useWordPrediction(
     [fetchPredictions, debounceMs]
   );
 
+  // Chargement du bundle local (IndexedDB ou téléchargement)
+  useEffect(() => {
+    if (offline) chargerLocal();
+  }, [offline]);
+
+  // Prédiction locale : null si le bundle n'est pas (encore) chargé
+  const predireLocal = useCallback((input: string, prevWord: string) => {
+    if (!offline || !predicteurLocal) return null;
+    const results = predicteurLocal.predicteur.predict(input, {
+      limit,
+      prevWord,
+      minPrefixLength: 2,
+      // Lexique d'une autre version que le bundle : ignoré (IDs différents)
+      lexiquePersonnel: personalize && getLexiquePersonnel().size > 0 &&
+        getLexiquePersonnel().version === predicteurLocal.dictionnaire ? getLexiquePersonnel() : null,
+      grouperLemmes: groupByLemma,
+    });
+    return {
+      results: results.map(versResultat),
+      codeDys: predicteurLocal.predicteur.transcode(input),
+      suffisant: results.filter((r) => !r.fallback).length >= Math.min(limit, MIN_RESULTATS_LOCAUX),
+    };
+  }, [offline, limit, personalize, groupByLemma]);
+
   // Cleanup on unmount
   useEffect(() => {
     return () => {
@@ -210,8 +417,23 @@ export function useWordPrediction(
 
   // Public methods
   const predict = useCallback((input: string, prevWord?: string) => {
+    const trimmedInput = input.trim().toLowerCase();
+    const locaux = trimmedInput.length >= minLength ? predireLocal(trimmedInput, prevWord || '') : null;
+    if (locaux) {
+      // Affichage immédiat, sans debounce
+      setSuggestions(locaux.results);
+      setCodeDys(locaux.codeDys);
+      setSelectedIndex(-1);
+      setError(null);
+      if (locaux.suffisant) {
+        // Pas d'appel serveur ; une réponse en vol pour un input précédent sera ignorée
+        debouncedPredict.cancel();
+        lastQueryRef.current = trimmedInput;
+        return;
+      }
+    }
     debouncedPredict(input, prevWord || '');
-  }, [debouncedPredict]);
+  }, [debouncedPredict, predireLocal, minLength]);
 
   const clear = useCallback(() => {
     debouncedPredict.cancel();
@@ -223,8 +445,14 @@ export function useWordPrediction(
 
   const select = useCallback((result: PredictionResult) => {
     // Le composant parent gérera l'insertion du mot
+    if (personalize && Number.isInteger(result.id)) {
+      getLexiquePersonnel().enregistrer(result.id);
+      saveLexiquePersonnel();
+      // Le classement a changé : les résultats en cache sont périmés
+      globalCache.clear();
+    }
     clear();
-  }, [clear]);
+  }, [clear, personalize]);
 
   const navigateUp = useCallback(() => {
     setSelectedIndex((prev) => 
@@ -6,6 +6,9 @@
 export { useWordPrediction, type UseWordPredictionOptions, type UseWordPredictionReturn } from './hooks/useWordPrediction';
 export type { PredictionResult, PredictionResponse } from './hooks/useWordPrediction';
 
+// Prédiction hors ligne (bundle client)
+export { chargerPredicteurLocal, decoderBundle, type ManifesteBundle, type PredicteurLocal } from './lib/bundleClient';
+
 // Composants
 export { EditorPredictionPopup, type EditorPredictionPopupProps } from './components/EditorPredictionPopup';
 export { TextEditorWithPrediction } from './components/TextEditorWithPrediction';
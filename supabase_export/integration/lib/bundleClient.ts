@@ -0,0 +1,177 @@
+/**
+ * BUNDLE CLIENT (prédiction hors ligne)
+ * Lecteur du dictionnaire réduit produit par build_bundle_client.js et moteur
+ * de l'edge function (predicteur.ts + rules.ts) exécuté dans le navigateur.
+ * Le bundle est gardé en IndexedDB avec sa version : il n'est retéléchargé
+ * que si le manifeste en annonce une nouvelle, et reste utilisable sans réseau.
+ */
+
+import { PredicteurDys, type DictData, type DictEntry } from '../../functions/predict/predicteur.ts';
+
+const VERSION = 1;
+const TAILLE_ENTETE = 28;
+
+const BASE_IDB = 'dys_prediction';
+const STORE_IDB = 'bundle';
+const CLE_IDB = 'dictionnaire';
+
+export interface ManifesteBundle {
+  version: string;
+  fichier: string;
+  octets: number;
+  entrees: number;
+  niveau: string;
+  seuil: number;
+  freqMin?: number;
+  dictionnaire?: string;
+  date: string;
+}
+
+export interface BundleDecode {
+  dict: DictData;
+  emojis: Record<string, string>;
+  meta: { niveau: string; seuil: number; freqMin?: number; dictionnaire?: string; date: string };
+}
+
+export interface PredicteurLocal {
+  predicteur: PredicteurDys;
+  /** Entrées du bundle par ID global (champs statiques des réponses compactes) */
+  entrees: Map<number, DictEntry>;
+  /** Toutes les entrées de fréquence >= freqMin sont dans le bundle (null : inconnu) */
+  freqMin: number | null;
+  /** Version du dictionnaire source (null : bundle antérieur, inconnue) */
+  dictionnaire: string | null;
+}
+
+const aligner4 = (n: number) => (n + 3) & ~3;
+
+/**
+ * Décode le bundle et reconstruit les index du moteur
+ * (les IDs des index sont des positions dans entries, entry.id reste l'ID global)
+ */
+export function decoderBundle(buffer: ArrayBuffer): BundleDecode {
+  const view = new DataView(buffer);
+  const magic = String.fromCharCode(...new Uint8Array(buffer, 0, 4));
+  if (magic !== 'DYSC') throw new Error('Bundle client invalide (magic)');
+  const version = view.getUint32(4, true);
+  if (version !== VERSION) throw new Error(`Version de bundle non supportée: ${version}`);
+  const nbEntrees = view.getUint32(8, true);
+  const tailleMeta = view.getUint32(16, true);
+  const tailleTexte = view.getUint32(20, true);
+  const tailleEmojis = view.getUint32(24, true);
+
+  const decoder = new TextDecoder();
+  let offset = TAILLE_ENTETE;
+  const meta = JSON.parse(decoder.decode(new Uint8Array(buffer, offset, tailleMeta)));
+  offset += aligner4(tailleMeta);
+  const lignes = decoder.decode(new Uint8Array(buffer, offset, tailleTexte)).split('\n');
+  offset += aligner4(tailleTexte);
+  const lignesEmojis = tailleEmojis ? decoder.decode(new Uint8Array(buffer, offset, tailleEmojis)).split('\n') : [];
+  offset += aligner4(tailleEmojis);
+  const ids = new Uint32Array(buffer, offset, nbEntrees);
+  offset += nbEntrees * 4;
+  const freqs = new Float32Array(buffer, offset, nbEntrees);
+
+  const entries: DictEntry[] = new Array(nbEntrees);
+  const indexPhonDys: Record<string, number[]> = {};
+  const idxOrthoPrefix: Record<string, number[]> = {};
+  const idxDysPrefix: Record<string, number[]> = {};
+  const ajouter = (index: Record<string, number[]>, cle: string, i: number) => {
+    (index[cle] || (index[cle] = [])).push(i);
+  };
+
+  for (let i = 0; i < nbEntrees; i++) {
+    const [ortho, phon, phon_dys, lemme, cgram, genre, nombre, infover] = lignes[i].split('\t');
+    const entry: DictEntry = { id: ids[i], ortho, phon, phon_dys, lemme, cgram, freq: Math.round(freqs[i] * 10) / 10 };
+    if (genre) entry.genre = genre;
+    if (nombre) entry.nombre = nombre;
+    if (infover) entry.infover = infover;
+    entries[i] = entry;
+
+    if (phon_dys) ajouter(indexPhonDys, phon_dys, i);
+    if (ortho.length >= 2) ajouter(idxOrthoPrefix, ortho.toLowerCase().substring(0, 2), i);
+    if (phon_dys.length >= 2) ajouter(idxDysPrefix, phon_dys.substring(0, 2), i);
+  }
+
+  const emojis: Record<string, string> = {};
+  for (const ligne of lignesEmojis) {
+    const [lemme, emoji] = ligne.split('\t');
+    emojis[lemme] = emoji;
+  }
+
+  return {
+    dict: { meta: { total_entries: nbEntrees }, entries, index_phon_dys: indexPhonDys, idx_ortho_prefix: idxOrthoPrefix, idx_dys_prefix: idxDysPrefix },
+    emojis,
+    meta,
+  };
+}
+
+// --- IndexedDB ---
+
+function ouvrirBase(): Promise<IDBDatabase> {
+  return new Promise((resolve, reject) => {
+    const requete = indexedDB.open(BASE_IDB, 1);
+    requete.onupgradeneeded = () => requete.result.createObjectStore(STORE_IDB);
+    requete.onsuccess = () => resolve(requete.result);
+    requete.onerror = () => reject(requete.error);
+  });
+}
+
+async function lireBundleStocke(): Promise<{ version: string; donnees: ArrayBuffer } | null> {
+  const base = await ouvrirBase();
+  return new Promise((resolve, reject) => {
+    const requete = base.transaction(STORE_IDB, 'readonly').objectStore(STORE_IDB).get(CLE_IDB);
+    requete.onsuccess = () => resolve(requete.result || null);
+    requete.onerror = () => reject(requete.error);
+  });
+}
+
+async function stockerBundle(version: string, donnees: ArrayBuffer): Promise<void> {
+  const base = await ouvrirBase();
+  return new Promise((resolve, reject) => {
+    const transaction = base.transaction(STORE_IDB, 'readwrite');
+    transaction.objectStore(STORE_IDB).put({ version, donnees }, CLE_IDB);
+    transaction.oncomplete = () => resolve();
+    transaction.onerror = () => reject(transaction.error);
+  });
+}
+
+/**
+ * Charge le prédicteur local : bundle en IndexedDB s'il est à jour (ou si le
+ * réseau est indisponible), sinon téléchargement puis stockage.
+ * @param urlManifeste - URL publique de bundle_client.json (bucket predict-data)
+ * @returns null si aucun bundle n'est disponible (ni en cache, ni en ligne)
+ */
+export async function chargerPredicteurLocal(urlManifeste: string): Promise<PredicteurLocal | null> {
+  let stocke: { version: string; donnees: ArrayBuffer } | null = null;
+  try {
+    stocke = await lireBundleStocke();
+  } catch {
+    // IndexedDB indisponible (mode privé) : bundle en mémoire uniquement
+  }
+
+  let donnees = stocke?.donnees || null;
+  try {
+    const manifeste: ManifesteBundle = await (await fetch(urlManifeste, { cache: 'no-cache' })).json();
+    if (!stocke || stocke.version !== manifeste.version) {
+      const reponse = await fetch(new URL(manifeste.fichier, urlManifeste).toString());
+      if (!reponse.ok) throw new Error(`Bundle introuvable (${reponse.status})`);
+      donnees = await reponse.arrayBuffer();
+      stockerBundle(manifeste.version, donnees).catch(() => {});
+    }
+  } catch (err) {
+    // Hors ligne : on garde le bundle stocké, quelle que soit sa version
+    if (!donnees) {
+      console.warn('Bundle de prédiction locale indisponible:', err);
+      return null;
+    }
+  }
+
+  const { dict, emojis, meta } = decoderBundle(donnees!);
+  return {
+    predicteur: new PredicteurDys(dict, emojis, null, null),
+    entrees: new Map(dict.entries.map((e) => [e.id, e])),
+    freqMin: meta.freqMin ?? null,
+    dictionnaire: meta.dictionnaire ?? null,
+  };
+}
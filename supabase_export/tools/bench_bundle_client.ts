@@ -0,0 +1,105 @@
+/**
+ * BENCHMARK - Bundle client (prédiction hors ligne)
+ * Mesure, avec le moteur exécuté dans le navigateur (bundleClient.ts +
+ * predicteur.ts) :
+ *   - taille du bundle (brute et gzip) par rapport au budget
+ *   - temps de chargement : décodage + index + construction du prédicteur
+ *   - latence par frappe (mots tapés lettre par lettre), p50 / p99
+ *   - part des frappes servies en local (sans appel serveur) et, si le
+ *     dictionnaire complet est fourni, accord du top-1 avec l'edge function
+ *
+ * Usage: deno run --allow-read supabase_export/tools/bench_bundle_client.ts \
+ *          [bundle_client.bin] [dictionnaire_dys_optimized.json]
+ * Code de sortie 1 si un budget est dépassé.
+ */
+
+import { decoderBundle } from "../integration/lib/bundleClient.ts";
+import { PredicteurDys } from "../functions/predict/predicteur.ts";
+
+const BUDGET_KO = 600;            // Bundle non compressé (voir build_bundle_client.js)
+const BUDGET_CHARGEMENT_MS = 200; // Décodage + index au démarrage de l'éditeur
+const BUDGET_FRAPPE_MS = 16;      // p99 par frappe : une image à 60 Hz
+const MIN_RESULTATS_LOCAUX = 3;   // Même règle que useWordPrediction.ts
+const CHARGEMENTS = 10;
+
+const MOTS = ["bato", "mézon", "pobelle", "fotograf", "cahmp", "chocola", "élefan", "tortu", "papillon", "gato",
+  "maman", "ecole", "jardin", "lapin", "voiture", "cheval", "manger", "jouer", "dormir", "soleil"];
+const PREV_WORDS = ["", "le", "un", "les", "je"];
+
+const dossier = new URL("../functions/predict/data/", import.meta.url);
+const fichierBundle = Deno.args[0] || new URL("bundle_client.bin", dossier).pathname;
+const fichierComplet = Deno.args[1] || null;
+
+const centile = (tries: number[], p: number) => tries[Math.min(tries.length - 1, Math.floor(tries.length * p))];
+
+async function tailleGzip(octets: Uint8Array): Promise<number> {
+  const flux = new Blob([octets]).stream().pipeThrough(new CompressionStream("gzip"));
+  return (await new Response(flux).arrayBuffer()).byteLength;
+}
+
+const octets = await Deno.readFile(fichierBundle);
+const buffer = octets.buffer.slice(octets.byteOffset, octets.byteOffset + octets.byteLength);
+
+// Chargement (médiane de plusieurs décodages, le premier compte comme démarrage à froid)
+const chargements: number[] = [];
+let predicteur: PredicteurDys | null = null;
+for (let i = 0; i < CHARGEMENTS; i++) {
+  const t = performance.now();
+  const { dict, emojis } = decoderBundle(buffer.slice(0));
+  predicteur = new PredicteurDys(dict, emojis, null, null);
+  chargements.push(performance.now() - t);
+}
+const premierChargement = chargements[0];
+chargements.sort((a, b) => a - b);
+const local = predicteur!;
+
+// Référence : edge function avec le dictionnaire complet (optionnel)
+const complet = fichierComplet
+  ? new PredicteurDys(JSON.parse(await Deno.readTextFile(fichierComplet)), {}, null, null)
+  : null;
+
+// Frappes
+const durees: number[] = [];
+let suffisants = 0;
+let accords = 0;
+let comparees = 0;
+for (let tour = 0; tour < 3; tour++) {
+  for (const prevWord of PREV_WORDS) {
+    for (const mot of MOTS) {
+      for (let n = 2; n <= mot.length; n++) {
+        const q = mot.slice(0, n);
+        const t = performance.now();
+        const results = local.predict(q, { prevWord, limit: 8, minPrefixLength: 2 });
+        durees.push(performance.now() - t);
+        if (tour > 0) continue;
+
+        const suffisant = results.filter((r) => !r.fallback).length >= MIN_RESULTATS_LOCAUX;
+        if (suffisant) suffisants++;
+        if (complet && suffisant) {
+          const attendu = complet.predict(q, { prevWord, limit: 8, minPrefixLength: 2, useTopK: false });
+          comparees++;
+          if (attendu[0] && results[0] && attendu[0].id === results[0].id) accords++;
+        }
+      }
+    }
+  }
+}
+const frappesParTour = durees.length / 3;
+durees.sort((a, b) => a - b);
+
+const gzip = await tailleGzip(octets);
+const p99 = centile(durees, 0.99);
+const mediane = centile(chargements, 0.5);
+
+console.log("=".repeat(50));
+console.log("📦 BENCHMARK BUNDLE CLIENT");
+console.log("=".repeat(50));
+console.log(`Bundle : ${local.meta.total_entries} entrées, ${(octets.length / 1024).toFixed(1)} Ko (gzip ${(gzip / 1024).toFixed(1)} Ko), budget ${BUDGET_KO} Ko`);
+console.log(`Chargement : ${premierChargement.toFixed(1)} ms à froid, ${mediane.toFixed(1)} ms médiane (budget ${BUDGET_CHARGEMENT_MS} ms)`);
+console.log(`Frappe : p50 ${(centile(durees, 0.5) * 1000).toFixed(0)} µs, p99 ${(p99 * 1000).toFixed(0)} µs, max ${durees[durees.length - 1].toFixed(2)} ms (budget p99 ${BUDGET_FRAPPE_MS} ms)`);
+console.log(`Frappes servies en local : ${(suffisants / frappesParTour * 100).toFixed(0)} %`);
+if (complet) console.log(`Top-1 identique à l'edge function (frappes locales) : ${(accords / Math.max(comparees, 1) * 100).toFixed(0)} %`);
+
+const echec = octets.length > BUDGET_KO * 1024 || mediane > BUDGET_CHARGEMENT_MS || p99 > BUDGET_FRAPPE_MS;
+console.log(echec ? "\n❌ Budget dépassé" : "\n✅ Budgets respectés");
+Deno.exit(echec ? 1 : 0);
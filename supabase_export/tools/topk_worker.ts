@@ -0,0 +1,64 @@
+/**
+ * WORKER TOP-K (version Edge)
+ * Lancé par build_topk.py --edge : même protocole que topk_worker.js, mais
+ * avec le scoring de l'edge function (predicteur.ts et rules.ts).
+ *
+ * Usage: deno run --allow-read supabase_export/tools/topk_worker.ts <dictionnaire_optimisé.json>
+ */
+
+import { PredicteurDys } from "../functions/predict/predicteur.ts";
+import { encoderDrapeaux } from "../functions/predict/topk.ts";
+import { CONTEXT, SEGMENTATION, RULES_VERSION } from "../functions/predict/rules.ts";
+
+const MIN_PREFIX_LENGTH = 2; // Valeur par défaut de predict()
+
+const dictData = JSON.parse(await Deno.readTextFile(Deno.args[0]));
+// Sans bigrammes : les successeurs dépendent du mot exact, hors table
+const predicteur = new PredicteurDys(dictData, {}, null, null);
+const segmentations = SEGMENTATION.map((r) => r.name);
+
+function enumererClasses(): { cle: string; prevWord: string }[] {
+  const candidats = ["", ...CONTEXT.keys()];
+  for (const rule of SEGMENTATION) if (rule.triggers) candidats.push(...rule.triggers);
+  const classes = new Map<string, string>();
+  for (const prevWord of candidats) {
+    const cle = predicteur.classeContexte(prevWord);
+    if (!classes.has(cle)) classes.set(cle, prevWord);
+  }
+  return [...classes].map(([cle, prevWord]) => ({ cle, prevWord }));
+}
+
+// deno-lint-ignore no-explicit-any
+function traiter(requete: any): unknown {
+  if (requete.cmd === "info") {
+    return {
+      versionRegles: RULES_VERSION,
+      totalEntries: dictData.meta.total_entries,
+      minPrefixLength: MIN_PREFIX_LENGTH,
+      segmentations,
+      classes: enumererClasses(),
+    };
+  }
+  if (requete.cmd === "topk") {
+    const { prevWord = "", prefixes, k } = requete;
+    const resultats = prefixes.map((prefixe: string) =>
+      predicteur.predict(prefixe, { limit: k, prevWord, minPrefixLength: MIN_PREFIX_LENGTH, useTopK: false })
+        .map((r) => [r.id, r.score, encoderDrapeaux(r, segmentations)])
+    );
+    return { resultats };
+  }
+  return { erreur: `Commande inconnue: ${requete.cmd}` };
+}
+
+// Une requête JSON par ligne sur stdin, une réponse par ligne sur stdout
+const encoder = new TextEncoder();
+let tampon = "";
+for await (const morceau of Deno.stdin.readable.pipeThrough(new TextDecoderStream())) {
+  tampon += morceau;
+  let fin;
+  while ((fin = tampon.indexOf("\n")) !== -1) {
+    const ligne = tampon.slice(0, fin).trim();
+    tampon = tampon.slice(fin + 1);
+    if (ligne) await Deno.stdout.write(encoder.encode(JSON.stringify(traiter(JSON.parse(ligne))) + "\n"));
+  }
+}
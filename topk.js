@@ -0,0 +1,138 @@
+const fs = require('fs');
+
+/**
+ * TABLE TOP-K PRÉCALCULÉE (préfixes courts)
+ * Lit le fichier binaire produit par build_topk.py : pour chaque
+ * (niveau, classe de contexte, préfixe de 1 à 3 lettres), les IDs
+ * des k meilleures entrées avec leur score et leurs drapeaux.
+ *
+ * Drapeaux (uint8) :
+ *   bits 0-1 : type de match (0 ortho, 1 phon_dys, 2 fuzzy)
+ *   bit 2    : fallback
+ *   bit 3    : contextMatch
+ *   bits 4-7 : segmentation (index dans meta.segmentations + 1, 0 = aucune)
+ */
+
+const MAGIC = 'DYST';
+const VERSION = 1;
+const TAILLE_ENTETE = 32;
+
+const TYPES_MATCH = ['ortho', 'phon_dys', 'fuzzy'];
+
+function aligner4(n) {
+  return (n + 3) & ~3;
+}
+
+class TableTopK {
+  /**
+   * @param {Buffer|ArrayBuffer} buffer - Contenu de topk.bin
+   */
+  constructor(buffer) {
+    const buf = Buffer.isBuffer(buffer) ? buffer : Buffer.from(buffer);
+    if (buf.toString('latin1', 0, 4) !== MAGIC) {
+      throw new Error('Fichier top-k invalide (magic)');
+    }
+    const version = buf.readUInt32LE(4);
+    if (version !== VERSION) {
+      throw new Error(`Version top-k non supportée: ${version}`);
+    }
+    const nbCles = buf.readUInt32LE(8);
+    const nbResultats = buf.readUInt32LE(12);
+    this.k = buf.readUInt32LE(16);
+    this.totalEntries = buf.readUInt32LE(20);
+    const tailleMeta = buf.readUInt32LE(24);
+    const tailleCles = buf.readUInt32LE(28);
+
+    let offset = TAILLE_ENTETE;
+    this.meta = JSON.parse(buf.toString('utf8', offset, offset + tailleMeta));
+    offset += aligner4(tailleMeta);
+
+    // Clés "niveau\tclasse\tpréfixe" (indices dans meta.niveaux / meta.classes)
+    const lignes = buf.toString('utf8', offset, offset + tailleCles).split('\n');
+    offset += aligner4(tailleCles);
+    this.index = new Map();
+    for (let i = 0; i < nbCles; i++) this.index.set(lignes[i], i);
+
+    this.niveaux = new Map(this.meta.niveaux.map((n, i) => [n, i]));
+    this.classes = new Map(this.meta.classes.map((c, i) => [c.cle, i]));
+    this.longueurMax = this.meta.longueurMax;
+
+    // Copie alignée (Buffer.from peut partager un pool non aligné)
+    // Plusieurs clés peuvent pointer sur le même bloc de résultats
+    const ab = buf.buffer.slice(buf.byteOffset, buf.byteOffset + buf.byteLength);
+    this.debuts = new Uint32Array(ab, offset, nbCles);
+    offset += nbCles * 4;
+    this.longueurs = new Uint8Array(ab, offset, nbCles);
+    offset += aligner4(nbCles);
+    this.ids = new Uint32Array(ab, offset, nbResultats);
+    offset += nbResultats * 4;
+    this.scores = new Float32Array(ab, offset, nbResultats);
+    offset += nbResultats * 4;
+    this.drapeaux = new Uint8Array(ab, offset, nbResultats);
+
+    this.octets = ab.byteLength;
+  }
+
+  static charger(chemin) {
+    return new TableTopK(fs.readFileSync(chemin));
+  }
+
+  /**
+   * Résultats précalculés d'un préfixe
+   * @returns {{ids: Uint32Array, scores: Float32Array, drapeaux: Uint8Array}|null}
+   *          Vues sans copie, null si la clé n'est pas dans la table
+   */
+  chercher(niveau, classe, prefixe) {
+    const n = this.niveaux.get(niveau);
+    const c = this.classes.get(classe);
+    if (n === undefined || c === undefined) return null;
+    const pos = this.index.get(`${n}\t${c}\t${prefixe}`);
+    if (pos === undefined) return null;
+
+    const debut = this.debuts[pos];
+    const fin = debut + this.longueurs[pos];
+    return {
+      ids: this.ids.subarray(debut, fin),
+      scores: this.scores.subarray(debut, fin),
+      drapeaux: this.drapeaux.subarray(debut, fin)
+    };
+  }
+
+  /**
+   * Décode les drapeaux d'un résultat
+   * @returns {{matchType: string, fallback: boolean, contextMatch: boolean, segmentation: string|null}}
+   */
+  decoder(drapeau) {
+    const seg = drapeau >> 4;
+    return {
+      matchType: TYPES_MATCH[drapeau & 3],
+      fallback: (drapeau & 4) !== 0,
+      contextMatch: (drapeau & 8) !== 0,
+      segmentation: seg > 0 ? this.meta.segmentations[seg - 1] : null
+    };
+  }
+
+  /**
+   * Statistiques mémoire
+   */
+  stats() {
+    return {
+      cles: this.index.size,
+      resultats: this.ids.length,
+      octets: this.octets
+    };
+  }
+}
+
+/**
+ * Encode les drapeaux d'un résultat de predict() (utilisé par topk_worker.js)
+ */
+function encoderDrapeaux(resultat, segmentations) {
+  let drapeau = Math.max(0, TYPES_MATCH.indexOf(resultat.matchType));
+  if (resultat.fallback) drapeau |= 4;
+  if (resultat.contextMatch) drapeau |= 8;
+  if (resultat.segmentation) drapeau |= (segmentations.indexOf(resultat.segmentation) + 1) << 4;
+  return drapeau;
+}
+
+module.exports = { TableTopK, encoderDrapeaux };
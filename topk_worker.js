@@ -0,0 +1,83 @@
+/**
+ * WORKER TOP-K
+ * Processus lancé par build_topk.py (un par cœur) : calcule les résultats de
+ * predict() pour des lots de préfixes. Le scoring reste celui de predicteur.js,
+ * la table ne peut donc pas diverger de la prédiction en direct.
+ *
+ * Protocole : une requête JSON par ligne sur stdin, une réponse par ligne sur stdout
+ *   {"cmd": "info"}
+ *     → {versionRegles, totalEntries, minPrefixLength, segmentations, classes: [{cle, prevWord}]}
+ *   {"cmd": "topk", "niveau": "cp_cm2", "prevWord": "le", "prefixes": ["ba", ...], "k": 10}
+ *     → {resultats: [[[id, score, drapeaux], ...], ...]}  (un tableau par préfixe)
+ *
+ * Usage: node topk_worker.js data/dictionnaire_dys.json
+ */
+
+// stdout est réservé au protocole : les logs (règles, prédicteur) passent sur stderr,
+// avant tout require (RuleRepository logge au chargement)
+console.log = (...args) => console.error(...args);
+
+const readline = require('readline');
+const PredicteurDys = require('./predicteur');
+const { encoderDrapeaux } = require('./topk');
+
+const MIN_PREFIX_LENGTH = 2;   // Valeur par défaut de predict()
+const BUDGET_FLOU_MS = 1000;   // Hors ligne : la recherche floue n'est jamais interrompue
+
+const predicteur = new PredicteurDys(process.argv[2] || 'data/dictionnaire_dys.json');
+// Les successeurs de bigrammes dépendent du mot exact : hors table
+predicteur.bigrammes = null;
+const segmentations = (predicteur.rules.SEGMENTATION || []).map(r => r.name);
+
+/**
+ * Classes de contexte : un mot précédent représentatif par classe
+ */
+function enumererClasses() {
+  const candidats = [''];
+  for (const trigger of predicteur.rules.CONTEXT.keys()) candidats.push(trigger);
+  for (const rule of predicteur.rules.SEGMENTATION || []) {
+    if (rule.triggers) candidats.push(...rule.triggers);
+  }
+
+  const classes = new Map();
+  for (const prevWord of candidats) {
+    const cle = predicteur.classeContexte(prevWord);
+    if (!classes.has(cle)) classes.set(cle, prevWord);
+  }
+  return Array.from(classes, ([cle, prevWord]) => ({ cle, prevWord }));
+}
+
+function traiter(requete) {
+  if (requete.cmd === 'info') {
+    return {
+      versionRegles: predicteur.rulesVersion,
+      totalEntries: predicteur.meta.total_entries,
+      minPrefixLength: MIN_PREFIX_LENGTH,
+      segmentations,
+      classes: enumererClasses()
+    };
+  }
+
+  if (requete.cmd === 'topk') {
+    const { niveau, prevWord = '', prefixes, k } = requete;
+    const resultats = prefixes.map(prefixe =>
+      predicteur.predict(prefixe, {
+        level: niveau,
+        limit: k,
+        prevWord,
+        minPrefixLength: MIN_PREFIX_LENGTH,
+        fuzzyBudgetMs: BUDGET_FLOU_MS,
+        useTopK: false
+      }).map(r => [r.id, r.score, encoderDrapeaux(r, segmentations)])
+    );
+    return { resultats };
+  }
+
+  return { erreur: `Commande inconnue: ${requete.cmd}` };
+}
+
+const rl = readline.createInterface({ input: process.stdin });
+rl.on('line', ligne => {
+  if (!ligne.trim()) return;
+  process.stdout.write(JSON.stringify(traiter(JSON.parse(ligne))) + '\n');
+});
@@ -0,0 +1,92 @@
+/**
+ * TRIE (arbre de préfixes)
+ * Indexe des clés (ortho, phon_dys...) vers des IDs d'entrées du dictionnaire.
+ * Utilisé par la recherche floue et le parcours des équivalences orthographiques.
+ */
+
+class NoeudTrie {
+  constructor() {
+    this.enfants = null; // Map<char, NoeudTrie>, créée à la demande
+    this.ids = null;     // IDs des entrées dont la clé se termine ici
+  }
+
+  enfant(char) {
+    return this.enfants ? this.enfants.get(char) : undefined;
+  }
+}
+
+class Trie {
+  constructor() {
+    this.racine = new NoeudTrie();
+    this.taille = 0;
+  }
+
+  /**
+   * Construit un trie à partir des entrées du dictionnaire
+   * @param {Array<object>} entries - Entrées du dictionnaire
+   * @param {function(object): string} getCle - Extrait la clé d'une entrée
+   */
+  static depuisEntrees(entries, getCle) {
+    const trie = new Trie();
+    for (const entry of entries) {
+      const cle = getCle(entry);
+      if (cle) trie.inserer(cle, entry.id);
+    }
+    return trie;
+  }
+
+  inserer(cle, id) {
+    let noeud = this.racine;
+    for (const char of cle) {
+      if (!noeud.enfants) noeud.enfants = new Map();
+      let suivant = noeud.enfants.get(char);
+      if (!suivant) {
+        suivant = new NoeudTrie();
+        noeud.enfants.set(char, suivant);
+      }
+      noeud = suivant;
+    }
+    if (!noeud.ids) noeud.ids = [];
+    noeud.ids.push(id);
+    this.taille++;
+  }
+
+  /**
+   * Nœud atteint en suivant le préfixe (undefined si absent)
+   */
+  noeud(prefixe, depart = this.racine) {
+    let noeud = depart;
+    for (const char of prefixe) {
+      noeud = noeud.enfant(char);
+      if (!noeud) return undefined;
+    }
+    return noeud;
+  }
+
+  /**
+   * Collecte les IDs de toutes les clés sous un nœud (parcours en profondeur)
+   * @param {NoeudTrie} noeud - Nœud de départ
+   * @param {function(number)} visiteur - Appelé pour chaque ID
+   * @param {number} max - Nombre max d'IDs visités
+   * @returns {number} - Nombre d'IDs visités
+   */
+  collecter(noeud, visiteur, max = Infinity) {
+    let compte = 0;
+    const pile = [noeud];
+    while (pile.length > 0 && compte < max) {
+      const n = pile.pop();
+      if (n.ids) {
+        for (const id of n.ids) {
+          visiteur(id);
+          if (++compte >= max) break;
+        }
+      }
+      if (n.enfants) {
+        for (const e of n.enfants.values()) pile.push(e);
+      }
+    }
+    return compte;
+  }
+}
+
+module.exports = { Trie, NoeudTrie };
@@ -0,0 +1,291 @@
+#!/usr/bin/env python3
+"""
+Réglage hors ligne des poids du scoring de predict() (rules/poids.json)
+sur un corpus de requêtes étiquetées.
+
+Corpus data/requetes_etiquetees.tsv : une requête par ligne,
+    saisie<TAB>mot attendu<TAB>mot précédent (optionnel)
+par exemple "bato<TAB>bateau<TAB>un". Lignes vides et "#..." ignorées.
+
+Objectif (à maximiser) :
+    MRR@10 - lambda × frappes
+    - MRR@10 : rang du mot attendu pour la saisie complète
+    - frappes : part de la saisie tapée avant que le mot entre dans le
+      top-5 visible (latence côté enfant ; saisie complète + 1 s'il n'y
+      entre jamais)
+
+Les workers (tuner_worker.js, un par cœur) chargent le corpus une fois :
+les candidats de chaque préfixe sont capturés à ce moment, une évaluation
+ne refait que le scoring. Les vecteurs de poids d'une étape sont répartis
+sur le pool.
+
+Méthodes :
+    coordonnees : descente coordonnée (un poids à la fois, multiplicateurs)
+    aleatoire   : tirages autour des poids courants (log-normal)
+    grille      : produit cartésien sur --parametres
+
+Sortie : rules/poids_optimises.json (même format que rules/poids.json,
+à relire avant de le copier : un corpus trop petit sur-ajuste). Après la
+copie, node build_poids_edge.js met à jour les poids de l'edge function.
+
+Usage :
+    python tuner_poids.py [--methode coordonnees|aleatoire|grille]
+                          [--iterations 5] [--lambda 0.2] [--niveau cp_cm2]
+                          [--parametres frequence_log,mot_exact] [--corpus fichier.tsv]
+"""
+
+import itertools
+import json
+import math
+import os
+import random
+import sys
+import time
+from multiprocessing import Pool
+
+from build_topk import demarrer_worker, interroger
+
+RACINE = os.path.dirname(os.path.abspath(__file__))
+FICHIER_DICTIONNAIRE = 'data/dictionnaire_dys.json'
+FICHIER_CORPUS = 'data/requetes_etiquetees.tsv'
+FICHIER_POIDS = os.path.join(RACINE, 'rules/poids.json')
+FICHIER_SORTIE = os.path.join(RACINE, 'rules/poids_optimises.json')
+WORKER = ['node', os.path.join(RACINE, 'tuner_worker.js')]
+
+LAMBDA = 0.2
+ITERATIONS = 5
+MULTIPLICATEURS = (0, 0.5, 0.75, 1.25, 1.5, 2)   # Descente coordonnée
+GRILLE = (0.5, 0.75, 1, 1.25, 1.5)               # Grille, par paramètre
+SIGMA = 0.3                                      # Tirages aléatoires (log-normal)
+TIRAGES_PAR_ITERATION = 16
+ENTIERS = {'marge_longueur'}                     # Seuils en nombre de lettres
+PREFIXE_CONTEXTE = 'contexte.'
+
+
+def lire_option(nom, defaut):
+    args = sys.argv[1:]
+    if nom in args and args.index(nom) + 1 < len(args):
+        return args[args.index(nom) + 1]
+    return defaut
+
+
+def lire_corpus(chemin):
+    requetes = []
+    with open(chemin, 'r', encoding='utf-8') as f:
+        for ligne in f:
+            ligne = ligne.rstrip('\r\n')
+            if not ligne.strip() or ligne.startswith('#'):
+                continue
+            colonnes = ligne.split('\t')
+            if len(colonnes) < 2:
+                raise ValueError(f"{chemin} : ligne sans mot attendu ({ligne!r})")
+            requetes.append([colonnes[0], colonnes[1], colonnes[2] if len(colonnes) > 2 else ''])
+    return requetes
+
+
+def lire_poids(chemin):
+    """poids.json → vecteur plat ({"frequence_log": 60, "contexte.pronom_je": 20, ...})"""
+    with open(chemin, 'r', encoding='utf-8') as f:
+        poids = json.load(f)
+    vecteur = {}
+    for cle, valeur in poids.items():
+        if cle.startswith('_'):
+            continue
+        if cle == 'contexte':
+            for regle, boost in valeur.items():
+                if not regle.startswith('_'):
+                    vecteur[PREFIXE_CONTEXTE + regle] = boost
+        elif isinstance(valeur, (int, float)):
+            vecteur[cle] = valeur
+    return vecteur
+
+
+def vers_poids(vecteur):
+    """Vecteur plat → format de poids.json (contexte regroupé)"""
+    poids = {'contexte': {}}
+    for cle, valeur in vecteur.items():
+        if cle.startswith(PREFIXE_CONTEXTE):
+            poids['contexte'][cle[len(PREFIXE_CONTEXTE):]] = valeur
+        else:
+            poids[cle] = valeur
+    return poids
+
+
+def borner(cle, valeur, depart):
+    """Poids positifs, au plus le double de la valeur de départ"""
+    haut = 2 * depart[cle] if depart[cle] > 0 else 10
+    valeur = min(max(valeur, 0), haut)
+    return round(valeur) if cle in ENTIERS else round(valeur, 2)
+
+
+# --- Pool ---
+
+def initialiser(commande, niveau, requetes):
+    demarrer_worker(commande)
+    interroger({'cmd': 'charger', 'niveau': niveau, 'requetes': requetes})
+
+
+def evaluer_lot(vecteurs):
+    reponse = interroger({'cmd': 'evaluer', 'poids': [vers_poids(v) for v in vecteurs]})
+    return reponse['resultats']
+
+
+class Evaluateur:
+    """Évalue des vecteurs en parallèle (mémoïsés) et garde le meilleur"""
+
+    def __init__(self, pool, nb_workers, lam):
+        self.pool = pool
+        self.nb_workers = nb_workers
+        self.lam = lam
+        self.cache = {}
+        self.evaluations = 0
+        self.ms = 0.0
+
+    def objectif(self, mesure):
+        return mesure['mrr'] - self.lam * mesure['frappes']
+
+    def evaluer(self, vecteurs):
+        a_calculer = {}
+        for v in vecteurs:
+            cle = tuple(sorted(v.items()))
+            if cle not in self.cache:
+                a_calculer[cle] = v
+        a_calculer = list(a_calculer.values())
+        if a_calculer:
+            taille = math.ceil(len(a_calculer) / self.nb_workers)
+            lots = [a_calculer[i:i + taille] for i in range(0, len(a_calculer), taille)]
+            mesures = [m for lot in self.pool.map(evaluer_lot, lots) for m in lot]
+            for v, mesure in zip(a_calculer, mesures):
+                mesure['objectif'] = self.objectif(mesure)
+                self.cache[tuple(sorted(v.items()))] = mesure
+                self.ms += mesure['ms']
+            self.evaluations += len(a_calculer)
+        return [self.cache[tuple(sorted(v.items()))] for v in vecteurs]
+
+    def meilleur(self, vecteurs):
+        mesures = self.evaluer(vecteurs)
+        i = max(range(len(vecteurs)), key=lambda j: mesures[j]['objectif'])
+        return vecteurs[i], mesures[i]
+
+
+# --- Méthodes de recherche ---
+
+def descente_coordonnees(evaluateur, depart, parametres, iterations):
+    courant, mesure = evaluateur.meilleur([depart])
+    for passe in range(iterations):
+        ameliore = False
+        for cle in parametres:
+            base = depart[cle] if depart[cle] > 0 else 5
+            voisins = [dict(courant, **{cle: borner(cle, base * m, depart)}) for m in MULTIPLICATEURS]
+            candidat, m = evaluateur.meilleur(voisins)
+            if m['objectif'] > mesure['objectif'] + 1e-9:
+                courant, mesure, ameliore = candidat, m, True
+        afficher_etape(f"passe {passe + 1}", mesure)
+        if not ameliore:
+            break
+    return courant, mesure
+
+
+def recherche_aleatoire(evaluateur, depart, parametres, iterations, graine=1):
+    rnd = random.Random(graine)
+    courant, mesure = evaluateur.meilleur([depart])
+    for iteration in range(iterations):
+        tirages = [courant]
+        for _ in range(TIRAGES_PAR_ITERATION):
+            v = dict(courant)
+            for cle in parametres:
+                base = v[cle] if v[cle] > 0 else 1
+                v[cle] = borner(cle, base * math.exp(rnd.gauss(0, SIGMA)), depart)
+            tirages.append(v)
+        courant, mesure = evaluateur.meilleur(tirages)
+        afficher_etape(f"itération {iteration + 1}", mesure)
+    return courant, mesure
+
+
+def recherche_grille(evaluateur, depart, parametres):
+    axes = [[borner(cle, depart[cle] * m, depart) for m in GRILLE] for cle in parametres]
+    vecteurs = [dict(depart, **dict(zip(parametres, valeurs))) for valeurs in itertools.product(*axes)]
+    print(f"   {len(vecteurs)} points")
+    courant, mesure = evaluateur.meilleur(vecteurs)
+    afficher_etape("grille", mesure)
+    return courant, mesure
+
+
+# --- Rapport ---
+
+def afficher_etape(nom, mesure):
+    print(f"   {nom:<13} objectif {mesure['objectif']:.4f}  MRR@10 {mesure['mrr']:.4f}  "
+          f"frappes {mesure['frappes']:.3f}  inaccessibles {mesure['inaccessibles']}")
+
+
+def ecrire_sortie(vecteur, depart, mesure, initiale, methode, lam, nb_requetes):
+    poids = {
+        '_comment': f"Généré par tuner_poids.py ({methode}, lambda {lam}, {nb_requetes} requêtes). "
+                    f"MRR@10 {initiale['mrr']:.4f} → {mesure['mrr']:.4f}, "
+                    f"frappes {initiale['frappes']:.3f} → {mesure['frappes']:.3f}. "
+                    f"À relire avant de remplacer rules/poids.json"
+    }
+    poids.update(vers_poids(vecteur))
+    with open(FICHIER_SORTIE, 'w', encoding='utf-8') as f:
+        json.dump(poids, f, ensure_ascii=False, indent=2)
+        f.write('\n')
+
+    changes = [(cle, depart[cle], vecteur[cle]) for cle in vecteur if vecteur[cle] != depart[cle]]
+    if changes:
+        print("\nPoids modifiés :")
+        for cle, avant, apres in changes:
+            print(f"   {cle:<34} {avant:>7} → {apres}")
+
+
+def main():
+    debut = time.time()
+    methode = lire_option('--methode', 'coordonnees')
+    if methode not in ('coordonnees', 'aleatoire', 'grille'):
+        print(f"❌ Méthode inconnue : {methode}")
+        return 1
+    iterations = int(lire_option('--iterations', ITERATIONS))
+    lam = float(lire_option('--lambda', LAMBDA))
+    niveau = lire_option('--niveau', 'cp_cm2')
+    corpus = lire_option('--corpus', FICHIER_CORPUS)
+
+    requetes = lire_corpus(corpus)
+    depart = lire_poids(FICHIER_POIDS)
+    parametres = lire_option('--parametres', '')
+    if parametres:
+        parametres = parametres.split(',')
+        inconnus = [p for p in parametres if p not in depart]
+        if inconnus:
+            print(f"❌ Poids inconnus : {', '.join(inconnus)}")
+            return 1
+    elif methode == 'grille':
+        parametres = ['frequence_log', 'mot_exact', 'prefixe_ortho']   # 5^n points : rester petit
+    else:
+        parametres = list(depart)
+
+    nb_workers = os.cpu_count() or 1
+    print(f"📂 {len(requetes)} requêtes ({corpus}), {len(parametres)} poids, {nb_workers} workers")
+    print(f"⚙️ Méthode {methode}, objectif MRR@10 - {lam} × frappes")
+
+    commande = WORKER + [FICHIER_DICTIONNAIRE]
+    with Pool(nb_workers, initializer=initialiser, initargs=(commande, niveau, requetes)) as pool:
+        evaluateur = Evaluateur(pool, nb_workers, lam)
+        initiale = evaluateur.evaluer([depart])[0]
+        afficher_etape("départ", initiale)
+        if methode == 'coordonnees':
+            vecteur, mesure = descente_coordonnees(evaluateur, depart, parametres, iterations)
+        elif methode == 'aleatoire':
+            vecteur, mesure = recherche_aleatoire(evaluateur, depart, parametres, iterations)
+        else:
+            vecteur, mesure = recherche_grille(evaluateur, depart, parametres)
+
+    ecrire_sortie(vecteur, depart, mesure, initiale, methode, lam, len(requetes))
+    print("-" * 30)
+    print("✅ Terminé !")
+    print(f"{evaluateur.evaluations} évaluations, scoring {evaluateur.ms / max(evaluateur.evaluations, 1):.1f} ms par évaluation")
+    print(f"Durée : {time.time() - debut:.1f}s")
+    print(f"📁 Fichier généré : {FICHIER_SORTIE}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
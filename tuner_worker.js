@@ -0,0 +1,147 @@
+/**
+ * WORKER DU TUNER DE POIDS
+ * Processus lancé par tuner_poids.py (un par cœur) : rejoue un corpus de
+ * requêtes étiquetées avec des vecteurs de poids différents.
+ *
+ * La recherche de candidats (index, phonétique, floue) ne dépend pas des
+ * poids : elle est faite une fois au chargement (option capture de predict())
+ * et chaque évaluation ne refait que le scoring (scorerCandidats) et le rang
+ * du mot attendu.
+ *
+ * Protocole : une requête JSON par ligne sur stdin, une réponse par ligne sur stdout
+ *   {"cmd": "charger", "niveau": "cp_cm2", "requetes": [["bato", "bateau", "un"], ...]}
+ *     → {requetes, prefixes, candidats}
+ *   {"cmd": "evaluer", "poids": [{"frequence_log": 55, "contexte": {...}}, ...]}
+ *     → {resultats: [{mrr, frappes, inaccessibles, ms}, ...]}  (un par vecteur)
+ *
+ * Usage: node tuner_worker.js data/dictionnaire_dys.json
+ */
+
+// stdout est réservé au protocole : les logs (règles, prédicteur) passent sur stderr,
+// avant tout require (RuleRepository logge au chargement)
+console.log = (...args) => console.error(...args);
+
+const readline = require('readline');
+const PredicteurDys = require('./predicteur');
+
+const MIN_PREFIX_LENGTH = 2;   // Valeur par défaut de predict()
+const LIMIT = 10;              // MRR@10
+const K_VISIBLE = 5;           // Top-k visible dans la popup (frappes)
+const BUDGET_FLOU_MS = 1000;   // Hors ligne : la recherche floue n'est jamais interrompue
+
+const predicteur = new PredicteurDys(process.argv[2] || 'data/dictionnaire_dys.json');
+
+// Candidats capturés par (préfixe, mot précédent), partagés entre requêtes
+let captures = new Map();
+// Par requête : mot attendu et clés de capture de ses préfixes (du plus court au plus long)
+let requetes = [];
+
+function capturer(prefixe, prevWord, niveau) {
+  const cle = `${prevWord}\t${prefixe}`;
+  if (!captures.has(cle)) {
+    const capture = {};
+    predicteur.predict(prefixe, {
+      level: niveau,
+      limit: LIMIT,
+      prevWord,
+      minPrefixLength: MIN_PREFIX_LENGTH,
+      fuzzyBudgetMs: BUDGET_FLOU_MS,
+      useTopK: false,
+      capture
+    });
+    captures.set(cle, capture.candidats ? capture : null);
+  }
+  return cle;
+}
+
+function charger({ niveau = 'cp_cm2', requetes: corpus }) {
+  captures = new Map();
+  requetes = corpus.map(([saisie, attendu, prevWord = '']) => {
+    const s = saisie.toLowerCase();
+    const prefixes = [];
+    for (let n = MIN_PREFIX_LENGTH; n <= s.length; n++) {
+      prefixes.push(capturer(s.slice(0, n), prevWord, niveau));
+    }
+    return { attendu: attendu.toLowerCase(), longueur: s.length, prefixes };
+  });
+
+  let candidats = 0;
+  for (const capture of captures.values()) candidats += capture ? capture.candidats.length : 0;
+  return { requetes: requetes.length, prefixes: captures.size, candidats };
+}
+
+/**
+ * Rang (1-based) du mot attendu après scoring, Infinity s'il est absent.
+ * Même ordre que le tri stable de predict() : scores strictement supérieurs,
+ * puis ex aequo placés avant lui dans la liste des candidats
+ */
+function rang(capture, attendu, poids) {
+  if (!capture) return Infinity;
+  const scores = predicteur.scorerCandidats(capture.candidats, capture.contexte, poids);
+  let meilleur = -1;
+  for (let i = 0; i < scores.length; i++) {
+    if (scores[i].ortho.toLowerCase() === attendu && (meilleur < 0 || scores[i].score > scores[meilleur].score)) {
+      meilleur = i;
+    }
+  }
+  if (meilleur < 0) return Infinity;
+  const cible = scores[meilleur].score;
+  let r = 1;
+  for (let i = 0; i < scores.length; i++) {
+    if (scores[i].score > cible || (scores[i].score === cible && i < meilleur)) r++;
+  }
+  return r;
+}
+
+function evaluer(surcharge) {
+  const debut = performance.now();
+  const poids = Object.assign({}, predicteur.rules.POIDS, surcharge, {
+    contexte: Object.assign({}, predicteur.rules.POIDS.contexte, surcharge.contexte)
+  });
+
+  let rr = 0;
+  let frappes = 0;
+  let inaccessibles = 0;
+  for (const requete of requetes) {
+    const { attendu, longueur, prefixes } = requete;
+    // MRR sur la saisie complète
+    const r = prefixes.length > 0 ? rang(captures.get(prefixes[prefixes.length - 1]), attendu, poids) : Infinity;
+    if (r <= LIMIT) rr += 1 / r;
+
+    // Frappes avant que le mot entre dans le top visible (part de la saisie)
+    let n = 0;
+    for (let i = 0; i < prefixes.length; i++) {
+      if (rang(captures.get(prefixes[i]), attendu, poids) <= K_VISIBLE) {
+        n = MIN_PREFIX_LENGTH + i;
+        break;
+      }
+    }
+    if (n > 0) {
+      frappes += n / longueur;
+    } else {
+      // Inaccessible : toute la saisie, plus une frappe pour le chercher ailleurs
+      frappes += (longueur + 1) / longueur;
+      inaccessibles++;
+    }
+  }
+
+  const total = Math.max(requetes.length, 1);
+  return {
+    mrr: rr / total,
+    frappes: frappes / total,
+    inaccessibles,
+    ms: +(performance.now() - debut).toFixed(1)
+  };
+}
+
+function traiter(requete) {
+  if (requete.cmd === 'charger') return charger(requete);
+  if (requete.cmd === 'evaluer') return { resultats: requete.poids.map(evaluer) };
+  return { erreur: `Commande inconnue: ${requete.cmd}` };
+}
+
+const rl = readline.createInterface({ input: process.stdin });
+rl.on('line', ligne => {
+  if (!ligne.trim()) return;
+  process.stdout.write(JSON.stringify(traiter(JSON.parse(ligne))) + '\n');
+});